@@ -0,0 +1,101 @@
+# =============================================
+# PLATFORM ANALITIGI API ENDPOINT'LERI (sistem admin)
+# GET  /api/v1/analitik                  -> Platform ozeti (platform_ozet tablosundan)
+# GET  /api/v1/analitik/sorgular         -> Kayitli sorgular
+# GET  /api/v1/analitik/canli/{sorgu}    -> Tum OSGB'lere simdi sor (onbelleksiz)
+# POST /api/v1/analitik/yenile           -> platform_ozet'i simdi yenile
+# =============================================
+#
+# Ayrinti: app/services/analitik_service.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_master_db
+from app.core.zamanlayici import zamanlayici
+from app.middleware.deps import TokenKullanici, rol_gerekli
+
+from app.services.analitik_service import (
+    ANALITIK_SORGULARI, dagit, ozetleri_yenile, platform_ozeti,
+)
+
+router = APIRouter(
+    prefix="/analitik",
+    tags=["Platform Analitigi"],
+)
+
+
+# =============================================
+# GET /api/v1/analitik
+# =============================================
+@router.get("")
+def analitik_ozet(
+    tenant_detay: bool = Query(False, description="OSGB bazinda sonuclari da getir"),
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+    db: Session = Depends(get_master_db),
+):
+    """
+    📚 DERS: Dashboard bu endpoint'i kullanir: tek tablo okunur,
+    OSGB veritabanlarina hic gidilmez.
+
+    "eksik_tenantlar": son yenilemede yanit vermeyen OSGB'ler
+    (toplamda onlarin bir onceki verisi kullanildi).
+    """
+    return {
+        "yenileme_araligi_dk": settings.ANALITIK_YENILEME_DK,
+        "sorgular": platform_ozeti(db, tenant_detay=tenant_detay),
+    }
+
+
+# =============================================
+# GET /api/v1/analitik/sorgular
+# =============================================
+@router.get("/sorgular")
+def analitik_sorgulari(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    return {
+        "sorgular": [{"ad": ad, "aciklama": aciklama} for ad, (_, aciklama) in ANALITIK_SORGULARI.items()],
+        "zamanlayici": zamanlayici.durum(),
+    }
+
+
+# =============================================
+# GET /api/v1/analitik/canli/{sorgu_adi}
+# =============================================
+@router.get("/canli/{sorgu_adi}")
+async def analitik_canli(
+    sorgu_adi: str,
+    zaman_asimi_sn: float = Query(None, gt=0, le=60, description="Bos = ANALITIK_ZAMAN_ASIMI_SN"),
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """
+    Sorguyu tum aktif OSGB'lerde SIMDI calistirir. Zaman asimina ugrayan
+    OSGB'ler "hatalar"da listelenir, "toplam" yanit verenlerin toplamidir.
+    """
+    if sorgu_adi not in ANALITIK_SORGULARI:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Analitik sorgusu bulunamadi: '{sorgu_adi}'",
+        )
+    # dagit() thread havuzunda bekler: event loop'u tutmasin
+    return await run_in_threadpool(dagit, sorgu_adi, None, zaman_asimi_sn)
+
+
+# =============================================
+# POST /api/v1/analitik/yenile
+# =============================================
+@router.post("/yenile")
+async def analitik_yenile(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """platform_ozet tablosunu zamanlayiciyi beklemeden yeniler."""
+    rapor = await run_in_threadpool(ozetleri_yenile)
+    if rapor.get("atlandi"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Platform ozeti su anda baska bir islem tarafindan yenileniyor",
+        )
+    return rapor
@@ -1,6 +1,8 @@
 # =============================================
 # AUTH API ENDPOINT'LERI
 # POST /api/v1/auth/login  -> Kullanici girisi
+# POST /api/v1/auth/yenile -> Refresh token ile yeni token cifti
+# POST /api/v1/auth/cikis  -> Oturumu kapat
 # GET  /api/v1/auth/ben     -> Mevcut kullanici bilgisi
 # =============================================
 
@@ -11,16 +13,20 @@
 # Boylece main.py temiz kalir!
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from jose import JWTError
 
 from app.core.database import get_master_db
-from app.core.security import token_coz
-from app.schemas.auth import LoginRequest, TokenResponse, KullaniciBilgi
-from app.services.auth_service import kullanici_giris
+from app.core.rate_limit import istemci_ip
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir
+from app.schemas.auth import LoginRequest, TokenResponse, KullaniciBilgi, YenileRequest, CikisRequest
+from app.services.auth_service import (
+    giris_siniri_kontrol, kullanici_bul, kullanici_giris, token_yenile, cikis_yap,
+)
 from app.services.log_service import islem_logla
-from app.models.master import Kullanici, Tenant, IslemLogEnum
+from app.services.tenant_dizini import tenant_dizini
+from app.models.master import Kullanici, IslemLogEnum
 
 # ---- ROUTER OLUSTUR ----
 router = APIRouter(
@@ -46,14 +52,19 @@ async def login(
     db: Session = Depends(get_master_db),
 ):
     """Login endpoint'i (Swagger icin form-data)"""
+    # Sinir asildiysa 429 (DB'ye log yazilmaz, bcrypt calismaz)
+    giris_siniri_kontrol(istemci_ip(request), form_data.username)
     try:
-        sonuc = kullanici_giris(
+        sonuc = await kullanici_giris(
             email=form_data.username,
             sifre=form_data.password,
             db=db,
+            ip=istemci_ip(request),
+            user_agent=request.headers.get("user-agent"),
+            subdomain_tenant=getattr(request.state, "tenant_kaydi", None),
         )
         # Basarili giris logu
-        kullanici = db.query(Kullanici).filter(Kullanici.email == form_data.username).first()
+        kullanici = await run_in_threadpool(kullanici_bul, db, form_data.username)
         await islem_logla(
             db=db, islem_turu=IslemLogEnum.GIRIS, modul="auth",
             aciklama=f"Basarili giris: {form_data.username}",
@@ -81,13 +92,17 @@ async def login_json(
     db: Session = Depends(get_master_db),
 ):
     """JSON login endpoint'i (Flutter icin)"""
+    giris_siniri_kontrol(istemci_ip(request), login_data.email)
     try:
-        sonuc = kullanici_giris(
+        sonuc = await kullanici_giris(
             email=login_data.email,
             sifre=login_data.sifre,
             db=db,
+            ip=istemci_ip(request),
+            user_agent=request.headers.get("user-agent"),
+            subdomain_tenant=getattr(request.state, "tenant_kaydi", None),
         )
-        kullanici = db.query(Kullanici).filter(Kullanici.email == login_data.email).first()
+        kullanici = await run_in_threadpool(kullanici_bul, db, login_data.email)
         await islem_logla(
             db=db, islem_turu=IslemLogEnum.GIRIS, modul="auth",
             aciklama=f"Basarili giris: {login_data.email}",
@@ -103,13 +118,61 @@ async def login_json(
         raise
 
 
+# =============================================
+# POST /api/v1/auth/yenile
+# Refresh token ile yeni access + refresh token
+# =============================================
+@router.post("/yenile", response_model=TokenResponse)
+def yenile(
+    request: Request,
+    veri: YenileRequest,
+    db: Session = Depends(get_master_db),
+):
+    """
+    📚 DERS: Access token suresi dolunca (401) frontend bunu cagirir.
+
+    Gonderilen refresh token artik GECERSIZDIR; yanittaki yeni
+    refresh token saklanmalidir. Ayni refresh token ikinci kez
+    gonderilirse o oturum tamamen kapatilir (calinma suphesi).
+    """
+    return token_yenile(
+        veri.refresh_token,
+        db,
+        ip=istemci_ip(request),
+        user_agent=request.headers.get("user-agent"),
+    )
+
+
+# =============================================
+# POST /api/v1/auth/cikis
+# Oturumu (veya tum oturumlari) kapat
+# =============================================
+@router.post("/cikis", status_code=status.HTTP_204_NO_CONTENT)
+async def cikis(
+    request: Request,
+    veri: CikisRequest = CikisRequest(),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(get_master_db),
+):
+    """Access token aninda, refresh token'in ailesi DB'de iptal edilir."""
+    # DB isi (iptal UPDATE'leri + commit) event loop'u bekletmesin
+    await run_in_threadpool(
+        cikis_yap, db, kullanici, refresh_token=veri.refresh_token, tum_cihazlar=veri.tum_cihazlar,
+    )
+    await islem_logla(
+        db=db, islem_turu=IslemLogEnum.CIKIS, modul="auth",
+        aciklama=f"Cikis: {kullanici.email}" + (" (tum cihazlar)" if veri.tum_cihazlar else ""),
+        kullanici=kullanici, request=request,
+    )
+
+
 # =============================================
 # GET /api/v1/auth/ben
 # Mevcut kullanicinin bilgilerini dondurur
 # =============================================
 @router.get("/ben", response_model=KullaniciBilgi)
 def mevcut_kullanici(
-    token: str = Depends(oauth2_scheme),
+    token_kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(get_master_db),
 ):
     """
@@ -120,26 +183,11 @@ def mevcut_kullanici(
 
     Bu endpoint token'i cozer ve kullanici bilgisini dondurur.
     Dashboard'da "Hosgeldin Ahmet" yazmak icin kullanilir.
+    Diger endpoint'lerin aksine bilgiler DB'den taze okunur.
     """
-    # Token'i coz
-    try:
-        payload = token_coz(token)
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Gecersiz token",
-            )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token suresi dolmus veya gecersiz",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
     # Kullaniciyi bul
     kullanici = db.query(Kullanici).filter(
-        Kullanici.email == email
+        Kullanici.id == token_kullanici.id
     ).first()
 
     if not kullanici:
@@ -148,13 +196,11 @@ def mevcut_kullanici(
             detail="Kullanici bulunamadi",
         )
 
-    # Tenant bilgisi
+    # Tenant bilgisi (bellekteki dizinden)
     tenant_ad = None
     db_name = None
     if kullanici.tenant_id:
-        tenant = db.query(Tenant).filter(
-            Tenant.id == kullanici.tenant_id
-        ).first()
+        tenant = tenant_dizini.id_ile(kullanici.tenant_id)
         if tenant:
             tenant_ad = tenant.ad
             db_name = tenant.db_name
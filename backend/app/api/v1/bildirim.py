@@ -0,0 +1,260 @@
+# =============================================
+# BILDIRIM API (WebSocket)
+# Istemcinin polling yapmadan aninda haberdar olmasi
+# =============================================
+#
+# Endpoint listesi:
+# WS     /api/v1/bildirim/ws       -> Anlik bildirim kanali (tenant + kullanici)
+# POST   /api/v1/bildirim/duyuru   -> OSGB'nin tum acik oturumlarina duyuru (yonetici)
+# GET    /api/v1/bildirim/durum    -> Bu worker'in baglanti istatistigi (sistem admin)
+#
+# 📚 DERS: WebSocket'te kimlik dogrulama
+# Tarayici WebSocket acarken Authorization header'i EKLEYEMEZ; token'i
+# URL'ye koymak da erisim loglarina sizdirir. Bu yuzden:
+#   - Header varsa (mobil / servis istemcisi): Authorization: Bearer <token>
+#   - Yoksa baglandiktan sonra ILK mesaj: {"olay": "giris", "token": "<access token>"}
+#     (WS_GIRIS_SURESI_SN icinde gelmezse baglanti kapanir)
+# Token REST API'dekiyle ayni dogrulamadan gecer (imza, sure, iptal listesi).
+# Access token kisa omurlu: suresi dolmadan {"olay": "token", "token": "<yeni>"}
+# gonderilmezse baglanti 4401 ile kapanir, istemci yeni token'la yeniden baglanir.
+#
+# Sunucu -> istemci mesajlari: {"olay", "kanal", "veri", "zaman"}
+#   baglandi, pong, kayip (mesaj dustu: ekrani yenile), sure_uyarilari,
+#   ziyaret_plani, ziyaret_atandi, ice_aktarim, geokod, duyuru,
+#   sync (baska cihaz degisiklik gonderdi: GET /api/v1/sync)
+#
+# Kapanis kodlari: 4401 kimlik, 4403 yetki, 4408 istemci okumuyor,
+# 1013 sunucu dolu (baska worker'a dene), 1001 sunucu yeniden basliyor.
+#
+# Bosta baglantilarin canli olup olmadigini uvicorn'un WebSocket ping'i
+# kontrol eder (--ws-ping-interval, varsayilan 20 sn). Worker basina
+# binlerce baglanti icin:
+#   - acik dosya siniri yukseltilmeli (ulimit -n)
+#   - sikistirma kapatilmali (--ws-per-message-deflate false, run_server.py):
+#     permessage-deflate'in zlib durumu baglanti basina ~100 KB; kisa JSON
+#     bildirimlerde kazanci yok. Olcum: python -m benchmarks.bench_websocket
+#
+# Yayin tarafi: app/core/bildirim.py
+
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.orm import Session
+
+from app.core.bildirim import bildirim_merkezi, kullanici_kanali, mesaj_olustur, tenant_bildir, tenant_kanali, Abone
+from app.core.config import settings
+from app.core.database import get_master_db
+from app.core.logger import logger
+from app.middleware.deps import TokenKullanici, rol_gerekli, token_dogrula
+from app.models.master import IslemLogEnum
+from app.schemas.bildirim import DuyuruIstegi
+from app.services.log_service import islem_logla
+
+router = APIRouter(
+    prefix="/bildirim",
+    tags=["Bildirimler"],
+)
+
+KAPAT_KIMLIK = 4401
+KAPAT_YETKI = 4403
+KAPAT_YAVAS = 4408
+KAPAT_DOLU = 1013
+
+
+class _Red(Exception):
+    """Baglanti bu kod ve nedenle kapatilmali."""
+
+    def __init__(self, kod: int, neden: str):
+        super().__init__(neden)
+        self.kod = kod
+        self.neden = neden
+
+
+def _token_coz(token: Optional[str]) -> dict:
+    """REST'teki mevcut_kullanici_getir ile ayni kontroller; hata -> _Red."""
+    if not token:
+        raise _Red(KAPAT_KIMLIK, "Token gerekli")
+    try:
+        payload = token_dogrula(token)
+    except HTTPException as e:
+        raise _Red(KAPAT_KIMLIK, e.detail)
+    if not payload.get("aktif", False):
+        raise _Red(KAPAT_YETKI, "Hesabiniz devre disi")
+    return payload
+
+
+async def _token_al(websocket: WebSocket) -> Optional[str]:
+    yetki = websocket.headers.get("authorization", "")
+    if yetki.lower().startswith("bearer "):
+        return yetki[7:].strip()
+    try:
+        ilk = await asyncio.wait_for(websocket.receive_json(), timeout=settings.WS_GIRIS_SURESI_SN)
+    except asyncio.TimeoutError:
+        raise _Red(KAPAT_KIMLIK, "Giris mesaji gelmedi")
+    except (ValueError, KeyError):
+        raise _Red(KAPAT_KIMLIK, "Gecersiz giris mesaji")
+    if isinstance(ilk, dict) and ilk.get("olay") == "giris":
+        return ilk.get("token")
+    raise _Red(KAPAT_KIMLIK, "Ilk mesaj giris olmali")
+
+
+async def _kapat(websocket: WebSocket, kod: int, neden: str = "") -> None:
+    # Istemci zaten gitmis / TCP tamponu dolu olabilir: kapanis da beklemesin
+    try:
+        await asyncio.wait_for(websocket.close(code=kod, reason=neden), timeout=1.0)
+    except Exception:
+        pass
+
+
+async def _gonder(websocket: WebSocket, abone: Abone, oturum: dict) -> None:
+    """Kuyruktaki mesajlari yazar; token suresi dolunca / kapat istenince kapatir."""
+    loop = asyncio.get_running_loop()
+    while True:
+        kalan = oturum["exp"] - time.time()
+        if kalan <= 0:
+            await _kapat(websocket, KAPAT_KIMLIK, "Token suresi doldu")
+            return
+        # wait_for yerine zamanlayici: bosta baglanti basina ek gorev olusmaz
+        sure_doldu = loop.call_later(kalan, abone.uyandir.set)
+        try:
+            await abone.uyandir.wait()
+        finally:
+            sure_doldu.cancel()
+        abone.uyandir.clear()
+        if abone.kapat_kodu is not None:
+            await _kapat(websocket, abone.kapat_kodu, abone.kapat_nedeni)
+            return
+
+        mesajlar = []
+        if abone.dusen:
+            mesajlar.append(mesaj_olustur("kayip", {"sayi": abone.dusen}))
+            abone.dusen = 0
+        mesajlar.extend(abone.kuyruk)
+        abone.kuyruk.clear()
+        for metin in mesajlar:
+            try:
+                await asyncio.wait_for(websocket.send_text(metin), timeout=settings.WS_GONDERIM_ZAMAN_ASIMI_SN)
+            except asyncio.TimeoutError:
+                bildirim_merkezi.yavas_kapatilan += 1
+                logger.warning(f"WebSocket istemcisi okumuyor, kapatildi: {abone.kanallar}")
+                await _kapat(websocket, KAPAT_YAVAS, "Istemci mesajlari okumuyor")
+                return
+
+
+async def _oku(websocket: WebSocket, abone: Abone, oturum: dict) -> None:
+    """Istemci mesajlari: ping ve token yenileme. Baglanti kopunca WebSocketDisconnect."""
+    while True:
+        try:
+            mesaj = await websocket.receive_json()
+        except (ValueError, KeyError):
+            continue
+        olay = mesaj.get("olay") if isinstance(mesaj, dict) else None
+        if olay == "ping":
+            abone.ekle(mesaj_olustur("pong"))
+        elif olay == "token":
+            try:
+                payload = _token_coz(mesaj.get("token"))
+            except _Red as e:
+                abone.kapat(e.kod, e.neden)
+                return
+            if payload["user_id"] != oturum["user_id"]:
+                abone.kapat(KAPAT_KIMLIK, "Token baska kullaniciya ait")
+                return
+            oturum["exp"] = payload["exp"]
+            abone.uyandir.set()  # gonderici yeni sureyle beklesin
+
+
+# =============================================
+# WS /api/v1/bildirim/ws
+# =============================================
+@router.websocket("/ws")
+async def bildirim_soketi(websocket: WebSocket):
+    """
+    📚 DERS: Baglanti basina iki hafif gorev, thread YOK:
+    okuyucu (istemci mesajlari) ve gonderici (kuyruk -> soket).
+    Bosta baglanti sadece bekleyen bir Event'tir; worker binlercesini tasir.
+    """
+    await websocket.accept()
+    try:
+        payload = _token_coz(await _token_al(websocket))
+        # Subdomain'den gelindiyse (bkz. middleware/tenant.py) token o OSGB'ye ait olmali
+        tenant_kaydi = websocket.scope.get("state", {}).get("tenant_kaydi")
+        if tenant_kaydi is not None and tenant_kaydi.db_name != payload.get("db_name"):
+            raise _Red(KAPAT_YETKI, "Bu oturum bu OSGB'ye ait degil")
+    except _Red as e:
+        await _kapat(websocket, e.kod, e.neden)
+        return
+    except WebSocketDisconnect:
+        return
+
+    kanallar = [kullanici_kanali(payload["user_id"])]
+    if payload.get("tenant_id"):
+        kanallar.append(tenant_kanali(payload["tenant_id"]))
+    abone = bildirim_merkezi.kaydol(kanallar)
+    if abone is None:
+        await _kapat(websocket, KAPAT_DOLU, "Sunucu dolu")
+        return
+
+    oturum = {"user_id": payload["user_id"], "exp": payload["exp"]}
+    abone.ekle(mesaj_olustur("baglandi", {"kanallar": kanallar}))
+    gorevler = {
+        asyncio.create_task(_oku(websocket, abone, oturum)),
+        asyncio.create_task(_gonder(websocket, abone, oturum)),
+    }
+    try:
+        # Biri biterse (istemci gitti / kapatildi) digeri de durur
+        bitenler, _ = await asyncio.wait(gorevler, return_when=asyncio.FIRST_COMPLETED)
+        for gorev in bitenler:
+            hata = gorev.exception()
+            if hata is not None and not isinstance(hata, WebSocketDisconnect):
+                logger.warning(f"WebSocket baglantisi hatayla kapandi: {hata!r}")
+    finally:
+        # Once kayit silinir: endpoint iptal edildiyse (sunucu kapaniyor) asagidaki await de iptal olur
+        bildirim_merkezi.ayril(abone)
+        for gorev in gorevler:
+            gorev.cancel()
+        await asyncio.gather(*gorevler, return_exceptions=True)
+
+
+# =============================================
+# POST /api/v1/bildirim/duyuru
+# =============================================
+@router.post("/duyuru", status_code=status.HTTP_202_ACCEPTED)
+async def duyuru_gonder(
+    request: Request,
+    istek: DuyuruIstegi,
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    master_db: Session = Depends(get_master_db),
+):
+    """OSGB'nin o an bagli tum kullanicilarina (tum worker'larda) duyuru."""
+    if not kullanici.tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu islem icin bir OSGB'ye ait olmaniz gerekir",
+        )
+    tenant_bildir(kullanici.tenant_id, "duyuru", {
+        "mesaj": istek.mesaj,
+        "gonderen": f"{kullanici.ad} {kullanici.soyad}",
+    })
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.SISTEM, modul="bildirim",
+        aciklama=f"Duyuru gonderildi: {istek.mesaj[:100]}",
+        kullanici=kullanici, request=request,
+    )
+    return {"mesaj": "Duyuru gonderildi"}
+
+
+# =============================================
+# GET /api/v1/bildirim/durum
+# =============================================
+@router.get("/durum")
+def bildirim_durumu(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """Bu worker'daki acik baglanti, kanal, dusen mesaj sayilari."""
+    return bildirim_merkezi.istatistik()
@@ -21,11 +21,13 @@ import os
 import uuid
 from pathlib import Path
 
-from app.middleware.deps import mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
-from app.models.master import Kullanici, IslemLogEnum
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
 from app.models.tenant import Calisan, Isyeri
 from app.services.log_service import islem_logla
-from app.services.excel_service import excel_export, excel_import, excel_sablon_olustur, CALISAN_ALANLARI
+from app.services.kpi_service import calisan_katkisi, kpi_artir, kpi_fark, kpi_yenile
+from app.services.excel_service import excel_export, excel_import, sablon_yaniti, CALISAN_ALANLARI
+from app.core.bildirim import tenant_bildir
 from app.core.database import get_master_db
 from app.schemas.calisan import (
     CalisanCreate, CalisanUpdate, CalisanResponse, CalisanListResponse,
@@ -49,7 +51,7 @@ def calisan_listele(
     arama: Optional[str] = Query(None, description="Ad/soyad ile arama"),
     isyeri_id: Optional[int] = Query(None, description="Isyeri filtresi"),
     aktif: Optional[bool] = Query(None, description="Aktif/pasif filtresi"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
@@ -101,7 +103,7 @@ def calisan_listele(
 def calisan_excel_export(
     arama: Optional[str] = Query(None),
     isyeri_id: Optional[int] = Query(None),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Mevcut calisanlari Excel dosyasina aktar."""
@@ -133,15 +135,11 @@ def calisan_excel_export(
 
 @router.get("/excel/sablon")
 def calisan_excel_sablon(
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    request: Request,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
 ):
-    """Bos Excel sablonu indir (iceri aktarim icin)."""
-    sablon_bytes = excel_sablon_olustur(CALISAN_ALANLARI, sayfa_adi="Calisan Sablonu")
-    return Response(
-        content=sablon_bytes,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=calisan_sablon.xlsx"},
-    )
+    """Bos Excel sablonu indir (iceri aktarim icin). Onbellekten, ETag ile."""
+    return sablon_yaniti(request, CALISAN_ALANLARI, "Calisan Sablonu", "calisan_sablon.xlsx")
 
 
 @router.post("/excel/import")
@@ -149,7 +147,7 @@ async def calisan_excel_import(
     request: Request,
     dosya: UploadFile = File(..., description="Excel dosyasi (.xlsx)"),
     isyeri_id: int = Query(..., description="Calisanlarin eklenecegi isyeri ID"),
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -191,12 +189,15 @@ async def calisan_excel_import(
         eklenen += 1
 
     if eklenen > 0:
+        kpi_artir(db, calisan_aktif=eklenen)
         db.commit()
         await islem_logla(
             db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="calisan",
             aciklama=f"Excel'den toplu calisan yuklendi: {eklenen} adet ({isyeri.ad})",
             kullanici=kullanici, request=request,
         )
+        # Ayni OSGB'nin diger acik ekranlari listeyi yenilesin
+        tenant_bildir(kullanici.tenant_id, "ice_aktarim", {"modul": "calisan", "eklenen": eklenen})
 
     return {
         "mesaj": f"{eklenen} calisan eklendi",
@@ -219,7 +220,7 @@ async def calisan_profil_foto_yukle(
     calisan_id: int,
     request: Request,
     foto: UploadFile = File(..., description="Profil fotografi (jpg, png, gif, webp)"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Calisana profil fotografi yukle. Mevcut foto varsa degistirir."""
@@ -318,7 +319,7 @@ def calisan_profil_foto_getir(
 @router.delete("/{calisan_id}/profil-foto")
 def calisan_profil_foto_sil(
     calisan_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Profil fotografini sil."""
@@ -345,7 +346,7 @@ def calisan_profil_foto_sil(
 @router.get("/{calisan_id}", response_model=CalisanResponse)
 def calisan_detay(
     calisan_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     calisan = db.query(Calisan).filter(Calisan.id == calisan_id).first()
@@ -372,7 +373,7 @@ def calisan_detay(
 async def calisan_ekle(
     request: Request,
     calisan_data: CalisanCreate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -396,6 +397,7 @@ async def calisan_ekle(
     # Yeni calisan olustur
     yeni_calisan = Calisan(**calisan_data.model_dump())
     db.add(yeni_calisan)
+    kpi_artir(db, **calisan_katkisi(yeni_calisan))
     db.commit()
     db.refresh(yeni_calisan)
 
@@ -423,7 +425,7 @@ async def calisan_guncelle(
     calisan_id: int,
     request: Request,
     calisan_data: CalisanUpdate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -452,8 +454,13 @@ async def calisan_guncelle(
     eski_degerler = {alan: getattr(calisan, alan) for alan in guncel_veriler}
 
     # Sadece gonderilen alanlari guncelle
+    onceki_katki = calisan_katkisi(calisan)
     for alan, deger in guncel_veriler.items():
         setattr(calisan, alan, deger)
+    yeni_katki = calisan_katkisi(calisan)
+    kpi_fark(db, onceki_katki, yeni_katki)
+    if yeni_katki != onceki_katki:
+        kpi_yenile(db, "egitim")    # Suresi dolan egitimler sadece aktif calisanlarda sayilir
 
     db.commit()
     db.refresh(calisan)
@@ -482,7 +489,7 @@ async def calisan_guncelle(
 async def calisan_sil(
     calisan_id: int,
     request: Request,
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -498,7 +505,9 @@ async def calisan_sil(
         )
 
     # Soft delete
+    kpi_fark(db, calisan_katkisi(calisan), {})
     calisan.aktif = False
+    kpi_yenile(db, "egitim")
     db.commit()
 
     # Log kaydi
@@ -0,0 +1,51 @@
+# =============================================
+# DASHBOARD API ENDPOINT'LERI
+# GET  /api/v1/dashboard          -> OSGB'nin KPI ozeti (tek satir okuma)
+# POST /api/v1/dashboard/yenile   -> KPI'lari simdi bastan say (yonetici)
+# =============================================
+#
+# Ayrinti: app/services/kpi_service.py (kpi_ozeti tablosu, yazma hook'lari,
+# gece uzlastirmasi)
+
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+
+from app.services.kpi_service import tenant_kpi_uzlastir, kpi_getir
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+)
+
+
+# =============================================
+# GET /api/v1/dashboard
+# =============================================
+@router.get("")
+def dashboard(
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """
+    📚 DERS: Tablolar sayilmaz; kpi_ozeti'nin tek satiri okunur.
+    Sayaclar yazma aninda, tarihe bagli KPI'lar gunde bir guncellenir.
+    """
+    return kpi_getir(db)
+
+
+# =============================================
+# POST /api/v1/dashboard/yenile
+# =============================================
+@router.post("/yenile")
+async def dashboard_yenile(
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    db: Session = Depends(tenant_db_getir),
+):
+    """Gece uzlastirmasini bu OSGB icin hemen calistirir; duzeltilen sayaclari dondurur."""
+    sapmalar = await run_in_threadpool(tenant_kpi_uzlastir, db)
+    return {"duzeltilen": sapmalar, **kpi_getir(db)}
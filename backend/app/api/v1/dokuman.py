@@ -35,8 +35,8 @@ from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, sessionmaker
 from typing import Optional
 
-from app.middleware.deps import mevcut_kullanici_getir, tenant_db_getir
-from app.models.master import Kullanici
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir
+
 from app.models.tenant import Dokuman
 from app.schemas.dokuman import DokumanResponse, DokumanListResponse
 
@@ -151,7 +151,7 @@ def dokuman_indir(
 def dokuman_listele(
     kaynak_tipi: str,
     kaynak_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
@@ -184,7 +184,7 @@ async def dokuman_yukle(
     request: Request,
     dosya: UploadFile = File(...),
     aciklama: Optional[str] = Form(None),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
@@ -260,7 +260,7 @@ async def dokuman_yukle(
 @router.delete("/dokuman/{dokuman_id}")
 def dokuman_sil(
     dokuman_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
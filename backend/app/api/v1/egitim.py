@@ -0,0 +1,450 @@
+# =============================================
+# EGITIM API ENDPOINT'LERI
+# Calisan egitim kayitlari + sertifika dosyalari
+# =============================================
+#
+# Endpoint listesi:
+# GET    /api/v1/egitim                   -> Egitimleri listele (calisan, isyeri, bolum, egitim adi)
+# POST   /api/v1/egitim                   -> Tek calisana egitim ekle
+# POST   /api/v1/egitim/toplu             -> Ayni egitimi bir calisan grubuna ekle (tek INSERT)
+# POST   /api/v1/egitim/sertifika/toplu   -> Bir oturumun sertifikalarini tek seferde yukle
+# GET    /api/v1/egitim/{id}              -> Tek egitim getir
+# PUT    /api/v1/egitim/{id}              -> Egitim guncelle
+# DELETE /api/v1/egitim/{id}              -> Egitim sil
+# POST   /api/v1/egitim/{id}/sertifika    -> Sertifika dosyasi yukle
+# GET    /api/v1/egitim/{id}/sertifika    -> Sertifika dosyasini indir
+#
+# 📚 DERS: Egitim eklenince/degisince o OSGB'nin sure uyarilari arka planda
+# yenilenir (BackgroundTasks: yanit gonderildikten SONRA calisir).
+# Toplu yazim ayrintisi: app/services/toplu_kayit_service.py
+
+import os
+import uuid
+from datetime import date
+from pathlib import Path
+
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, Request, UploadFile, status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import BinaryIO, List, Optional
+
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
+from app.models.tenant import Calisan, Egitim
+from app.services.log_service import islem_logla
+from app.services.toplu_kayit_service import toplu_kaydet
+from app.services.kpi_service import kpi_yenile
+from app.services.uyari_service import tenant_uyarilarini_arka_planda_yenile
+from app.core.database import get_master_db
+from app.schemas.egitim import (
+    EgitimCreate, EgitimTopluCreate, EgitimUpdate, EgitimResponse, EgitimListResponse,
+)
+
+router = APIRouter(
+    prefix="/egitim",
+    tags=["Egitim Yonetimi"],
+)
+
+# Sertifikalar: uploads/{db_name}/egitim/{egitim_id}/{uuid}_{dosya_adi}
+UPLOAD_DIR = Path(__file__).resolve().parent.parent.parent.parent / "uploads"
+SERTIFIKA_UZANTILARI = {'.pdf', '.jpg', '.jpeg', '.png'}
+MAX_SERTIFIKA_BOYUTU = 10 * 1024 * 1024      # Dosya basina 10 MB
+MAX_TOPLU_SERTIFIKA = 500                    # Tek istekte en fazla dosya
+_KOPYA_PARCASI = 1024 * 1024                 # Diske parca parca yazilir (dosya bellege alinmaz)
+
+
+def _egitim_getir(db: Session, egitim_id: int) -> Egitim:
+    egitim = db.query(Egitim).filter(Egitim.id == egitim_id).first()
+    if not egitim:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Egitim bulunamadi (ID: {egitim_id})",
+        )
+    return egitim
+
+
+_BOYUT_HATASI = f"Dosya boyutu cok buyuk. Maksimum: {MAX_SERTIFIKA_BOYUTU // (1024*1024)} MB"
+
+
+def _sertifika_hatasi(dosya_adi: str, boyut: Optional[int]) -> Optional[str]:
+    """Dosya kabul edilemiyorsa sebebi, edilebiliyorsa None (boyut bilinmiyorsa yazarken bakilir)."""
+    uzanti = os.path.splitext(dosya_adi)[1].lower()
+    if uzanti not in SERTIFIKA_UZANTILARI:
+        return f"Bu dosya tipi desteklenmiyor: {uzanti}. Izinli tipler: {', '.join(sorted(SERTIFIKA_UZANTILARI))}"
+    if boyut is not None and boyut > MAX_SERTIFIKA_BOYUTU:
+        return _BOYUT_HATASI
+    return None
+
+
+def _sertifika_kaydet(db_name: str, egitim_id: int, dosya_adi: str, kaynak: BinaryIO) -> str:
+    """
+    Yuklenen dosyayi parca parca diske kopyalar (thread havuzunda cagrilir).
+    Boyut siniri asilirsa yarim dosya silinir ve ValueError.
+    """
+    klasor = UPLOAD_DIR / db_name / "egitim" / str(egitim_id)
+    klasor.mkdir(parents=True, exist_ok=True)
+    dosya_yolu = klasor / f"{uuid.uuid4().hex[:8]}_{os.path.basename(dosya_adi)}"
+    kaynak.seek(0)
+    yazilan = 0
+    try:
+        with open(dosya_yolu, "wb") as f:
+            while parca := kaynak.read(_KOPYA_PARCASI):
+                yazilan += len(parca)
+                if yazilan > MAX_SERTIFIKA_BOYUTU:
+                    raise ValueError(_BOYUT_HATASI)
+                f.write(parca)
+    except BaseException:
+        dosya_yolu.unlink(missing_ok=True)
+        raise
+    return str(dosya_yolu)
+
+
+# =============================================
+# GET /api/v1/egitim
+# =============================================
+@router.get("", response_model=EgitimListResponse)
+def egitim_listele(
+    sayfa: int = Query(1, ge=1, description="Sayfa numarasi"),
+    adet: int = Query(50, ge=1, le=500, description="Sayfa basina kayit"),
+    calisan_id: Optional[int] = Query(None),
+    isyeri_id: Optional[int] = Query(None),
+    bolum: Optional[str] = Query(None),
+    egitim_adi: Optional[str] = Query(None, description="Egitim adinda ara"),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """Egitimler en yeni once; calisan adi ayni sorguda (join) gelir."""
+    query = db.query(Egitim, Calisan.ad, Calisan.soyad).join(Calisan, Egitim.calisan_id == Calisan.id)
+    if calisan_id:
+        query = query.filter(Egitim.calisan_id == calisan_id)
+    if isyeri_id:
+        query = query.filter(Calisan.isyeri_id == isyeri_id)
+    if bolum:
+        query = query.filter(Calisan.bolum == bolum)
+    if egitim_adi:
+        query = query.filter(Egitim.egitim_adi.ilike(f"%{egitim_adi}%"))
+
+    toplam = query.count()
+    satirlar = (
+        query.order_by(Egitim.egitim_tarihi.desc(), Egitim.id.desc())
+        .offset((sayfa - 1) * adet)
+        .limit(adet)
+        .all()
+    )
+    egitimler = []
+    for egitim, ad, soyad in satirlar:
+        egitim_dict = EgitimResponse.model_validate(egitim).model_dump()
+        egitim_dict["calisan_adi"] = f"{ad} {soyad}"
+        egitimler.append(egitim_dict)
+    return {"toplam": toplam, "egitimler": egitimler}
+
+
+# =============================================
+# POST /api/v1/egitim
+# Tek calisana egitim ekle
+# =============================================
+@router.post("", response_model=EgitimResponse, status_code=status.HTTP_201_CREATED)
+async def egitim_ekle(
+    request: Request,
+    egitim_data: EgitimCreate,
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    calisan = db.query(Calisan).filter(Calisan.id == egitim_data.calisan_id, Calisan.aktif == True).first()
+    if not calisan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Aktif calisan bulunamadi (ID: {egitim_data.calisan_id})",
+        )
+
+    yeni_egitim = Egitim(**egitim_data.model_dump())
+    db.add(yeni_egitim)
+    kpi_yenile(db, "egitim")
+    db.commit()
+    db.refresh(yeni_egitim)
+
+    if yeni_egitim.gecerlilik_tarihi:
+        arka_plan.add_task(tenant_uyarilarini_arka_planda_yenile, kullanici.tenant_id)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="egitim",
+        aciklama=f"Egitim eklendi: {yeni_egitim.egitim_adi} - {calisan.ad} {calisan.soyad}",
+        kullanici=kullanici, kayit_id=yeni_egitim.id, kayit_turu="Egitim",
+        yeni_deger=egitim_data.model_dump(), request=request,
+    )
+
+    egitim_dict = EgitimResponse.model_validate(yeni_egitim).model_dump()
+    egitim_dict["calisan_adi"] = f"{calisan.ad} {calisan.soyad}"
+    return egitim_dict
+
+
+# =============================================
+# POST /api/v1/egitim/toplu
+# 📚 DERS: /{egitim_id} ONCESINDE olmali!
+# =============================================
+@router.post("/toplu", status_code=status.HTTP_201_CREATED)
+async def egitim_toplu_ekle(
+    request: Request,
+    istek: EgitimTopluCreate,
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """
+    Bir egitim oturumunu tum katilimcilara yazar: tek transaction, tek
+    INSERT. Ayni gun ayni egitimi zaten olan calisan atlanir (istek
+    tekrar gonderilirse cift kayit olusmaz).
+    """
+    ortak = istek.model_dump(exclude={"calisanlar"})
+    try:
+        # KPI sayaci kayitlarla ayni commit'te guncellenir
+        rapor = await run_in_threadpool(
+            toplu_kaydet, db, Egitim, istek.calisanlar, ortak, ("egitim_adi", "egitim_tarihi"), ("egitim",),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if rapor["eklenen"] and istek.gecerlilik_tarihi:
+        arka_plan.add_task(tenant_uyarilarini_arka_planda_yenile, kullanici.tenant_id)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="egitim",
+        aciklama=(
+            f"Toplu egitim eklendi: {istek.egitim_adi} ({istek.egitim_tarihi}), "
+            f"{rapor['eklenen']} calisan, {len(rapor['atlanan'])} zaten kayitli"
+        ),
+        kullanici=kullanici, kayit_turu="Egitim",
+        yeni_deger={**ortak, "calisanlar": istek.calisanlar.model_dump(exclude_none=True)},
+        request=request,
+    )
+    return rapor
+
+
+# =============================================
+# POST /api/v1/egitim/sertifika/toplu
+# 📚 DERS: /{egitim_id} ONCESINDE olmali!
+# =============================================
+@router.post("/sertifika/toplu")
+async def sertifika_toplu_yukle(
+    request: Request,
+    egitim_adi: str = Form(...),
+    egitim_tarihi: date = Form(...),
+    dosyalar: List[UploadFile] = File(..., description="Dosya adi calisanin TC no'su: 12345678901.pdf"),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """
+    Bir oturumun (egitim_adi + egitim_tarihi) sertifikalarini toplu yukler.
+    Her dosya adindaki TC no ile o oturumdaki egitim kaydi eslesir:
+    eslesme TEK sorgu, sertifika_url yazimi TEK toplu UPDATE.
+    """
+    if len(dosyalar) > MAX_TOPLU_SERTIFIKA:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tek istekte en fazla {MAX_TOPLU_SERTIFIKA} dosya yuklenebilir",
+        )
+
+    # TC no -> UploadFile; hatali dosyalar sebebiyle ayrilir. Icerik burada
+    # OKUNMAZ: eslesen her dosya asagida tek tek diske akitilir, 500 dosya
+    # ayni anda bellege alinmaz.
+    adaylar, hatali = {}, []
+    for dosya in dosyalar:
+        dosya.filename = dosya.filename or "dosya"
+        hata = _sertifika_hatasi(dosya.filename, dosya.size)
+        if hata:
+            hatali.append({"dosya_adi": dosya.filename, "hata": hata})
+            continue
+        adaylar[os.path.splitext(os.path.basename(dosya.filename))[0].strip()] = dosya
+
+    eslesen = {}
+    if adaylar:
+        eslesen = dict(
+            db.query(Calisan.tc_no, Egitim.id)
+            .join(Egitim, Egitim.calisan_id == Calisan.id)
+            .filter(
+                Egitim.egitim_adi == egitim_adi,
+                Egitim.egitim_tarihi == egitim_tarihi,
+                Calisan.tc_no.in_(list(adaylar)),
+            )
+        )
+
+    guncellemeler = []
+    for tc_no, egitim_id in eslesen.items():
+        dosya = adaylar[tc_no]
+        try:
+            url = await run_in_threadpool(_sertifika_kaydet, kullanici.db_name, egitim_id, dosya.filename, dosya.file)
+        except ValueError as e:
+            hatali.append({"dosya_adi": dosya.filename, "hata": str(e)})
+            continue
+        finally:
+            await dosya.close()
+        guncellemeler.append({"id": egitim_id, "sertifika_url": url})
+
+    if guncellemeler:
+        db.execute(update(Egitim), guncellemeler, execution_options={"synchronize_session": False})
+        db.commit()
+
+    eslesmeyen = sorted(adaylar[tc_no].filename for tc_no in adaylar.keys() - eslesen.keys())
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="egitim",
+        aciklama=(
+            f"Toplu sertifika yuklendi: {egitim_adi} ({egitim_tarihi}), "
+            f"{len(guncellemeler)} yuklendi, {len(eslesmeyen) + len(hatali)} yuklenmedi"
+        ),
+        kullanici=kullanici, kayit_turu="Egitim", request=request,
+    )
+    return {"yuklenen": len(guncellemeler), "eslesmeyen": eslesmeyen, "hatali": hatali}
+
+
+# =============================================
+# GET /api/v1/egitim/{id}
+# =============================================
+@router.get("/{egitim_id}", response_model=EgitimResponse)
+def egitim_detay(
+    egitim_id: int,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    egitim = _egitim_getir(db, egitim_id)
+    calisan = db.query(Calisan).filter(Calisan.id == egitim.calisan_id).first()
+    egitim_dict = EgitimResponse.model_validate(egitim).model_dump()
+    egitim_dict["calisan_adi"] = f"{calisan.ad} {calisan.soyad}" if calisan else None
+    return egitim_dict
+
+
+# =============================================
+# PUT /api/v1/egitim/{id}
+# =============================================
+@router.put("/{egitim_id}", response_model=EgitimResponse)
+async def egitim_guncelle(
+    egitim_id: int,
+    request: Request,
+    egitim_data: EgitimUpdate,
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    egitim = _egitim_getir(db, egitim_id)
+
+    guncel_veriler = egitim_data.model_dump(exclude_unset=True)
+    eski_degerler = {alan: getattr(egitim, alan) for alan in guncel_veriler}
+    # Ad/tarih yenilenme kontrolunu, gecerlilik tarihi uyariyi etkiler
+    uyari_etkilenir = bool(egitim.gecerlilik_tarihi or guncel_veriler.get("gecerlilik_tarihi"))
+
+    for alan, deger in guncel_veriler.items():
+        setattr(egitim, alan, deger)
+    if {"egitim_adi", "egitim_tarihi", "gecerlilik_tarihi"} & guncel_veriler.keys():
+        kpi_yenile(db, "egitim")
+
+    db.commit()
+    db.refresh(egitim)
+
+    if uyari_etkilenir:
+        arka_plan.add_task(tenant_uyarilarini_arka_planda_yenile, kullanici.tenant_id)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="egitim",
+        aciklama=f"Egitim guncellendi: {egitim.egitim_adi} (ID: {egitim_id})",
+        kullanici=kullanici, kayit_id=egitim_id, kayit_turu="Egitim",
+        eski_deger=eski_degerler, yeni_deger=guncel_veriler, request=request,
+    )
+
+    return egitim
+
+
+# =============================================
+# DELETE /api/v1/egitim/{id}
+# 📚 DERS: Egitim tablosunda aktif kolonu yok -> kalici silme
+# =============================================
+@router.delete("/{egitim_id}")
+async def egitim_sil(
+    egitim_id: int,
+    request: Request,
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    egitim = _egitim_getir(db, egitim_id)
+    egitim_adi = egitim.egitim_adi
+    uyari_etkilenir = egitim.gecerlilik_tarihi is not None
+
+    db.delete(egitim)
+    kpi_yenile(db, "egitim")
+    db.commit()
+
+    if uyari_etkilenir:
+        arka_plan.add_task(tenant_uyarilarini_arka_planda_yenile, kullanici.tenant_id)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_SILME, modul="egitim",
+        aciklama=f"Egitim silindi: {egitim_adi} (ID: {egitim_id})",
+        kullanici=kullanici, kayit_id=egitim_id, kayit_turu="Egitim",
+        request=request,
+    )
+
+    return {"mesaj": f"'{egitim_adi}' egitim kaydi silindi", "id": egitim_id}
+
+
+# =============================================
+# POST /api/v1/egitim/{id}/sertifika
+# =============================================
+@router.post("/{egitim_id}/sertifika", response_model=EgitimResponse)
+async def sertifika_yukle(
+    egitim_id: int,
+    request: Request,
+    dosya: UploadFile = File(...),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    egitim = _egitim_getir(db, egitim_id)
+
+    dosya_adi = dosya.filename or "sertifika"
+    hata = _sertifika_hatasi(dosya_adi, dosya.size)
+    if hata:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=hata)
+
+    try:
+        egitim.sertifika_url = await run_in_threadpool(
+            _sertifika_kaydet, kullanici.db_name, egitim_id, dosya_adi, dosya.file,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    db.commit()
+    db.refresh(egitim)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="egitim",
+        aciklama=f"Sertifika yuklendi: {egitim.egitim_adi} (ID: {egitim_id})",
+        kullanici=kullanici, kayit_id=egitim_id, kayit_turu="Egitim", request=request,
+    )
+    return egitim
+
+
+# =============================================
+# GET /api/v1/egitim/{id}/sertifika
+# =============================================
+@router.get("/{egitim_id}/sertifika")
+def sertifika_indir(
+    egitim_id: int,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    egitim = _egitim_getir(db, egitim_id)
+    if not egitim.sertifika_url or not os.path.exists(egitim.sertifika_url):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sertifika dosyasi bulunamadi")
+    # Kayitli ad "{uuid8}_{orijinal}" -> indirmede orijinal ad
+    return FileResponse(path=egitim.sertifika_url, filename=os.path.basename(egitim.sertifika_url)[9:])
@@ -23,11 +23,13 @@ import os
 import uuid
 from pathlib import Path
 
-from app.middleware.deps import mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
-from app.models.master import Kullanici, IslemLogEnum
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
 from app.models.tenant import Firma
 from app.services.log_service import islem_logla
-from app.services.excel_service import excel_export, excel_import, excel_sablon_olustur, FIRMA_ALANLARI
+from app.services.kpi_service import firma_katkisi, kpi_artir, kpi_fark
+from app.services.excel_service import excel_export, excel_import, sablon_yaniti, FIRMA_ALANLARI
+from app.core.bildirim import tenant_bildir
 from app.core.database import get_master_db
 from app.schemas.firma import (
     FirmaCreate, FirmaUpdate, FirmaResponse, FirmaListResponse,
@@ -50,7 +52,7 @@ def firma_listele(
     adet: int = Query(20, ge=1, le=100, description="Sayfa basina kayit"),
     arama: Optional[str] = Query(None, description="Firma adi ile arama"),
     aktif: Optional[bool] = Query(None, description="Aktif/pasif filtresi"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
@@ -113,7 +115,7 @@ def firma_listele(
 @router.get("/excel/export")
 def firma_excel_export(
     arama: Optional[str] = Query(None),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Mevcut firmalari Excel dosyasina aktar."""
@@ -131,22 +133,18 @@ def firma_excel_export(
 
 @router.get("/excel/sablon")
 def firma_excel_sablon(
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    request: Request,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
 ):
-    """Bos Excel sablonu indir (iceri aktarim icin)."""
-    sablon_bytes = excel_sablon_olustur(FIRMA_ALANLARI, sayfa_adi="Firma Sablonu")
-    return Response(
-        content=sablon_bytes,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=firma_sablon.xlsx"},
-    )
+    """Bos Excel sablonu indir (iceri aktarim icin). Onbellekten, ETag ile."""
+    return sablon_yaniti(request, FIRMA_ALANLARI, "Firma Sablonu", "firma_sablon.xlsx")
 
 
 @router.post("/excel/import")
 async def firma_excel_import(
     request: Request,
     dosya: UploadFile = File(..., description="Excel dosyasi (.xlsx)"),
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -173,12 +171,15 @@ async def firma_excel_import(
         eklenen += 1
 
     if eklenen > 0:
+        kpi_artir(db, firma_aktif=eklenen)
         db.commit()
         await islem_logla(
             db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="firma",
             aciklama=f"Excel'den toplu firma yuklendi: {eklenen} adet",
             kullanici=kullanici, request=request,
         )
+        # Ayni OSGB'nin diger acik ekranlari listeyi yenilesin
+        tenant_bildir(kullanici.tenant_id, "ice_aktarim", {"modul": "firma", "eklenen": eklenen})
 
     return {
         "mesaj": f"{eklenen} firma eklendi",
@@ -201,7 +202,7 @@ async def firma_logo_yukle(
     firma_id: int,
     request: Request,
     logo: UploadFile = File(..., description="Logo dosyasi (jpg, png, gif, webp)"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Firmaya logo yukle. Mevcut logo varsa degistirir."""
@@ -301,7 +302,7 @@ def firma_logo_getir(
 @router.delete("/{firma_id}/logo")
 def firma_logo_sil(
     firma_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Firma logosunu sil."""
@@ -328,7 +329,7 @@ def firma_logo_sil(
 @router.get("/{firma_id}", response_model=FirmaResponse)
 def firma_detay(
     firma_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
@@ -356,7 +357,7 @@ def firma_detay(
 async def firma_ekle(
     request: Request,
     firma_data: FirmaCreate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -386,6 +387,7 @@ async def firma_ekle(
     # Yani: Firma(ad="ABC", il="Istanbul", ...) gibi olur
     yeni_firma = Firma(**firma_data.model_dump())
     db.add(yeni_firma)
+    kpi_artir(db, **firma_katkisi(yeni_firma))
     db.commit()
     db.refresh(yeni_firma)
 
@@ -409,7 +411,7 @@ async def firma_guncelle(
     firma_id: int,
     request: Request,
     firma_data: FirmaUpdate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -435,8 +437,10 @@ async def firma_guncelle(
     eski_degerler = {alan: getattr(firma, alan) for alan in guncel_veriler}
 
     # Sadece gonderilen alanlari guncelle
+    onceki_katki = firma_katkisi(firma)
     for alan, deger in guncel_veriler.items():
         setattr(firma, alan, deger)
+    kpi_fark(db, onceki_katki, firma_katkisi(firma))
 
     db.commit()
     db.refresh(firma)
@@ -460,7 +464,7 @@ async def firma_guncelle(
 async def firma_sil(
     firma_id: int,
     request: Request,
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -489,6 +493,7 @@ async def firma_sil(
         )
 
     # Soft delete: Aktif -> Pasif
+    kpi_fark(db, firma_katkisi(firma), {})
     firma.aktif = False
     db.commit()
 
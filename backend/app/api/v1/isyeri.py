@@ -12,13 +12,17 @@
 # POST   /api/v1/isyeri           -> Yeni isyeri ekle
 # PUT    /api/v1/isyeri/{id}      -> Isyeri guncelle
 # DELETE /api/v1/isyeri/{id}      -> Isyeri sil (pasife cek)
+# POST   /api/v1/isyeri/geokod    -> Koordinatsiz isyerlerini arka planda geokodla
+# GET    /api/v1/isyeri/geokod    -> Son geokodlama isinin durumu
+# GET    /api/v1/isyeri/yakin     -> Bir noktaya yakin isyerleri (mesafeye gore)
+# GET    /api/v1/isyeri/alan      -> Harita gorunumundeki isyerleri
 #
 # Firma'dan farki:
 # - firma_id ile filtreleme yapilabilir
 # - Response'da firma_adi ek alan olarak donuyor (join ile)
-# - tehlike_sinifi Enum kontrolu var
+# - tehlike_sinifi gonderilmezse NACE kodundan bulunur (app/services/nace_service.py)
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, UploadFile, File
 from fastapi.responses import Response, FileResponse
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -26,14 +30,21 @@ import os
 import uuid
 from pathlib import Path
 
-from app.middleware.deps import mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
-from app.models.master import Kullanici, IslemLogEnum
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
 from app.models.tenant import Isyeri, Firma, TehlikeSinifi
 from app.services.log_service import islem_logla
-from app.services.excel_service import excel_export, excel_import, excel_sablon_olustur, ISYERI_ALANLARI
+from app.services.limit_service import limit_ayir, sayac_azalt
+from app.services.kpi_service import isyeri_katkisi, kpi_artir, kpi_fark
+from app.services.excel_service import excel_export, excel_import, sablon_yaniti, ISYERI_ALANLARI
+from app.services.nace_service import nace_indeksi, nace_uygula
+from app.services.geokod_service import geokod_isi_baslat, geokod_is_durumu
+from app.services.mekansal_service import alandakiler, mekansal_indeksler, yakindakiler
+from app.services.ziyaret_plan_service import PLAN_ALANLARI_ISYERI, ziyaretleri_arka_planda_yenile
+from app.core.bildirim import tenant_bildir
 from app.core.database import get_master_db
 from app.schemas.isyeri import (
-    IsyeriCreate, IsyeriUpdate, IsyeriResponse, IsyeriListResponse,
+    IsyeriCreate, IsyeriUpdate, IsyeriResponse, IsyeriListResponse, IsyeriKonumListResponse,
 )
 
 # Router olustur
@@ -72,7 +83,7 @@ def isyeri_listele(
     arama: Optional[str] = Query(None, description="Isyeri adi ile arama"),
     firma_id: Optional[int] = Query(None, description="Firmaya gore filtrele"),
     aktif: Optional[bool] = Query(None, description="Aktif/pasif filtresi"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """
@@ -123,7 +134,7 @@ def isyeri_listele(
 def isyeri_excel_export(
     arama: Optional[str] = Query(None),
     firma_id: Optional[int] = Query(None),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Mevcut isyerlerini Excel dosyasina aktar."""
@@ -148,22 +159,18 @@ def isyeri_excel_export(
 
 @router.get("/excel/sablon")
 def isyeri_excel_sablon(
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    request: Request,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
 ):
-    """Bos Excel sablonu indir (iceri aktarim icin)."""
-    sablon_bytes = excel_sablon_olustur(ISYERI_ALANLARI, sayfa_adi="Isyeri Sablonu")
-    return Response(
-        content=sablon_bytes,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=isyeri_sablon.xlsx"},
-    )
+    """Bos Excel sablonu indir (iceri aktarim icin). Onbellekten, ETag ile."""
+    return sablon_yaniti(request, ISYERI_ALANLARI, "Isyeri Sablonu", "isyeri_sablon.xlsx")
 
 
 @router.post("/excel/import")
 async def isyeri_excel_import(
     request: Request,
     dosya: UploadFile = File(..., description="Excel dosyasi (.xlsx)"),
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -178,23 +185,24 @@ async def isyeri_excel_import(
     icerik = dosya.file.read()
     sonuc = excel_import(icerik, ISYERI_ALANLARI)
 
-    eklenen = 0
+    # 📚 DERS: NACE kodlari tum dosya icin TEK seferde cozulur;
+    # ayni kod yuzlerce satirda tekrar etse de bir kez aranir.
+    nace_kayitlari = nace_indeksi.toplu_coz(v.get("nace_kodu") for v in sonuc["basarili"])
+
+    eklenecekler = []
     atlanan = []
-    for veri in sonuc["basarili"]:
+    for veri, nace in zip(sonuc["basarili"], nace_kayitlari):
         # SGK sicil no benzersiz kontrolu
         mevcut = db.query(Isyeri).filter(Isyeri.sgk_sicil_no == veri.get("sgk_sicil_no")).first()
         if mevcut:
             atlanan.append({"satir": 0, "hata": f"SGK '{veri['sgk_sicil_no']}' zaten mevcut", "veri": veri})
             continue
 
-        # tehlike_sinifi string -> Enum cevir
-        ts = veri.get("tehlike_sinifi", "")
-        if ts:
-            try:
-                veri["tehlike_sinifi"] = TehlikeSinifi(ts)
-            except ValueError:
-                atlanan.append({"satir": 0, "hata": f"Gecersiz tehlike sinifi: '{ts}'", "veri": veri})
-                continue
+        # NACE kodu dogrula; tehlike_sinifi sutunu bossa listeden
+        hata = nace_uygula(veri, nace)
+        if hata:
+            atlanan.append({"satir": 0, "hata": hata, "veri": veri})
+            continue
 
         # firma_id kontrolu
         fid = veri.get("firma_id")
@@ -205,17 +213,29 @@ async def isyeri_excel_import(
                 atlanan.append({"satir": 0, "hata": f"Gecersiz firma_id: '{fid}'", "veri": veri})
                 continue
 
-        yeni_isyeri = Isyeri(**veri)
-        db.add(yeni_isyeri)
-        eklenen += 1
+        eklenecekler.append(Isyeri(**veri))
 
+    # 📚 DERS: Limit TUM dosya icin bir kez kontrol edilir.
+    # Limit yetmiyorsa hicbir satir yazilmaz (yarim yuklenmis dosya olmaz).
+    eklenen = len(eklenecekler)
     if eklenen > 0:
+        limit_ayir(db, kullanici, "isyeri", adet=eklenen)
+        db.add_all(eklenecekler)
+        kpi_artir(db, **isyeri_katkisi(*eklenecekler))
         db.commit()
+        mekansal_indeksler.gecersiz_kil(kullanici.db_name)
         await islem_logla(
             db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="isyeri",
             aciklama=f"Excel'den toplu isyeri yuklendi: {eklenen} adet",
             kullanici=kullanici, request=request,
         )
+        # Ayni OSGB'nin diger acik ekranlari listeyi yenilesin
+        tenant_bildir(kullanici.tenant_id, "ice_aktarim", {"modul": "isyeri", "eklenen": eklenen})
+
+        # Excel'de koordinat yok: lokasyonu olanlar arka planda geokodlanir
+        geokodlanacak = [iy.id for iy in eklenecekler if iy.lokasyon and iy.koordinat_lat is None]
+        if geokodlanacak:
+            geokod_isi_baslat(kullanici.db_name, geokodlanacak)
 
     return {
         "mesaj": f"{eklenen} isyeri eklendi",
@@ -226,6 +246,86 @@ async def isyeri_excel_import(
     }
 
 
+# =============================================
+# GEOKODLAMA (adres -> koordinat)
+# 📚 DERS: /{isyeri_id} ONCESINDE olmali!
+# =============================================
+
+@router.post("/geokod", status_code=status.HTTP_202_ACCEPTED)
+def isyeri_geokodla(
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    db: Session = Depends(tenant_db_getir),
+):
+    """
+    📚 DERS: 202 Accepted = "istek alindi, islem arka planda suruyor".
+    Nominatim saniyede 1 adres cozer; yuzlerce isyeri dakikalar surer.
+    Durum GET /isyeri/geokod ile izlenir.
+    """
+    bekleyen = (
+        db.query(Isyeri)
+        .filter(Isyeri.koordinat_lat.is_(None), Isyeri.aktif == True, Isyeri.lokasyon.isnot(None))
+        .count()
+    )
+    if bekleyen == 0:
+        return {"mesaj": "Koordinati eksik isyeri yok", "bekleyen": 0}
+    return {"mesaj": f"{bekleyen} isyeri geokodlama kuyruguna alindi", "bekleyen": bekleyen,
+            "is": geokod_isi_baslat(kullanici.db_name)}
+
+
+@router.get("/geokod")
+def isyeri_geokod_durumu(
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+):
+    """Bu OSGB'nin son geokodlama isi (yoksa null)."""
+    return {"is": geokod_is_durumu(kullanici.db_name) if kullanici.db_name else None}
+
+
+# =============================================
+# MEKANSAL SORGULAR (rota planlama, harita)
+# 📚 DERS: /{isyeri_id} ONCESINDE olmali!
+# =============================================
+
+@router.get("/yakin", response_model=IsyeriKonumListResponse)
+def isyeri_yakin(
+    lat: float = Query(..., ge=-90, le=90, description="Enlem"),
+    lng: float = Query(..., ge=-180, le=180, description="Boylam"),
+    yaricap: float = Query(5000, gt=0, le=200_000, description="Yaricap (metre)"),
+    limit: int = Query(50, ge=1, le=500),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """
+    📚 DERS: Sahadaki uzman "yakinimdaki isyerleri" der:
+    GET /isyeri/yakin?lat=41.01&lng=28.97&yaricap=3000
+    Sonuc yakindan uzaga sirali, her kayitta mesafe_m var.
+    Koordinati olmayan isyerleri donmez (bkz. POST /isyeri/geokod).
+    """
+    sonuc = yakindakiler(db, kullanici.db_name, lat, lng, yaricap, limit)
+    return IsyeriKonumListResponse(toplam=len(sonuc["isyerleri"]), **sonuc)
+
+
+@router.get("/alan", response_model=IsyeriKonumListResponse)
+def isyeri_alan(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    limit: int = Query(500, ge=1, le=2000),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """Harita gorunumu (dikdortgen) icindeki isyerleri; merkeze yakindan uzaga."""
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Gecersiz alan: min_lat/min_lng, max_lat/max_lng'den buyuk olamaz",
+        )
+    sonuc = alandakiler(db, kullanici.db_name, min_lat, min_lng, max_lat, max_lng, limit)
+    return IsyeriKonumListResponse(toplam=len(sonuc["isyerleri"]), **sonuc)
+
+
 # =============================================
 # LOGO ISLEMLERI
 # =============================================
@@ -238,7 +338,7 @@ async def isyeri_logo_yukle(
     isyeri_id: int,
     request: Request,
     logo: UploadFile = File(..., description="Logo dosyasi (jpg, png, gif, webp)"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Isyerine logo yukle. Mevcut logo varsa degistirir."""
@@ -338,7 +438,7 @@ def isyeri_logo_getir(
 @router.delete("/{isyeri_id}/logo")
 def isyeri_logo_sil(
     isyeri_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Isyeri logosunu sil."""
@@ -365,7 +465,7 @@ def isyeri_logo_sil(
 @router.get("/{isyeri_id}", response_model=IsyeriResponse)
 def isyeri_detay(
     isyeri_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Tek isyeri detayi getir."""
@@ -389,7 +489,7 @@ def isyeri_detay(
 async def isyeri_ekle(
     request: Request,
     isyeri_data: IsyeriCreate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -399,7 +499,7 @@ async def isyeri_ekle(
     Firma'dan farki:
     - firma_id zorunlu (hangi firmaya ait)
     - SGK sicil no benzersiz olmali
-    - tehlike_sinifi string'den Enum'a cevrilir
+    - tehlike_sinifi NACE kodundan bulunur
     """
     # firma_id gecerli mi kontrol et
     firma = db.query(Firma).filter(Firma.id == isyeri_data.firma_id).first()
@@ -420,21 +520,21 @@ async def isyeri_ekle(
     # Veriyi hazirla
     veri = isyeri_data.model_dump()
 
-    # 📚 DERS: tehlike_sinifi string -> Enum cevir
-    # Frontend "tehlikeli" string gonderir, DB'de Enum olarak saklanir
-    try:
-        veri["tehlike_sinifi"] = TehlikeSinifi(veri["tehlike_sinifi"])
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Gecersiz tehlike sinifi: '{veri['tehlike_sinifi']}'. "
-                   f"Gecerli degerler: az_tehlikeli, tehlikeli, cok_tehlikeli",
-        )
+    # 📚 DERS: tehlike_sinifi gonderildiyse o kullanilir, gonderilmediyse
+    # NACE listesinden gelir. Kod listede yoksa ve sinif da yoksa 422.
+    hata = nace_uygula(veri, nace_indeksi.getir(veri["nace_kodu"]))
+    if hata:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=hata)
+
+    # Abonelik limiti (sayac ekleme ile ayni transaction'da artar)
+    limit_ayir(db, kullanici, "isyeri")
 
     yeni_isyeri = Isyeri(**veri)
     db.add(yeni_isyeri)
+    kpi_artir(db, **isyeri_katkisi(yeni_isyeri))
     db.commit()
     db.refresh(yeni_isyeri)
+    mekansal_indeksler.gecersiz_kil(kullanici.db_name)
 
     # firma_adi ekle (response icin)
     yeni_isyeri.firma_adi = firma.ad
@@ -459,7 +559,8 @@ async def isyeri_guncelle(
     isyeri_id: int,
     request: Request,
     isyeri_data: IsyeriUpdate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -472,8 +573,30 @@ async def isyeri_guncelle(
             detail=f"Isyeri bulunamadi (ID: {isyeri_id})",
         )
 
-    # Eski degerleri kaydet (log icin)
     guncel_veriler = isyeri_data.model_dump(exclude_unset=True)
+
+    # NACE ya da tehlike sinifi degistiyse ikisi birlikte yeniden belirlenir.
+    # Sadece kod degistiyse sinif yeni koddan gelir; eski sinif tasinmaz
+    # (kod listede yoksa istemci sinifi da gondermeli, yoksa 422).
+    # Aciklama listeden sadece istek YENI kod getirdiyse doldurulur; sadece
+    # sinif degistiyse kullanicinin yazdigi aciklama korunur.
+    kod_gonderildi = bool(guncel_veriler.get("nace_kodu"))
+    if kod_gonderildi or guncel_veriler.get("tehlike_sinifi"):
+        nace_veri = {
+            "nace_kodu": guncel_veriler.get("nace_kodu") or isyeri.nace_kodu,
+            "nace_aciklama": guncel_veriler.get("nace_aciklama"),
+            "tehlike_sinifi": guncel_veriler.get("tehlike_sinifi"),
+        }
+        hata = nace_uygula(nace_veri, nace_indeksi.getir(nace_veri["nace_kodu"]))
+        if hata:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=hata)
+        guncel_veriler["tehlike_sinifi"] = nace_veri["tehlike_sinifi"]
+        if kod_gonderildi:
+            guncel_veriler["nace_kodu"] = nace_veri["nace_kodu"]
+            if not guncel_veriler.get("nace_aciklama") and nace_veri["nace_aciklama"]:
+                guncel_veriler["nace_aciklama"] = nace_veri["nace_aciklama"]
+
+    # Eski degerleri kaydet (log icin)
     eski_degerler = {}
     for alan in guncel_veriler:
         eski = getattr(isyeri, alan)
@@ -482,22 +605,27 @@ async def isyeri_guncelle(
             eski = eski.value
         eski_degerler[alan] = eski
 
-    # tehlike_sinifi geldiyse Enum'a cevir
-    if "tehlike_sinifi" in guncel_veriler and guncel_veriler["tehlike_sinifi"] is not None:
-        try:
-            guncel_veriler["tehlike_sinifi"] = TehlikeSinifi(guncel_veriler["tehlike_sinifi"])
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Gecersiz tehlike sinifi: '{guncel_veriler['tehlike_sinifi']}'",
-            )
-
-    # Sadece gonderilen alanlari guncelle
+    # Pasif -> aktif: limitten yer ayir, aktif -> pasif: sayaci azalt
+    if "aktif" in guncel_veriler and guncel_veriler["aktif"] is not None:
+        if guncel_veriler["aktif"] and not isyeri.aktif:
+            limit_ayir(db, kullanici, "isyeri")
+        elif not guncel_veriler["aktif"] and isyeri.aktif:
+            sayac_azalt(db, "isyeri")
+
+    # Sadece gonderilen alanlari guncelle (tehlike sinifi / aktiflik KPI'lari da kayar)
+    onceki_katki = isyeri_katkisi(isyeri)
     for alan, deger in guncel_veriler.items():
         setattr(isyeri, alan, deger)
+    kpi_fark(db, onceki_katki, isyeri_katkisi(isyeri))
 
     db.commit()
     db.refresh(isyeri)
+    mekansal_indeksler.gecersiz_kil(kullanici.db_name)
+
+    # Tehlike sinifi / konum / aktiflik degistiyse mevcut ziyaret plani da degisir
+    # (yanit gonderildikten sonra, arka planda)
+    if PLAN_ALANLARI_ISYERI & guncel_veriler.keys():
+        arka_plan.add_task(ziyaretleri_arka_planda_yenile, kullanici.db_name, [isyeri_id])
 
     # firma_adi ekle (response icin)
     _firma_adi_ekle(isyeri, db)
@@ -528,7 +656,8 @@ async def isyeri_guncelle(
 async def isyeri_sil(
     isyeri_id: int,
     request: Request,
-    kullanici: Kullanici = Depends(
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -546,9 +675,14 @@ async def isyeri_sil(
             detail=f"Isyeri bulunamadi (ID: {isyeri_id})",
         )
 
-    # Soft delete
+    # Soft delete (zaten pasifse sayac tekrar azalmasin)
+    if isyeri.aktif:
+        sayac_azalt(db, "isyeri")
+    kpi_fark(db, isyeri_katkisi(isyeri), {})
     isyeri.aktif = False
     db.commit()
+    mekansal_indeksler.gecersiz_kil(kullanici.db_name)
+    arka_plan.add_task(ziyaretleri_arka_planda_yenile, kullanici.db_name, [isyeri_id])
 
     # Log kaydi
     await islem_logla(
@@ -0,0 +1,234 @@
+# =============================================
+# KKD ZIMMET API ENDPOINT'LERI
+# Kisisel koruyucu donanim teslim kayitlari
+# =============================================
+#
+# Endpoint listesi:
+# GET    /api/v1/kkd          -> Zimmetleri listele (calisan, isyeri, bolum, tip)
+# POST   /api/v1/kkd          -> Tek calisana zimmet
+# POST   /api/v1/kkd/toplu    -> Ayni KKD'yi bir calisan grubuna zimmetle (tek INSERT)
+# PUT    /api/v1/kkd/{id}     -> Zimmet guncelle (imza alindi vs.)
+# DELETE /api/v1/kkd/{id}     -> Zimmet sil
+#
+# Toplu yazim ayrintisi: app/services/toplu_kayit_service.py
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
+from app.models.tenant import Calisan, KKDTipi, KKDZimmet
+from app.services.log_service import islem_logla
+from app.services.toplu_kayit_service import toplu_kaydet
+from app.core.database import get_master_db
+from app.schemas.kkd import (
+    KKDZimmetCreate, KKDZimmetTopluCreate, KKDZimmetUpdate, KKDZimmetResponse, KKDZimmetListResponse,
+)
+
+router = APIRouter(
+    prefix="/kkd",
+    tags=["KKD Zimmet Yonetimi"],
+)
+
+
+def _kkd_tipi_coz(deger: str) -> KKDTipi:
+    gecerli = [e.value for e in KKDTipi]
+    if deger not in gecerli:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Gecersiz KKD tipi: {deger}. Gecerli degerler: {gecerli}",
+        )
+    return KKDTipi(deger)
+
+
+def _zimmet_sozlugu(zimmet: KKDZimmet, calisan_adi: Optional[str] = None) -> dict:
+    zimmet_dict = KKDZimmetResponse.model_validate(zimmet).model_dump()
+    zimmet_dict["calisan_adi"] = calisan_adi
+    return zimmet_dict
+
+
+# =============================================
+# GET /api/v1/kkd
+# =============================================
+@router.get("", response_model=KKDZimmetListResponse)
+def kkd_listele(
+    sayfa: int = Query(1, ge=1, description="Sayfa numarasi"),
+    adet: int = Query(50, ge=1, le=500, description="Sayfa basina kayit"),
+    calisan_id: Optional[int] = Query(None),
+    isyeri_id: Optional[int] = Query(None),
+    bolum: Optional[str] = Query(None),
+    kkd_tipi: Optional[KKDTipi] = Query(None),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """Zimmetler en yeni once; calisan adi ayni sorguda (join) gelir."""
+    query = db.query(KKDZimmet, Calisan.ad, Calisan.soyad).join(Calisan, KKDZimmet.calisan_id == Calisan.id)
+    if calisan_id:
+        query = query.filter(KKDZimmet.calisan_id == calisan_id)
+    if isyeri_id:
+        query = query.filter(Calisan.isyeri_id == isyeri_id)
+    if bolum:
+        query = query.filter(Calisan.bolum == bolum)
+    if kkd_tipi:
+        query = query.filter(KKDZimmet.kkd_tipi == kkd_tipi)
+
+    toplam = query.count()
+    satirlar = (
+        query.order_by(KKDZimmet.teslim_tarihi.desc(), KKDZimmet.id.desc())
+        .offset((sayfa - 1) * adet)
+        .limit(adet)
+        .all()
+    )
+    return {
+        "toplam": toplam,
+        "zimmetler": [_zimmet_sozlugu(zimmet, f"{ad} {soyad}") for zimmet, ad, soyad in satirlar],
+    }
+
+
+# =============================================
+# POST /api/v1/kkd
+# Tek calisana zimmet
+# =============================================
+@router.post("", response_model=KKDZimmetResponse, status_code=status.HTTP_201_CREATED)
+async def kkd_zimmetle(
+    request: Request,
+    zimmet_data: KKDZimmetCreate,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    kkd_tipi = _kkd_tipi_coz(zimmet_data.kkd_tipi)
+    calisan = db.query(Calisan).filter(Calisan.id == zimmet_data.calisan_id, Calisan.aktif == True).first()
+    if not calisan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Aktif calisan bulunamadi (ID: {zimmet_data.calisan_id})",
+        )
+
+    yeni_zimmet = KKDZimmet(**{**zimmet_data.model_dump(), "kkd_tipi": kkd_tipi})
+    db.add(yeni_zimmet)
+    db.commit()
+    db.refresh(yeni_zimmet)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="kkd",
+        aciklama=f"KKD zimmetlendi: {kkd_tipi.value} - {calisan.ad} {calisan.soyad}",
+        kullanici=kullanici, kayit_id=yeni_zimmet.id, kayit_turu="KKDZimmet",
+        yeni_deger=zimmet_data.model_dump(), request=request,
+    )
+
+    return _zimmet_sozlugu(yeni_zimmet, f"{calisan.ad} {calisan.soyad}")
+
+
+# =============================================
+# POST /api/v1/kkd/toplu
+# 📚 DERS: /{zimmet_id} ONCESINDE olmali!
+# =============================================
+@router.post("/toplu", status_code=status.HTTP_201_CREATED)
+async def kkd_toplu_zimmetle(
+    request: Request,
+    istek: KKDZimmetTopluCreate,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """
+    Ayni KKD'yi secilen calisanlarin hepsine tek transaction, tek INSERT
+    ile zimmetler. Ayni gun ayni tipi zaten almis calisan atlanir.
+    """
+    ortak = {**istek.model_dump(exclude={"calisanlar"}), "kkd_tipi": _kkd_tipi_coz(istek.kkd_tipi)}
+    try:
+        rapor = await run_in_threadpool(
+            toplu_kaydet, db, KKDZimmet, istek.calisanlar, ortak, ("kkd_tipi", "teslim_tarihi"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="kkd",
+        aciklama=(
+            f"Toplu KKD zimmetlendi: {istek.kkd_tipi} ({istek.teslim_tarihi}), "
+            f"{rapor['eklenen']} calisan, {len(rapor['atlanan'])} zaten zimmetli"
+        ),
+        kullanici=kullanici, kayit_turu="KKDZimmet",
+        yeni_deger={**istek.model_dump(exclude={"calisanlar"}), "calisanlar": istek.calisanlar.model_dump(exclude_none=True)},
+        request=request,
+    )
+    return rapor
+
+
+# =============================================
+# PUT /api/v1/kkd/{id}
+# =============================================
+@router.put("/{zimmet_id}", response_model=KKDZimmetResponse)
+async def kkd_guncelle(
+    zimmet_id: int,
+    request: Request,
+    zimmet_data: KKDZimmetUpdate,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    zimmet = db.query(KKDZimmet).filter(KKDZimmet.id == zimmet_id).first()
+    if not zimmet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"KKD zimmeti bulunamadi (ID: {zimmet_id})",
+        )
+
+    guncel_veriler = zimmet_data.model_dump(exclude_unset=True)
+    eski_degerler = {alan: getattr(zimmet, alan) for alan in guncel_veriler}
+    if "kkd_tipi" in eski_degerler:
+        eski_degerler["kkd_tipi"] = zimmet.kkd_tipi.value
+
+    for alan, deger in guncel_veriler.items():
+        setattr(zimmet, alan, _kkd_tipi_coz(deger) if alan == "kkd_tipi" else deger)
+
+    db.commit()
+    db.refresh(zimmet)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="kkd",
+        aciklama=f"KKD zimmeti guncellendi (ID: {zimmet_id})",
+        kullanici=kullanici, kayit_id=zimmet_id, kayit_turu="KKDZimmet",
+        eski_deger=eski_degerler, yeni_deger=guncel_veriler, request=request,
+    )
+
+    return _zimmet_sozlugu(zimmet)
+
+
+# =============================================
+# DELETE /api/v1/kkd/{id}
+# 📚 DERS: KKD zimmet tablosunda aktif kolonu yok -> kalici silme
+# =============================================
+@router.delete("/{zimmet_id}")
+async def kkd_sil(
+    zimmet_id: int,
+    request: Request,
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    zimmet = db.query(KKDZimmet).filter(KKDZimmet.id == zimmet_id).first()
+    if not zimmet:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"KKD zimmeti bulunamadi (ID: {zimmet_id})",
+        )
+
+    kkd_tipi = zimmet.kkd_tipi.value
+    db.delete(zimmet)
+    db.commit()
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_SILME, modul="kkd",
+        aciklama=f"KKD zimmeti silindi: {kkd_tipi} (ID: {zimmet_id})",
+        kullanici=kullanici, kayit_id=zimmet_id, kayit_turu="KKDZimmet",
+        request=request,
+    )
+
+    return {"mesaj": f"'{kkd_tipi}' zimmet kaydi silindi", "id": zimmet_id}
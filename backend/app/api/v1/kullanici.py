@@ -0,0 +1,121 @@
+# =============================================
+# KULLANICI API ENDPOINT'LERI
+# GET  /api/v1/kullanici   -> OSGB'nin kullanicilari
+# POST /api/v1/kullanici   -> OSGB'ye yeni kullanici ekle (max_kullanici limiti)
+# =============================================
+#
+# 📚 DERS: Kullanicilar master DB'dedir (giris tum OSGB'ler icin tek yerden).
+# OSGB yoneticisi sadece kendi OSGB'sinin kullanicilarini gorur/ekler;
+# sistem_admin tenant_id vererek herhangi bir OSGB'ye ekleyebilir.
+# Limit kontrolu: app/services/limit_service.py (kullanici_limiti_ayir)
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.database import get_master_db
+from app.core.security import sifre_hashle_async
+from app.middleware.deps import TokenKullanici, rol_gerekli
+from app.models.master import IslemLogEnum, Kullanici, RolEnum
+from app.schemas.kullanici import KullaniciOlustur, KullaniciResponse
+from app.services.limit_service import kullanici_limiti_ayir
+from app.services.log_service import islem_logla
+
+router = APIRouter(
+    prefix="/kullanici",
+    tags=["Kullanici Yonetimi"],
+)
+
+_yonetici = rol_gerekli("sistem_admin", "osgb_yoneticisi")
+
+
+def _hedef_tenant(kullanici: TokenKullanici, tenant_id: Optional[int]) -> int:
+    """OSGB yoneticisi icin kendi OSGB'si; sistem_admin icin verilen tenant_id."""
+    if kullanici.rol != RolEnum.SISTEM_ADMIN:
+        return kullanici.tenant_id
+    if tenant_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="tenant_id belirtilmeli",
+        )
+    return tenant_id
+
+
+# =============================================
+# GET /api/v1/kullanici
+# =============================================
+@router.get("", response_model=list[KullaniciResponse])
+def kullanici_listele(
+    tenant_id: Optional[int] = Query(None, description="Sadece sistem_admin icin"),
+    kullanici: TokenKullanici = Depends(_yonetici),
+    db: Session = Depends(get_master_db),
+):
+    """OSGB'nin kullanicilari (ada gore)"""
+    hedef = _hedef_tenant(kullanici, tenant_id)
+    return (
+        db.query(Kullanici)
+        .filter(Kullanici.tenant_id == hedef)
+        .order_by(Kullanici.ad, Kullanici.soyad)
+        .all()
+    )
+
+
+# =============================================
+# POST /api/v1/kullanici
+# =============================================
+@router.post("", response_model=KullaniciResponse, status_code=status.HTTP_201_CREATED)
+async def kullanici_ekle(
+    veri: KullaniciOlustur,
+    request: Request,
+    kullanici: TokenKullanici = Depends(_yonetici),
+    db: Session = Depends(get_master_db),
+):
+    """
+    📚 DERS: Yeni kullanici = limit kontrolu + email tekilligi + sifre hash'i.
+
+    max_kullanici doluysa 403 doner, hicbir sey yazilmaz.
+    """
+    hedef = _hedef_tenant(kullanici, veri.tenant_id)
+    email = veri.email.lower()
+    sifre_hash = await sifre_hashle_async(veri.sifre)
+
+    def _yaz() -> Kullanici:
+        # tenants satiri kilitlenir: ayni OSGB'ye es zamanli eklemeler limiti asamaz
+        kullanici_limiti_ayir(db, hedef)
+        if db.query(Kullanici.id).filter(Kullanici.email == email).first():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"'{email}' email adresi zaten kayitli",
+            )
+        yeni = Kullanici(
+            email=email,
+            sifre_hash=sifre_hash,
+            ad=veri.ad,
+            soyad=veri.soyad,
+            telefon=veri.telefon,
+            unvan=veri.unvan,
+            rol=RolEnum(veri.rol),
+            tenant_id=hedef,
+            aktif=True,
+        )
+        db.add(yeni)
+        db.commit()
+        db.refresh(yeni)
+        return yeni
+
+    try:
+        yeni = await run_in_threadpool(_yaz)
+    except HTTPException:
+        db.rollback()
+        raise
+
+    await islem_logla(
+        db=db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="kullanici",
+        aciklama=f"Yeni kullanici eklendi: {yeni.email} ({yeni.rol.value})",
+        kullanici=kullanici, kayit_id=yeni.id, kayit_turu="Kullanici",
+        yeni_deger={"email": yeni.email, "rol": yeni.rol.value, "tenant_id": hedef},
+        request=request,
+    )
+    return yeni
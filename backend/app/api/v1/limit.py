@@ -0,0 +1,85 @@
+# =============================================
+# ABONELIK LIMITI API ENDPOINT'LERI
+# GET  /api/v1/limit            -> OSGB'nin limit kullanimi
+# POST /api/v1/limit/uzlastir   -> Sayaclari gercek sayimla duzelt (sistem admin)
+# =============================================
+#
+# Ayrinti: app/services/limit_service.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.database import get_master_db, get_tenant_engine
+from app.core.logger import db_logger
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.services.limit_service import kullanici_kullanimi, kullanim, sayaclari_uzlastir
+from app.services.tenant_dizini import tenant_dizini
+
+router = APIRouter(
+    prefix="/limit",
+    tags=["Abonelik Limitleri"],
+)
+
+
+# =============================================
+# GET /api/v1/limit
+# Kullanicinin OSGB'si: ne kadar kullanildi, limit ne?
+# =============================================
+@router.get("")
+def limit_kullanimi(
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """
+    {"isyeri": {"kullanilan": 42, "limit": 50}, "kullanici": {"kullanilan": 4, "limit": 10}}
+    (limit null = sinirsiz)
+    """
+    sonuc = kullanim(db, kullanici)
+    sonuc["kullanici"] = kullanici_kullanimi(master_db, kullanici)
+    return sonuc
+
+
+# =============================================
+# POST /api/v1/limit/uzlastir
+# Tum (veya tek) OSGB'nin sayaclarini COUNT(*) ile yeniden hesapla
+# =============================================
+@router.post("/uzlastir")
+def limit_uzlastir(
+    tenant_id: int = Query(None, description="Bos = tum OSGB'ler"),
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """
+    📚 DERS: Sayaclar normalde hep dogrudur (ekleme ile ayni transaction).
+    Elle SQL ile kayit silinirse/eklenirse kayabilir; bu endpoint duzeltir.
+    Sadece farki olan OSGB'ler "duzeltilen" listesinde doner.
+    """
+    tenantlar = tenant_dizini.tumu()
+    if tenant_id is not None:
+        tenantlar = [t for t in tenantlar if t.id == tenant_id]
+
+    duzeltilen = []
+    hatalar = []
+    for tenant in tenantlar:
+        SessionLocal = sessionmaker(bind=get_tenant_engine(tenant.db_name), autocommit=False, autoflush=False)
+        db = SessionLocal()
+        try:
+            sonuc = sayaclari_uzlastir(db)
+        except Exception as e:
+            db.rollback()
+            db_logger.error(f"Sayac uzlastirma basarisiz: {tenant.db_name} | {e}")
+            hatalar.append({"tenant_id": tenant.id, "db_name": tenant.db_name, "hata": str(e)})
+            continue
+        finally:
+            db.close()
+
+        farklar = {ad: d for ad, d in sonuc.items() if d["onceki"] != d["gercek"]}
+        if farklar:
+            db_logger.warning(f"Sayac kaymasi duzeltildi: {tenant.db_name} | {farklar}")
+            duzeltilen.append({"tenant_id": tenant.id, "db_name": tenant.db_name, "sayaclar": farklar})
+
+    return {
+        "kontrol_edilen": len(tenantlar),
+        "duzeltilen": duzeltilen,
+        "hatalar": hatalar,
+    }
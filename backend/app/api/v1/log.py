@@ -12,9 +12,11 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timedelta
 
+from app.core.config import settings
 from app.core.database import get_master_db
-from app.middleware.deps import rol_gerekli
-from app.models.master import Kullanici, IslemLog, IslemLogEnum
+from app.core.sorgu_izleme import endpoint_ozeti
+from app.middleware.deps import TokenKullanici, rol_gerekli
+from app.models.master import IslemLog, IslemLogEnum
 from app.schemas.log import IslemLogResponse, LogListResponse
 
 router = APIRouter(
@@ -38,7 +40,7 @@ def log_listele(
     son_gun: Optional[int] = Query(None, description="Son X gun icindeki loglar"),
     kayit_turu: Optional[str] = Query(None, description="Kayit turu: Firma, Isyeri, Calisan..."),
     kayit_id: Optional[int] = Query(None, description="Belirli bir kaydin loglari"),
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(get_master_db),
@@ -102,7 +104,7 @@ def log_listele(
 @router.get("/ozet")
 def log_ozet(
     son_gun: int = Query(7, description="Son X gun"),
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(get_master_db),
@@ -129,3 +131,27 @@ def log_ozet(
         "giris_sayisi": giris_sayisi,
         "basarisiz_giris": basarisiz_giris,
     }
+
+
+# =============================================
+# GET /api/v1/log/sorgu-ozet
+# Endpoint bazinda SQL sorgu istatistikleri (N+1 avi icin)
+# =============================================
+@router.get("/sorgu-ozet")
+def sorgu_ozet(
+    limit: int = Query(50, ge=1, le=500, description="En cok sorgu yapan ilk X endpoint"),
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """
+    📚 DERS: Hangi endpoint istek basina kac sorgu calistiriyor?
+
+    Liste "ort_sorgu" (istek basina ortalama sorgu) degerine gore siralidir.
+    ort_sorgu kayit sayisiyla birlikte artiyorsa o endpoint'te N+1 vardir.
+    Sayilar bu worker process'in baslangicindan beri tutulur.
+    """
+    endpointler = endpoint_ozeti()
+    return {
+        "yavas_sorgu_esigi_ms": settings.YAVAS_SORGU_MS,
+        "sorgu_uyari_esigi": settings.ISTEK_SORGU_UYARI_ESIGI,
+        "endpointler": endpointler[:limit],
+    }
@@ -0,0 +1,45 @@
+# =============================================
+# METRIK ENDPOINT'I
+# GET /metrics -> Prometheus formatinda metrikler
+# =============================================
+#
+# 📚 DERS: Bu endpoint insanlar icin degil, Prometheus icin.
+# Prometheus her 15-30 saniyede bir bu adresi okur.
+# Cikti duz metindir:
+#
+#   osgb_http_istek_suresi_saniye_bucket{metod="GET",route="/api/v1/firma",...,le="0.05"} 120
+#   osgb_db_havuz_kullanimda{veritabani="osgb_demo"} 2
+#
+# Prometheus JWT token kullanamaz. Bu yuzden METRIK_TOKEN ayari
+# doluysa sabit bir "Authorization: Bearer <METRIK_TOKEN>" beklenir.
+# Uretimde ayrica Nginx ile sadece ic agdan erisime izin verilmeli.
+
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import kayit_defteri
+
+# Bu router /api/v1 altinda DEGIL, kok dizinde (/metrics) calisir
+router = APIRouter(tags=["Izleme"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrikler(request: Request):
+    """Tum metrikleri Prometheus text formatinda dondurur."""
+    if settings.METRIK_TOKEN:
+        beklenen = f"Bearer {settings.METRIK_TOKEN}"
+        gelen = request.headers.get("authorization", "")
+        # Bayt olarak karsilastir: str ile ASCII disi header TypeError (500) verir
+        if not secrets.compare_digest(gelen.encode(), beklenen.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Gecersiz metrik token",
+            )
+
+    return PlainTextResponse(
+        kayit_defteri.yaz(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
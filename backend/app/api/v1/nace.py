@@ -0,0 +1,52 @@
+# =============================================
+# NACE KODLARI API ENDPOINT'LERI
+# GET /api/v1/nace?q=2511        -> Otomatik tamamlama (kod veya aciklama oneki)
+# GET /api/v1/nace/{kod}         -> Tek kod (aciklama + tehlike sinifi)
+# =============================================
+#
+# Ayrinti: app/services/nace_service.py (bellekte indeks, DB'ye gidilmez)
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir
+
+from app.services.nace_service import nace_indeksi
+
+router = APIRouter(
+    prefix="/nace",
+    tags=["NACE Kodlari"],
+)
+
+
+# =============================================
+# GET /api/v1/nace?q=...
+# =============================================
+@router.get("")
+def nace_ara(
+    q: str = Query(..., min_length=1, description="Kod oneki (25.11) veya aciklama kelimeleri (metal yapi)"),
+    limit: int = Query(20, ge=1, le=100),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+):
+    """
+    📚 DERS: Isyeri formundaki NACE alani her tus vurusunda bunu cagirir.
+    Indeks bellekte oldugu icin yanit mikro saniyeler icinde hazirdir.
+    """
+    sonuclar = nace_indeksi.ara(q, limit=limit)
+    return {"sonuclar": [k.sozluk() for k in sonuclar]}
+
+
+# =============================================
+# GET /api/v1/nace/{kod}
+# =============================================
+@router.get("/{kod}")
+def nace_getir(
+    kod: str,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+):
+    kayit = nace_indeksi.getir(kod)
+    if kayit is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"NACE kodu bulunamadi: '{kod}'",
+        )
+    return kayit.sozluk()
@@ -13,7 +13,7 @@
 # PUT    /api/v1/personel/{id}         -> Personel guncelle
 # DELETE /api/v1/personel/{id}         -> Personel sil (pasife cek)
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, UploadFile, File
 from fastapi.responses import Response, FileResponse
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -21,11 +21,13 @@ import os
 import uuid
 from pathlib import Path
 
-from app.middleware.deps import mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
-from app.models.master import Kullanici, IslemLogEnum
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
 from app.models.tenant import Personel, PersonelUnvan, UzmanlikSinifi
 from app.services.log_service import islem_logla
-from app.services.excel_service import excel_export, excel_import, excel_sablon_olustur, PERSONEL_ALANLARI
+from app.services.excel_service import excel_export, excel_import, sablon_yaniti, PERSONEL_ALANLARI
+from app.services.ziyaret_plan_service import PLAN_ALANLARI_PERSONEL, ziyaretleri_arka_planda_yenile
+from app.core.bildirim import tenant_bildir
 from app.core.database import get_master_db
 from app.schemas.personel import (
     PersonelCreate, PersonelUpdate, PersonelResponse, PersonelListResponse,
@@ -62,7 +64,7 @@ def personel_listele(
     arama: Optional[str] = Query(None, description="Ad/soyad ile arama"),
     unvan: Optional[str] = Query(None, description="Unvan filtresi: isg_uzmani, isyeri_hekimi, dsp"),
     aktif: Optional[bool] = Query(None, description="Aktif/pasif filtresi"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Personel listesi. Unvan filtresi ve arama destekler."""
@@ -108,7 +110,7 @@ def personel_listele(
 def personel_excel_export(
     arama: Optional[str] = Query(None),
     unvan: Optional[str] = Query(None),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Mevcut personeli Excel dosyasina aktar."""
@@ -142,22 +144,18 @@ def personel_excel_export(
 
 @router.get("/excel/sablon")
 def personel_excel_sablon(
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    request: Request,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
 ):
-    """Bos Excel sablonu indir (iceri aktarim icin)."""
-    sablon_bytes = excel_sablon_olustur(PERSONEL_ALANLARI, sayfa_adi="Personel Sablonu")
-    return Response(
-        content=sablon_bytes,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=personel_sablon.xlsx"},
-    )
+    """Bos Excel sablonu indir (iceri aktarim icin). Onbellekten, ETag ile."""
+    return sablon_yaniti(request, PERSONEL_ALANLARI, "Personel Sablonu", "personel_sablon.xlsx")
 
 
 @router.post("/excel/import")
 async def personel_excel_import(
     request: Request,
     dosya: UploadFile = File(..., description="Excel dosyasi (.xlsx)"),
-    kullanici: Kullanici = Depends(
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -206,6 +204,8 @@ async def personel_excel_import(
             aciklama=f"Excel'den toplu personel yuklendi: {eklenen} adet",
             kullanici=kullanici, request=request,
         )
+        # Ayni OSGB'nin diger acik ekranlari listeyi yenilesin
+        tenant_bildir(kullanici.tenant_id, "ice_aktarim", {"modul": "personel", "eklenen": eklenen})
 
     return {
         "mesaj": f"{eklenen} personel eklendi",
@@ -230,7 +230,7 @@ async def profil_foto_yukle(
     personel_id: int,
     request: Request,
     foto: UploadFile = File(..., description="Profil fotografi (jpg, png, gif, webp)"),
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Personele profil fotografi yukle. Mevcut foto varsa degistirir."""
@@ -343,7 +343,7 @@ def profil_foto_getir(
 @router.delete("/{personel_id}/profil-foto")
 def profil_foto_sil(
     personel_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     """Profil fotografini sil."""
@@ -370,7 +370,7 @@ def profil_foto_sil(
 @router.get("/{personel_id}", response_model=PersonelResponse)
 def personel_detay(
     personel_id: int,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
 ):
     personel = db.query(Personel).filter(Personel.id == personel_id).first()
@@ -395,7 +395,7 @@ def personel_detay(
 async def personel_ekle(
     request: Request,
     personel_data: PersonelCreate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -443,7 +443,8 @@ async def personel_guncelle(
     personel_id: int,
     request: Request,
     personel_data: PersonelUpdate,
-    kullanici: Kullanici = Depends(mevcut_kullanici_getir),
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
     db: Session = Depends(tenant_db_getir),
     master_db: Session = Depends(get_master_db),
 ):
@@ -477,6 +478,11 @@ async def personel_guncelle(
     db.commit()
     db.refresh(personel)
 
+    # Atamayi etkileyen alan degistiyse personelin isyerleri yeniden planlanir
+    # (yanit gonderildikten sonra, arka planda)
+    if PLAN_ALANLARI_PERSONEL & guncel_veriler.keys():
+        arka_plan.add_task(ziyaretleri_arka_planda_yenile, kullanici.db_name, (), personel_id)
+
     await islem_logla(
         db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="personel",
         aciklama=f"Personel guncellendi: {personel.ad} {personel.soyad}",
@@ -498,7 +504,8 @@ async def personel_guncelle(
 async def personel_sil(
     personel_id: int,
     request: Request,
-    kullanici: Kullanici = Depends(
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(
         rol_gerekli("sistem_admin", "osgb_yoneticisi")
     ),
     db: Session = Depends(tenant_db_getir),
@@ -515,6 +522,7 @@ async def personel_sil(
 
     personel.aktif = False
     db.commit()
+    arka_plan.add_task(ziyaretleri_arka_planda_yenile, kullanici.db_name, (), personel_id)
 
     await islem_logla(
         db=master_db, islem_turu=IslemLogEnum.KAYIT_SILME, modul="personel",
@@ -0,0 +1,78 @@
+# =============================================
+# PROFIL API ENDPOINT'LERI
+# Kaydedilen istek profillerini listeleme ve indirme
+# =============================================
+#
+# 📚 DERS: Profil nasil olusur?
+# sistem_admin token'i ile herhangi bir istege "X-Profile: 1" header'i
+# (veya ?_profil=1) eklenir. Yanittaki X-Profile-Id ile buradan indirilir.
+# Ayrinti: app/core/profil.py ve app/middleware/profil.py
+#
+# .folded dosyasi flamegraph araclarina verilir:
+#   flamegraph.pl profil.folded > profil.svg
+#   veya https://www.speedscope.app adresine surukle-birak
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from app.core.profil import profil_dosyasi, profil_idleri, profil_ozeti_oku
+from app.middleware.deps import TokenKullanici, rol_gerekli
+
+
+router = APIRouter(
+    prefix="/profil",
+    tags=["Profilleme"],
+)
+
+
+# =============================================
+# GET /api/v1/profil
+# Kayitli profiller (en yeni once)
+# =============================================
+@router.get("")
+def profil_listele(
+    adet: int = Query(50, ge=1, le=200),
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """Son profillerin ozetleri: yol, sure, DB suresi, kirilim."""
+    idler = sorted(profil_idleri(), reverse=True)[:adet]
+    profiller = [ozet for ozet in (profil_ozeti_oku(i) for i in idler) if ozet is not None]
+    return {"toplam": len(profiller), "profiller": profiller}
+
+
+# =============================================
+# GET /api/v1/profil/{profil_id}
+# Flamegraph yiginlarini indir (.folded)
+# =============================================
+@router.get("/{profil_id}")
+def profil_indir(
+    profil_id: str,
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """Folded stack dosyasi (flamegraph.pl / speedscope / inferno)."""
+    yol = profil_dosyasi(profil_id, ".folded")
+    if yol is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profil bulunamadi",
+        )
+    return FileResponse(yol, media_type="text/plain; charset=utf-8", filename=f"{profil_id}.folded")
+
+
+# =============================================
+# GET /api/v1/profil/{profil_id}/ozet
+# Tek profilin ozeti
+# =============================================
+@router.get("/{profil_id}/ozet")
+def profil_ozet(
+    profil_id: str,
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """Sure, CPU, DB ve ornekten tahmin edilen serilestirme/excel suresi."""
+    ozet = profil_ozeti_oku(profil_id)
+    if ozet is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profil bulunamadi",
+        )
+    return ozet
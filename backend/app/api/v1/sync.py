@@ -0,0 +1,321 @@
+# =============================================
+# MOBIL SENKRONIZASYON API
+# Cevrimdisi calisan Flutter istemcisinin veri alisverisi
+# =============================================
+#
+# Endpoint listesi:
+# GET    /api/v1/sync?since=<imlec>   -> Imlecten sonra degisen kayitlar (boyuta gore sayfali, gzip)
+# POST   /api/v1/sync                 -> Cevrimdisi biriken degisiklikleri uygula (cakisma kontrollu)
+#
+# 📚 DERS: Istemci dongusu
+#   1. Ilk acilis: GET /sync (since yok) -> tum firma/isyeri/calisan/personel/dokuman
+#      "devam": true oldukca donen "imlec" ile tekrar ister
+#   2. Sonraki acilislar: GET /sync?since=<son imlec> -> sadece degisenler
+#      aktif=false gelen kayit silinmistir (soft delete)
+#   3. Cevrimdisi yapilan degisiklikler: POST /sync, sonra tekrar GET
+#   4. WebSocket'ten "sync" olayi gelirse (baska cihaz push etti) GET
+#
+# Cakisma: guncelle/sil islemi, istemcinin o kayit icin bildigi degisim_no
+# (temel_no) ile gelir. Sunucudaki kayit o arada degistiyse islem
+# uygulanmaz, "cakisma" + sunucudaki guncel kayit doner; istemci birlestirip
+# yeni temel_no ile tekrar gonderir. Kontrol ile yazma arasinda baska
+# kimse yazamaz (degisim sayaci kilidi, bkz. app/services/sync_service.py).
+#
+# Her degisiklik REST'teki endpoint'in kendisiyle uygulanir: dogrulama,
+# abonelik limiti, KPI, ziyaret plani ve islem logu ayni kalir. Endpoint'lerin
+# arka plan isleri (ziyaret plani) bu istegin BackgroundTasks'ina eklenir,
+# yanit gonderildikten sonra calisir. Her biri
+# kendi transaction'inda: biri hata verirse (beklenmeyen hata dahil) sadece
+# o geri alinir, digerleri yine uygulanir.
+# Dokumanlar sadece cekilir (dosya yukleme REST'ten).
+
+import gzip
+import inspect
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.v1.calisan import calisan_ekle, calisan_guncelle, calisan_sil
+from app.api.v1.firma import firma_ekle, firma_guncelle, firma_sil
+from app.api.v1.isyeri import isyeri_ekle, isyeri_guncelle, isyeri_sil
+from app.api.v1.personel import personel_ekle, personel_guncelle, personel_sil
+from app.core.bildirim import tenant_bildir
+from app.core.config import settings
+from app.core.database import get_master_db
+from app.core.logger import logger
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, rol_gerekli, tenant_db_getir
+
+from app.models.tenant import SyncIslemi
+from app.schemas.calisan import CalisanCreate, CalisanUpdate
+from app.schemas.firma import FirmaCreate, FirmaUpdate
+from app.schemas.isyeri import IsyeriCreate, IsyeriUpdate
+from app.schemas.personel import PersonelCreate, PersonelUpdate
+from app.schemas.sync import SyncDegisikligi, SyncGonderimi
+from app.services.sync_service import (
+    SYNC_TABLO_ADLARI, degisiklikleri_getir, degisim_no_ayir, imlec_coz, satir_sozlugu,
+)
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Mobil Senkronizasyon"],
+)
+
+# tablo -> (ekle, guncelle, sil endpoint'i, Create schemasi, Update schemasi)
+_YAZMA = {
+    "firma": (firma_ekle, firma_guncelle, firma_sil, FirmaCreate, FirmaUpdate),
+    "isyeri": (isyeri_ekle, isyeri_guncelle, isyeri_sil, IsyeriCreate, IsyeriUpdate),
+    "calisan": (calisan_ekle, calisan_guncelle, calisan_sil, CalisanCreate, CalisanUpdate),
+    "personel": (personel_ekle, personel_guncelle, personel_sil, PersonelCreate, PersonelUpdate),
+}
+
+# REST'teki DELETE endpoint'leriyle ayni roller
+_silme_yetkisi = rol_gerekli("sistem_admin", "osgb_yoneticisi")
+
+
+# =============================================
+# GET /api/v1/sync
+# =============================================
+@router.get("")
+def sync_cek(
+    request: Request,
+    since: Optional[str] = Query(None, max_length=64, description="Onceki yanittaki imlec (bos = ilk senkronizasyon)"),
+    bayt: Optional[int] = Query(
+        None, ge=16 * 1024, le=settings.SYNC_SAYFA_BAYT_EN_FAZLA,
+        description="Sayfanin yaklasik boyutu (sikistirmadan once); yavas agda kucuk tutulmali",
+    ),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """
+    📚 DERS: Yanit JSON'u servis katmaninda hazir metin olarak uretilir
+    (kayit basina bir kez serilestirme, boyut sayimi ayni metinden).
+    Her kayitta tekrar eden alan adlariyla dolu bu JSON gzip ile kat kat
+    kuculur: istemci Accept-Encoding: gzip gonderiyorsa sikistirilir.
+    """
+    sayfa = degisiklikleri_getir(db, imlec_coz(since), bayt)
+    govde = sayfa.govde
+    basliklar = {"Vary": "Accept-Encoding", "Cache-Control": "no-store"}
+    if (
+        len(govde) >= settings.SYNC_SIKISTIRMA_ESIGI
+        and "gzip" in request.headers.get("accept-encoding", "").lower()
+    ):
+        govde = gzip.compress(govde, compresslevel=settings.SYNC_GZIP_SEVIYESI)
+        basliklar["Content-Encoding"] = "gzip"
+    return Response(content=govde, media_type="application/json", headers=basliklar)
+
+
+def _referanslari_coz(db: Session, veri: dict) -> dict:
+    """
+    *_id alanina yazilmis islem_id'yi (bu ya da onceki push'ta eklenen kayit)
+    gercek id'ye cevirir: {"isyeri_id": "5b1c..."} -> {"isyeri_id": 17}
+    """
+    sonuc = dict(veri)
+    for alan, deger in veri.items():
+        if not (alan.endswith("_id") and isinstance(deger, str)) or deger.isdigit():
+            continue
+        islem = db.get(SyncIslemi, deger)
+        if islem is None or islem.kayit_id is None or islem.tablo != alan[:-3]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{alan}: '{deger}' islemiyle eklenmis bir {alan[:-3]} bulunamadi",
+            )
+        sonuc[alan] = islem.kayit_id
+    return sonuc
+
+
+def _kayit_id_bagla(db: Session, islem: SyncIslemi, model) -> Callable[[], None]:
+    """
+    📚 DERS: Eklenen kaydin id'si islem satirina AYNI transaction'da yazilir.
+    Ekleme endpoint'i kendi icinde commit eder; id, o commit'in flush'inda
+    belli olur. after_flush'ta yeni kayit yakalanir, after_flush_postexec'te
+    islem.kayit_id atanir. Commit, oturum kirli kaldikca tekrar flush ettigi
+    icin bu UPDATE de ayni COMMIT'e girer: "islem uygulandi ama kayit_id bos"
+    ara durumu hic olusmaz. Donen fonksiyon dinleyicileri kaldirir.
+    """
+    yeniler = []
+
+    def yakala(session, flush_context):
+        # after_flush'ta session.new hala flush oncesi halini gosterir
+        yeniler.extend(n for n in session.new if isinstance(n, model))
+
+    def bagla(session, flush_context):
+        # after_flush'ta yapilan degisiklik flush sonunda silinir; burada atanir
+        if yeniler and islem.kayit_id is None:
+            islem.kayit_id = yeniler[0].id
+
+    event.listen(db, "after_flush", yakala)
+    event.listen(db, "after_flush_postexec", bagla)
+
+    def kaldir():
+        event.remove(db, "after_flush", yakala)
+        event.remove(db, "after_flush_postexec", bagla)
+
+    return kaldir
+
+
+def _endpoint_cagir(endpoint, **argumanlar):
+    """
+    REST endpoint'ini FastAPI'siz, argumanlari ADIYLA vererek cagirir.
+    Endpoint'in almadigi arguman (or. arka_plan) verilmez; imzaya yeni
+    parametre eklenmesi sync'i bozmaz. Adlar REST'teki gibi:
+    {tablo}_id, {tablo}_data, request, kullanici, db, master_db, arka_plan
+    """
+    parametreler = inspect.signature(endpoint).parameters
+    return endpoint(**{ad: deger for ad, deger in argumanlar.items() if ad in parametreler})
+
+
+async def _uygula(
+    degisiklik: SyncDegisikligi, request: Request, kullanici: TokenKullanici,
+    db: Session, master_db: Session, arka_plan: BackgroundTasks,
+) -> dict:
+    """Tek degisiklik -> {"durum": "uygulandi" | "cakisma" | "hata", ...}"""
+    sonuc = {
+        "islem_id": degisiklik.islem_id, "tablo": degisiklik.tablo,
+        "islem": degisiklik.islem, "id": degisiklik.id,
+    }
+    tablo = SYNC_TABLO_ADLARI[degisiklik.tablo]
+
+    # Ayni islem daha once uygulandiysa (istemci yaniti alamamis) tekrar uygulanmaz
+    onceki = db.get(SyncIslemi, degisiklik.islem_id)
+    if onceki is not None:
+        kayit = db.get(tablo.model, onceki.kayit_id) if onceki.kayit_id else None
+        return {
+            **sonuc, "durum": "uygulandi", "tekrar": True, "id": onceki.kayit_id,
+            "kayit": satir_sozlugu(tablo, kayit) if kayit is not None else None,
+        }
+
+    ekle, guncelle, sil, create_sema, update_sema = _YAZMA[degisiklik.tablo]
+    try:
+        if degisiklik.islem == "sil":
+            _silme_yetkisi(kullanici)
+        veri = _referanslari_coz(db, degisiklik.veri)
+        if degisiklik.islem == "ekle":
+            girdi = create_sema.model_validate(veri)
+        elif degisiklik.islem == "guncelle":
+            girdi = update_sema.model_validate(veri)
+
+        if degisiklik.islem != "ekle":
+            # Once sayac kilidi: kontrol ile yazma arasinda bu kayda kimse yazamaz
+            degisim_no_ayir(db)
+            kayit = db.get(tablo.model, degisiklik.id, populate_existing=True)
+            if kayit is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Kayit bulunamadi (ID: {degisiklik.id})",
+                )
+            if kayit.degisim_no != degisiklik.temel_no:
+                sunucudaki = satir_sozlugu(tablo, kayit)
+                db.rollback()
+                return {**sonuc, "durum": "cakisma", "kayit": sunucudaki}
+
+        # Degisiklikle AYNI transaction'da commit olur (endpoint commit eder)
+        islem = SyncIslemi(
+            islem_id=degisiklik.islem_id, tablo=degisiklik.tablo,
+            kayit_id=degisiklik.id, kullanici_id=kullanici.id,
+        )
+        db.add(islem)
+        ortak = {
+            "request": request, "kullanici": kullanici, "db": db,
+            "master_db": master_db, "arka_plan": arka_plan,
+        }
+        kimlik = f"{degisiklik.tablo}_id"
+        if degisiklik.islem == "ekle":
+            kaldir = _kayit_id_bagla(db, islem, tablo.model)
+            try:
+                await _endpoint_cagir(ekle, **{f"{degisiklik.tablo}_data": girdi}, **ortak)
+            finally:
+                kaldir()
+        elif degisiklik.islem == "guncelle":
+            await _endpoint_cagir(
+                guncelle, **{kimlik: degisiklik.id, f"{degisiklik.tablo}_data": girdi}, **ortak,
+            )
+        else:
+            await _endpoint_cagir(sil, **{kimlik: degisiklik.id}, **ortak)
+    except ValidationError as e:
+        db.rollback()
+        return {
+            **sonuc, "durum": "hata", "kod": status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "hata": e.errors(include_url=False, include_context=False),
+        }
+    except HTTPException as e:
+        db.rollback()
+        return {**sonuc, "durum": "hata", "kod": e.status_code, "hata": e.detail}
+    except IntegrityError:
+        db.rollback()
+        return {
+            **sonuc, "durum": "hata", "kod": status.HTTP_409_CONFLICT,
+            "hata": "Kayit benzersizlik kuralina takildi (ornegin ayni TC kimlik no)",
+        }
+    except DBAPIError as e:
+        # Kilit zaman asimi / baglanti kopmasi: istemci ayni islem_id ile tekrar dener
+        db.rollback()
+        logger.warning(f"Sync degisikligi uygulanamadi ({degisiklik.tablo} {degisiklik.islem}): {e}")
+        return {
+            **sonuc, "durum": "hata", "kod": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "hata": "Gecici veritabani hatasi, tekrar deneyin",
+        }
+    except Exception:
+        # Beklenmeyen hata sadece bu degisikligi dusurur; partinin geri kalani
+        # uygulanir, ayrinti istemciye degil loga gider
+        db.rollback()
+        logger.error(
+            f"Sync degisikliginde beklenmeyen hata ({degisiklik.tablo} {degisiklik.islem})",
+            exc_info=True,
+        )
+        return {
+            **sonuc, "durum": "hata", "kod": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "hata": "Beklenmeyen sunucu hatasi",
+        }
+
+    kayit = db.get(tablo.model, islem.kayit_id)
+    return {**sonuc, "durum": "uygulandi", "id": islem.kayit_id, "kayit": satir_sozlugu(tablo, kayit)}
+
+
+# =============================================
+# POST /api/v1/sync
+# =============================================
+@router.post("")
+async def sync_gonder(
+    request: Request,
+    gonderim: SyncGonderimi,
+    arka_plan: BackgroundTasks,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """
+    Degisiklikler gonderildigi SIRAYLA uygulanir; her biri icin sonuc doner:
+      uygulandi -> "kayit": sunucudaki hali (ekle'de yeni id + degisim_no)
+      cakisma   -> "kayit": sunucudaki guncel hali, istemci birlestirip tekrar gonderir
+      hata      -> "kod" + "hata": REST endpoint'inin verecegi hata
+    """
+    if len(gonderim.degisiklikler) > settings.SYNC_PUSH_EN_FAZLA:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tek istekte en fazla {settings.SYNC_PUSH_EN_FAZLA} degisiklik gonderilebilir",
+        )
+
+    sonuclar = []
+    for degisiklik in gonderim.degisiklikler:
+        sonuclar.append(await _uygula(degisiklik, request, kullanici, db, master_db, arka_plan))
+
+    sayilar = {"uygulandi": 0, "cakisma": 0, "hata": 0}
+    for s in sonuclar:
+        sayilar[s["durum"]] += 1
+    yeni_uygulanan = sum(1 for s in sonuclar if s["durum"] == "uygulandi" and not s.get("tekrar"))
+    if yeni_uygulanan:
+        # Tekrar korumasi suresi dolan islem kayitlari (indeksli, genelde birkac satir)
+        db.query(SyncIslemi).filter(
+            SyncIslemi.olusturma_tarihi < datetime.utcnow() - timedelta(days=settings.SYNC_ISLEM_SAKLAMA_GUN)
+        ).delete(synchronize_session=False)
+        db.commit()
+        # Ayni OSGB'nin diger cihazlari cekmeye baslasin
+        tenant_bildir(kullanici.tenant_id, "sync", {"uygulanan": yeni_uygulanan})
+
+    return {"sonuclar": sonuclar, **sayilar}
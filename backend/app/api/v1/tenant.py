@@ -0,0 +1,149 @@
+# =============================================
+# OSGB (TENANT) YONETIMI API ENDPOINT'LERI
+# GET  /api/v1/tenant          -> Tum OSGB'ler
+# POST /api/v1/tenant          -> Yeni OSGB kur (veritabani + yonetici)
+# PATCH /api/v1/tenant/{id}/durum -> OSGB'yi devre disi birak / yeniden ac
+# GET  /api/v1/tenant/sablon   -> Sablon veritabaninin durumu
+# POST /api/v1/tenant/sablon   -> Sablonu bastan kur
+# =============================================
+#
+# 📚 DERS: Bu endpoint'ler sadece sistem_admin'e aciktir.
+# Ayrinti: app/services/tenant_provizyon.py
+
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.database import get_master_db
+from app.core.security import sifre_hashle_async
+from app.middleware.deps import TokenKullanici, rol_gerekli
+from app.models.master import IslemLogEnum, Tenant
+from app.schemas.tenant import TenantDurum, TenantOlustur, TenantOlusturYanit, TenantResponse
+from app.services.log_service import islem_logla
+from app.services.tenant_provizyon import (
+    sablon_durumu, sablon_hazirla, tenant_durum_degistir, tenant_olustur,
+)
+
+router = APIRouter(
+    prefix="/tenant",
+    tags=["OSGB Yonetimi"],
+)
+
+
+# =============================================
+# GET /api/v1/tenant
+# =============================================
+@router.get("", response_model=list[TenantResponse])
+def tenant_listele(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+    db: Session = Depends(get_master_db),
+):
+    """Tum OSGB'ler (en yeni once)"""
+    return db.query(Tenant).order_by(Tenant.id.desc()).all()
+
+
+# =============================================
+# GET /api/v1/tenant/sablon
+# =============================================
+@router.get("/sablon")
+def sablon_bilgisi(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """
+    {"db": "osgb_template", "mevcut": true, "parmak_izi": "...", "beklenen": "...", "guncel": true}
+
+    guncel=false: modeller degismis, bir sonraki OSGB kurulumunda sablon
+    kendiliginden yenilenir (ya da POST /tenant/sablon).
+    """
+    return sablon_durumu()
+
+
+# =============================================
+# POST /api/v1/tenant/sablon
+# =============================================
+@router.post("/sablon")
+def sablon_yenile(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+):
+    """Sablonu parmak izine bakmadan bastan kurar."""
+    sablon_hazirla(yeniden=True)
+    return sablon_durumu()
+
+
+# =============================================
+# POST /api/v1/tenant
+# Yeni OSGB kur
+# =============================================
+@router.post("", response_model=TenantOlusturYanit, status_code=status.HTTP_201_CREATED)
+async def tenant_ekle(
+    veri: TenantOlustur,
+    request: Request,
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+    db: Session = Depends(get_master_db),
+):
+    """
+    📚 DERS: Tek istekte hazir OSGB.
+
+    1. Veritabani osgb_template'ten kopyalanir (CREATE DATABASE ... TEMPLATE)
+    2. Master DB'ye OSGB ve yonetici kullanici eklenir
+    3. Yonetici hemen giris yapabilir
+
+    Yanittaki "sureler" her adimin kac ms surdugunu gosterir.
+    """
+    tenant_alanlari = veri.model_dump(
+        exclude={"yonetici_email", "yonetici_sifre", "yonetici_ad", "yonetici_soyad"}
+    )
+    yonetici_alanlari = {
+        "email": veri.yonetici_email,
+        "sifre_hash": await sifre_hashle_async(veri.yonetici_sifre),
+        "ad": veri.yonetici_ad,
+        "soyad": veri.yonetici_soyad,
+    }
+
+    # CREATE DATABASE ve psycopg2 cagrilari bloklayici: event loop'u tutmasin
+    tenant, yonetici, sureler = await run_in_threadpool(
+        tenant_olustur, db, tenant_alanlari, yonetici_alanlari
+    )
+
+    await islem_logla(
+        db=db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="tenant",
+        aciklama=f"Yeni OSGB kuruldu: {tenant.ad} ({tenant.db_name}) - {sureler['toplam_ms']:.0f}ms",
+        kullanici=kullanici, kayit_id=tenant.id, kayit_turu="Tenant",
+        yeni_deger=tenant_alanlari, request=request,
+    )
+
+    return {
+        "tenant": tenant,
+        "yonetici_email": yonetici.email,
+        "sureler": {ad: round(ms, 1) for ad, ms in sureler.items()},
+    }
+
+
+# =============================================
+# PATCH /api/v1/tenant/{tenant_id}/durum
+# OSGB'yi devre disi birak / yeniden ac
+# =============================================
+@router.patch("/{tenant_id}/durum", response_model=TenantResponse)
+async def tenant_durum(
+    tenant_id: int,
+    veri: TenantDurum,
+    request: Request,
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin")),
+    db: Session = Depends(get_master_db),
+):
+    """
+    {"aktif": false} -> OSGB'nin tum kullanicilarinin oturumlari hemen kapanir,
+    mevcut access token'lari OSGB verisine erisemez (403).
+    """
+    tenant, kapatilan = await run_in_threadpool(tenant_durum_degistir, db, tenant_id, veri.aktif)
+
+    await islem_logla(
+        db=db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="tenant",
+        aciklama=(
+            f"OSGB {'aktif edildi' if veri.aktif else 'devre disi birakildi'}: {tenant.ad}"
+            + ("" if veri.aktif else f" ({kapatilan} kullanicinin oturumu kapatildi)")
+        ),
+        kullanici=kullanici, kayit_id=tenant.id, kayit_turu="Tenant",
+        yeni_deger={"aktif": veri.aktif}, request=request,
+    )
+    return tenant
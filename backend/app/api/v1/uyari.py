@@ -0,0 +1,79 @@
+# =============================================
+# SURE UYARILARI API ENDPOINT'LERI
+# GET  /api/v1/uyarilar           -> Suresi dolan / dolmak uzere olan egitimler
+# POST /api/v1/uyarilar/yenile    -> Kendi OSGB'ni simdi yeniden tara
+# =============================================
+#
+# Ayrinti: app/services/uyari_service.py (sure_uyarilari onbellek tablosu)
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_master_db
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, rol_gerekli
+
+from app.services.uyari_service import tenant_uyarilarini_yenile, uyarilari_getir
+
+router = APIRouter(
+    prefix="/uyarilar",
+    tags=["Sure Uyarilari"],
+)
+
+
+def _tenant_id(kullanici: TokenKullanici) -> int:
+    if not kullanici.tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uyarilar OSGB'ye aittir; bu kullanici bir OSGB'ye bagli degil",
+        )
+    return kullanici.tenant_id
+
+
+# =============================================
+# GET /api/v1/uyarilar
+# =============================================
+@router.get("")
+def uyari_listele(
+    gun: Optional[int] = Query(None, ge=0, le=365, description="Kac gun icinde bitenler (bos = UYARI_ILERI_GUN)"),
+    gecmis: bool = Query(True, description="Suresi dolmuslari da getir"),
+    tur: Optional[str] = Query(None, description="Uyari turu: egitim"),
+    isyeri_id: Optional[int] = Query(None),
+    sayfa: int = Query(1, ge=1),
+    adet: int = Query(50, ge=1, le=500),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(get_master_db),
+):
+    """
+    📚 DERS: Dashboard bu endpoint'i kullanir: OSGB veritabanina gidilmez,
+    zamanlayicinin doldurdugu sure_uyarilari tablosu okunur.
+    hesaplama_tarihi verinin ne kadar taze oldugunu gosterir.
+    """
+    sonuc = uyarilari_getir(
+        db, _tenant_id(kullanici), gun=gun, gecmis=gecmis, tur=tur,
+        isyeri_id=isyeri_id, sayfa=sayfa, adet=adet,
+    )
+    sonuc["tarama_araligi_dk"] = settings.UYARI_TARAMA_DK
+    return sonuc
+
+
+# =============================================
+# POST /api/v1/uyarilar/yenile
+# =============================================
+@router.post("/yenile")
+async def uyari_yenile(
+    kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin", "osgb_yoneticisi")),
+):
+    """Zamanlayiciyi beklemeden kendi OSGB'ni tarar."""
+    try:
+        rapor = await run_in_threadpool(tenant_uyarilarini_yenile, _tenant_id(kullanici), False)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OSGB bulunamadi")
+    if rapor.get("atlandi"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Sure uyarilari su anda baska bir islem tarafindan yenileniyor",
+        )
+    return rapor
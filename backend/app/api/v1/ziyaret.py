@@ -0,0 +1,272 @@
+# =============================================
+# ZIYARET API ENDPOINT'LERI
+# Isyeri ziyaretleri ve aylik ziyaret plani
+# =============================================
+#
+# Endpoint listesi:
+# GET    /api/v1/ziyaret              -> Ziyaretleri listele (donem, isyeri, personel, durum)
+# POST   /api/v1/ziyaret/plan         -> Donemin ziyaret planini olustur / yenile
+# GET    /api/v1/ziyaret/rota         -> Gunun en kisa ziyaret sirasi (onizleme)
+# POST   /api/v1/ziyaret/rota         -> Ayni sirayi ziyaret saatlerine yaz
+# GET    /api/v1/ziyaret/{id}         -> Tek ziyaret getir
+# PUT    /api/v1/ziyaret/{id}         -> Ziyaret guncelle (tamamlandi, not, tarih...)
+#
+# Planlama ayrintisi: app/services/ziyaret_plan_service.py
+# Rota ayrintisi: app/services/rota_service.py
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+
+from app.middleware.deps import TokenKullanici, mevcut_kullanici_getir, tenant_db_getir, rol_gerekli
+from app.models.master import IslemLogEnum
+from app.models.tenant import Personel, Ziyaret, ZiyaretDurumu
+from app.services.log_service import islem_logla
+from app.services.ziyaret_plan_service import donem_yaz, plan_olustur
+from app.services.rota_service import gunluk_rotalar
+from app.services.kpi_service import kpi_yenile
+from app.core.bildirim import kullanici_bildir, tenant_bildir
+from app.core.database import get_master_db
+from app.schemas.ziyaret import (
+    ZiyaretPlanIstegi, ZiyaretRotaIstegi, ZiyaretUpdate, ZiyaretResponse, ZiyaretListResponse,
+)
+
+router = APIRouter(
+    prefix="/ziyaret",
+    tags=["Ziyaret Yonetimi"],
+)
+
+
+# =============================================
+# GET /api/v1/ziyaret
+# =============================================
+@router.get("", response_model=ZiyaretListResponse)
+def ziyaret_listele(
+    sayfa: int = Query(1, ge=1, description="Sayfa numarasi"),
+    adet: int = Query(50, ge=1, le=500, description="Sayfa basina kayit"),
+    donem: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Plan donemi: 2026-11"),
+    isyeri_id: Optional[int] = Query(None),
+    ziyaretci_id: Optional[int] = Query(None, description="Personel ID"),
+    durum: Optional[ZiyaretDurumu] = Query(None),
+    atanmamis: bool = Query(False, description="Sadece personel atanamamis ziyaretler"),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """Ziyaretler tarih sirasiyla (takvim gorunumu)."""
+    query = db.query(Ziyaret)
+    if donem:
+        query = query.filter(Ziyaret.plan_donemi == donem)
+    if isyeri_id:
+        query = query.filter(Ziyaret.isyeri_id == isyeri_id)
+    if ziyaretci_id:
+        query = query.filter(Ziyaret.ziyaretci_id == ziyaretci_id)
+    if durum:
+        query = query.filter(Ziyaret.durum == durum)
+    if atanmamis:
+        query = query.filter(Ziyaret.ziyaretci_id.is_(None))
+
+    toplam = query.count()
+    ziyaretler = (
+        query.order_by(Ziyaret.ziyaret_tarihi, Ziyaret.id)
+        .offset((sayfa - 1) * adet)
+        .limit(adet)
+        .all()
+    )
+    return ZiyaretListResponse(toplam=toplam, ziyaretler=ziyaretler)
+
+
+# =============================================
+# POST /api/v1/ziyaret/plan
+# 📚 DERS: /{ziyaret_id} ONCESINDE olmali!
+# =============================================
+@router.post("/plan")
+async def ziyaret_plani_olustur(
+    request: Request,
+    istek: ZiyaretPlanIstegi,
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """
+    Donemin tum isyerleri (ya da verilenler) icin personel atar ve
+    ziyaretleri takvime yayar. Onceki planin PLANLANDI ziyaretleri
+    yenileriyle degisir; tamamlananlar korunur ve suresi dusulur.
+    """
+    try:
+        rapor = await run_in_threadpool(plan_olustur, db, istek.donem, istek.isyeri_idleri)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_EKLEME, modul="ziyaret",
+        aciklama=(
+            f"Ziyaret plani olusturuldu: {rapor['donem']}, {rapor['ziyaret_sayisi']} ziyaret, "
+            f"{len(rapor['atanamayan'])} atanamayan"
+        ),
+        kullanici=kullanici, request=request,
+    )
+
+    # Anlik bildirim: OSGB'ye plan hazir, sisteme giris yapan personele kendi yuku
+    tenant_bildir(kullanici.tenant_id, "ziyaret_plani", {
+        "donem": rapor["donem"], "ziyaret_sayisi": rapor["ziyaret_sayisi"],
+        "atanamayan": len(rapor["atanamayan"]),
+    })
+    doluluk = {p["personel_id"]: p["planlanan_dk"] for p in rapor["personel_doluluk"]}
+    if doluluk:
+        for personel_id, kullanici_id in db.query(Personel.id, Personel.kullanici_id).filter(
+            Personel.id.in_(list(doluluk)), Personel.kullanici_id.isnot(None)
+        ):
+            kullanici_bildir(kullanici_id, "ziyaret_atandi", {
+                "donem": rapor["donem"], "planlanan_dk": doluluk[personel_id],
+            })
+    return rapor
+
+
+# =============================================
+# GET /api/v1/ziyaret/rota
+# 📚 DERS: /{ziyaret_id} ONCESINDE olmali!
+# =============================================
+@router.get("/rota")
+async def ziyaret_rotasi(
+    gun: date = Query(..., description="Gun: 2026-11-03"),
+    ziyaretci_id: Optional[int] = Query(None, description="Personel ID (bos = o gunun tum personeli)"),
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    """
+    Gunun planli ziyaretleri icin en kisa sira ve yol suresi dahil
+    saatler. Hicbir sey degismez; onizlemedir.
+    """
+    return await run_in_threadpool(gunluk_rotalar, db, kullanici.db_name, gun, ziyaretci_id)
+
+
+@router.post("/rota")
+async def ziyaret_rotasi_uygula(
+    request: Request,
+    istek: ZiyaretRotaIstegi,
+    kullanici: TokenKullanici = Depends(
+        rol_gerekli("sistem_admin", "osgb_yoneticisi")
+    ),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    """Onizlemedeki sirayi ziyaret saatlerine yazar (tek toplu UPDATE)."""
+    sonuc = await run_in_threadpool(
+        gunluk_rotalar, db, kullanici.db_name, istek.gun, istek.ziyaretci_id, True,
+    )
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="ziyaret",
+        aciklama=(
+            f"Ziyaret rotasi uygulandi: {istek.gun}, {sonuc['personel_sayisi']} personel, "
+            f"{sonuc['onceki_km']} km -> {sonuc['toplam_km']} km"
+        ),
+        kullanici=kullanici, request=request,
+    )
+    return sonuc
+
+
+# =============================================
+# GET /api/v1/ziyaret/{id}
+# =============================================
+@router.get("/{ziyaret_id}", response_model=ZiyaretResponse)
+def ziyaret_detay(
+    ziyaret_id: int,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+):
+    ziyaret = db.query(Ziyaret).filter(Ziyaret.id == ziyaret_id).first()
+    if not ziyaret:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ziyaret bulunamadi (ID: {ziyaret_id})",
+        )
+    return ziyaret
+
+
+# =============================================
+# PUT /api/v1/ziyaret/{id}
+# =============================================
+@router.put("/{ziyaret_id}", response_model=ZiyaretResponse)
+async def ziyaret_guncelle(
+    ziyaret_id: int,
+    request: Request,
+    ziyaret_data: ZiyaretUpdate,
+    kullanici: TokenKullanici = Depends(mevcut_kullanici_getir),
+    db: Session = Depends(tenant_db_getir),
+    master_db: Session = Depends(get_master_db),
+):
+    ziyaret = db.query(Ziyaret).filter(Ziyaret.id == ziyaret_id).first()
+    if not ziyaret:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ziyaret bulunamadi (ID: {ziyaret_id})",
+        )
+
+    guncel_veriler = ziyaret_data.model_dump(exclude_unset=True)
+
+    if "durum" in guncel_veriler:
+        gecerli = [e.value for e in ZiyaretDurumu]
+        if guncel_veriler["durum"] not in gecerli:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Gecersiz durum: {guncel_veriler['durum']}. Gecerli degerler: {gecerli}",
+            )
+        guncel_veriler["durum"] = ZiyaretDurumu(guncel_veriler["durum"])
+
+    # Personel degisiyorsa adi da guncellenir (listede join gerekmesin)
+    personel = None
+    if guncel_veriler.get("ziyaretci_id"):
+        personel = db.query(Personel).filter(
+            Personel.id == guncel_veriler["ziyaretci_id"], Personel.aktif == True
+        ).first()
+        if not personel:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Aktif personel bulunamadi (ID: {guncel_veriler['ziyaretci_id']})",
+            )
+        guncel_veriler["ziyaretci_adi"] = f"{personel.ad} {personel.soyad}"
+
+    # Sure tarihlerden hesaplanir (kapasite hesabi buna bakar)
+    baslangic = guncel_veriler.get("ziyaret_tarihi", ziyaret.ziyaret_tarihi)
+    bitis = guncel_veriler.get("ziyaret_bitis", ziyaret.ziyaret_bitis)
+    if ("ziyaret_tarihi" in guncel_veriler or "ziyaret_bitis" in guncel_veriler) and bitis:
+        if bitis <= baslangic:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ziyaret bitisi baslangictan sonra olmali",
+            )
+        guncel_veriler["sure_dk"] = int((bitis - baslangic).total_seconds() // 60)
+
+    # Planli ziyaret baska aya tasindiysa donemi de tasinir (kapasite o ayin
+    # plan_donemi'ne gore hesaplanir; eski donemde kalirsa iki ay da yanlis olur)
+    if guncel_veriler.get("ziyaret_tarihi") and ziyaret.plan_donemi:
+        guncel_veriler["plan_donemi"] = donem_yaz(guncel_veriler["ziyaret_tarihi"])
+
+    eski_degerler = {alan: getattr(ziyaret, alan) for alan in guncel_veriler}
+    for alan, deger in guncel_veriler.items():
+        setattr(ziyaret, alan, deger)
+    if {"durum", "ziyaret_tarihi"} & guncel_veriler.keys():
+        kpi_yenile(db, "ziyaret")
+
+    db.commit()
+    db.refresh(ziyaret)
+
+    await islem_logla(
+        db=master_db, islem_turu=IslemLogEnum.KAYIT_GUNCELLEME, modul="ziyaret",
+        aciklama=f"Ziyaret guncellendi (ID: {ziyaret_id})",
+        kullanici=kullanici, kayit_id=ziyaret_id, kayit_turu="Ziyaret",
+        eski_deger=eski_degerler, yeni_deger=guncel_veriler, request=request,
+    )
+
+    # Yeni atanan personelin (sisteme giris yapiyorsa) cihazlarina bildirim
+    if personel is not None and personel.id != eski_degerler.get("ziyaretci_id"):
+        kullanici_bildir(personel.kullanici_id, "ziyaret_atandi", {
+            "ziyaret_id": ziyaret.id, "isyeri_id": ziyaret.isyeri_id, "ziyaret_tarihi": ziyaret.ziyaret_tarihi,
+        })
+
+    return ziyaret
@@ -0,0 +1,272 @@
+# =============================================
+# ANLIK BILDIRIMLER (WebSocket pub/sub)
+# Sunucudan istemciye "su oldu" mesaji: polling yerine push
+# =============================================
+#
+# 📚 DERS: Kanal mantigi
+# Her WebSocket baglantisi (abone) iki kanala yazilir:
+#   tenant:{tenant_id}      -> OSGB'nin tum acik oturumlari (uyarilar, plan, ice aktarim)
+#   kullanici:{kullanici_id} -> sadece o kullanicinin cihazlari (ona atanan ziyaretler)
+# Yayinlayan taraf baglantilari bilmez, sadece kanala yazar:
+#   tenant_bildir(5, "sure_uyarilari", {"uyari_sayisi": 12})
+#
+# 📚 DERS: Birden fazla worker
+# Kullanici worker 1'e bagli, is worker 3'te bitti: mesaj oraya nasil gider?
+# WS_PG_YAYIN acikken yayin once PostgreSQL'e gider (SELECT pg_notify),
+# her worker'in pg_dinleyici'si onu alir ve KENDI aboneleri varsa dagitir
+# (yayinlayan worker da kendi mesajini bu yoldan alir: cift teslim olmaz).
+# Dinleyici bagli degilse / NOTIFY gonderilemezse mesaj sadece bu worker'da
+# dagitilir. NOTIFY govdesi 8000 bayt ile sinirli: mesajlar kisa tutulmali
+# (kayit degil "su degisti, yenile" bilgisi).
+#
+# 📚 DERS: Geri basinc (backpressure)
+# Yavas / uyuyan bir istemci icin mesajlar sonsuza kadar birikemez:
+#   - Her aboneye SINIRLI kuyruk (WS_KUYRUK_BOYUTU). Dolunca en ESKI mesaj
+#     duser; istemciye {"olay": "kayip"} gider -> ekranini bastan yuklemeli.
+#   - Bir mesaj WS_GONDERIM_ZAMAN_ASIMI_SN icinde yazilamiyorsa (TCP
+#     tamponu dolu, istemci okumuyor) baglanti kapatilir.
+# Yayinlayan asla beklemez: yayinla() bloklamaz.
+#
+# Teslim garantisi YOK (en fazla bir kez): bildirim bir ipucudur, veri
+# her zaman REST API'den okunur. Yeniden baglanan istemci ekranini yeniler.
+#
+# Thread-safe: yayinla() event loop'tan, threadpool'dan (senkron endpoint'ler),
+# zamanlayici thread'lerinden ve pg dinleyicisinden cagrilabilir; dagitim
+# her zaman event loop thread'inde yapilir (call_soon_threadsafe).
+
+import asyncio
+import json
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.pg_dinleyici import pg_dinleyici
+
+
+# Worker'lar arasi dagitimda kullanilan PostgreSQL NOTIFY kanali
+BILDIRIM_KANALI = "ws_bildirim"
+
+# NOTIFY govdesi 8000 bayttan kisa olmali (kanal adi on eki dahil)
+_NOTIFY_SINIRI = 7900
+# pg_notify bir transaction'da en fazla bu kadar mesaj gonderir
+_NOTIFY_PARTI = 100
+
+
+def tenant_kanali(tenant_id: int) -> str:
+    return f"tenant:{tenant_id}"
+
+
+def kullanici_kanali(kullanici_id: int) -> str:
+    return f"kullanici:{kullanici_id}"
+
+
+def mesaj_olustur(olay: str, veri: Any = None, kanal: Optional[str] = None) -> str:
+    """Istemciye giden JSON metni (tum aboneler icin BIR kez serilestirilir)."""
+    return json.dumps(
+        {"olay": olay, "kanal": kanal, "veri": veri, "zaman": datetime.utcnow().isoformat(timespec="seconds")},
+        default=str, ensure_ascii=False,
+    )
+
+
+class Abone:
+    """
+    Tek WebSocket baglantisinin bekleyen mesajlari.
+    Sadece event loop thread'inde kullanilir (kilit gerekmez).
+    Binlerce bosta baglanti icin hafif: bir deque + bir Event.
+    """
+    __slots__ = ("kanallar", "kuyruk", "uyandir", "dusen", "kapat_kodu", "kapat_nedeni")
+
+    def __init__(self, kanallar: Tuple[str, ...], boyut: int):
+        self.kanallar = kanallar
+        self.kuyruk: deque = deque(maxlen=boyut)
+        self.uyandir = asyncio.Event()
+        self.dusen = 0                      # Istemciye henuz bildirilmemis kayip mesaj
+        self.kapat_kodu: Optional[int] = None
+        self.kapat_nedeni = ""
+
+    def ekle(self, metin: str) -> bool:
+        """Mesaji kuyruga ekler. Kuyruk doluysa en eskisi duser -> True."""
+        dustu = len(self.kuyruk) == self.kuyruk.maxlen
+        if dustu:
+            self.dusen += 1
+        self.kuyruk.append(metin)
+        self.uyandir.set()
+        return dustu
+
+    def kapat(self, kod: int, neden: str = "") -> None:
+        """Gondericiye 'baglantiyi bu kodla kapat' der."""
+        self.kapat_kodu, self.kapat_nedeni = kod, neden
+        self.uyandir.set()
+
+
+class BildirimMerkezi:
+    """Worker icindeki tum aboneler ve kanal -> abone esleme tablosu."""
+
+    def __init__(self):
+        self._kanallar: Dict[str, Set[Abone]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pg_kuyrugu: Optional[queue.Queue] = None
+        self._pg_thread: Optional[threading.Thread] = None
+        self.baglanti_sayisi = 0
+        self.dusen_mesaj = 0
+        self.yavas_kapatilan = 0
+
+    # ---- YASAM DONGUSU (lifespan) ----
+    def baslat(self, pg_yayin: bool = False) -> None:
+        """Event loop'u yakalar; pg_yayin ise NOTIFY gonderici thread'ini baslatir."""
+        self._loop = asyncio.get_running_loop()
+        if pg_yayin and self._pg_thread is None:
+            self._pg_kuyrugu = queue.Queue(maxsize=10000)
+            self._pg_thread = threading.Thread(target=self._pg_gonder, name="ws-bildirim", daemon=True)
+            self._pg_thread.start()
+
+    def durdur(self) -> None:
+        """Kapanista: tum istemcilere 1001 (going away) -> baska worker'a yeniden baglanirlar."""
+        for abone in {a for aboneler in self._kanallar.values() for a in aboneler}:
+            abone.kapat(1001, "Sunucu yeniden baslatiliyor")
+        if self._pg_thread is not None:
+            self._pg_kuyrugu.put(None)
+            self._pg_thread.join(timeout=2)
+            self._pg_thread = None
+            self._pg_kuyrugu = None
+
+    # ---- ABONELIK (WebSocket endpoint'i) ----
+    def kaydol(self, kanallar: Iterable[str]) -> Optional[Abone]:
+        """Yeni baglanti. Worker WS_MAKS_BAGLANTI'ya ulastiysa None."""
+        if self.baglanti_sayisi >= settings.WS_MAKS_BAGLANTI:
+            return None
+        abone = Abone(tuple(kanallar), settings.WS_KUYRUK_BOYUTU)
+        for kanal in abone.kanallar:
+            self._kanallar.setdefault(kanal, set()).add(abone)
+        self.baglanti_sayisi += 1
+        return abone
+
+    def ayril(self, abone: Abone) -> None:
+        for kanal in abone.kanallar:
+            aboneler = self._kanallar.get(kanal)
+            if aboneler is not None:
+                aboneler.discard(abone)
+                if not aboneler:
+                    del self._kanallar[kanal]
+        self.baglanti_sayisi -= 1
+
+    # ---- YAYIN ----
+    def yayinla(self, kanal: str, olay: str, veri: Any = None) -> None:
+        """Kanala mesaj: her thread'den cagrilabilir, bloklamaz."""
+        if self._pg_kuyrugu is None and kanal not in self._kanallar:
+            return  # Dinleyen yok: serilestirmeye bile gerek yok
+        metin = mesaj_olustur(olay, veri, kanal)
+        if self._pg_kuyrugu is not None and pg_dinleyici.bagli:
+            yuk = f"{kanal} {metin}"
+            if len(yuk.encode()) <= _NOTIFY_SINIRI:
+                try:
+                    self._pg_kuyrugu.put_nowait(yuk)
+                    return
+                except queue.Full:
+                    logger.warning(f"Bildirim NOTIFY kuyrugu dolu, sadece bu worker'a: {kanal} {olay}")
+            else:
+                logger.warning(f"Bildirim NOTIFY icin cok buyuk, sadece bu worker'a: {kanal} {olay}")
+        self._yerel(kanal, metin)
+
+    def _yerel(self, kanal: str, metin: str) -> None:
+        """Bu worker'in abonelerine (event loop thread'inde) dagitir."""
+        loop = self._loop
+        if loop is None or kanal not in self._kanallar:
+            return
+        try:
+            calisan = asyncio.get_running_loop()
+        except RuntimeError:
+            calisan = None
+        if calisan is loop:
+            self._dagit(kanal, metin)
+            return
+        try:
+            loop.call_soon_threadsafe(self._dagit, kanal, metin)
+        except RuntimeError:
+            # Event loop kapanmis (uygulama duruyor)
+            pass
+
+    def _dagit(self, kanal: str, metin: str) -> None:
+        for abone in tuple(self._kanallar.get(kanal, ())):
+            if abone.ekle(metin):
+                self.dusen_mesaj += 1
+
+    # ---- WORKER'LAR ARASI (PostgreSQL LISTEN/NOTIFY) ----
+    def pg_bildirimi(self, veri: str) -> None:
+        """pg_dinleyici geri cagirmasi (dinleyici thread'inde): '<kanal> <json>'."""
+        kanal, _, metin = veri.partition(" ")
+        if metin:
+            self._yerel(kanal, metin)
+
+    def pg_yeniden_baglandi(self) -> None:
+        """Dinleyici koptugu surede gelen mesajlar kayboldu: acik istemciler ekranini yenilesin."""
+        loop = self._loop
+        if loop is not None and self._kanallar:
+            try:
+                loop.call_soon_threadsafe(self._kayip_bildir)
+            except RuntimeError:
+                pass
+
+    def _kayip_bildir(self) -> None:
+        for abone in {a for aboneler in self._kanallar.values() for a in aboneler}:
+            abone.dusen += 1
+            abone.uyandir.set()
+
+    def _pg_gonder(self) -> None:
+        """Gonderici thread: kuyruktaki mesajlari partiler halinde pg_notify ile yollar."""
+        from app.core.database import master_engine
+
+        dur = False
+        while not dur:
+            yuk = self._pg_kuyrugu.get()
+            if yuk is None:
+                return
+            parti = [yuk]
+            while len(parti) < _NOTIFY_PARTI:
+                try:
+                    yuk = self._pg_kuyrugu.get_nowait()
+                except queue.Empty:
+                    break
+                if yuk is None:
+                    dur = True
+                    break
+                parti.append(yuk)
+            try:
+                with master_engine.begin() as baglanti:
+                    for yuk in parti:
+                        baglanti.execute(text("SELECT pg_notify(:k, :v)"), {"k": BILDIRIM_KANALI, "v": yuk})
+            except Exception as e:
+                logger.warning(f"Bildirim NOTIFY gonderilemedi, {len(parti)} mesaj sadece bu worker'a: {e}")
+                for yuk in parti:
+                    self.pg_bildirimi(yuk)
+
+    def istatistik(self) -> dict:
+        return {
+            "baglanti": self.baglanti_sayisi,
+            "kanal": len(self._kanallar),
+            "dusen_mesaj": self.dusen_mesaj,
+            "yavas_kapatilan": self.yavas_kapatilan,
+            "pg_yayin": self._pg_thread is not None,
+        }
+
+
+# Uygulama genelinde tek merkez (worker basina)
+bildirim_merkezi = BildirimMerkezi()
+
+
+def tenant_bildir(tenant_id: Optional[int], olay: str, veri: Any = None) -> None:
+    """OSGB'nin tum acik oturumlarina bildirim (tenant_id None ise hicbir sey yapmaz)."""
+    if tenant_id is not None:
+        bildirim_merkezi.yayinla(tenant_kanali(tenant_id), olay, veri)
+
+
+def kullanici_bildir(kullanici_id: Optional[int], olay: str, veri: Any = None) -> None:
+    """Tek kullanicinin tum cihazlarina bildirim."""
+    if kullanici_id is not None:
+        bildirim_merkezi.yayinla(kullanici_kanali(kullanici_id), olay, veri)
@@ -30,6 +30,81 @@ class Settings(BaseSettings):
     DATABASE_USER: str = "postgres"           # Kullanıcı adı
     DATABASE_PASSWORD: str = ""               # Şifre (.env'den okunacak)
     DATABASE_NAME: str = "osgb_master"        # Ana veritabanı adı (master)
+    DB_POOL_SIZE: int = 5                     # Her veritabani icin acik tutulan baglanti
+    DB_MAX_OVERFLOW: int = 10                 # Yogunlukta gecici olarak acilabilecek ek baglanti
+    SQL_ECHO: bool = False                    # True: TUM SQL sorgularini konsola yazdir (sadece hata ayiklarken)
+    YAVAS_SORGU_MS: int = 200                 # Bu sureyi asan sorgular db_logger'a yazilir
+    ISTEK_SORGU_UYARI_ESIGI: int = 50         # Tek istekte bundan fazla sorgu = muhtemel N+1, uyar
+    DB_DEBUG_HEADERLARI: bool = False         # True: yanitlara X-DB-Queries / X-DB-Time ekle (sadece gelistirme)
+    PG_DINLEYICI_AKTIF: bool = True           # Master DB'de LISTEN/NOTIFY ile degisiklikleri aninda al
+
+    # --- TENANT YONLENDIRME ---
+    TENANT_ANA_DOMAIN: str = ""               # "osgbyazilim.com" -> abc.osgbyazilim.com = "abc" OSGB'si (bos = kapali)
+    TENANT_AYRILMIS_SUBDOMAINLER: str = "api,www,admin"  # Tenant sayilmayan subdomain'ler
+    TENANT_DIZINI_MAKS_YAS_SN: int = 300      # Bellekteki tenant listesi en fazla bu kadar eski olabilir
+
+    # --- TENANT PROVIZYON ---
+    TENANT_SABLON_DB: str = "osgb_template"   # Yeni OSGB veritabanlari bu sablondan kopyalanir
+    TENANT_DENEME_GUN: int = 14               # Yeni OSGB'nin deneme suresi (gun)
+    MIGRASYON_PARALEL: int = 8                # Ayni anda migre edilen en fazla OSGB veritabani
+    MIGRASYON_KILIT_BEKLEME_SN: int = 10      # Migrasyon bir tablo kilidini en fazla bu kadar bekler
+
+    # --- PLATFORM ANALITIGI ---
+    ZAMANLAYICI_AKTIF: bool = True            # Periyodik arka plan gorevleri (ozet yenileme vb.)
+    ANALITIK_YENILEME_DK: int = 15            # platform_ozet tablosu kac dakikada bir yenilenir
+    ANALITIK_ZAMAN_ASIMI_SN: float = 10       # Tum OSGB'lerden yanit beklenen en uzun sure
+    ANALITIK_PARALEL: int = 8                 # Ayni anda sorgulanan en fazla OSGB veritabani
+
+    # --- NACE KODLARI ---
+    NACE_DOSYASI: str = ""                    # "kod;aciklama;tehlike_sinifi" CSV (bos = app/data/nace_kodlari.csv)
+
+    # --- GEOKODLAMA (adres -> koordinat) ---
+    GEOKOD_SAGLAYICI: str = "nominatim"       # "nominatim" veya "cevrimdisi" (test / internetsiz gelistirme)
+    GEOKOD_NOMINATIM_URL: str = "https://nominatim.openstreetmap.org/search"
+    GEOKOD_USER_AGENT: str = "OSGB-Yazilim/1.0"  # Nominatim tanimlayici User-Agent zorunlu tutuyor
+    GEOKOD_ISTEK_ARALIGI_SN: float = 1.0      # Saglayiciya iki istek arasi en az (Nominatim: saniyede 1)
+    GEOKOD_BULUNAMADI_TEKRAR_GUN: int = 30    # Bulunamayan adres bu kadar gun sonra tekrar sorulur
+
+    # --- MEKANSAL SORGULAR ---
+    MEKANSAL_POSTGIS: bool = True             # PostGIS kuruluysa kullan (False: her zaman bellekteki izgara)
+    MEKANSAL_IZGARA_DERECE: float = 0.05      # Izgara hucresi (~5.5 km); yakin sorgularinin tipik yaricapi
+    MEKANSAL_INDEKS_MAKS_YAS_SN: int = 60     # Bellekteki izgara en fazla bu kadar eski olabilir (diger worker'lar)
+
+    # --- ZIYARET PLANLAMA ---
+    PERSONEL_AYLIK_KAPASITE_DK: int = 11700   # Tam sureli ISG profesyoneli: ayda 195 saat
+    ZIYARET_GUNLUK_DK: int = 480              # Personel basina gunluk ziyaret suresi (ve tek ziyaretin en fazlasi)
+    ZIYARET_BASLANGIC_SAATI: int = 9          # Gunun ilk ziyareti bu saatte baslar
+
+    # --- ROTA OPTIMIZASYONU ---
+    ROTA_ISLEM_SAYISI: int = 2                # Toplu rota cozumunde paralel process (1 = ayni process'te sirayla)
+    ROTA_YOL_KATSAYISI: float = 1.3           # Kus ucusu mesafe x katsayi ~ karayolu mesafesi
+    ROTA_ORTALAMA_HIZ_KMS: float = 40         # Duraklar arasi yol suresi icin (sehir ici ortalama, km/saat)
+    ROTA_MESAFE_ONBELLEK: int = 200000        # Onbellekte tutulan en fazla mesafe cifti (tum OSGB'ler toplami)
+
+    # --- SURE UYARILARI ---
+    UYARI_TARAMA_DK: int = 60                 # sure_uyarilari tablosu kac dakikada bir yenilenir
+    UYARI_ILERI_GUN: int = 60                 # Bu kadar gun icinde suresi dolacaklar uyarilir
+    UYARI_GECMIS_GUN: int = 90                # Suresi gecmis olanlar bu kadar gun daha listede kalir
+
+    # --- DASHBOARD KPI ---
+    KPI_YAKLASAN_GUN: int = 7                 # "Yaklasan ziyaret": bugunden itibaren bu kadar gun icinde
+    KPI_UZLASTIRMA_SAATI: int = 3             # Gece uzlastirmasi (tam sayim) her gun bu saatte
+
+    # --- BILDIRIM (WEBSOCKET) ---
+    WS_MAKS_BAGLANTI: int = 10000             # Worker basina en fazla acik baglanti (asilirsa 1013 ile kapatilir)
+    WS_KUYRUK_BOYUTU: int = 100               # Baglanti basina bekleyen mesaj; dolunca en eskisi duser
+    WS_GONDERIM_ZAMAN_ASIMI_SN: float = 10.0  # Bu surede yazilamayan mesaj -> istemci okumuyor, baglanti kapatilir
+    WS_GIRIS_SURESI_SN: float = 10.0          # Token header'da yoksa ilk mesajla bu surede gelmeli
+    WS_PG_YAYIN: bool = True                  # Worker'lar arasi dagitim NOTIFY ile (PG_DINLEYICI_AKTIF gerekir)
+
+    # --- MOBIL SENKRONIZASYON ---
+    SYNC_SAYFA_BAYT: int = 512 * 1024         # Bir sayfadaki kayitlarin (sikistirmadan once) yaklasik boyutu
+    SYNC_SAYFA_BAYT_EN_FAZLA: int = 4 * 1024 * 1024  # Istemcinin isteyebilecegi en buyuk sayfa
+    SYNC_TABLO_SATIR: int = 2000              # Sayfa icin tablo basina en fazla okunan satir
+    SYNC_SIKISTIRMA_ESIGI: int = 1024         # Bundan kucuk yanitlar gzip'lenmez
+    SYNC_GZIP_SEVIYESI: int = 6               # 1 (hizli) - 9 (kucuk)
+    SYNC_PUSH_EN_FAZLA: int = 100             # Tek push isteginde en fazla degisiklik
+    SYNC_ISLEM_SAKLAMA_GUN: int = 30          # Push tekrar korumasi (islem_id) bu kadar gun saklanir
 
     @property
     def DATABASE_URL(self) -> str:
@@ -59,7 +134,30 @@ class Settings(BaseSettings):
     # --- GÜVENLİK ---
     SECRET_KEY: str = "gizli-anahtar-bunu-uretimde-degistir"  # JWT için gizli anahtar
     ALGORITHM: str = "HS256"                   # JWT şifreleme algoritması
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60      # Token süresi (dakika)
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60      # Access token süresi (dakika); istemci refresh'e gecince kisaltilir
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30        # Refresh token süresi (gün)
+    BCRYPT_ROUNDS: int = 12                    # bcrypt maliyeti (her +1 sureyi ikiye katlar)
+    BCRYPT_MAX_WORKERS: int = 4                # Ayni anda en fazla kac sifre hash'i hesaplanir
+
+    # --- GIRIS SINIRLAMA (token bucket) ---
+    GIRIS_IP_KAPASITE: int = 30                # Bir IP'den art arda yapilabilecek giris denemesi
+    GIRIS_IP_DAKIKA_BASI: float = 30           # IP basina dakikada geri dolan deneme hakki
+    GIRIS_EMAIL_KAPASITE: int = 5              # Bir email icin art arda giris denemesi
+    GIRIS_EMAIL_DAKIKA_BASI: float = 3         # Email basina dakikada geri dolan deneme hakki
+    PROXY_ARKASINDA: bool = False              # True: istemci IP'si X-Forwarded-For'dan okunur (Nginx arkasi)
+
+    # --- LOGLAMA ---
+    LOG_FORMAT: str = "metin"                  # "metin" (okunabilir) veya "json" (log toplayicilar icin)
+    LOG_KUYRUK_BOYUTU: int = 10000             # Yazilmayi bekleyen en fazla log kaydi
+
+    # --- METRIKLER ---
+    METRIK_TOKEN: str = ""                     # Doluysa /metrics "Authorization: Bearer <token>" ister
+    METRIK_TENANT_ETIKETI: bool = True         # Istek surelerini tenant bazinda da ayir
+
+    # --- PROFILLEME ---
+    PROFIL_AKTIF: bool = False                 # True: sistem_admin "X-Profile: 1" veya "?_profil=1" ile istek profilleyebilsin
+    PROFIL_ARALIK_MS: float = 5.0              # Ornekleme araligi (kucuk = daha hassas, daha cok yuk)
+    PROFIL_SAKLAMA_ADET: int = 200             # logs/profiller altinda saklanan en fazla profil
 
     # --- AYAR DOSYASI ---
     class Config:
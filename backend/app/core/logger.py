@@ -17,47 +17,171 @@
 # WARNING -> Dikkat edilmesi gereken durum ("Token suresi dolmak uzere")
 # ERROR   -> Hata olustu ama sistem calismaya devam ediyor
 # CRITICAL-> Ciddi hata, sistem durabilir
+#
+# 📚 DERS: Kuyruklu (asenkron) loglama
+# Diske yazmak ve dosya dondurme (rotation) yavas islemlerdir.
+# Bunlari istegi isleyen kodun icinde yaparsak event loop bekler.
+# Bu yuzden:
+#
+#   logger.info(...) -> KuyrukHandler -> [ kuyruk ] -> Yazici thread -> Konsol / Dosyalar
+#
+# logger.info() sadece kaydi kuyruga birakip hemen doner.
+# Asil yazma isini tek bir arka plan thread'i (QueueListener) yapar.
+# Kuyruk sinirlidir: dolarsa yeni kayitlar DUSURULUR ve sayilir,
+# uygulama asla log yuzunden beklemez.
 
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from app.core.config import settings
 
 
-def setup_logger(name: str = "osgb") -> logging.Logger:
+# LogRecord'un kendi alanlari (JSON'a "ekstra" olarak yazilmayacaklar)
+_STANDART_ALANLAR = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message"}
+
+
+class JsonFormatter(logging.Formatter):
     """
-    📚 DERS: Logger ayarlarini yapar.
+    📚 DERS: Her log kaydini tek satirlik JSON olarak yazar.
 
-    RotatingFileHandler kullaniyoruz:
-    - Dosya 5MB'i gecince yeni dosya olusturur
-    - En fazla 10 dosya saklar (5MB x 10 = 50MB max)
-    - Eski dosyalar otomatik silinir
-    - Boylece disk dolmaz!
+    Ornek cikti:
+    {"zaman": "2026-02-07T19:30:45.123", "seviye": "INFO", "logger": "osgb.api", "mesaj": "..."}
+
+    Log toplayicilar (Loki, ELK, Vector...) bu satirlari regex ile
+    parcalamadan dogrudan alan alan okuyabilir.
+    logger.info("...", extra={"sure_ms": 12}) ile eklenen alanlar da JSON'a girer.
     """
-    logger = logging.getLogger(name)
 
-    # Zaten ayarlanmissa tekrar ayarlama
-    if logger.handlers:
-        return logger
+    def format(self, record: logging.LogRecord) -> str:
+        kayit = {
+            "zaman": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "seviye": record.levelname,
+            "logger": record.name,
+            "mesaj": record.getMessage(),
+        }
+        for alan, deger in record.__dict__.items():
+            if alan not in _STANDART_ALANLAR and not alan.startswith("_"):
+                kayit[alan] = deger
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            kayit["hata"] = record.exc_text
+        return json.dumps(kayit, ensure_ascii=False, default=str)
 
-    logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
 
-    # ---- LOG FORMATI ----
+class KuyrukHandler(QueueHandler):
+    """
+    📚 DERS: Log kaydini sinirli kuyruga birakan handler.
+
+    Kuyruk doluysa beklemez; kaydi dusurur ve dusurulen_sayisi'ni artirir.
+    Boylece disk yavaslasa bile API istekleri yavaslamaz.
+
+    Yazici thread durdurulduktan sonra (kapanis, atexit) kuyrugu okuyan
+    kimse kalmaz; bu durumda kayitlar dogrudan handler'lara yazilir.
+    """
+
+    def __init__(self, kuyruk: queue.Queue):
+        super().__init__(kuyruk)
+        self.dusurulen_sayisi = 0
+        self._kilit = threading.Lock()
+        # Yazici yokken kullanilacak handler'lar (None = kuyruga yaz)
+        self.dogrudan: list | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        dogrudan = self.dogrudan
+        if dogrudan is None:
+            super().emit(record)
+            return
+        for handler in dogrudan:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Mesaji simdi olustur (argumanlar baska thread'de degisebilir),
+        # hata detayini ise ayri tut ki JSON formatinda "hata" alanina yazilsin
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._kilit:
+                self.dusurulen_sayisi += 1
+
+
+class _YaziciThread(QueueListener):
+    """QueueListener: kapanista kuyruk dolu olsa bile bitis isaretini birakabilsin."""
+
+    def start(self):
+        self._thread = threading.Thread(target=self._monitor, name="osgb-log-yazici", daemon=True)
+        self._thread.start()
+
+    def enqueue_sentinel(self):
+        # put_nowait yerine bekleyerek koy: kuyruktaki kayitlar yazilsin, sonra dursun.
+        # Yazici calistikca kuyrukta yer acilir; isaret konana kadar beklenir.
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(self._sentinel, timeout=1)
+                return
+            except queue.Full:
+                continue
+        # Yazici thread olmus: kuyruktakileri burada (senkron) yaz
+        self._kalanlari_yaz()
+
+    def _kalanlari_yaz(self):
+        while True:
+            try:
+                kayit = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if kayit is not self._sentinel:
+                self.handle(kayit)
+
+
+def _formatter_olustur() -> logging.Formatter:
+    """LOG_FORMAT ayarina gore metin veya JSON formatter dondurur."""
+    if settings.LOG_FORMAT.lower() == "json":
+        return JsonFormatter()
     # Ornek cikti:
     # 2026-02-07 19:30:45 | INFO | auth_service | Kullanici giris yapti: admin@osgbyazilim.com
-    formatter = logging.Formatter(
+    return logging.Formatter(
         "%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
+
+def _handlerlari_olustur() -> list:
+    """
+    📚 DERS: Asil yazma isini yapan handler'lar.
+    Bunlar SADECE yazici thread'de calisir.
+
+    RotatingFileHandler kullaniyoruz:
+    - Dosya 5MB'i gecince yeni dosya olusturur
+    - En fazla 10 dosya saklar (5MB x 10 = 50MB max)
+    - Eski dosyalar otomatik silinir
+    - Boylece disk dolmaz!
+    """
+    formatter = _formatter_olustur()
+
     # ---- KONSOL HANDLER ----
     # Terminalde gorunsun (gelistirme sirasinda faydali)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
-    logger.addHandler(console_handler)
 
     # ---- DOSYA HANDLER ----
     # Log dosyasina yaz (sunucu kapansa bile kayitlar kalir)
@@ -73,7 +197,6 @@ def setup_logger(name: str = "osgb") -> logging.Logger:
     )
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
-    logger.addHandler(file_handler)
 
     # Hata log dosyasi (sadece hatalar)
     error_handler = RotatingFileHandler(
@@ -84,8 +207,88 @@ def setup_logger(name: str = "osgb") -> logging.Logger:
     )
     error_handler.setFormatter(formatter)
     error_handler.setLevel(logging.ERROR)
-    logger.addHandler(error_handler)
 
+    return [console_handler, file_handler, error_handler]
+
+
+# ---- ORTAK KUYRUK VE YAZICI ----
+# Tum osgb.* logger'lari ayni kuyrugu ve ayni yazici thread'i paylasir
+_kuyruk: queue.Queue = queue.Queue(maxsize=settings.LOG_KUYRUK_BOYUTU)
+_kuyruk_handler = KuyrukHandler(_kuyruk)
+_yazici = None
+_yazici_kilit = threading.Lock()
+
+
+def _yazici_baslat() -> None:
+    """Yazici thread'i (henuz calismiyorsa) baslatir."""
+    global _yazici
+    with _yazici_kilit:
+        if _yazici is not None:
+            return
+        _yazici = _YaziciThread(_kuyruk, *_handlerlari_olustur(), respect_handler_level=True)
+        _yazici.start()
+        _kuyruk_handler.dogrudan = None
+
+
+def log_kapat() -> None:
+    """
+    📚 DERS: Uygulama kapanirken cagrilir.
+    Kuyrukta bekleyen kayitlar diske yazilir, yazici thread durur.
+    Cagrilmazsa son loglar kaybolabilir!
+
+    Kapanistan sonra gelen kayitlar (lifespan sonu, atexit) kaybolmasin diye
+    ayni handler'lar senkron yazmaya devam eder; dosyalari logging.shutdown kapatir.
+    """
+    global _yazici
+    with _yazici_kilit:
+        if _yazici is None:
+            return
+        # Once senkron yazmaya gec, sonra kuyrugu bosalt:
+        # arada gelen kayit kuyrukta sahipsiz kalmasin
+        _kuyruk_handler.dogrudan = list(_yazici.handlers)
+        # stop: bitis isareti konana kadar bekler, sonra thread'i join eder
+        _yazici.stop()
+        for handler in _yazici.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass     # Akis zaten kapanmis (logging.shutdown da boyle yapar)
+        _yazici = None
+
+
+def log_istatistikleri() -> dict:
+    """Kuyruk durumu: bekleyen kayit sayisi, kapasite ve dusurulen kayitlar."""
+    return {
+        "bekleyen": _kuyruk.qsize(),
+        "kapasite": _kuyruk.maxsize,
+        "dusurulen": _kuyruk_handler.dusurulen_sayisi,
+    }
+
+
+atexit.register(log_kapat)
+
+
+def setup_logger(name: str = "osgb") -> logging.Logger:
+    """
+    📚 DERS: Logger ayarlarini yapar.
+
+    Logger'a dogrudan dosya/konsol handler'i EKLEMIYORUZ.
+    Sadece ortak KuyrukHandler'i ekliyoruz; yazma isi arka planda yapilir.
+    """
+    logger = logging.getLogger(name)
+
+    # Zaten ayarlanmissa tekrar ayarlama
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+    logger.addHandler(_kuyruk_handler)
+
+    # Alt logger'lar (osgb.auth) ust logger'a (osgb) da iletmesin,
+    # yoksa ayni satir iki kez yazilir
+    logger.propagate = False
+
+    _yazici_baslat()
     return logger
 
 
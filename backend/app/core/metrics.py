@@ -0,0 +1,288 @@
+# =============================================
+# METRIKLER (Prometheus formati)
+# Istek sureleri, DB kullanimi, havuz durumu...
+# =============================================
+#
+# 📚 DERS: Log ile metrik farki
+# Log: "Su an su oldu" (tek tek olaylar, metin)
+# Metrik: "Son 5 dakikada kac istek geldi, %95'i kac ms surdu?" (sayilar)
+#
+# Prometheus belirli araliklarla GET /metrics adresini okur (scrape)
+# ve sayilari zaman serisi olarak saklar. Grafana ile grafik cizilir.
+#
+# Uc metrik tipi kullaniyoruz:
+# - Sayac (counter):     Sadece artar. "Toplam yuklenen bayt"
+# - Gosterge (gauge):    Artar/azalir. "Havuzdaki acik baglanti sayisi"
+# - Histogram:           Dagilim. "Istek suresi 0.1s'den kisa olanlar kac tane?"
+#
+# ONEMLI: Etiket (label) degerleri SINIRLI olmali!
+# route="/api/v1/firma/{firma_id}" dogru  -> tek seri
+# route="/api/v1/firma/5"          yanlis -> her ID icin ayri seri (hafiza patlar)
+#
+# Not: Her worker process kendi metriklerini tutar. Gunicorn ile birden
+# fazla worker calisiyorsa Prometheus her worker'i ayri hedef olarak okur.
+
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Istek sureleri icin varsayilan kova sinirlari (saniye)
+SURE_KOVALARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _etiket_kacis(deger: str) -> str:
+    """Prometheus etiket degerindeki ozel karakterleri kacir."""
+    return str(deger).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiket_yaz(adlar: Tuple[str, ...], degerler: Tuple, ekstra: str = "") -> str:
+    parcalar = [f'{ad}="{_etiket_kacis(deger)}"' for ad, deger in zip(adlar, degerler)]
+    if ekstra:
+        parcalar.append(ekstra)
+    return "{" + ",".join(parcalar) + "}" if parcalar else ""
+
+
+def _sayi_yaz(deger: float) -> str:
+    if deger == float("inf"):
+        return "+Inf"
+    if float(deger).is_integer():
+        return str(int(deger))
+    return repr(float(deger))
+
+
+class _Metrik:
+    """Tum metrik tiplerinin ortak kismi: ad, aciklama, etiket adlari."""
+    tip = ""
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Iterable[str] = ()):
+        self.ad = ad
+        self.aciklama = aciklama
+        self.etiketler = tuple(etiketler)
+        self._kilit = threading.Lock()
+        kayit_defteri.kaydet(self)
+
+    def _anahtar(self, etiketler: dict) -> Tuple:
+        return tuple(etiketler.get(ad, "") for ad in self.etiketler)
+
+    def satirlar(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Sayac(_Metrik):
+    """Sadece artan sayac. Ornek: osgb_yukleme_bayt_toplam"""
+    tip = "counter"
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Iterable[str] = ()):
+        super().__init__(ad, aciklama, etiketler)
+        self._degerler: Dict[Tuple, float] = {}
+
+    def artir(self, miktar: float = 1, **etiketler) -> None:
+        anahtar = self._anahtar(etiketler)
+        with self._kilit:
+            self._degerler[anahtar] = self._degerler.get(anahtar, 0) + miktar
+
+    def satirlar(self) -> List[str]:
+        with self._kilit:
+            kopya = list(self._degerler.items())
+        return [f"{self.ad}{_etiket_yaz(self.etiketler, k)} {_sayi_yaz(v)}" for k, v in kopya]
+
+
+class Gosterge(_Metrik):
+    """
+    Artip azalabilen deger.
+
+    Iki kullanim:
+    - gosterge.ayarla(5, veritabani="osgb_demo")
+    - toplayici fonksiyonu: her /metrics okumasinda anlik deger hesaplanir
+      (ornek: havuz durumu). Fonksiyon [(etiket_degerleri, deger), ...] dondurur.
+    """
+    tip = "gauge"
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Iterable[str] = (),
+                 toplayici: Optional[Callable[[], Iterable[Tuple[Tuple, float]]]] = None):
+        super().__init__(ad, aciklama, etiketler)
+        self._degerler: Dict[Tuple, float] = {}
+        self._toplayici = toplayici
+
+    def ayarla(self, deger: float, **etiketler) -> None:
+        with self._kilit:
+            self._degerler[self._anahtar(etiketler)] = deger
+
+    def satirlar(self) -> List[str]:
+        if self._toplayici is not None:
+            kopya = list(self._toplayici())
+        else:
+            with self._kilit:
+                kopya = list(self._degerler.items())
+        return [f"{self.ad}{_etiket_yaz(self.etiketler, tuple(k))} {_sayi_yaz(v)}" for k, v in kopya]
+
+
+class Histogram(_Metrik):
+    """
+    📚 DERS: Dagilim metrigi.
+
+    Her gozlem, degerinin dustugu kovayi bir artirir. Prometheus
+    kovalardan p50/p95/p99 hesaplar (histogram_quantile).
+    """
+    tip = "histogram"
+
+    def __init__(self, ad: str, aciklama: str, etiketler: Iterable[str] = (),
+                 kovalar: Tuple[float, ...] = SURE_KOVALARI):
+        super().__init__(ad, aciklama, etiketler)
+        self.kovalar = tuple(sorted(kovalar))
+        # anahtar -> [kova sayilari..., +Inf sayisi], toplam
+        self._seriler: Dict[Tuple, list] = {}
+
+    def gozlemle(self, deger: float, **etiketler) -> None:
+        anahtar = self._anahtar(etiketler)
+        indeks = bisect_left(self.kovalar, deger)
+        with self._kilit:
+            seri = self._seriler.get(anahtar)
+            if seri is None:
+                seri = self._seriler[anahtar] = [[0] * (len(self.kovalar) + 1), 0.0]
+            seri[0][indeks] += 1
+            seri[1] += deger
+
+    @contextmanager
+    def zamanla(self, **etiketler):
+        """with histogram.zamanla(islem="export"): ...  -> gecen sureyi gozlemler."""
+        baslangic = perf_counter()
+        try:
+            yield
+        finally:
+            self.gozlemle(perf_counter() - baslangic, **etiketler)
+
+    def satirlar(self) -> List[str]:
+        with self._kilit:
+            kopya = [(k, list(v[0]), v[1]) for k, v in self._seriler.items()]
+        satirlar = []
+        for anahtar, sayilar, toplam in kopya:
+            birikimli = 0
+            for sinir, sayi in zip(self.kovalar + (float("inf"),), sayilar):
+                birikimli += sayi
+                etiket = _etiket_yaz(self.etiketler, anahtar, f'le="{_sayi_yaz(sinir)}"')
+                satirlar.append(f"{self.ad}_bucket{etiket} {birikimli}")
+            etiket = _etiket_yaz(self.etiketler, anahtar)
+            satirlar.append(f"{self.ad}_sum{etiket} {_sayi_yaz(toplam)}")
+            satirlar.append(f"{self.ad}_count{etiket} {birikimli}")
+        return satirlar
+
+
+class _KayitDefteri:
+    """Tanimlanan tum metriklerin listesi. /metrics bunu yazdirir."""
+
+    def __init__(self):
+        self._metrikler: List[_Metrik] = []
+
+    def kaydet(self, metrik: _Metrik) -> None:
+        self._metrikler.append(metrik)
+
+    def yaz(self) -> str:
+        """Prometheus text exposition formatinda tum metrikler."""
+        cikti = []
+        for metrik in self._metrikler:
+            cikti.append(f"# HELP {metrik.ad} {metrik.aciklama}")
+            cikti.append(f"# TYPE {metrik.ad} {metrik.tip}")
+            cikti.extend(metrik.satirlar())
+        return "\n".join(cikti) + "\n"
+
+
+kayit_defteri = _KayitDefteri()
+
+
+# =============================================
+# UYGULAMA METRIKLERI
+# =============================================
+
+# ---- HTTP ISTEKLERI ----
+ISTEK_SURESI = Histogram(
+    "osgb_http_istek_suresi_saniye",
+    "HTTP istek suresi (route sablonu ve tenant bazinda)",
+    ("metod", "route", "durum", "tenant"),
+)
+
+# ---- VERITABANI (istek basina) ----
+ISTEK_DB_SORGU = Histogram(
+    "osgb_http_istek_db_sorgu_sayisi",
+    "Bir HTTP isteginde calisan SQL sorgusu sayisi",
+    ("route",),
+    kovalar=(1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+ISTEK_DB_SURE = Histogram(
+    "osgb_http_istek_db_suresi_saniye",
+    "Bir HTTP isteginde SQL sorgularinda gecen toplam sure",
+    ("route",),
+)
+
+# ---- YUKLEMELER ----
+YUKLEME_BAYT = Sayac(
+    "osgb_yukleme_bayt_toplam",
+    "multipart/form-data ile yuklenen toplam bayt",
+    ("route",),
+)
+
+# ---- EXCEL ISLERI ----
+EXCEL_IS_SURESI = Histogram(
+    "osgb_excel_is_suresi_saniye",
+    "Excel export/sablon/import islem suresi",
+    ("islem", "sayfa"),
+)
+
+
+# ---- ANLIK DURUM (her okumada hesaplanir) ----
+def _havuz_toplayici(alan: str):
+    def topla():
+        from app.core.database import havuz_durumlari
+        return [((db_adi,), durum[alan]) for db_adi, durum in havuz_durumlari().items()]
+    return topla
+
+
+def _log_kuyrugu_toplayici(alan: str):
+    def topla():
+        from app.core.logger import log_istatistikleri
+        return [((), log_istatistikleri()[alan])]
+    return topla
+
+
+def _bildirim_toplayici(alan: str):
+    def topla():
+        from app.core.bildirim import bildirim_merkezi
+        return [((), bildirim_merkezi.istatistik()[alan])]
+    return topla
+
+
+HAVUZ_KULLANIMDA = Gosterge(
+    "osgb_db_havuz_kullanimda", "Havuzdan alinmis (kullanimda) baglanti sayisi",
+    ("veritabani",), toplayici=_havuz_toplayici("kullanimda"),
+)
+HAVUZ_BOSTA = Gosterge(
+    "osgb_db_havuz_bosta", "Havuzda bekleyen (bosta) baglanti sayisi",
+    ("veritabani",), toplayici=_havuz_toplayici("bosta"),
+)
+HAVUZ_TASMA = Gosterge(
+    "osgb_db_havuz_tasma", "Havuz boyutunun uzerinde acilmis (overflow) baglanti sayisi",
+    ("veritabani",), toplayici=_havuz_toplayici("tasma"),
+)
+LOG_KUYRUGU = Gosterge(
+    "osgb_log_kuyrugu_bekleyen", "Yazilmayi bekleyen log kaydi sayisi",
+    toplayici=_log_kuyrugu_toplayici("bekleyen"),
+)
+LOG_DUSURULEN = Gosterge(
+    "osgb_log_dusurulen_kayit", "Kuyruk dolu oldugu icin dusurulen log kaydi sayisi (baslangictan beri)",
+    toplayici=_log_kuyrugu_toplayici("dusurulen"),
+)
+WS_BAGLANTI = Gosterge(
+    "osgb_ws_baglanti", "Acik WebSocket bildirim baglantisi sayisi (bu worker)",
+    toplayici=_bildirim_toplayici("baglanti"),
+)
+WS_DUSEN_MESAJ = Gosterge(
+    "osgb_ws_dusen_mesaj", "Istemci kuyrugu dolu oldugu icin dusen bildirim sayisi (baslangictan beri)",
+    toplayici=_bildirim_toplayici("dusen_mesaj"),
+)
+WS_YAVAS_KAPATILAN = Gosterge(
+    "osgb_ws_yavas_kapatilan", "Mesajlari okumadigi icin kapatilan WebSocket baglantisi (baslangictan beri)",
+    toplayici=_bildirim_toplayici("yavas_kapatilan"),
+)
@@ -0,0 +1,145 @@
+# =============================================
+# POSTGRESQL LISTEN/NOTIFY DINLEYICISI
+# Veritabanindaki degisikliklerden aninda haberdar olmak
+# =============================================
+#
+# 📚 DERS: LISTEN/NOTIFY nedir?
+# PostgreSQL'in yerlesik mesajlasma sistemi:
+#   Bir baglanti:  LISTEN tenant_degisti;
+#   Baska biri:    SELECT pg_notify('tenant_degisti', '5');
+#   -> Dinleyen baglantiya ("tenant_degisti", "5") bildirimi gelir.
+# Tetikleyici (trigger) ile tablo degisince otomatik bildirim gonderilebilir.
+#
+# Boylece bellekteki onbellegi (cache) "5 dakikada bir yenile" yerine
+# DEGISTIGI ANDA yenileyebiliriz; arada DB'ye hic sorgu gitmez.
+#
+# Kullanim:
+#   pg_dinleyici.abone_ol("tenant_degisti", bildirim_fonk, yeniden_baglaninca_fonk)
+#   pg_dinleyici.baslat()     # lifespan'de
+#   pg_dinleyici.durdur()     # kapanista
+#
+# ONEMLI: Baglanti koparsa aradaki bildirimler KAYBOLUR. Bu yuzden
+# yeniden baglaninca her abonenin "yeniden_baglaninca" fonksiyonu
+# cagrilir (ornek: onbellegi bastan yukle).
+#
+# Geri cagirma fonksiyonlari dinleyici THREAD'inde calisir: hizli ve
+# thread-safe olmali.
+
+import select
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+from app.core.config import settings
+from app.core.logger import db_logger
+
+
+Bildirim = Callable[[str], None]
+YenidenBaglanti = Optional[Callable[[], None]]
+
+
+class PgDinleyici:
+    """Tek bir ayrilmis baglanti uzerinden birden fazla kanali dinler."""
+
+    def __init__(self, dsn: str, bekleme_sn: float = 5.0):
+        self.dsn = dsn
+        self.bekleme_sn = bekleme_sn
+        self._aboneler: Dict[str, List[Tuple[Bildirim, YenidenBaglanti]]] = {}
+        self._dur = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._baglanti = None
+        self.bagli = False
+
+    def abone_ol(self, kanal: str, bildirim: Bildirim, yeniden_baglaninca: YenidenBaglanti = None) -> None:
+        """Kanal icin geri cagirma ekler. baslat()'tan ONCE cagrilmali."""
+        aboneler = self._aboneler.setdefault(kanal, [])
+        if (bildirim, yeniden_baglaninca) not in aboneler:
+            aboneler.append((bildirim, yeniden_baglaninca))
+
+    def baslat(self) -> None:
+        if not self._aboneler or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._dur.clear()
+        self._thread = threading.Thread(target=self._calistir, name="pg-dinleyici", daemon=True)
+        self._thread.start()
+
+    def durdur(self) -> None:
+        self._dur.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.bekleme_sn + 1)
+            self._thread = None
+
+    # ---- BAGLANTI ----
+    def _baglan(self):
+        baglanti = psycopg2.connect(self.dsn)
+        # LISTEN transaction icinde kalirsa bildirimler commit'e kadar gelmez
+        baglanti.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with baglanti.cursor() as cur:
+            for kanal in self._aboneler:
+                cur.execute(f'LISTEN "{kanal}"')
+        return baglanti
+
+    def _kapat(self) -> None:
+        if self._baglanti is not None:
+            try:
+                self._baglanti.close()
+            except Exception:
+                pass
+        self._baglanti = None
+        self.bagli = False
+
+    def _yeniden_baglaninca(self) -> None:
+        for aboneler in self._aboneler.values():
+            for _, geri_cagir in aboneler:
+                if geri_cagir is not None:
+                    try:
+                        geri_cagir()
+                    except Exception as e:
+                        db_logger.error(f"pg dinleyici: yeniden yukleme basarisiz: {e}")
+
+    def _dagit(self, kanal: str, veri: str) -> None:
+        for bildirim, _ in self._aboneler.get(kanal, ()):
+            try:
+                bildirim(veri)
+            except Exception as e:
+                db_logger.error(f"pg dinleyici: '{kanal}' bildirimi islenemedi ({veri!r}): {e}")
+
+    # ---- DONGU ----
+    def _calistir(self) -> None:
+        bekleme = 1.0
+        while not self._dur.is_set():
+            if self._baglanti is None:
+                try:
+                    self._baglanti = self._baglan()
+                except Exception as e:
+                    db_logger.warning(f"pg dinleyici baglanamadi, {bekleme:.0f}s sonra tekrar: {e}")
+                    self._dur.wait(bekleme)
+                    bekleme = min(bekleme * 2, 60.0)
+                    continue
+                self.bagli = True
+                bekleme = 1.0
+                db_logger.info(f"pg dinleyici bagli: {', '.join(self._aboneler)}")
+                # LISTEN'den once (baglanti yokken) olan degisiklikler icin
+                # tam yenileme; ilk baglantida da: lifespan yuklemesiyle
+                # LISTEN arasinda degisiklik olmus olabilir
+                self._yeniden_baglaninca()
+
+            try:
+                hazir, _, _ = select.select([self._baglanti], [], [], self.bekleme_sn)
+                if not hazir:
+                    continue
+                self._baglanti.poll()
+                while self._baglanti.notifies:
+                    bildirim = self._baglanti.notifies.pop(0)
+                    self._dagit(bildirim.channel, bildirim.payload)
+            except Exception as e:
+                if not self._dur.is_set():
+                    db_logger.warning(f"pg dinleyici baglantisi koptu: {e}")
+                self._kapat()
+        self._kapat()
+
+
+# Uygulama genelinde tek dinleyici (master DB)
+pg_dinleyici = PgDinleyici(settings.DATABASE_URL)
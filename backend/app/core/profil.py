@@ -0,0 +1,252 @@
+# =============================================
+# ISTEK PROFILLEME (istatistiksel ornekleme)
+# "Bu istek 4 saniye surdu, zaman nereye gitti?"
+# =============================================
+#
+# 📚 DERS: Ornekleyici (sampling) profiler nedir?
+# Her fonksiyon cagrisini olcmek (cProfile) kodu 2-3 kat yavaslatir.
+# Ornekleyici ise ayri bir thread'den birkac milisaniyede bir
+# "su an hangi fonksiyondayiz?" diye bakar (sys._current_frames()).
+# Bir fonksiyon ornekleri ne kadar cok gorulduyse o kadar uzun calismistir.
+# Istek kodunun kendisine hicbir sey eklenmez.
+#
+# 📚 DERS: Sadece BU istegin yiginlari
+# Sunucuda ayni anda baska istekler de calisir. Bir ornegi bu istege
+# yazmak icin yiginda su iki isaretten biri aranir:
+# - Event loop thread'i: middleware'in kendi frame'i yiginda mi?
+#   (Calisan coroutine'ler await zinciri boyunca birbirine baglidir.)
+# - Thread havuzu (senkron endpoint/dependency): yiginda bu istegin
+#   eslestigi route'un endpoint'i ya da dependency fonksiyonlarindan biri
+#   var mi? Route, router eslestirince scope["route"] icine konur.
+# Diger thread'lerin frame'lerinden sadece f_code okunur; f_locals'a
+# dokunulmaz (calisan bir frame'in yerel degiskenlerini baska thread'den
+# okumak o frame'i degistirir ve guvenli degildir).
+# Bedeli: ayni route'a es zamanli gelen istekler ayni profile karisabilir,
+# async endpoint'in kendisi run_in_threadpool'a verdigi is de sayilmaz.
+#
+# 📚 DERS: Cikti formati (folded stacks)
+# Her satir bir yigin ve kac kez goruldugu:
+#   [thread-havuzu];isyeri_excel_export (app/api/v1/isyeri.py:301);save (openpyxl/...) 42
+# Bu format flamegraph.pl, speedscope.app ve inferno tarafindan dogrudan okunur.
+#
+# Profil dosyalari logs/profiller/ altina yazilir:
+#   <profil_id>.folded -> flamegraph icin yiginlar
+#   <profil_id>.json   -> ozet (sure, CPU, DB, serilestirme kirilimi)
+
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+
+
+_BACKEND_DIZINI = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFIL_DIZINI = os.path.join(_BACKEND_DIZINI, "logs", "profiller")
+
+# profil_id sadece bu karakterlerden olusabilir (dosya yolu saldirilarina karsi)
+PROFIL_ID_DESENI = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$")
+
+# ---- FRAME ETIKETLERI ----
+# En uzun kok once denensin: site-packages, sys.path'teki digerlerinden once eslesir
+_KOK_DIZINLER = sorted(
+    {os.path.abspath(p) for p in sys.path if p and os.path.isdir(p)} | {_BACKEND_DIZINI},
+    key=len, reverse=True,
+)
+
+
+@lru_cache(maxsize=4096)
+def _dosya_kisalt(dosya: str) -> str:
+    """/.../site-packages/sqlalchemy/orm/query.py -> sqlalchemy/orm/query.py"""
+    for kok in _KOK_DIZINLER:
+        if dosya.startswith(kok + os.sep):
+            return dosya[len(kok) + 1:]
+    return dosya
+
+
+@lru_cache(maxsize=16384)
+def _etiket(kod) -> str:
+    # Ayni fonksiyonun farkli satirlari tek kutuda toplansin diye co_firstlineno
+    return f"{kod.co_name} ({_dosya_kisalt(kod.co_filename)}:{kod.co_firstlineno})".replace(";", ",")
+
+
+# ---- ORNEK SINIFLANDIRMA ----
+# Yigindaki EN DERIN (en ic) eslesen kategori kazanir:
+# jsonable_encoder icinden bir SQL lazy-load calisiyorsa ornek "db" sayilir.
+_DB_DOSYALARI = (os.sep + "sqlalchemy" + os.sep, os.sep + "psycopg2" + os.sep)
+_SERILESTIRME_FONKSIYONLARI = {"serialize_response", "jsonable_encoder", "render"}
+_EXCEL_DOSYALARI = (os.sep + "openpyxl" + os.sep,)
+
+
+def _kategori(kod) -> Optional[str]:
+    dosya = kod.co_filename
+    if any(parca in dosya for parca in _DB_DOSYALARI):
+        return "db"
+    if any(parca in dosya for parca in _EXCEL_DOSYALARI):
+        return "excel"
+    if kod.co_name in _SERILESTIRME_FONKSIYONLARI:
+        return "serilestirme"
+    return None
+
+
+def _rota_kodlari(route):
+    """APIRoute'un endpoint'i ve (ic ice) dependency'lerinin kod nesneleri."""
+    dependant = getattr(route, "dependant", None)
+    bekleyen = [dependant] if dependant is not None else []
+    fonksiyonlar = [getattr(route, "endpoint", None)]
+    while bekleyen:
+        dep = bekleyen.pop()
+        fonksiyonlar.append(dep.call)
+        bekleyen.extend(dep.dependencies)
+    for fonksiyon in fonksiyonlar:
+        # rol_gerekli gibi __call__'lu nesneler ve functools.wraps sarmalari
+        fonksiyon = inspect.unwrap(fonksiyon) if callable(fonksiyon) else None
+        kod = getattr(fonksiyon, "__code__", None) or getattr(
+            getattr(fonksiyon, "__call__", None), "__code__", None)
+        if kod is not None:
+            yield kod
+
+
+class Ornekleyici(threading.Thread):
+    """
+    📚 DERS: Tek bir istegi ornekleyen arka plan thread'i.
+
+    Kullanim (middleware icinde):
+        ornekleyici = Ornekleyici(sys._getframe(), scope)
+        ornekleyici.start()
+        ... istek islenir ...
+        await run_in_threadpool(ornekleyici.durdur)   # join event loop'u bekletmesin
+        ornekleyici.yiginlar  -> Counter({"a;b;c": 12, ...})
+    """
+
+    def __init__(self, hedef_cerceve, scope: dict, aralik_ms: float = None):
+        super().__init__(name="osgb-profil", daemon=True)
+        self.hedef_cerceve = hedef_cerceve
+        self.scope = scope
+        self._route = None
+        self._rota_kodlari: frozenset = frozenset()
+        self.loop_thread = threading.get_ident()
+        self.aralik = (aralik_ms or settings.PROFIL_ARALIK_MS) / 1000
+        self.yiginlar: Counter = Counter()
+        self.kategoriler: Counter = Counter()
+        self.ornek_sayisi = 0
+        self.tur_sayisi = 0
+        self._dur = threading.Event()
+
+    def durdur(self) -> None:
+        self._dur.set()
+        self.join()
+
+    def _kodlari_guncelle(self) -> None:
+        """Route eslestiyse endpoint + dependency fonksiyonlarinin kod nesneleri."""
+        route = self.scope.get("route")
+        if route is None or route is self._route:
+            return
+        self._route = route
+        self._rota_kodlari = frozenset(_rota_kodlari(route))
+
+    def run(self) -> None:
+        kendi_id = threading.get_ident()
+        while not self._dur.wait(self.aralik):
+            self.tur_sayisi += 1
+            self._kodlari_guncelle()
+            for thread_id, cerceve in sys._current_frames().items():
+                # durdur() cagrildiysa istek bitmistir; join beklemesini ornekleme
+                if thread_id == kendi_id or self._dur.is_set():
+                    continue
+                self._ornekle(thread_id, cerceve)
+
+    def _ornekle(self, thread_id: int, cerceve) -> None:
+        # Yigini icten disa dogru yuru; bu istege ait oldugunu gosteren frame'de dur
+        yigin = []
+        kok = None
+        while cerceve is not None:
+            kod = cerceve.f_code
+            if thread_id == self.loop_thread:
+                if cerceve is self.hedef_cerceve:
+                    kok = "[event-loop]"
+                    break
+            elif kod in self._rota_kodlari:
+                # Endpoint/dependency frame'i de yigina girsin
+                yigin.append(kod)
+                kok = "[thread-havuzu]"
+                break
+            yigin.append(kod)
+            cerceve = cerceve.f_back
+
+        if kok is None or not yigin:
+            return
+
+        kategori = "uygulama"
+        for kod in yigin:
+            bulunan = _kategori(kod)
+            if bulunan is not None:
+                kategori = bulunan
+                break
+
+        self.ornek_sayisi += 1
+        self.kategoriler[kategori] += 1
+        self.yiginlar[";".join([kok] + [_etiket(k) for k in reversed(yigin)])] += 1
+
+
+# =============================================
+# PROFIL DOSYALARI
+# =============================================
+def yeni_profil_id() -> str:
+    """20261019-165238-1a2b3c4d (tarihe gore siralanabilir)"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def profil_kaydet(profil_id: str, ornekleyici: Ornekleyici, ozet: dict) -> None:
+    """Yiginlari ve ozeti diske yazar, eski profilleri temizler."""
+    os.makedirs(PROFIL_DIZINI, exist_ok=True)
+    yol = os.path.join(PROFIL_DIZINI, profil_id)
+
+    with open(yol + ".folded", "w", encoding="utf-8") as f:
+        for yigin, sayi in ornekleyici.yiginlar.most_common():
+            f.write(f"{yigin} {sayi}\n")
+    with open(yol + ".json", "w", encoding="utf-8") as f:
+        json.dump(ozet, f, ensure_ascii=False, indent=2)
+
+    _eski_profilleri_sil()
+
+
+def _eski_profilleri_sil() -> None:
+    """PROFIL_SAKLAMA_ADET'ten fazla profil varsa en eskileri sil."""
+    idler = sorted(profil_idleri())
+    fazla = len(idler) - settings.PROFIL_SAKLAMA_ADET
+    for profil_id in idler[:max(fazla, 0)]:
+        for uzanti in (".folded", ".json"):
+            try:
+                os.remove(os.path.join(PROFIL_DIZINI, profil_id + uzanti))
+            except FileNotFoundError:
+                pass
+
+
+def profil_idleri() -> list:
+    if not os.path.isdir(PROFIL_DIZINI):
+        return []
+    return [ad[:-5] for ad in os.listdir(PROFIL_DIZINI) if ad.endswith(".json")]
+
+
+def profil_dosyasi(profil_id: str, uzanti: str) -> Optional[str]:
+    """Gecerli bir profil_id icin dosya yolu; yoksa None."""
+    if not PROFIL_ID_DESENI.match(profil_id):
+        return None
+    yol = os.path.join(PROFIL_DIZINI, profil_id + uzanti)
+    return yol if os.path.isfile(yol) else None
+
+
+def profil_ozeti_oku(profil_id: str) -> Optional[dict]:
+    yol = profil_dosyasi(profil_id, ".json")
+    if yol is None:
+        return None
+    with open(yol, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,108 @@
+# =============================================
+# ISTEK SINIRLAMA (Rate Limit)
+# Token bucket: kisa patlamalara izin ver, surekli saldiriyi durdur
+# =============================================
+#
+# 📚 DERS: Token bucket (jeton kovasi) nasil calisir?
+# Her anahtarin (IP, email...) bir kovasi var. Kovada en fazla
+# "kapasite" kadar jeton olur ve jetonlar saniyede "hiz" kadar geri dolar.
+# Her deneme bir jeton harcar. Kova bossa istek REDDEDILIR ve bir
+# sonraki jetonun ne zaman dolacagi (Retry-After) soylenir.
+#
+#   kapasite=5, dakikada 3:
+#   - Ard arda 5 deneme serbest (yanlis yazilan sifre, vardiya basi)
+#   - Sonra her 20 saniyede 1 deneme (kaba kuvvet saldirisi icin cok yavas)
+#
+# Neden giriste ONEMLI?
+# Her giris denemesi ~250 ms bcrypt CPU'su demek. Sinir bcrypt'ten ONCE
+# kontrol edilir: reddedilen deneme neredeyse hic CPU harcamaz.
+#
+# Not: Sayaclar process icinde tutulur (Redis yok). Birden fazla worker
+# varsa her worker kendi kovasini tutar; efektif sinir worker sayisi ile carpilir.
+
+import threading
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """
+    Anahtar bazinda jeton kovasi.
+
+    sinirlayici = TokenBucket(kapasite=5, dakika_basi=3)
+    bekle = sinirlayici.al("ali@firma.com")
+    if bekle: -> reddet, bekle saniye sonra tekrar denesin
+    """
+
+    def __init__(self, kapasite: int, dakika_basi: float, en_fazla_anahtar: int = 100_000):
+        self.kapasite = float(kapasite)
+        self.hiz = dakika_basi / 60.0          # saniyede dolan jeton
+        self.en_fazla_anahtar = en_fazla_anahtar
+        # anahtar -> (jeton, son_guncelleme)
+        self._kovalar: Dict[str, Tuple[float, float]] = {}
+        self._kilit = threading.Lock()
+
+    def al(self, anahtar: str) -> float:
+        """
+        Bir jeton harcamayi dener.
+
+        Donus: 0 -> izin verildi, > 0 -> reddedildi, kac saniye sonra tekrar denenebilir.
+        """
+        simdi = monotonic()
+        with self._kilit:
+            jeton, son = self._kovalar.get(anahtar, (self.kapasite, simdi))
+            jeton = min(self.kapasite, jeton + (simdi - son) * self.hiz)
+            if jeton >= 1:
+                self._kovalar[anahtar] = (jeton - 1, simdi)
+                if len(self._kovalar) > self.en_fazla_anahtar:
+                    self._temizle(simdi)
+                return 0.0
+            self._kovalar[anahtar] = (jeton, simdi)
+            return (1 - jeton) / self.hiz if self.hiz > 0 else float("inf")
+
+    def _temizle(self, simdi: float) -> None:
+        """
+        Kovasi tekrar dolmus anahtarlari sil (hafiza sinirsiz buyumesin).
+        Dolu kova ile hic olmayan kova ayni davranir, silmek guvenli.
+        """
+        dolu = [
+            anahtar for anahtar, (jeton, son) in self._kovalar.items()
+            if jeton + (simdi - son) * self.hiz >= self.kapasite
+        ]
+        for anahtar in dolu:
+            del self._kovalar[anahtar]
+
+    def sifirla(self, anahtar: Optional[str] = None) -> None:
+        with self._kilit:
+            if anahtar is None:
+                self._kovalar.clear()
+            else:
+                self._kovalar.pop(anahtar, None)
+
+
+# ---- GIRIS SINIRLAYICILARI ----
+# IP siniri genis: ayni ofisten (tek dis IP) vardiya basi toplu giris olur.
+# Email siniri dar: tek hesaba yonelik sifre denemesi.
+giris_ip_sinirlayici = TokenBucket(settings.GIRIS_IP_KAPASITE, settings.GIRIS_IP_DAKIKA_BASI)
+giris_email_sinirlayici = TokenBucket(settings.GIRIS_EMAIL_KAPASITE, settings.GIRIS_EMAIL_DAKIKA_BASI)
+
+
+def istemci_ip(request: Request) -> str:
+    """
+    Sinirlama icin istemci IP'si.
+
+    📚 DERS: X-Forwarded-For istemci tarafindan uydurulabilir!
+    Sadece PROXY_ARKASINDA=True ise (Nginx header'i kendisi yaziyorsa) okunur.
+    """
+    if settings.PROXY_ARKASINDA:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+        real_ip = request.headers.get("x-real-ip")
+        if real_ip:
+            return real_ip.strip()
+    return request.client.host if request.client else "bilinmiyor"
@@ -3,8 +3,12 @@
 # Sifre hashleme ve JWT token islemleri
 # =============================================
 
+import asyncio
+import hashlib
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 # JWT token olusturma/dogrulama
 from jose import JWTError, jwt
@@ -17,7 +21,26 @@ from app.core.config import settings
 
 # ---- SIFRE HASHLEME ----
 # bcrypt: En guvenlisifre hashleme algoritmasi
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 📚 DERS: rounds = maliyet. 12 -> 2^12 tur, yaklasik 250 ms CPU.
+# min_rounds ayni deger: daha dusuk maliyetle saklanmis eski hash'ler
+# needs_update() ile "guncellenmeli" sayilir (girisde yeniden hashlenir).
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# 📚 DERS: bcrypt bilerek YAVAS bir islemdir.
+# async endpoint icinde dogrudan cagrilirsa event loop 250 ms kilitlenir:
+# o surede bu worker'daki HIC BIR istek ilerleyemez. Bu yuzden hash
+# islemleri ayri, SINIRLI bir thread havuzunda calisir (bcrypt C/Rust
+# tarafinda GIL'i birakir). Havuz doluysa yeni istekler sirada bekler;
+# giris patlamasi tum CPU'yu ve FastAPI'nin genel thread havuzunu yutmaz.
+_sifre_havuzu = ThreadPoolExecutor(
+    max_workers=settings.BCRYPT_MAX_WORKERS,
+    thread_name_prefix="bcrypt",
+)
 
 
 def sifre_hashle(sifre: str) -> str:
@@ -39,6 +62,24 @@ def sifre_dogrula(duz_sifre: str, hash_sifre: str) -> bool:
     return pwd_context.verify(duz_sifre, hash_sifre)
 
 
+async def sifre_hashle_async(sifre: str) -> str:
+    """sifre_hashle'nin event loop'u kilitlemeyen hali (async endpoint'ler icin)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_sifre_havuzu, sifre_hashle, sifre)
+
+
+async def sifre_dogrula_ve_guncelle(duz_sifre: str, hash_sifre: str) -> Tuple[bool, Optional[str]]:
+    """
+    Sifreyi bcrypt havuzunda dogrular.
+
+    Donus: (dogru_mu, yeni_hash)
+    yeni_hash sadece sifre dogruysa ve eski hash guncel ayarlarla
+    (BCRYPT_ROUNDS) uretilmemisse doludur; cagiran DB'ye yazmalidir.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_sifre_havuzu, pwd_context.verify_and_update, duz_sifre, hash_sifre)
+
+
 # ---- JWT TOKEN ----
 
 def token_olustur(data: dict, sure: Optional[timedelta] = None) -> str:
@@ -77,6 +118,54 @@ def token_olustur(data: dict, sure: Optional[timedelta] = None) -> str:
     return encoded_jwt
 
 
+def erisim_tokeni_olustur(kullanici, db_name: Optional[str]) -> str:
+    """
+    📚 DERS: Kisa omurlu access token.
+
+    Yetkilendirme icin gereken HER SEY token'in icinde:
+    endpoint'ler kullaniciyi master DB'den tekrar okumaz (bkz. deps.py).
+    {
+        "typ": "access",
+        "jti": "b1f0...",              # Token kimligi (cikista iptal icin)
+        "sub": "ahmet@abc.com",
+        "user_id": 5, "ad": "Ahmet", "soyad": "Yilmaz",
+        "rol": "isg_uzmani",
+        "tenant_id": 1, "db_name": "osgb_abc",
+        "aktif": true,                 # Token verildigi andaki durum
+        "tv": 0,                       # Kullanici.token_versiyon
+    }
+    """
+    return token_olustur({
+        "typ": "access",
+        "jti": secrets.token_hex(16),
+        "sub": kullanici.email,
+        "user_id": kullanici.id,
+        "ad": kullanici.ad,
+        "soyad": kullanici.soyad,
+        "rol": kullanici.rol.value,
+        "tenant_id": kullanici.tenant_id,
+        "db_name": db_name,
+        "aktif": bool(kullanici.aktif),
+        "tv": kullanici.token_versiyon or 0,
+    })
+
+
+def yenileme_tokeni_uret() -> Tuple[str, str]:
+    """
+    Rastgele refresh token uretir: (istemciye verilecek token, DB'ye yazilacak hash).
+
+    📚 DERS: Refresh token JWT degildir, 256 bit rastgele bir anahtardir.
+    Tahmin edilemeyecek kadar uzun oldugu icin bcrypt'e gerek yok;
+    SHA-256 hash'i ile aranir (indeksli, hizli).
+    """
+    token = secrets.token_urlsafe(32)
+    return token, yenileme_tokeni_hashle(token)
+
+
+def yenileme_tokeni_hashle(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def token_coz(token: str) -> dict:
     """
     JWT token'i coz ve icindeki veriyi dondur.
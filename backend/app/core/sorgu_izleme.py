@@ -0,0 +1,186 @@
+# =============================================
+# SQL SORGU IZLEME
+# Her HTTP isteginde kac sorgu calisti, ne kadar surdu?
+# =============================================
+#
+# 📚 DERS: SQLAlchemy event'leri
+# SQLAlchemy her sorguyu veritabanina gondermeden once ve sonra
+# "before_cursor_execute" / "after_cursor_execute" event'lerini tetikler.
+# Bu event'lere fonksiyon baglayarak sorgulari sayabilir ve zamanlayabiliriz.
+#
+# 📚 DERS: ContextVar (baglam degiskeni)
+# Ayni anda yuzlerce istek islenir. Hangi sorgu hangi istege ait?
+# ContextVar her istegin kendi "kutusunu" tutar:
+# - Middleware istek basinda bos bir IstekIstatistigi koyar
+# - Sorgu event'leri o kutudaki sayilari artirir
+# - Middleware istek sonunda kutuyu okur (metrik/log/header icin)
+# Senkron endpoint'ler thread havuzunda calissa bile baglam kopyalanir,
+# yani ayni kutuyu gorurler.
+#
+# Bu modul ayrica:
+# - YAVAS_SORGU_MS'i asan sorgulari db_logger'a yazar (parametreler GIZLENIR)
+# - Endpoint bazinda ozet tutar: "GET /api/v1/calisan ortalama 23 sorgu"
+#   Bir endpoint'in sorgu sayisi kayit sayisiyla artiyorsa N+1 vardir.
+
+import re
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logger import db_logger
+
+
+@dataclass
+class IstekIstatistigi:
+    """Bir HTTP isteginin veritabani kullanimi."""
+    sorgu_sayisi: int = 0
+    sorgu_suresi: float = 0.0   # saniye
+    yol: str = ""               # Yavas sorgu loguna yazmak icin
+
+
+_aktif_istek: ContextVar[Optional[IstekIstatistigi]] = ContextVar("osgb_aktif_istek", default=None)
+
+
+def istek_baslat(yol: str = ""):
+    """Yeni istek icin bos istatistik olusturur. Donen token istek_bitir'e verilir."""
+    return _aktif_istek.set(IstekIstatistigi(yol=yol))
+
+
+def istek_bitir(token) -> Optional[IstekIstatistigi]:
+    """Istegin istatistigini dondurur ve baglami eski haline getirir."""
+    istatistik = _aktif_istek.get()
+    _aktif_istek.reset(token)
+    return istatistik
+
+
+def aktif_istatistik() -> Optional[IstekIstatistigi]:
+    """Su an islenen istegin istatistigi (istek disindaysa None)."""
+    return _aktif_istek.get()
+
+
+# ---- PARAMETRE GIZLEME ----
+# 📚 DERS: Sorgu parametrelerinde TC no, email, sifre hash'i olabilir.
+# KVKK geregi bunlari log dosyasina YAZMIYORUZ; sadece yapisini yaziyoruz:
+#   {"email_1": "***", "param_1": "***"}   veya   "(3 parametre)"
+
+def _parametre_gizle(parameters, executemany: bool) -> str:
+    if not parameters:
+        return "-"
+    if executemany:
+        return f"({len(parameters)} satir)"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: ***" for k in parameters) + "}"
+    return f"({len(parameters)} parametre)"
+
+
+_BOSLUK = re.compile(r"\s+")
+
+
+def _sorgu_kisalt(statement: str, limit: int = 1000) -> str:
+    """Cok satirli SQL'i tek satira indir ve uzunsa kes."""
+    tek_satir = _BOSLUK.sub(" ", statement).strip()
+    return tek_satir if len(tek_satir) <= limit else tek_satir[:limit] + "..."
+
+
+# ---- SQLALCHEMY EVENT'LERI ----
+# Engine SINIFINA baglaniyoruz: master ve tum tenant engine'leri otomatik izlenir.
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _sorgu_oncesi(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("osgb_sorgu_baslangic", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _sorgu_sonrasi(conn, cursor, statement, parameters, context, executemany):
+    baslangiclar = conn.info.get("osgb_sorgu_baslangic")
+    if not baslangiclar:
+        return
+    sure = perf_counter() - baslangiclar.pop()
+
+    istatistik = _aktif_istek.get()
+    if istatistik is not None:
+        istatistik.sorgu_sayisi += 1
+        istatistik.sorgu_suresi += sure
+
+    sure_ms = sure * 1000
+    if sure_ms >= settings.YAVAS_SORGU_MS:
+        db_adi = conn.engine.url.database
+        yol = istatistik.yol if istatistik is not None else "-"
+        db_logger.warning(
+            f"Yavas sorgu {sure_ms:.1f}ms | {db_adi} | {yol} | "
+            f"{_sorgu_kisalt(statement)} | {_parametre_gizle(parameters, executemany)}",
+            extra={"sure_ms": round(sure_ms, 1), "veritabani": db_adi, "yol": yol},
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _sorgu_hatasi(exception_context):
+    # Hatali sorguda after_cursor_execute calismaz; baslangic zamanini temizle
+    conn = exception_context.connection
+    if conn is not None:
+        baslangiclar = conn.info.get("osgb_sorgu_baslangic")
+        if baslangiclar:
+            baslangiclar.pop()
+
+
+# =============================================
+# ENDPOINT OZETI
+# Her route icin toplam istek, sorgu ve DB suresi
+# =============================================
+_ozet: dict = {}
+_ozet_kilit = threading.Lock()
+
+
+def endpoint_ozeti_kaydet(metod: str, route: str, istatistik: IstekIstatistigi) -> None:
+    """Biten bir istegin DB kullanimini route ozetine ekler."""
+    anahtar = f"{metod} {route}"
+    with _ozet_kilit:
+        kayit = _ozet.get(anahtar)
+        if kayit is None:
+            kayit = _ozet[anahtar] = {"istek": 0, "sorgu": 0, "sure": 0.0, "max_sorgu": 0}
+        kayit["istek"] += 1
+        kayit["sorgu"] += istatistik.sorgu_sayisi
+        kayit["sure"] += istatistik.sorgu_suresi
+        kayit["max_sorgu"] = max(kayit["max_sorgu"], istatistik.sorgu_sayisi)
+
+    if istatistik.sorgu_sayisi > settings.ISTEK_SORGU_UYARI_ESIGI:
+        db_logger.warning(
+            f"Cok fazla sorgu (muhtemel N+1): {anahtar} | {istatistik.sorgu_sayisi} sorgu | "
+            f"{istatistik.sorgu_suresi * 1000:.1f}ms",
+            extra={"route": anahtar, "sorgu_sayisi": istatistik.sorgu_sayisi},
+        )
+
+
+def endpoint_ozeti() -> list:
+    """
+    Route bazinda DB kullanimi, istek basina ortalama sorguya gore (cok -> az).
+
+    [{"endpoint": "GET /api/v1/calisan", "istek": 120, "ort_sorgu": 22.0,
+      "max_sorgu": 102, "ort_db_ms": 35.2, "toplam_db_ms": 4224.0}, ...]
+    """
+    with _ozet_kilit:
+        kopya = {k: dict(v) for k, v in _ozet.items()}
+    sonuc = []
+    for anahtar, kayit in kopya.items():
+        sonuc.append({
+            "endpoint": anahtar,
+            "istek": kayit["istek"],
+            "ort_sorgu": round(kayit["sorgu"] / kayit["istek"], 2),
+            "max_sorgu": kayit["max_sorgu"],
+            "ort_db_ms": round(kayit["sure"] * 1000 / kayit["istek"], 2),
+            "toplam_db_ms": round(kayit["sure"] * 1000, 2),
+        })
+    sonuc.sort(key=lambda x: x["ort_sorgu"], reverse=True)
+    return sonuc
+
+
+def endpoint_ozeti_sifirla() -> None:
+    """Ozeti temizler (ornegin bir degisiklikten sonra yeniden olcmek icin)."""
+    with _ozet_kilit:
+        _ozet.clear()
@@ -0,0 +1,61 @@
+# =============================================
+# ACCESS TOKEN IPTAL LISTESI (deny list)
+# Suresi dolmadan gecersiz kilinan access token'lar
+# =============================================
+#
+# 📚 DERS: Access token DB'ye bakmadan dogrulanir (imza + sure).
+# Peki cikis yapan kullanicinin token'i suresi dolana kadar gecerli mi kalsin?
+# Hayir: iptal edilen token'lar burada, SURESI DOLANA KADAR tutulur.
+# Suresi dolan token zaten reddedilir, listeden silinir -> liste kucuk kalir.
+#
+# Iki tur kayit var:
+# - jti (token kimligi): tek bir token (cikis yapilan cihaz)
+# - kullanici + token versiyonu: kullanicinin o versiyondan ESKI tum
+#   token'lari (tum cihazlardan cikis, sifre degisikligi, hesap kapatma)
+#
+# Not: Liste process icinde tutulur. Birden fazla worker varsa iptal
+# sadece istegi karsilayan worker'da aninda gecerlidir; digerlerinde
+# token en gec ACCESS_TOKEN_EXPIRE_MINUTES sonra dusar. Refresh token
+# DB'de iptal edildigi icin oturum her durumda yenilenemez.
+
+import threading
+from time import time
+from typing import Dict, Tuple
+
+_kilit = threading.Lock()
+_iptal_jti: Dict[str, float] = {}                      # jti -> exp (unix)
+_iptal_versiyon: Dict[int, Tuple[int, float]] = {}     # kullanici_id -> (gecerli en kucuk versiyon, bitis)
+
+
+def _temizle(simdi: float) -> None:
+    for jti in [j for j, exp in _iptal_jti.items() if exp <= simdi]:
+        del _iptal_jti[jti]
+    for k_id in [k for k, (_, bitis) in _iptal_versiyon.items() if bitis <= simdi]:
+        del _iptal_versiyon[k_id]
+
+
+def jti_iptal_et(jti: str, exp: float) -> None:
+    """Tek bir access token'i suresi dolana kadar gecersiz kil."""
+    with _kilit:
+        _iptal_jti[jti] = exp
+        _temizle(time())
+
+
+def kullanici_iptal_et(kullanici_id: int, gecerli_versiyon: int, bitis: float) -> None:
+    """
+    Kullanicinin gecerli_versiyon'dan kucuk tv'li tum token'larini gecersiz kil.
+    bitis: o ana kadar verilmis en gec token'in suresinin dolacagi an.
+    """
+    with _kilit:
+        onceki = _iptal_versiyon.get(kullanici_id)
+        if onceki is None or onceki[0] <= gecerli_versiyon:
+            _iptal_versiyon[kullanici_id] = (gecerli_versiyon, bitis)
+        _temizle(time())
+
+
+def iptal_edildi_mi(payload: dict) -> bool:
+    """Token payload'i iptal listesinde mi? (her istekte cagrilir, kilitsiz okur)"""
+    if payload.get("jti") in _iptal_jti:
+        return True
+    kayit = _iptal_versiyon.get(payload.get("user_id"))
+    return kayit is not None and payload.get("tv", 0) < kayit[0]
@@ -0,0 +1,97 @@
+# =============================================
+# ZAMANLAYICI (periyodik arka plan gorevleri)
+# "Her 15 dakikada bir platform ozetini yenile" gibi isler
+# =============================================
+#
+# 📚 DERS: Neden Celery/cron degil?
+# Gorevler az ve hafif: uygulamanin kendi event loop'unda calisan bir
+# asyncio gorevi yeterli. Gorev fonksiyonlari senkron (DB sorgulari)
+# oldugu icin asyncio.to_thread ile ayri thread'de calisir; event loop
+# (istekler) bloklanmaz.
+#
+# Birden fazla uvicorn worker'i varsa her biri kendi zamanlayicisini
+# calistirir. Ayni isi iki kez yapmamak gorevin sorumlulugundadir
+# (ornek: analitik_service advisory lock ile tek worker'a birakir).
+#
+# Kullanim (lifespan'de):
+#   zamanlayici.ekle("platform_ozet", 900, ozetleri_yenile, ilk_gecikme_sn=30)
+#   zamanlayici.baslat()
+#   ...
+#   await zamanlayici.durdur()
+
+import asyncio
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+
+from app.core.logger import logger
+
+
+@dataclass
+class Gorev:
+    ad: str
+    aralik_sn: float
+    fonk: Callable[[], object]
+    ilk_gecikme_sn: float = 0.0
+    son_calisma: Optional[float] = None   # monotonic
+    son_sure_sn: Optional[float] = None
+    son_hata: Optional[str] = None
+    calisma_sayisi: int = 0
+
+
+class Zamanlayici:
+    def __init__(self):
+        self._gorevler: Dict[str, Gorev] = {}
+        self._tasklar: List[asyncio.Task] = []
+
+    def ekle(self, ad: str, aralik_sn: float, fonk: Callable[[], object], ilk_gecikme_sn: float = 0.0) -> None:
+        """Gorev ekler (ayni adla tekrar eklenirse eskisinin yerine gecer)."""
+        self._gorevler[ad] = Gorev(ad=ad, aralik_sn=aralik_sn, fonk=fonk, ilk_gecikme_sn=ilk_gecikme_sn)
+
+    async def _dongu(self, gorev: Gorev) -> None:
+        await asyncio.sleep(gorev.ilk_gecikme_sn)
+        while True:
+            baslangic = monotonic()
+            try:
+                await asyncio.to_thread(gorev.fonk)
+                gorev.son_hata = None
+            except Exception as e:
+                gorev.son_hata = str(e)
+                logger.error(f"Zamanlanmis gorev basarisiz: {gorev.ad} | {e}")
+            gorev.son_calisma = baslangic
+            gorev.son_sure_sn = monotonic() - baslangic
+            gorev.calisma_sayisi += 1
+            # Aralik bir calismanin BASLANGICINDAN sonrakine: uzun suren gorev kaymaz
+            await asyncio.sleep(max(0.0, gorev.aralik_sn - gorev.son_sure_sn))
+
+    def baslat(self) -> None:
+        if self._tasklar:
+            return
+        for gorev in self._gorevler.values():
+            self._tasklar.append(asyncio.create_task(self._dongu(gorev), name=f"zamanlayici:{gorev.ad}"))
+        if self._gorevler:
+            logger.info(f"Zamanlayici baslatildi: {', '.join(self._gorevler)}")
+
+    async def durdur(self) -> None:
+        for task in self._tasklar:
+            task.cancel()
+        # Thread'de calisan fonksiyon iptal edilemez; sadece beklenmez
+        await asyncio.gather(*self._tasklar, return_exceptions=True)
+        self._tasklar = []
+
+    def durum(self) -> List[dict]:
+        simdi = monotonic()
+        return [
+            {
+                "ad": g.ad,
+                "aralik_sn": g.aralik_sn,
+                "calisma_sayisi": g.calisma_sayisi,
+                "son_calisma_once_sn": round(simdi - g.son_calisma, 1) if g.son_calisma else None,
+                "son_sure_sn": round(g.son_sure_sn, 3) if g.son_sure_sn is not None else None,
+                "son_hata": g.son_hata,
+            }
+            for g in self._gorevler.values()
+        ]
+
+
+zamanlayici = Zamanlayici()
@@ -3,6 +3,8 @@
 # FastAPI uygulaması burada başlatılır
 # =============================================
 
+from contextlib import asynccontextmanager
+
 # FastAPI'yi içe aktar
 from fastapi import FastAPI
 
@@ -14,8 +16,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 
 # Loglama
-from app.core.logger import logger
+from app.core.logger import logger, log_kapat
 from app.middleware.request_logger import RequestLoggerMiddleware
+from app.middleware.profil import ProfilMiddleware
+from app.middleware.tenant import TenantMiddleware
+from app.core.pg_dinleyici import pg_dinleyici
+from app.core.zamanlayici import zamanlayici
+from app.core.bildirim import BILDIRIM_KANALI, bildirim_merkezi
+from app.services.tenant_dizini import TENANT_KANALI, tenant_dizini
+from app.services.excel_service import sablonlari_hazirla
+from app.services.analitik_service import ozetleri_yenile
+from app.services.uyari_service import uyarilari_yenile
+from app.services.kpi_service import kpi_uzlastir, uzlastirmaya_kalan_sn
+from app.services.nace_service import nace_indeksi
+from app.services.geokod_service import geokod_kapat
+from app.services.rota_service import rota_kapat
 
 # API Router'lari
 from app.api.v1.auth import router as auth_router
@@ -25,10 +40,76 @@ from app.api.v1.isyeri import router as isyeri_router
 from app.api.v1.dokuman import router as dokuman_router
 from app.api.v1.calisan import router as calisan_router
 from app.api.v1.personel import router as personel_router
+from app.api.v1.metrik import router as metrik_router
+from app.api.v1.profil import router as profil_router
+from app.api.v1.limit import router as limit_router
+from app.api.v1.tenant import router as tenant_router
+from app.api.v1.kullanici import router as kullanici_router
+from app.api.v1.analitik import router as analitik_router
+from app.api.v1.nace import router as nace_router
+from app.api.v1.ziyaret import router as ziyaret_router
+from app.api.v1.uyari import router as uyari_router
+from app.api.v1.egitim import router as egitim_router
+from app.api.v1.kkd import router as kkd_router
+from app.api.v1.dashboard import router as dashboard_router
+from app.api.v1.bildirim import router as bildirim_router
+from app.api.v1.sync import router as sync_router
+
+
+# ---- BASLANGIC / KAPANIS ----
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    📚 DERS: Lifespan = uygulamanin yasam dongusu.
+    yield'den onceki kod sunucu acilirken, sonraki kod kapanirken calisir.
+    """
+    # Excel sablonlari ilk istekte degil, acilista uretilsin
+    sablonlari_hazirla()
+
+    # NACE listesi bellege: tehlike sinifi ve otomatik tamamlama DB'siz calisir
+    try:
+        nace_indeksi.yukle()
+    except (OSError, ValueError) as e:
+        # Liste yoksa isyeri kaydi yine calisir, tehlike sinifi elle girilir
+        logger.error(f"NACE listesi yuklenemedi: {e}")
+
+    # Tenant dizini: subdomain/db_name cozumlemesi icin master DB'ye her istekte gidilmesin
+    try:
+        tenant_dizini.yukle()
+    except Exception as e:
+        # Master DB henuz hazir degilse ilk kullanimda tekrar denenir
+        logger.error(f"Tenant dizini yuklenemedi: {e}")
+    # WebSocket bildirimleri: worker'lar arasi dagitim ayni dinleyici baglantisindan
+    ws_pg_yayin = settings.PG_DINLEYICI_AKTIF and settings.WS_PG_YAYIN
+    if settings.PG_DINLEYICI_AKTIF:
+        pg_dinleyici.abone_ol(TENANT_KANALI, tenant_dizini.bildirim, tenant_dizini.yukle)
+        if ws_pg_yayin:
+            pg_dinleyici.abone_ol(BILDIRIM_KANALI, bildirim_merkezi.pg_bildirimi, bildirim_merkezi.pg_yeniden_baglandi)
+        pg_dinleyici.baslat()
+    bildirim_merkezi.baslat(pg_yayin=ws_pg_yayin)
+
+    # Periyodik gorevler (acilisi yavaslatmasin diye ilk calisma gecikmeli)
+    if settings.ZAMANLAYICI_AKTIF:
+        zamanlayici.ekle("platform_ozet", settings.ANALITIK_YENILEME_DK * 60, ozetleri_yenile, ilk_gecikme_sn=30)
+        zamanlayici.ekle("sure_uyarilari", settings.UYARI_TARAMA_DK * 60, uyarilari_yenile, ilk_gecikme_sn=60)
+        zamanlayici.ekle("kpi_uzlastirma", 24 * 3600, kpi_uzlastir, ilk_gecikme_sn=uzlastirmaya_kalan_sn())
+        zamanlayici.baslat()
+
+    logger.info(f"{settings.APP_NAME} v{settings.APP_VERSION} baslatildi")
+    yield
+    logger.info("Uygulama kapatiliyor")
+    await zamanlayici.durdur()
+    bildirim_merkezi.durdur()
+    geokod_kapat()
+    rota_kapat()
+    pg_dinleyici.durdur()
+    # Kuyrukta bekleyen loglari diske yaz
+    log_kapat()
 
 
 # ---- UYGULAMAYI OLUŞTUR ----
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.APP_NAME,           # API dokümantasyonunda görünecek başlık
     version=settings.APP_VERSION,      # Versiyon numarası
     description="OSGB Yönetim Sistemi API - İş Sağlığı ve Güvenliği",
@@ -47,7 +128,12 @@ app.add_middleware(
     allow_headers=["*"],         # Tüm header'lar
 )
 
-# ---- ISTEK LOGLAMA MIDDLEWARE ----
+# ---- ISTEK PROFILLEME + LOGLAMA MIDDLEWARE ----
+# 📚 DERS: add_middleware ile en SON eklenen en DISTA calisir.
+# Profil middleware'i loglamanin icinde kalsin ki istegin DB istatistigini gorebilsin.
+app.add_middleware(ProfilMiddleware)
+# Tenant (subdomain) cozumlemesi loglamanin icinde: metrikler tenant etiketini gorur
+app.add_middleware(TenantMiddleware)
 app.add_middleware(RequestLoggerMiddleware)
 
 
@@ -61,6 +147,22 @@ app.include_router(isyeri_router, prefix="/api/v1")
 app.include_router(dokuman_router, prefix="/api/v1")
 app.include_router(calisan_router, prefix="/api/v1")
 app.include_router(personel_router, prefix="/api/v1")
+app.include_router(profil_router, prefix="/api/v1")
+app.include_router(limit_router, prefix="/api/v1")
+app.include_router(tenant_router, prefix="/api/v1")
+app.include_router(kullanici_router, prefix="/api/v1")
+app.include_router(analitik_router, prefix="/api/v1")
+app.include_router(nace_router, prefix="/api/v1")
+app.include_router(ziyaret_router, prefix="/api/v1")
+app.include_router(uyari_router, prefix="/api/v1")
+app.include_router(egitim_router, prefix="/api/v1")
+app.include_router(kkd_router, prefix="/api/v1")
+app.include_router(dashboard_router, prefix="/api/v1")
+app.include_router(bildirim_router, prefix="/api/v1")
+app.include_router(sync_router, prefix="/api/v1")
+
+# Prometheus metrikleri: /metrics (versiyonsuz, kok dizinde)
+app.include_router(metrik_router)
 
 
 # ---- ANA SAYFA ----
@@ -24,14 +24,19 @@
 # Her endpoint'te ayri ayri token kontrol etmek yerine
 # bu fonksiyonlari bir kez yaziyoruz, her yerde kullaniyoruz.
 
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session, sessionmaker
 from jose import JWTError
 
 from app.core.security import token_coz
-from app.core.database import get_master_db, get_tenant_engine
-from app.models.master import Kullanici
+from app.core.token_iptal import iptal_edildi_mi
+from app.core.database import get_tenant_engine
+from app.models.master import RolEnum
+from app.services.tenant_dizini import tenant_dizini
 
 # Token'in nereden alinacagini tanimla
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -41,57 +46,96 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 # 1. MEVCUT KULLANICI GETIR
 # Token'dan kullanici bilgisini cikarir
 # =============================================
-def mevcut_kullanici_getir(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_master_db),
-) -> Kullanici:
+@dataclass
+class TokenKullanici:
     """
-    📚 DERS: Her korunmus endpoint'te kullanilir.
+    📚 DERS: Token'dan olusturulan kullanici.
 
-    Akis:
-    1. Frontend istek gonderirken header'a token ekler:
-       Authorization: Bearer eyJhbGciOiJ...
-    2. Bu fonksiyon token'i alir ve cozer
-    3. Token icinden email'i bulur
-    4. DB'den kullaniciyi getirir
-    5. Endpoint'e hazir kullanici nesnesi verir
+    Access token yetkilendirme icin gereken her seyi tasir
+    (bkz. security.erisim_tokeni_olustur). Bu yuzden her istekte
+    master DB'ye "SELECT * FROM kullanicilar" atmaya gerek yok.
 
-    Kullanim:
-        @router.get("/profil")
-        def profil(kullanici: Kullanici = Depends(mevcut_kullanici_getir)):
-            return {"ad": kullanici.ad}
+    Endpoint'ler bunu Kullanici modeli gibi kullanir:
+    kullanici.id, kullanici.rol.value, kullanici.tenant_id, kullanici.ad...
+    DB'de degisiklik yapmak gerekirse (ornek: son_giris) kullanici.id ile
+    Kullanici kaydi ayrica okunmalidir.
+    """
+    id: int
+    email: str
+    ad: str
+    soyad: str
+    rol: RolEnum
+    tenant_id: Optional[int]
+    db_name: Optional[str]
+    token_versiyon: int
+    jti: str
+    exp: float
+
+
+def token_dogrula(token: str) -> dict:
+    """
+    Access token'i cozer ve dogrular: imza, sure, tip, iptal listesi.
+    Gecersizse 401 firlatir.
     """
-    # Hata mesaji
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Gecersiz veya suresi dolmus token",
         headers={"WWW-Authenticate": "Bearer"},
     )
-
     try:
-        # Token'i coz
         payload = token_coz(token)
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    # Kullaniciyi DB'den getir
-    kullanici = db.query(Kullanici).filter(
-        Kullanici.email == email
-    ).first()
-
-    if kullanici is None:
+    # Eski (tipsiz) token'lar ve yanlis tipteki token'lar kabul edilmez
+    if payload.get("typ") != "access" or payload.get("sub") is None:
+        raise credentials_exception
+    if iptal_edildi_mi(payload):
         raise credentials_exception
+    return payload
+
+
+def mevcut_kullanici_getir(
+    token: str = Depends(oauth2_scheme),
+) -> TokenKullanici:
+    """
+    📚 DERS: Her korunmus endpoint'te kullanilir.
+
+    Akis:
+    1. Frontend istek gonderirken header'a token ekler:
+       Authorization: Bearer eyJhbGciOiJ...
+    2. Bu fonksiyon token'i cozer ve dogrular (imza, sure, iptal listesi)
+    3. Token icindeki bilgilerden kullanici nesnesi olusturur (DB'ye gitmez!)
+    4. Endpoint'e hazir kullanici nesnesi verir
 
-    if not kullanici.aktif:
+    Hesap devre disi birakildiginda token_versiyon artirilir ve
+    kullanicinin eski token'lari iptal listesine girer.
+
+    Kullanim:
+        @router.get("/profil")
+        def profil(kullanici: TokenKullanici = Depends(mevcut_kullanici_getir)):
+            return {"ad": kullanici.ad}
+    """
+    payload = token_dogrula(token)
+
+    if not payload.get("aktif", False):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Hesabiniz devre disi",
         )
 
-    return kullanici
+    return TokenKullanici(
+        id=payload["user_id"],
+        email=payload["sub"],
+        ad=payload.get("ad", ""),
+        soyad=payload.get("soyad", ""),
+        rol=RolEnum(payload["rol"]),
+        tenant_id=payload.get("tenant_id"),
+        db_name=payload.get("db_name"),
+        token_versiyon=payload.get("tv", 0),
+        jti=payload.get("jti", ""),
+        exp=payload["exp"],
+    )
 
 
 # =============================================
@@ -99,6 +143,7 @@ def mevcut_kullanici_getir(
 # Kullanicinin ait oldugu OSGB'nin DB'sine baglanir
 # =============================================
 def tenant_db_getir(
+    request: Request,
     token: str = Depends(oauth2_scheme),
 ) -> Session:
     """
@@ -114,24 +159,17 @@ def tenant_db_getir(
 
     Akis:
     1. Token'dan db_name'i cikart
-    2. O DB'ye engine olustur
-    3. Session olustur ve don
+    2. OSGB hala aktif mi? (bellekteki tenant dizini, DB'ye gitmez)
+    3. O DB'ye engine olustur
+    4. Session olustur ve don
 
     Kullanim:
         @router.get("/firmalar")
         def firmalar(db: Session = Depends(tenant_db_getir)):
             return db.query(Firma).all()
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Gecersiz token",
-    )
-
-    try:
-        payload = token_coz(token)
-        db_name: str = payload.get("db_name")
-    except JWTError:
-        raise credentials_exception
+    payload = token_dogrula(token)
+    db_name: str = payload.get("db_name")
 
     # Sistem admin'in tenant DB'si yok
     if not db_name:
@@ -140,7 +178,27 @@ def tenant_db_getir(
             detail="Bu islem icin bir OSGB'ye ait olmaniz gerekir",
         )
 
-    # Tenant DB'ye baglan
+    # OSGB devre disi birakildiysa token'in suresi dolmasini beklemeden reddet
+    # (dizin, tenants tablosundaki her degisiklikte NOTIFY ile yenilenir)
+    tenant = tenant_dizini.id_ile(payload.get("tenant_id"))
+    if tenant is None or tenant.db_name != db_name or not tenant.aktif:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="OSGB hesabi devre disi",
+        )
+
+    # Subdomain'den gelindiyse (bkz. middleware/tenant.py) token o OSGB'ye ait olmali
+    tenant_kaydi = getattr(request.state, "tenant_kaydi", None)
+    if tenant_kaydi is not None and tenant_kaydi.db_name != db_name:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu oturum bu OSGB'ye ait degil",
+        )
+
+    # Metrikler istegi tenant bazinda ayirabilsin
+    request.state.tenant = db_name
+
+    # Tenant DB'ye baglan (engine havuzu tenant basina bir kez olusturulur)
     engine = get_tenant_engine(db_name)
     SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
     db = SessionLocal()
@@ -166,14 +224,14 @@ def rol_gerekli(*roller: str):
         @router.delete("/firma/{id}")
         def firma_sil(
             id: int,
-            kullanici: Kullanici = Depends(rol_gerekli("sistem_admin", "osgb_yoneticisi")),
+            kullanici: TokenKullanici = Depends(rol_gerekli("sistem_admin", "osgb_yoneticisi")),
         ):
             ...
 
     Python'daki decorator mantigi ile benzer ama
     FastAPI'nin Depends sistemi ile calisir.
     """
-    def kontrol(kullanici: Kullanici = Depends(mevcut_kullanici_getir)):
+    def kontrol(kullanici: TokenKullanici = Depends(mevcut_kullanici_getir)):
         if kullanici.rol.value not in roller:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,151 @@
+# =============================================
+# ISTEK PROFILLEME MIDDLEWARE
+# sistem_admin icin tek bir istegi profilleme
+# =============================================
+#
+# 📚 DERS: Nasil kullanilir?
+#   curl -H "Authorization: Bearer <admin token>" -H "X-Profile: 1" \
+#        https://api.../api/v1/isyeri/excel/export
+#   -> Yanitta "X-Profile-Id: 20261019-165238-1a2b3c4d"
+#   -> GET /api/v1/profil/20261019-165238-1a2b3c4d        (flamegraph yiginlari)
+#   -> GET /api/v1/profil/20261019-165238-1a2b3c4d/ozet   (CPU/DB/serilestirme)
+#
+# Header yerine query parametresi de olur: ?_profil=1
+# Varsayilan olarak kapalidir; .env'de PROFIL_AKTIF=true ile acilir.
+#
+# 📚 DERS: Kapaliyken sifir ek yuk
+# Header/query'de bayrak yoksa middleware hicbir sey yapmadan istegi gecirir:
+# token cozulmez, thread acilmaz. Bayrak varsa ama token sistem_admin'e ait
+# degilse istek yine normal islenir (bayrak sessizce yok sayilir).
+
+import sys
+from time import perf_counter, process_time
+from urllib.parse import parse_qsl
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logger import api_logger
+from app.core.profil import Ornekleyici, profil_kaydet, yeni_profil_id
+from app.core.sorgu_izleme import aktif_istatistik
+from app.middleware.deps import token_dogrula
+from app.middleware.request_logger import yol_sablonu
+
+
+def _profil_istendi_mi(scope: Scope) -> bool:
+    """X-Profile header'i veya ?_profil=1 var mi?"""
+    for ad, deger in scope["headers"]:
+        if ad == b"x-profile":
+            return deger not in (b"", b"0")
+    query = scope.get("query_string", b"").decode("latin-1")
+    return ("_profil", "1") in parse_qsl(query)
+
+
+def _admin_mi(scope: Scope) -> bool:
+    """
+    Bearer token gecerli bir access token mi ve rolu sistem_admin mi?
+    Dogrulama endpoint'lerle ayni (token_dogrula): refresh token ya da
+    iptal edilmis (cikis yapilmis) token profillemeyi acamaz.
+    """
+    for ad, deger in scope["headers"]:
+        if ad == b"authorization":
+            yetki = deger.decode("latin-1")
+            if not yetki.lower().startswith("bearer "):
+                return False
+            try:
+                return token_dogrula(yetki[7:].strip()).get("rol") == "sistem_admin"
+            except HTTPException:
+                return False
+    return False
+
+
+class ProfilMiddleware:
+    """
+    📚 DERS: Bayrakli istekleri Ornekleyici ile profiller.
+
+    Istek bitince profil logs/profiller/ altina yazilir ve
+    kimligi X-Profile-Id header'i ile dondurulur.
+
+    RequestLoggerMiddleware'in ICINDE calismali (main.py'de ondan ONCE eklenir);
+    boylece istegin DB istatistigi (sorgu_izleme) burada da gorunur.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.PROFIL_AKTIF
+            or not _profil_istendi_mi(scope)
+            or not _admin_mi(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profil_id = yeni_profil_id()
+        durum = 500
+
+        async def send_sarici(message: Message) -> None:
+            nonlocal durum
+            if message["type"] == "http.response.start":
+                durum = message["status"]
+                MutableHeaders(scope=message).append("x-profile-id", profil_id)
+            await send(message)
+
+        # Ornekleyici bu frame'i yiginda gorurse ornegi bu istege yazar
+        # Thread havuzundaki ornekler scope["route"] uzerinden eslestirilir
+        ornekleyici = Ornekleyici(sys._getframe(), scope)
+        baslangic = perf_counter()
+        cpu_baslangic = process_time()
+        ornekleyici.start()
+        try:
+            await self.app(scope, receive, send_sarici)
+        finally:
+            sure = perf_counter() - baslangic
+            cpu = process_time() - cpu_baslangic
+            # join ve dosya yazma event loop'u bekletmesin
+            await run_in_threadpool(ornekleyici.durdur)
+            await run_in_threadpool(self._kaydet, profil_id, scope, durum, sure, cpu, ornekleyici)
+
+    def _kaydet(self, profil_id: str, scope: Scope, durum: int, sure: float,
+                cpu: float, ornekleyici: Ornekleyici) -> None:
+        db = aktif_istatistik()
+        # Gercek ornekleme araligi: thread GIL beklerse ayarlanandan uzun olur
+        aralik = sure / ornekleyici.tur_sayisi if ornekleyici.tur_sayisi else 0.0
+
+        ozet = {
+            "profil_id": profil_id,
+            "metod": scope["method"],
+            "yol": scope["path"],
+            "sablon": yol_sablonu(scope),
+            "durum": durum,
+            "tenant": scope.get("state", {}).get("tenant"),
+            "sure_ms": round(sure * 1000, 2),
+            # process_time tum process'in CPU suresidir; ayni anda baska
+            # istekler calisiyorsa onlarin CPU'su da buraya girer
+            "islem_cpu_ms": round(cpu * 1000, 2),
+            "db_sorgu_sayisi": db.sorgu_sayisi if db else 0,
+            "db_ms": round(db.sorgu_suresi * 1000, 2) if db else 0.0,
+            # Asagidakiler ornek sayisindan TAHMIN edilir
+            "ornek_sayisi": ornekleyici.ornek_sayisi,
+            "ornekleme_araligi_ms": round(aralik * 1000, 3),
+            "kirilim_ms": {
+                kategori: round(sayi * aralik * 1000, 2)
+                for kategori, sayi in ornekleyici.kategoriler.most_common()
+            },
+        }
+
+        try:
+            profil_kaydet(profil_id, ornekleyici, ozet)
+        except OSError as e:
+            api_logger.error(f"Profil kaydedilemedi: {profil_id} | {e}")
+            return
+        api_logger.info(
+            f"Profil kaydedildi: {profil_id} | {scope['method']} {scope['path']} | "
+            f"{ozet['sure_ms']}ms | {ornekleyici.ornek_sayisi} ornek",
+            extra={"profil_id": profil_id},
+        )
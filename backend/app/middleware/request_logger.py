@@ -12,61 +12,182 @@
 # 2. Endpoint calisir
 # 3. Yanit donunce gecen sureyi hesaplar
 # 4. Her seyi loglar
+#
+# 📚 DERS: Neden "saf ASGI" middleware?
+# Starlette'in BaseHTTPMiddleware'i her istek icin ayri bir task acar ve
+# yaniti bir stream icine sarar. Bu hem ek yuk getirir hem de
+# StreamingResponse/FileResponse gibi parcali yanitlari yavaslatir.
+#
+# Saf ASGI middleware ise sadece "send" fonksiyonunu sarar:
+# yanit mesajlari (http.response.start, http.response.body) yanimizdan
+# gecerken durum kodunu ve boyutu not ederiz, baska hicbir sey yapmayiz.
+#
+# Istek bitince ayni bilgiler metriklere de (app/core/metrics.py) yazilir.
+#
+# DB_DEBUG_HEADERLARI aciksa yanita iki header daha eklenir:
+#   X-DB-Queries: 3        -> bu istekte calisan SQL sorgusu sayisi
+#   X-DB-Time: 4.10ms      -> bu sorgularda gecen toplam sure
+# Tarayicinin Network sekmesinde N+1 sorunlari hemen gorunur.
+# Varsayilan kapalidir: uretimde istemcilere sorgu bilgisi gonderilmez.
 
-import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
 from app.core.logger import api_logger
+from app.core import metrics
+from app.core.sorgu_izleme import (
+    aktif_istatistik, endpoint_ozeti_kaydet, istek_baslat, istek_bitir,
+)
+
+
+# Bu yollarin basarili isteklerini loglama (cok fazla log olur)
+LOGLANMAYAN_YOLLAR = ("/docs", "/redoc", "/openapi.json")
 
 
-class RequestLoggerMiddleware(BaseHTTPMiddleware):
+def yol_sablonu(scope: Scope) -> str:
+    """
+    📚 DERS: Istegin eslestigi route sablonunu dondurur.
+
+    /api/v1/firma/5  -> /api/v1/firma/{firma_id}
+
+    FastAPI, eslesen route'u scope["route"] icine koyar.
+    Hicbir route eslesmediyse (404) "eslesmeyen" doner; boylece
+    rastgele URL'ler log/metrik etiketlerini sisirmez.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", None) or scope["path"]
+    return "eslesmeyen"
+
+
+def _multipart_mi(scope: Scope) -> bool:
+    """Istek multipart/form-data (dosya yukleme) mi?"""
+    if scope["method"] not in ("POST", "PUT", "PATCH"):
+        return False
+    for ad, deger in scope["headers"]:
+        if ad == b"content-type":
+            return deger.startswith(b"multipart/")
+    return False
+
+
+class RequestLoggerMiddleware:
     """
     📚 DERS: Her HTTP istegini loglar.
 
     Log ornegi:
-    POST /api/v1/auth/login | 200 | 0.045s | 192.168.1.9
-    GET  /api/v1/firma      | 200 | 0.012s | 192.168.1.9
-    POST /api/v1/firma      | 201 | 0.034s | 192.168.1.9
-    GET  /api/v1/firma/999  | 404 | 0.003s | 192.168.1.9
+    POST /api/v1/auth/login | 200 | 0.045s | 512B | 192.168.1.9
+    GET  /api/v1/firma      | 200 | 0.012s | 2048B | 192.168.1.9
+    GET  /api/v1/firma/999 [/api/v1/firma/{firma_id}] | 404 | 0.003s | 58B | 192.168.1.9
+
+    Ayrica her yanita X-Response-Time header'i ekler (ornek: "12.35ms").
+    Bu sure yanit header'lari gonderilene kadar gecen suredir.
+    Istenirse X-DB-Queries / X-DB-Time da eklenir (DB_DEBUG_HEADERLARI).
     """
 
-    async def dispatch(self, request: Request, call_next):
-        # Baslangic zamani
-        baslangic = time.time()
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # WebSocket ve lifespan mesajlarina dokunma
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        baslangic = perf_counter()
+        durum = 500     # Yanit hic baslamazsa (beklenmeyen hata) 500 sayilir
+        boyut = 0
+        yuklenen = 0
+        db_token = istek_baslat(scope["path"])
+        db_istatistik = aktif_istatistik()
 
-        # IP adresi
-        ip = request.client.host if request.client else "bilinmiyor"
+        # Dosya yuklemelerinde (multipart) gelen govde boyutunu say
+        if _multipart_mi(scope):
+            asil_receive = receive
+
+            async def receive() -> Message:
+                nonlocal yuklenen
+                message = await asil_receive()
+                if message["type"] == "http.request":
+                    yuklenen += len(message.get("body", b""))
+                return message
+
+        async def send_sarici(message: Message) -> None:
+            nonlocal durum, boyut
+            if message["type"] == "http.response.start":
+                durum = message["status"]
+                sure_ms = (perf_counter() - baslangic) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("x-response-time", f"{sure_ms:.2f}ms")
+                if settings.DB_DEBUG_HEADERLARI:
+                    # Streaming yanitlarda header'dan sonra calisan sorgular sayilmaz
+                    headers.append("x-db-queries", str(db_istatistik.sorgu_sayisi))
+                    headers.append("x-db-time", f"{db_istatistik.sorgu_suresi * 1000:.2f}ms")
+            elif message["type"] == "http.response.body":
+                boyut += len(message.get("body", b""))
+            await send(message)
 
-        # Istegi isle (endpoint calissin)
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_sarici)
         except Exception as e:
             # Beklenmeyen hata
-            sure = time.time() - baslangic
-            api_logger.error(
-                f"{request.method:6s} {request.url.path} | 500 | {sure:.3f}s | {ip} | HATA: {e}"
-            )
+            sure = perf_counter() - baslangic
+            self._logla(scope, 500, sure, boyut, hata=e)
+            self._metrik_yaz(scope, 500, sure, yuklenen, istek_bitir(db_token))
             raise
 
-        # Gecen sure
-        sure = time.time() - baslangic
+        sure = perf_counter() - baslangic
+        self._logla(scope, durum, sure, boyut)
+        self._metrik_yaz(scope, durum, sure, yuklenen, istek_bitir(db_token))
+
+    def _metrik_yaz(self, scope: Scope, durum: int, sure: float, yuklenen: int, db_istatistik) -> None:
+        route = yol_sablonu(scope)
+        # tenant_db_getir dependency'si request.state.tenant'i doldurur
+        tenant = "-"
+        if settings.METRIK_TENANT_ETIKETI:
+            tenant = scope.get("state", {}).get("tenant") or "-"
+
+        metrics.ISTEK_SURESI.gozlemle(
+            sure, metod=scope["method"], route=route, durum=str(durum), tenant=tenant,
+        )
+        if db_istatistik is not None and db_istatistik.sorgu_sayisi:
+            metrics.ISTEK_DB_SORGU.gozlemle(db_istatistik.sorgu_sayisi, route=route)
+            metrics.ISTEK_DB_SURE.gozlemle(db_istatistik.sorgu_suresi, route=route)
+            if route != "eslesmeyen":
+                endpoint_ozeti_kaydet(scope["method"], route, db_istatistik)
+        if yuklenen:
+            metrics.YUKLEME_BAYT.artir(yuklenen, route=route)
+
+    def _logla(self, scope: Scope, durum: int, sure: float, boyut: int, hata: Exception = None) -> None:
+        metod = scope["method"]
+        yol = scope["path"]
+        sablon = yol_sablonu(scope)
+
+        # Docs ve static dosyalari loglama (cok fazla log olur)
+        if durum < 400 and hata is None and yol.startswith(LOGLANMAYAN_YOLLAR):
+            return
+
+        client = scope.get("client")
+        ip = client[0] if client else "bilinmiyor"
+
+        # Sablon yoldan farkliysa ikisini de goster: /firma/5 [/firma/{firma_id}]
+        gosterim = yol if sablon in (yol, "eslesmeyen") else f"{yol} [{sablon}]"
+        mesaj = f"{metod:6s} {gosterim} | {durum} | {sure:.3f}s | {boyut}B | {ip}"
+
+        # JSON log formatinda bu alanlar ayri ayri yazilir
+        ekstra = {
+            "metod": metod, "yol": yol, "sablon": sablon, "durum": durum,
+            "sure_ms": round(sure * 1000, 2), "boyut": boyut, "ip": ip,
+        }
 
         # Status koda gore log seviyesi
-        status = response.status_code
-        if status >= 500:
-            api_logger.error(
-                f"{request.method:6s} {request.url.path} | {status} | {sure:.3f}s | {ip}"
-            )
-        elif status >= 400:
-            api_logger.warning(
-                f"{request.method:6s} {request.url.path} | {status} | {sure:.3f}s | {ip}"
-            )
+        if hata is not None:
+            api_logger.error(f"{mesaj} | HATA: {hata}", extra=ekstra)
+        elif durum >= 500:
+            api_logger.error(mesaj, extra=ekstra)
+        elif durum >= 400:
+            api_logger.warning(mesaj, extra=ekstra)
         else:
-            # Docs ve static dosyalari loglama (cok fazla log olur)
-            if not request.url.path.startswith(("/docs", "/redoc", "/openapi.json")):
-                api_logger.info(
-                    f"{request.method:6s} {request.url.path} | {status} | {sure:.3f}s | {ip}"
-                )
-
-        return response
+            api_logger.info(mesaj, extra=ekstra)
@@ -0,0 +1,95 @@
+# =============================================
+# SUBDOMAIN -> TENANT YONLENDIRME MIDDLEWARE
+# abc.osgbyazilim.com -> "abc" OSGB'si
+# =============================================
+#
+# 📚 DERS: Her OSGB kendi adresinden girer:
+#   abc.osgbyazilim.com  -> tenants.subdomain = "abc"
+#   xyz.osgbyazilim.com  -> tenants.subdomain = "xyz"
+#
+# Bu middleware Host header'indan subdomain'i cikarir ve tenant'i
+# BELLEKTEKI dizinden bulur (master DB'ye sorgu yok, bkz. tenant_dizini.py).
+# Bulunan kayit request.state.tenant_kaydi'na konur:
+#   - tenant_db_getir: token'daki db_name bu OSGB'ninki degilse reddeder
+#   - login: baska OSGB'nin kullanicisi bu adresten giris yapamaz
+#
+# TENANT_ANA_DOMAIN bossa (gelistirme, localhost) middleware hicbir sey yapmaz.
+# api.osgbyazilim.com gibi ayrilmis subdomain'ler de tenant sayilmaz.
+#
+# Dizin eskidiyse master DB'den yeniden yuklenir; bu senkron is event
+# loop'u bekletmesin diye thread havuzunda yapilir (normalde bellekten okunur).
+#
+# WebSocket: bilinmeyen OSGB 4404, aktif olmayan OSGB 4403 ile kapatilir
+# (kodlar bildirim.py'deki 44xx = HTTP durum kodu duzeniyle ayni).
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.tenant_dizini import tenant_dizini
+
+
+def _host(scope: Scope) -> str:
+    for ad, deger in scope["headers"]:
+        if ad == b"host":
+            return deger.decode("latin-1").split(":", 1)[0].strip().lower()
+    return ""
+
+
+KAPAT_BULUNAMADI = 4404
+KAPAT_PASIF = 4403
+
+
+def subdomain_bul(host: str) -> str:
+    """'abc.osgbyazilim.com' -> 'abc'; ana domain veya ayrilmis ise ''."""
+    ana = settings.TENANT_ANA_DOMAIN.lower().strip(".")
+    if not ana or not host.endswith("." + ana):
+        return ""
+    subdomain = host[: -len(ana) - 1]
+    ayrilmis = {s.strip() for s in settings.TENANT_AYRILMIS_SUBDOMAINLER.split(",") if s.strip()}
+    if subdomain in ayrilmis:
+        return ""
+    return subdomain
+
+
+async def _reddet(scope: Scope, receive: Receive, send: Send, durum: int, mesaj: str, ws_kod: int) -> None:
+    """HTTP'de JSON hata yaniti, WebSocket'te (kabul etmeden) kapanis cercevesi."""
+    if scope["type"] == "http":
+        await JSONResponse({"detail": mesaj}, status_code=durum)(scope, receive, send)
+    else:
+        await send({"type": "websocket.close", "code": ws_kod, "reason": mesaj})
+
+
+class TenantMiddleware:
+    """Host header'indaki subdomain'e gore tenant'i belirler."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or not settings.TENANT_ANA_DOMAIN:
+            await self.app(scope, receive, send)
+            return
+
+        subdomain = subdomain_bul(_host(scope))
+        if not subdomain:
+            await self.app(scope, receive, send)
+            return
+
+        if tenant_dizini.yukleme_gerekli_mi():
+            kayit = await run_in_threadpool(tenant_dizini.subdomain_ile, subdomain)
+        else:
+            kayit = tenant_dizini.subdomain_ile(subdomain)
+        if kayit is None:
+            await _reddet(scope, receive, send, 404, "OSGB bulunamadi", KAPAT_BULUNAMADI)
+            return
+        if not kayit.aktif:
+            await _reddet(scope, receive, send, 403, "Bu OSGB hesabi aktif degil", KAPAT_PASIF)
+            return
+
+        durum = scope.setdefault("state", {})
+        durum["tenant_kaydi"] = kayit
+        # Metrikler ve loglar icin (tenant_db_getir ile ayni etiket)
+        durum["tenant"] = kayit.db_name
+        await self.app(scope, receive, send)
@@ -0,0 +1,94 @@
+# =============================================
+# TENANT VERITABANI MIGRASYONLARI
+# Her OSGB veritabaninin semasini versiyonlu adimlarla gunceller
+# =============================================
+#
+# 📚 DERS: Migrasyon nedir?
+# Modele yeni kolon eklemek kodu degistirir ama mevcut veritabanlarini
+# degistirmez (create_all var olan tabloya dokunmaz). Migrasyon, bu
+# degisikligi her veritabaninda BIR KEZ uygulayan numarali bir adimdir.
+#
+# Yeni migrasyon eklemek:
+#   1. Modeli degistir (app/models/tenant.py)
+#   2. Bu klasore mNNNN_kisa_ad.py ekle (NNNN = son numara + 1):
+#
+#        """Isyeri'ne web_sitesi kolonu"""
+#        from sqlalchemy import text
+#
+#        def uygula(baglanti):
+#            baglanti.execute(text(
+#                "ALTER TABLE isyerleri ADD COLUMN IF NOT EXISTS web_sitesi VARCHAR(255)"
+#            ))
+#
+#   3. python tenant_cli.py migrasyon --kuru   (once dene)
+#      python tenant_cli.py migrasyon          (tum OSGB'lere uygula)
+#
+# Kurallar:
+# - Migrasyon tekrar calissa da zarar vermemeli (IF NOT EXISTS): eski
+#   kurulumlarda kolon/indeks elle eklenmis olabilir.
+# - Her migrasyon kendi transaction'inda calisir (PostgreSQL'de DDL de
+#   transaction'a dahildir): ya tamami uygulanir ya hic.
+# - Modeli (app/models) ve servis kodunu (app/services) import etme: model
+#   ya da servis degisince, henuz migrate edilmemis veritabaninda eski
+#   migrasyonun yaptigi is de sessizce degisir. Tablo, kolon, indeks,
+#   fonksiyon, tetikleyici: DDL'i migrasyon dosyasina sabit metin olarak
+#   yaz (dosya bir kez yazilir, sonra donar).
+#
+# Calistirici: app/services/migrasyon_service.py
+
+import importlib
+import pkgutil
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List
+
+from sqlalchemy.engine import Connection
+
+
+_DOSYA_DESENI = re.compile(r"^m(\d{4})_\w+$")
+
+
+@dataclass(frozen=True)
+class Migrasyon:
+    versiyon: int
+    ad: str
+    aciklama: str
+    uygula: Callable[[Connection], None]
+
+
+@lru_cache(maxsize=1)
+def _yukle() -> tuple:
+    bulunan = []
+    for modul_bilgisi in pkgutil.iter_modules(__path__):
+        eslesme = _DOSYA_DESENI.match(modul_bilgisi.name)
+        if not eslesme:
+            continue
+        modul = importlib.import_module(f"{__name__}.{modul_bilgisi.name}")
+        bulunan.append(Migrasyon(
+            versiyon=int(eslesme.group(1)),
+            ad=modul_bilgisi.name,
+            aciklama=next(iter((modul.__doc__ or "").strip().splitlines()), ""),
+            uygula=modul.uygula,
+        ))
+    bulunan.sort(key=lambda m: m.versiyon)
+
+    # Numaralar 1'den baslayip bosluksuz artmali (iki gelistirici ayni
+    # numarayi alirsa burada fark edilir)
+    for beklenen, migrasyon in enumerate(bulunan, start=1):
+        if migrasyon.versiyon != beklenen:
+            raise RuntimeError(
+                f"Migrasyon numaralari sirali degil: {migrasyon.ad} "
+                f"(beklenen {beklenen:04d})"
+            )
+    return tuple(bulunan)
+
+
+def migrasyonlar() -> List[Migrasyon]:
+    """Tum migrasyonlar, versiyon sirasiyla."""
+    return list(_yukle())
+
+
+def son_versiyon() -> int:
+    tumu = _yukle()
+    return tumu[-1].versiyon if tumu else 0
@@ -0,0 +1,298 @@
+"""Baslangic: eksik tenant tablolarini olustur
+
+Eski yontemle (create_all, create_personeller_table.py) kurulmus
+veritabanlarinda sonradan eklenen tablolar (personeller, sayaclar...)
+eksik olabilir. Var olan tablolara (ve indekslerine) dokunulmaz.
+
+DDL burada sabittir: tablolarin bu migrasyon yazildigindaki hali. Sonraki
+model degisiklikleri kendi migrasyonlariyla gelir.
+"""
+
+from sqlalchemy import text
+
+
+# Enum tipleri (PostgreSQL'de CREATE TYPE IF NOT EXISTS yok: once bakilir)
+TURLER = {
+    "personelunvan": ("ISG_UZMANI", "ISYERI_HEKIMI", "DSP"),
+    "uzmanliksinifi": ("A_SINIFI", "B_SINIFI", "C_SINIFI"),
+    "tehlikesinifi": ("AZ_TEHLIKELI", "TEHLIKELI", "COK_TEHLIKELI"),
+    "ziyaretdurumu": ("PLANLANDI", "TAMAMLANDI", "IPTAL", "ERTELENDI"),
+    "kkdtipi": ("BARET", "ELDIVEN", "GOZLUK", "KULAKLLIK", "MASKE", "AYAKKABI", "YELEK", "DIGER"),
+}
+
+# (tablo, CREATE TABLE, indeksler) - yabanci anahtar sirasiyla
+TABLOLAR = (
+    ("dokumanlar", """
+CREATE TABLE dokumanlar (
+    id SERIAL NOT NULL,
+    kaynak_tipi VARCHAR(50) NOT NULL,
+    kaynak_id INTEGER NOT NULL,
+    dosya_adi VARCHAR(500) NOT NULL,
+    dosya_yolu VARCHAR(1000) NOT NULL,
+    dosya_tipi VARCHAR(100),
+    dosya_boyutu INTEGER,
+    aciklama VARCHAR(500),
+    yukleyen_id INTEGER,
+    yukleyen_adi VARCHAR(255),
+    aktif BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id)
+)
+""", (
+        "CREATE INDEX ix_dokumanlar_id ON dokumanlar (id)",
+        "CREATE INDEX ix_dokumanlar_kaynak_id ON dokumanlar (kaynak_id)",
+        "CREATE INDEX ix_dokumanlar_kaynak_tipi ON dokumanlar (kaynak_tipi)",
+    )),
+    ("firmalar", """
+CREATE TABLE firmalar (
+    id SERIAL NOT NULL,
+    ad VARCHAR(255) NOT NULL,
+    kisa_ad VARCHAR(16),
+    adres TEXT,
+    il VARCHAR(100) NOT NULL,
+    ilce VARCHAR(100) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    telefon VARCHAR(20) NOT NULL,
+    vergi_dairesi VARCHAR(255),
+    vergi_no VARCHAR(20),
+    logo_url VARCHAR(500),
+    aktif BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id)
+)
+""", (
+        "CREATE INDEX ix_firmalar_id ON firmalar (id)",
+    )),
+    ("personeller", """
+CREATE TABLE personeller (
+    id SERIAL NOT NULL,
+    ad VARCHAR(100) NOT NULL,
+    soyad VARCHAR(100) NOT NULL,
+    tc_no VARCHAR(11),
+    telefon VARCHAR(20),
+    email VARCHAR(255),
+    unvan personelunvan NOT NULL,
+    uzmanlik_belgesi_no VARCHAR(100),
+    diploma_no VARCHAR(100),
+    uzmanlik_sinifi uzmanliksinifi,
+    brans VARCHAR(255),
+    ise_baslama_tarihi DATE,
+    kullanici_id INTEGER,
+    profil_foto_url VARCHAR(500),
+    aktif BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id)
+)
+""", (
+        "CREATE INDEX ix_personeller_id ON personeller (id)",
+        "CREATE INDEX ix_personeller_kullanici_id ON personeller (kullanici_id)",
+        "CREATE UNIQUE INDEX ix_personeller_tc_no ON personeller (tc_no)",
+        "CREATE INDEX ix_personeller_unvan ON personeller (unvan)",
+    )),
+    ("sayaclar", """
+CREATE TABLE sayaclar (
+    ad VARCHAR(50) NOT NULL,
+    deger INTEGER NOT NULL,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (ad)
+)
+""", (
+    )),
+    ("sema_versiyonu", """
+CREATE TABLE sema_versiyonu (
+    versiyon SERIAL NOT NULL,
+    ad VARCHAR(100) NOT NULL,
+    uygulama_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    sure_ms FLOAT,
+    PRIMARY KEY (versiyon)
+)
+""", (
+    )),
+    ("cari_hesaplar", """
+CREATE TABLE cari_hesaplar (
+    id SERIAL NOT NULL,
+    firma_id INTEGER,
+    hesap_adi VARCHAR(255) NOT NULL,
+    hesap_tipi VARCHAR(50),
+    bakiye FLOAT,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(firma_id) REFERENCES firmalar (id)
+)
+""", (
+        "CREATE INDEX ix_cari_hesaplar_id ON cari_hesaplar (id)",
+    )),
+    ("isyerleri", """
+CREATE TABLE isyerleri (
+    id SERIAL NOT NULL,
+    firma_id INTEGER NOT NULL,
+    ad VARCHAR(255) NOT NULL,
+    sgk_sicil_no VARCHAR(50) NOT NULL,
+    nace_kodu VARCHAR(10) NOT NULL,
+    nace_aciklama VARCHAR(500),
+    tehlike_sinifi tehlikesinifi NOT NULL,
+    ana_faaliyet VARCHAR(500),
+    isveren_ad VARCHAR(100) NOT NULL,
+    isveren_soyad VARCHAR(100) NOT NULL,
+    isveren_vekili_ad VARCHAR(100),
+    isveren_vekili_soyad VARCHAR(100),
+    isg_uzmani_id INTEGER,
+    isyeri_hekimi_id INTEGER,
+    dsp_id INTEGER,
+    hizmet_baslama DATE,
+    ucretlendirme FLOAT,
+    mali_musavir_ad VARCHAR(100),
+    mali_musavir_soyad VARCHAR(100),
+    mali_musavir_telefon VARCHAR(20),
+    mali_musavir_email VARCHAR(255),
+    koordinat_lat FLOAT,
+    koordinat_lng FLOAT,
+    lokasyon VARCHAR(500),
+    logo_url VARCHAR(500),
+    aktif BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(firma_id) REFERENCES firmalar (id)
+)
+""", (
+        "CREATE INDEX ix_isyerleri_id ON isyerleri (id)",
+    )),
+    ("bolumler", """
+CREATE TABLE bolumler (
+    id SERIAL NOT NULL,
+    isyeri_id INTEGER NOT NULL,
+    ad VARCHAR(255) NOT NULL,
+    aktif BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(isyeri_id) REFERENCES isyerleri (id)
+)
+""", (
+        "CREATE INDEX ix_bolumler_id ON bolumler (id)",
+    )),
+    ("calisanlar", """
+CREATE TABLE calisanlar (
+    id SERIAL NOT NULL,
+    isyeri_id INTEGER NOT NULL,
+    tc_no VARCHAR(11),
+    ad VARCHAR(100) NOT NULL,
+    soyad VARCHAR(100) NOT NULL,
+    telefon VARCHAR(20),
+    email VARCHAR(255),
+    dogum_tarihi DATE,
+    ise_giris_tarihi DATE,
+    gorev VARCHAR(255),
+    bolum VARCHAR(255),
+    kan_grubu VARCHAR(10),
+    profil_foto_url VARCHAR(500),
+    aktif BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(isyeri_id) REFERENCES isyerleri (id),
+    UNIQUE (tc_no)
+)
+""", (
+        "CREATE INDEX ix_calisanlar_id ON calisanlar (id)",
+    )),
+    ("faturalar", """
+CREATE TABLE faturalar (
+    id SERIAL NOT NULL,
+    firma_id INTEGER NOT NULL,
+    cari_hesap_id INTEGER,
+    fatura_no VARCHAR(50),
+    fatura_tipi VARCHAR(20),
+    fatura_tarihi DATE NOT NULL,
+    vade_tarihi DATE,
+    toplam_tutar FLOAT NOT NULL,
+    kdv_tutar FLOAT,
+    genel_toplam FLOAT NOT NULL,
+    odendi BOOLEAN,
+    aciklama TEXT,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(firma_id) REFERENCES firmalar (id),
+    FOREIGN KEY(cari_hesap_id) REFERENCES cari_hesaplar (id),
+    UNIQUE (fatura_no)
+)
+""", (
+        "CREATE INDEX ix_faturalar_id ON faturalar (id)",
+    )),
+    ("ziyaretler", """
+CREATE TABLE ziyaretler (
+    id SERIAL NOT NULL,
+    isyeri_id INTEGER NOT NULL,
+    ziyaretci_id INTEGER,
+    ziyaretci_adi VARCHAR(255),
+    ziyaret_tarihi TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    ziyaret_bitis TIMESTAMP WITHOUT TIME ZONE,
+    durum ziyaretdurumu,
+    notlar TEXT,
+    gps_lat FLOAT,
+    gps_lng FLOAT,
+    onaylandi BOOLEAN,
+    onaylayan_id INTEGER,
+    onay_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    isveren_bilgilendirildi BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(isyeri_id) REFERENCES isyerleri (id)
+)
+""", (
+        "CREATE INDEX ix_ziyaretler_id ON ziyaretler (id)",
+    )),
+    ("egitimler", """
+CREATE TABLE egitimler (
+    id SERIAL NOT NULL,
+    calisan_id INTEGER NOT NULL,
+    egitim_adi VARCHAR(500) NOT NULL,
+    egitim_tarihi DATE NOT NULL,
+    egitim_suresi FLOAT,
+    egitimci VARCHAR(255),
+    sertifika_no VARCHAR(100),
+    sertifika_url VARCHAR(500),
+    gecerlilik_tarihi DATE,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(calisan_id) REFERENCES calisanlar (id)
+)
+""", (
+        "CREATE INDEX ix_egitimler_id ON egitimler (id)",
+    )),
+    ("kkd_zimmetleri", """
+CREATE TABLE kkd_zimmetleri (
+    id SERIAL NOT NULL,
+    calisan_id INTEGER NOT NULL,
+    kkd_tipi kkdtipi NOT NULL,
+    kkd_aciklama VARCHAR(255),
+    teslim_tarihi DATE NOT NULL,
+    teslim_alan_imza BOOLEAN,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(calisan_id) REFERENCES calisanlar (id)
+)
+""", (
+        "CREATE INDEX ix_kkd_zimmetleri_id ON kkd_zimmetleri (id)",
+    )),
+)
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    for tur, degerler in TURLER.items():
+        if baglanti.execute(text("SELECT 1 FROM pg_type WHERE typname = :ad"), {"ad": tur}).scalar():
+            continue
+        etiketler = ", ".join(f"'{deger}'" for deger in degerler)
+        baglanti.execute(text(f"CREATE TYPE {tur} AS ENUM ({etiketler})"))
+    for tablo, tablo_sql, indeksler in TABLOLAR:
+        # create_all(checkfirst=True) gibi: var olan tablonun indekslerine de dokunulmaz
+        if baglanti.execute(text("SELECT to_regclass(:ad)"), {"ad": tablo}).scalar() is not None:
+            continue
+        baglanti.execute(text(tablo_sql))
+        for indeks_sql in indeksler:
+            baglanti.execute(text(indeks_sql))
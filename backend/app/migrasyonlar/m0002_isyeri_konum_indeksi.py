@@ -0,0 +1,39 @@
+"""Isyeri konumlari icin PostGIS geography indeksi
+
+PostGIS sunucuda kurulu degilse hicbir sey yapmaz; yakin/alan sorgulari
+bellekteki izgara indeksiyle calisir (bkz. app/services/mekansal_service.py).
+PostGIS sonradan kurulursa indeks "python tenant_cli.py sablon --yeniden"
+ile yeni OSGB'lere, elle KONUM_INDEKSI_SQL ile mevcutlara eklenir.
+
+DDL burada sabittir: mekansal_service sonradan degisse de bu adim ayni kalir.
+"""
+
+from sqlalchemy import text
+
+from app.core.logger import db_logger
+
+
+KONUM_INDEKSI_SQL = """
+CREATE INDEX IF NOT EXISTS ix_isyerleri_konum ON isyerleri USING gist ((
+    ST_SetSRID(ST_MakePoint(isyerleri.koordinat_lng, isyerleri.koordinat_lat), 4326)::geography
+))
+WHERE koordinat_lat IS NOT NULL AND koordinat_lng IS NOT NULL
+"""
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    mevcut = baglanti.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")
+    ).scalar()
+    if not mevcut:
+        return
+    try:
+        # Savepoint: CREATE EXTENSION yetki hatasi tum migrasyonu bozmasin
+        with baglanti.begin_nested():
+            baglanti.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    except Exception as e:
+        db_logger.warning(f"PostGIS eklentisi kurulamadi, izgara indeksi kullanilacak: {e}")
+        return
+    baglanti.execute(text(KONUM_INDEKSI_SQL))
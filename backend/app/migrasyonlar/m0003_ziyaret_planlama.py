@@ -0,0 +1,20 @@
+"""Ziyaret planlamasi: personel kapasitesi/konumu, ziyaret donemi ve suresi"""
+
+from sqlalchemy import text
+
+
+KOLONLAR_SQL = """
+ALTER TABLE personeller ADD COLUMN IF NOT EXISTS aylik_kapasite_dk INTEGER;
+ALTER TABLE personeller ADD COLUMN IF NOT EXISTS konum_lat FLOAT;
+ALTER TABLE personeller ADD COLUMN IF NOT EXISTS konum_lng FLOAT;
+ALTER TABLE ziyaretler ADD COLUMN IF NOT EXISTS personel_unvan personelunvan;
+ALTER TABLE ziyaretler ADD COLUMN IF NOT EXISTS sure_dk INTEGER;
+ALTER TABLE ziyaretler ADD COLUMN IF NOT EXISTS plan_donemi VARCHAR(7);
+CREATE INDEX IF NOT EXISTS ix_ziyaretler_plan_donemi ON ziyaretler (plan_donemi);
+"""
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    baglanti.execute(text(KOLONLAR_SQL))
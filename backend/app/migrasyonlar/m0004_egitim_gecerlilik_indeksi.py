@@ -0,0 +1,15 @@
+"""Egitim: gecerlilik tarihi ve calisan indeksleri (sure uyarisi taramasi)"""
+
+from sqlalchemy import text
+
+
+INDEKSLER_SQL = """
+CREATE INDEX IF NOT EXISTS ix_egitimler_gecerlilik_tarihi ON egitimler (gecerlilik_tarihi);
+CREATE INDEX IF NOT EXISTS ix_egitimler_calisan_id ON egitimler (calisan_id);
+"""
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    baglanti.execute(text(INDEKSLER_SQL))
@@ -0,0 +1,33 @@
+"""Dashboard KPI ozeti tablosu (satir ilk kullanimda / gece uzlastirmasinda dolar)"""
+
+from sqlalchemy import text
+
+
+TABLO_SQL = """
+CREATE TABLE IF NOT EXISTS kpi_ozeti (
+    id SERIAL NOT NULL,
+    firma_aktif INTEGER NOT NULL,
+    isyeri_aktif INTEGER NOT NULL,
+    isyeri_az_tehlikeli INTEGER NOT NULL,
+    isyeri_tehlikeli INTEGER NOT NULL,
+    isyeri_cok_tehlikeli INTEGER NOT NULL,
+    calisan_aktif INTEGER NOT NULL,
+    ziyaret_yaklasan INTEGER NOT NULL,
+    ziyaret_geciken INTEGER NOT NULL,
+    egitim_suresi_dolacak INTEGER NOT NULL,
+    egitim_suresi_gecmis INTEGER NOT NULL,
+    fatura_odenmemis INTEGER NOT NULL,
+    fatura_odenmemis_tutar FLOAT NOT NULL,
+    fatura_vadesi_gecmis INTEGER NOT NULL,
+    gun DATE,
+    guncelleme_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    uzlastirma_tarihi TIMESTAMP WITHOUT TIME ZONE,
+    PRIMARY KEY (id)
+)
+"""
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    baglanti.execute(text(TABLO_SQL))
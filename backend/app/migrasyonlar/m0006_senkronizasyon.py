@@ -0,0 +1,86 @@
+"""Mobil senkronizasyon: degisim_no kolonlari, degisiklik sayaci ve tetikleyicileri, push islem kaydi
+
+Mevcut kayitlarin hepsi tek bir degisim numarasi alir: istemcinin ilk
+(since'siz) senkronizasyonu onlari da getirir.
+
+DDL burada sabittir: sync_service sonradan degisse de bu adim ayni kalir.
+Aciklamalar: app/services/sync_service.py
+"""
+
+from sqlalchemy import text
+
+
+TABLOLAR = ("firmalar", "isyerleri", "calisanlar", "personeller", "dokumanlar")
+
+ISLEM_TABLOSU_SQL = """
+CREATE TABLE IF NOT EXISTS sync_islemleri (
+    islem_id VARCHAR(64) NOT NULL PRIMARY KEY,
+    tablo VARCHAR(20) NOT NULL,
+    kayit_id INTEGER,
+    kullanici_id INTEGER,
+    olusturma_tarihi TIMESTAMP WITHOUT TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS ix_sync_islemleri_olusturma_tarihi ON sync_islemleri (olusturma_tarihi);
+"""
+
+FONKSIYON_SQL = """
+CREATE OR REPLACE FUNCTION degisim_no_ayir() RETURNS bigint AS $$
+DECLARE
+    numara bigint := nullif(current_setting('osgb.degisim_no', true), '')::bigint;
+BEGIN
+    IF numara IS NULL THEN
+        UPDATE sayaclar SET deger = deger + 1, guncelleme_tarihi = (now() AT TIME ZONE 'utc')
+            WHERE ad = 'degisim' RETURNING deger INTO numara;
+        IF numara IS NOT NULL THEN
+            PERFORM set_config('osgb.degisim_no', numara::text, true);
+        END IF;
+    END IF;
+    RETURN numara;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION degisim_ifade() RETURNS trigger AS $$
+BEGIN
+    PERFORM degisim_no_ayir();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION degisim_satir() RETURNS trigger AS $$
+BEGIN
+    NEW.degisim_no := degisim_no_ayir();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TETIKLEYICI_SQL = """
+DROP TRIGGER IF EXISTS degisim_ifade ON {tablo};
+CREATE TRIGGER degisim_ifade
+    BEFORE INSERT OR UPDATE ON {tablo}
+    FOR EACH STATEMENT EXECUTE FUNCTION degisim_ifade();
+DROP TRIGGER IF EXISTS degisim_satir ON {tablo};
+CREATE TRIGGER degisim_satir
+    BEFORE INSERT OR UPDATE ON {tablo}
+    FOR EACH ROW EXECUTE FUNCTION degisim_satir();
+"""
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    for tablo in TABLOLAR:
+        baglanti.execute(text(f"ALTER TABLE {tablo} ADD COLUMN IF NOT EXISTS degisim_no BIGINT"))
+    baglanti.execute(text(ISLEM_TABLOSU_SQL))
+    baglanti.execute(text(
+        "INSERT INTO sayaclar (ad, deger, guncelleme_tarihi) "
+        "VALUES ('degisim', 0, now() AT TIME ZONE 'utc') ON CONFLICT (ad) DO NOTHING"
+    ))
+    baglanti.execute(text(FONKSIYON_SQL))
+    for tablo in TABLOLAR:
+        baglanti.execute(text(TETIKLEYICI_SQL.format(tablo=tablo)))
+        # Eski kayitlar: tetikleyici tek bir degisim numarasi yazar
+        baglanti.execute(text(f"UPDATE {tablo} SET degisim_no = NULL WHERE degisim_no IS NULL"))
+    # Indeks doldurduktan sonra: satir satir indeks guncellemekten hizli
+    for tablo in TABLOLAR:
+        baglanti.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{tablo}_degisim_no ON {tablo} (degisim_no)"))
@@ -0,0 +1,23 @@
+"""Isyeri: planlamanin atadigi personel icin ayri kolonlar (kullanici ID'lerinden ayrildi)"""
+
+from sqlalchemy import text
+
+
+# (eski kolon: kullanici ID, yeni kolon: personel ID)
+_KOLONLAR = (
+    ("isg_uzmani_id", "isg_uzmani_personel_id"),
+    ("isyeri_hekimi_id", "isyeri_hekimi_personel_id"),
+    ("dsp_id", "dsp_personel_id"),
+)
+
+
+def uygula(baglanti):
+    if baglanti.dialect.name != "postgresql":
+        return
+    for kullanici_kolonu, personel_kolonu in _KOLONLAR:
+        baglanti.execute(text(f"ALTER TABLE isyerleri ADD COLUMN IF NOT EXISTS {personel_kolonu} INTEGER"))
+        # Mevcut atama: kullanici hesabina bagli personel bulunursa tasinir
+        baglanti.execute(text(
+            f"UPDATE isyerleri i SET {personel_kolonu} = p.id FROM personeller p "
+            f"WHERE i.{personel_kolonu} IS NULL AND p.kullanici_id = i.{kullanici_kolonu}"
+        ))
@@ -0,0 +1,27 @@
+"""Dashboard KPI ozeti: tek satiri onceden olustur (ilk yazimlar satiri olusturmak icin yarismasin)"""
+
+from sqlalchemy import text
+
+
+def uygula(baglanti):
+    # Sayac kolonlari burada sayilir. Tarihe bagli kolonlar gun bos kaldigi
+    # icin ilk GET /dashboard'da hesaplanir; gece uzlastirmasi hepsini duzeltir.
+    baglanti.execute(text("""
+        INSERT INTO kpi_ozeti (
+            id, firma_aktif, isyeri_aktif, isyeri_az_tehlikeli, isyeri_tehlikeli,
+            isyeri_cok_tehlikeli, calisan_aktif, ziyaret_yaklasan, ziyaret_geciken,
+            egitim_suresi_dolacak, egitim_suresi_gecmis, fatura_odenmemis,
+            fatura_odenmemis_tutar, fatura_vadesi_gecmis, guncelleme_tarihi
+        )
+        SELECT
+            1,
+            (SELECT count(*) FROM firmalar WHERE aktif),
+            (SELECT count(*) FROM isyerleri WHERE aktif),
+            (SELECT count(*) FROM isyerleri WHERE aktif AND tehlike_sinifi = 'AZ_TEHLIKELI'),
+            (SELECT count(*) FROM isyerleri WHERE aktif AND tehlike_sinifi = 'TEHLIKELI'),
+            (SELECT count(*) FROM isyerleri WHERE aktif AND tehlike_sinifi = 'COK_TEHLIKELI'),
+            (SELECT count(*) FROM calisanlar WHERE aktif),
+            0, 0, 0, 0, 0, 0, 0,
+            now() AT TIME ZONE 'utc'
+        ON CONFLICT (id) DO NOTHING
+    """))
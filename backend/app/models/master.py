@@ -18,6 +18,10 @@ from sqlalchemy import (
     ForeignKey,     # Baska tabloya referans (iliski)
     Enum,           # Secenekli tip (admin, uzman, hekim...)
     JSON,           # JSON veri tipi (esnek veri saklama)
+    Float,          # Ondalikli sayi (koordinat)
+    Date,           # Sadece tarih (son gecerlilik gunu)
+    Index,          # Birden fazla kolonlu indeks
+    text,           # Kismi indeks kosulu (WHERE ...)
 )
 from sqlalchemy.orm import relationship  # Tablolar arasi iliski
 
@@ -157,6 +161,10 @@ class Kullanici(Base):
     email_dogrulandi = Column(Boolean, default=False)
     son_giris = Column(DateTime)
 
+    # Token versiyonu: artirilinca kullanicinin TUM oturumlari gecersiz olur
+    # (sifre degisikligi, hesabi kapatma, "tum cihazlardan cikis")
+    token_versiyon = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Sistem alanlari
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
     guncelleme_tarihi = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -165,6 +173,38 @@ class Kullanici(Base):
         return f"<Kullanici(id={self.id}, email='{self.email}', rol='{self.rol}')>"
 
 
+# ---- YENILEME (REFRESH) TOKEN TABLOSU ----
+class RefreshToken(Base):
+    """
+    📚 DERS: Uzun omurlu oturum anahtari.
+
+    Access token kisa omurludur (dakikalar) ve DB'ye bakmadan dogrulanir.
+    Suresi dolunca istemci refresh token ile yenisini alir.
+
+    - Token'in kendisi DEGIL, SHA-256 hash'i saklanir (DB sizsa bile kullanilamaz)
+    - Her yenilemede eski token iptal edilir, yenisi verilir (rotation)
+    - Ayni girisden dogan tokenlar ayni "aile"dir. Iptal edilmis bir token
+      tekrar gelirse (calinmis olabilir) tum aile iptal edilir.
+    """
+    __tablename__ = "refresh_tokenlar"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kullanici_id = Column(Integer, ForeignKey("kullanicilar.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
+    aile_id = Column(String(32), nullable=False, index=True)
+
+    olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
+    son_kullanma = Column(DateTime, nullable=False)
+    iptal_tarihi = Column(DateTime, nullable=True)  # Doluysa kullanilamaz
+
+    # Hangi cihaz? (oturum listesi / supheli kullanim icin)
+    ip_adresi = Column(String(50))
+    user_agent = Column(String(500))
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, kullanici_id={self.kullanici_id}, aile='{self.aile_id}')>"
+
+
 # ---- ISLEM LOG (AUDIT LOG) TABLOSU ----
 class IslemLogEnum(str, enum.Enum):
     """Log islem turleri"""
@@ -239,3 +279,96 @@ class IslemLog(Base):
 
     def __repr__(self):
         return f"<IslemLog(id={self.id}, islem='{self.islem_turu}', kullanici='{self.kullanici_email}')>"
+
+
+# ---- PLATFORM OZET TABLOSU ----
+class PlatformOzet(Base):
+    """
+    📚 DERS: Tum OSGB'lerin toplu istatistikleri (onbellek tablo).
+
+    Her OSGB'nin kendi veritabani oldugu icin "platformda kac calisan var?"
+    sorusu TUM veritabanlarina gitmeyi gerektirir. Bunu her dashboard
+    acilisinda yapmak yerine zamanlayici periyodik olarak hesaplar ve
+    buraya yazar; dashboard tek tablo okur.
+    (bkz. app/services/analitik_service.py)
+
+    Ornek kayitlar:
+    sorgu="calisan", tenant_id=5,    veri={"aktif": 120, "toplam": 134}
+    sorgu="calisan", tenant_id=None, veri={"aktif": 48210, ...}  <- platform toplami
+
+    Her (sorgu, tenant_id) icin tek satir olur. PostgreSQL'de NULL'lar
+    birbirinden farkli sayildigi icin toplam satiri ayri bir kismi indeksle korunur.
+    """
+    __tablename__ = "platform_ozet"
+    __table_args__ = (
+        Index("uq_platform_ozet_sorgu_tenant", "sorgu", "tenant_id", unique=True),
+        Index(
+            "uq_platform_ozet_sorgu_toplam", "sorgu", unique=True,
+            postgresql_where=text("tenant_id IS NULL"),
+            sqlite_where=text("tenant_id IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    sorgu = Column(String(50), nullable=False, index=True)
+    tenant_id = Column(Integer, nullable=True, index=True)  # None = tum platform
+
+    veri = Column(JSON)                       # Sorgu sonucu (son basarili hesaplama)
+    hata = Column(Text, nullable=True)        # Son denemede hata/zaman asimi olduysa
+    eksik = Column(JSON, nullable=True)       # Toplam satiri: verisi eski/eksik OSGB id'leri
+    sure_ms = Column(Integer)
+    hesaplama_tarihi = Column(DateTime)       # veri'nin hesaplandigi an
+
+
+# ---- GEOKOD ONBELLEGI ----
+class GeokodOnbellek(Base):
+    """
+    📚 DERS: Adres -> koordinat onbellegi (tum OSGB'ler ortak).
+
+    Ayni adres bir daha saglayiciya (Nominatim) sorulmaz: adres sadelestirilip
+    (kucuk harf, Turkce karaktersiz, tek bosluk) anahtar yapilir.
+    Bulunamayan adresler de saklanir (lat/lng bos) ki her toplu islemde
+    tekrar sorulmasin; GEOKOD_BULUNAMADI_TEKRAR_GUN sonra yeniden denenir.
+    (bkz. app/services/geokod_service.py)
+    """
+    __tablename__ = "geokod_onbellek"
+
+    id = Column(Integer, primary_key=True)
+    adres_anahtari = Column(String(500), nullable=False, unique=True, index=True)
+    adres = Column(String(500), nullable=False)   # Ilk sorulan hali (okunabilirlik icin)
+    lat = Column(Float, nullable=True)            # None = bulunamadi
+    lng = Column(Float, nullable=True)
+    saglayici = Column(String(50), nullable=False)
+    sorgu_tarihi = Column(DateTime, default=datetime.utcnow)
+
+
+# ---- SURE UYARILARI ----
+class SureUyarisi(Base):
+    """
+    📚 DERS: Suresi dolmak uzere olan kayitlar (onbellek tablo).
+
+    "Hangi calisanin egitim sertifikasinin suresi doluyor?" sorusu her
+    dashboard acilisinda hesaplanmaz: zamanlayici tum OSGB'leri paralel
+    tarar (her birinde tek indeksli aralik sorgusu) ve sonucu buraya
+    yazar. GET /api/v1/uyarilar sadece bu tabloyu okur.
+    Bir OSGB o turda yanit veremezse onceki satirlari kalir.
+    (bkz. app/services/uyari_service.py)
+    """
+    __tablename__ = "sure_uyarilari"
+    __table_args__ = (
+        Index("ix_sure_uyarilari_tenant_son_tarih", "tenant_id", "son_tarih"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, nullable=False)
+    tur = Column(String(30), nullable=False)      # "egitim"
+    kayit_id = Column(Integer, nullable=False)    # OSGB DB'sindeki kaydin id'si (egitimler.id)
+    baslik = Column(String(500))                  # Egitim adi
+    son_tarih = Column(Date, nullable=False)      # gecerlilik_tarihi
+
+    calisan_id = Column(Integer)
+    calisan_adi = Column(String(255))
+    isyeri_id = Column(Integer)
+    isyeri_adi = Column(String(255))
+
+    hesaplama_tarihi = Column(DateTime, default=datetime.utcnow)
@@ -6,8 +6,8 @@
 
 from datetime import datetime, date
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Date,
-    Text, Float, ForeignKey, Enum, Table,
+    Column, Integer, BigInteger, String, Boolean, DateTime, Date,
+    Text, Float, ForeignKey, Enum, Table, FetchedValue,
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -90,6 +90,9 @@ class Firma(Base):
     aktif = Column(Boolean, default=True)
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
     guncelleme_tarihi = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Mobil senkronizasyon: son degisikligin sira numarasi (tetikleyici yazar,
+    # bkz. app/services/sync_service.py)
+    degisim_no = Column(BigInteger, index=True, server_default=FetchedValue(), server_onupdate=FetchedValue())
 
     # Iliskiler
     isyerleri = relationship("Isyeri", back_populates="firma")
@@ -134,6 +137,11 @@ class Isyeri(Base):
     isyeri_hekimi_id = Column(Integer)    # Atanan hekim
     dsp_id = Column(Integer)              # Atanan DSP
 
+    # Ziyaret planlamasinin atadigi personel (personel ID'leri, bkz. ziyaret_plan_service)
+    isg_uzmani_personel_id = Column(Integer)
+    isyeri_hekimi_personel_id = Column(Integer)
+    dsp_personel_id = Column(Integer)
+
     # Hizmet bilgileri
     hizmet_baslama = Column(Date)          # ISG hizmet sozlesmesi tarihi
     ucretlendirme = Column(Float)          # Aylik ucret
@@ -156,6 +164,7 @@ class Isyeri(Base):
     aktif = Column(Boolean, default=True)
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
     guncelleme_tarihi = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    degisim_no = Column(BigInteger, index=True, server_default=FetchedValue(), server_onupdate=FetchedValue())  # Senkronizasyon sirasi
 
     # Iliskiler
     bolumler = relationship("Bolum", back_populates="isyeri")
@@ -223,6 +232,7 @@ class Calisan(Base):
     aktif = Column(Boolean, default=True)
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
     guncelleme_tarihi = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    degisim_no = Column(BigInteger, index=True, server_default=FetchedValue(), server_onupdate=FetchedValue())  # Senkronizasyon sirasi
 
     # Iliskiler
     egitimler = relationship("Egitim", back_populates="calisan")
@@ -262,6 +272,9 @@ class Personel(Base):
 
     # Calisma bilgileri
     ise_baslama_tarihi = Column(Date)
+    aylik_kapasite_dk = Column(Integer)              # Bos = tam sureli (PERSONEL_AYLIK_KAPASITE_DK)
+    konum_lat = Column(Float)                        # Ziyaretlere ciktigi yer (ev/ofis)
+    konum_lng = Column(Float)
 
     # Kullanici baglantisi (opsiyonel - sisteme giris yapabilir)
     kullanici_id = Column(Integer, index=True)
@@ -273,6 +286,7 @@ class Personel(Base):
     aktif = Column(Boolean, default=True)
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
     guncelleme_tarihi = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    degisim_no = Column(BigInteger, index=True, server_default=FetchedValue(), server_onupdate=FetchedValue())  # Senkronizasyon sirasi
 
     def __repr__(self):
         return f"<Personel(id={self.id}, ad='{self.ad} {self.soyad}', unvan='{self.unvan}')>"
@@ -287,7 +301,7 @@ class Egitim(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    calisan_id = Column(Integer, ForeignKey("calisanlar.id"), nullable=False)
+    calisan_id = Column(Integer, ForeignKey("calisanlar.id"), nullable=False, index=True)
     calisan = relationship("Calisan", back_populates="egitimler")
 
     egitim_adi = Column(String(500), nullable=False)
@@ -296,7 +310,7 @@ class Egitim(Base):
     egitimci = Column(String(255))             # Egitimi veren kisi
     sertifika_no = Column(String(100))
     sertifika_url = Column(String(500))        # Dosya yolu
-    gecerlilik_tarihi = Column(Date)           # Ne zamana kadar gecerli
+    gecerlilik_tarihi = Column(Date, index=True)  # Ne zamana kadar gecerli (uyari taramasi aralik sorgusu)
 
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
 
@@ -341,12 +355,17 @@ class Ziyaret(Base):
     isyeri = relationship("Isyeri", back_populates="ziyaretler")
 
     # Ziyaret bilgileri
-    ziyaretci_id = Column(Integer)             # Ziyareti yapan ISG profesyoneli
+    ziyaretci_id = Column(Integer)             # Ziyareti yapan ISG profesyoneli (personel ID)
     ziyaretci_adi = Column(String(255))
     ziyaret_tarihi = Column(DateTime, nullable=False)
     ziyaret_bitis = Column(DateTime)
     durum = Column(Enum(ZiyaretDurumu), default=ZiyaretDurumu.PLANLANDI)
 
+    # Planlama (bkz. app/services/ziyaret_plan_service.py)
+    personel_unvan = Column(Enum(PersonelUnvan))   # Hangi hizmet icin (uzman / hekim / DSP)
+    sure_dk = Column(Integer)                      # Planlanan sure
+    plan_donemi = Column(String(7), index=True)    # "2026-11"; elle eklenen ziyarette bos
+
     # Ziyaret detaylari
     notlar = Column(Text)                       # Ziyaret notlari
     gps_lat = Column(Float)                     # Check-in lokasyonu
@@ -404,6 +423,7 @@ class Dokuman(Base):
     # Durum
     aktif = Column(Boolean, default=True)
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
+    degisim_no = Column(BigInteger, index=True, server_default=FetchedValue(), server_onupdate=FetchedValue())  # Senkronizasyon sirasi
 
     def __repr__(self):
         return f"<Dokuman(id={self.id}, dosya='{self.dosya_adi}', kaynak='{self.kaynak_tipi}:{self.kaynak_id}')>"
@@ -447,3 +467,102 @@ class Fatura(Base):
     aciklama = Column(Text)
 
     olusturma_tarihi = Column(DateTime, default=datetime.utcnow)
+
+
+# =============================================
+# SISTEM TABLOLARI
+# =============================================
+class Sayac(Base):
+    """
+    📚 DERS: Onbellekli sayaclar (abonelik limitleri icin).
+
+    "Kac aktif isyeri var?" sorusunu her eklemede COUNT(*) ile sormak
+    yerine sayi burada tutulur ve ekleme/silme ile AYNI transaction'da
+    guncellenir (bkz. app/services/limit_service.py).
+
+    Ornek kayit: ad="isyeri", deger=42
+    """
+    __tablename__ = "sayaclar"
+
+    ad = Column(String(50), primary_key=True)
+    deger = Column(Integer, nullable=False, default=0)
+    guncelleme_tarihi = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class KpiOzeti(Base):
+    """
+    📚 DERS: Dashboard KPI'lari (tek satir, id=1).
+
+    GET /api/v1/dashboard her acilista tablolari saymaz; bu satiri okur.
+    Sayac kolonlari (firma, isyeri, calisan) yazan endpoint'in transaction'inda
+    artirilir/azaltilir; tarihe bagli kolonlar (ziyaret, egitim, fatura) gun
+    donunce ve ilgili kayit degisince yeniden hesaplanir. Gece uzlastirmasi
+    hepsini gercek sayimla duzeltir (bkz. app/services/kpi_service.py).
+    """
+    __tablename__ = "kpi_ozeti"
+
+    id = Column(Integer, primary_key=True)
+
+    firma_aktif = Column(Integer, nullable=False, default=0)
+    isyeri_aktif = Column(Integer, nullable=False, default=0)
+    isyeri_az_tehlikeli = Column(Integer, nullable=False, default=0)
+    isyeri_tehlikeli = Column(Integer, nullable=False, default=0)
+    isyeri_cok_tehlikeli = Column(Integer, nullable=False, default=0)
+    calisan_aktif = Column(Integer, nullable=False, default=0)
+
+    ziyaret_yaklasan = Column(Integer, nullable=False, default=0)   # Planli, onumuzdeki KPI_YAKLASAN_GUN icinde
+    ziyaret_geciken = Column(Integer, nullable=False, default=0)    # Planli, tarihi gecmis
+    egitim_suresi_dolacak = Column(Integer, nullable=False, default=0)
+    egitim_suresi_gecmis = Column(Integer, nullable=False, default=0)
+    fatura_odenmemis = Column(Integer, nullable=False, default=0)
+    fatura_odenmemis_tutar = Column(Float, nullable=False, default=0.0)
+    fatura_vadesi_gecmis = Column(Integer, nullable=False, default=0)
+
+    gun = Column(Date)                          # Tarihe bagli kolonlarin hesaplandigi gun
+    guncelleme_tarihi = Column(DateTime, default=datetime.utcnow)
+    uzlastirma_tarihi = Column(DateTime)        # Son tam sayim (gece uzlastirmasi)
+
+
+class SyncIslemi(Base):
+    """
+    📚 DERS: Mobil istemcinin uyguladigimiz push islemleri.
+
+    Istemci yaniti alamazsa (baglanti koptu) ayni islemi tekrar gonderir.
+    islem_id istemcinin urettigi benzersiz anahtardir: burada varsa islem
+    ikinci kez uygulanmaz, ilk sonuc doner (cift kayit olusmaz).
+    """
+    __tablename__ = "sync_islemleri"
+
+    islem_id = Column(String(64), primary_key=True)
+    tablo = Column(String(20), nullable=False)
+    kayit_id = Column(Integer)                   # Eklenen / degistirilen kayit
+    kullanici_id = Column(Integer)
+    olusturma_tarihi = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class SemaVersiyonu(Base):
+    """
+    📚 DERS: Bu veritabanina hangi migrasyonlar uygulandi?
+
+    Her uygulanan migrasyon icin bir satir (bkz. app/migrasyonlar/).
+    Migrasyon yarida kesilirse tekrar calistirildiginda sadece
+    burada OLMAYANLAR uygulanir.
+    """
+    __tablename__ = "sema_versiyonu"
+
+    versiyon = Column(Integer, primary_key=True)
+    ad = Column(String(100), nullable=False)
+    uygulama_tarihi = Column(DateTime, default=datetime.utcnow)
+    sure_ms = Column(Float)
+
+
+# Her OSGB veritabaninda bulunan tablolar.
+# 📚 DERS: Master ve tenant modelleri ayni Base'i paylasir; create_all(bind=...)
+# tek basina master tablolarini (kullanicilar, tenants...) da kurardi.
+TENANT_TABLOLARI = [
+    model.__table__
+    for model in (
+        Firma, Isyeri, Bolum, Calisan, Personel, Egitim, KKDZimmet,
+        Ziyaret, Dokuman, CariHesap, Fatura, Sayac, KpiOzeti, SyncIslemi, SemaVersiyonu,
+    )
+]
@@ -42,17 +42,35 @@ class TokenResponse(BaseModel):
     {
         "access_token": "eyJhbGciOiJ...",  # JWT token (uzun sifreli metin)
         "token_type": "bearer",             # Token tipi (her zaman "bearer")
+        "expires_in": 900,                  # Access token kac saniye gecerli
+        "refresh_token": "x7Gk...",         # Yeni access token almak icin
         "kullanici": { ... }                # Kullanici bilgileri
     }
 
-    Frontend bu token'i saklayip her istekte gonderir:
+    Frontend access token'i her istekte gonderir:
     Authorization: Bearer eyJhbGciOiJ...
+    Suresi dolunca (401) refresh token ile POST /auth/yenile cagirir.
+    Her yenilemede YENI bir refresh token doner, eskisi gecersiz olur.
     """
     access_token: str
     token_type: str = "bearer"
+    expires_in: int
+    refresh_token: str
     kullanici: "KullaniciBilgi"
 
 
+# ---- TOKEN YENILEME / CIKIS ----
+class YenileRequest(BaseModel):
+    """POST /auth/yenile"""
+    refresh_token: str
+
+
+class CikisRequest(BaseModel):
+    """POST /auth/cikis"""
+    refresh_token: Optional[str] = None  # Verilirse bu cihazin oturumu kapanir
+    tum_cihazlar: bool = False           # True: kullanicinin tum oturumlari kapanir
+
+
 # ---- KULLANICI BILGI ----
 class KullaniciBilgi(BaseModel):
     """
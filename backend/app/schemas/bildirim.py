@@ -0,0 +1,16 @@
+# =============================================
+# BILDIRIM SCHEMALARI (Pydantic)
+# =============================================
+#
+# DuyuruIstegi: OSGB yoneticisinin tum acik oturumlara gonderdigi duyuru
+
+from pydantic import BaseModel, Field
+
+
+class DuyuruIstegi(BaseModel):
+    """
+    {
+        "mesaj": "Saat 17:00'de sistem bakimi yapilacak"
+    }
+    """
+    mesaj: str = Field(..., min_length=1, max_length=500)
@@ -9,8 +9,9 @@
 # CalisanCreate: Yeni calisan olustururken gereken alanlar
 # CalisanUpdate: Calisan guncellerken degisebilecek alanlar
 # CalisanResponse: API'nin dondurdugu calisan bilgisi
+# CalisanSecimi: Toplu islemlerde (egitim, KKD) hedef calisanlar
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, model_validator
 from typing import Optional
 from datetime import datetime, date
 
@@ -98,3 +99,22 @@ class CalisanListResponse(BaseModel):
     """Calisan listesi yaniti (sayfalama ile)"""
     toplam: int
     calisanlar: list[CalisanResponse]
+
+
+class CalisanSecimi(BaseModel):
+    """
+    Toplu islemin hedefi: id listesi YA DA filtre (isyeri + bolum).
+    Filtre sadece aktif calisanlari secer.
+
+    {"calisan_idleri": [3, 5, 8]}
+    {"isyeri_id": 2, "bolum": "Uretim"}
+    """
+    calisan_idleri: Optional[list[int]] = None
+    isyeri_id: Optional[int] = None
+    bolum: Optional[str] = None
+
+    @model_validator(mode="after")
+    def en_az_bir_kosul(self):
+        if not self.calisan_idleri and not self.isyeri_id and not self.bolum:
+            raise ValueError("calisan_idleri, isyeri_id veya bolum belirtilmeli")
+        return self
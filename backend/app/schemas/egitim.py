@@ -0,0 +1,86 @@
+# =============================================
+# EGITIM SCHEMALARI (Pydantic)
+# Calisan egitim kayitlari (tekil + toplu)
+# =============================================
+#
+# EgitimCreate: Tek calisana egitim kaydi
+# EgitimTopluCreate: Ayni egitimi bir calisan grubuna tek seferde yaz
+# EgitimUpdate: Degisebilecek alanlar
+# EgitimResponse: API'nin dondurdugu egitim bilgisi
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, date
+
+from app.schemas.calisan import CalisanSecimi
+
+
+class EgitimBilgisi(BaseModel):
+    """Tekil ve toplu kayitta ortak egitim alanlari."""
+    egitim_adi: str = Field(..., min_length=1, max_length=500)
+    egitim_tarihi: date
+    egitim_suresi: Optional[float] = Field(None, ge=0)   # Saat
+    egitimci: Optional[str] = None
+    gecerlilik_tarihi: Optional[date] = None
+
+
+class EgitimCreate(EgitimBilgisi):
+    """
+    {
+        "calisan_id": 12,
+        "egitim_adi": "Temel ISG Egitimi",
+        "egitim_tarihi": "2026-10-01",
+        "egitim_suresi": 8,
+        "gecerlilik_tarihi": "2027-10-01"
+    }
+    """
+    calisan_id: int
+    sertifika_no: Optional[str] = None
+
+
+class EgitimTopluCreate(EgitimBilgisi):
+    """
+    Bir egitim oturumu (orn. 200 kisilik Temel ISG):
+    {
+        "calisanlar": {"isyeri_id": 2, "bolum": "Uretim"},
+        "egitim_adi": "Temel ISG Egitimi",
+        "egitim_tarihi": "2026-10-01",
+        "gecerlilik_tarihi": "2027-10-01"
+    }
+    Ayni calisana ayni gun ayni egitim zaten yazilmissa atlanir.
+    """
+    calisanlar: CalisanSecimi
+
+
+class EgitimUpdate(BaseModel):
+    """Tum alanlar opsiyonel - sadece degisenleri gonder."""
+    egitim_adi: Optional[str] = None
+    egitim_tarihi: Optional[date] = None
+    egitim_suresi: Optional[float] = None
+    egitimci: Optional[str] = None
+    sertifika_no: Optional[str] = None
+    gecerlilik_tarihi: Optional[date] = None
+
+
+class EgitimResponse(BaseModel):
+    """API'nin dondurdugu egitim bilgisi."""
+    id: int
+    calisan_id: int
+    calisan_adi: Optional[str] = None   # Listede calisan adi (join)
+
+    egitim_adi: str
+    egitim_tarihi: date
+    egitim_suresi: Optional[float] = None
+    egitimci: Optional[str] = None
+    sertifika_no: Optional[str] = None
+    sertifika_url: Optional[str] = None
+    gecerlilik_tarihi: Optional[date] = None
+    olusturma_tarihi: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class EgitimListResponse(BaseModel):
+    """Egitim listesi yaniti (sayfalama ile)"""
+    toplam: int
+    egitimler: list[EgitimResponse]
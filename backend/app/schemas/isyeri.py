@@ -25,18 +25,20 @@ class IsyeriCreate(BaseModel):
         "firma_id": 1,
         "ad": "Merkez Fabrika",
         "sgk_sicil_no": "1234567",
-        "nace_kodu": "251100",
-        "tehlike_sinifi": "tehlikeli",
+        "nace_kodu": "25.11.01",
         "isveren_ad": "Ahmet",
         "isveren_soyad": "Yilmaz"
     }
+
+    tehlike_sinifi gondermeye gerek yok: gonderilmezse NACE listesinden
+    bulunur, gonderilirse o kullanilir (bkz. app/services/nace_service.py).
     """
     firma_id: int                                  # Hangi firmaya ait (zorunlu)
     ad: str                                        # Isyeri adi (zorunlu)
     sgk_sicil_no: str                              # SGK sicil numarasi (zorunlu)
     nace_kodu: str                                 # 6 haneli NACE kodu (zorunlu)
     nace_aciklama: Optional[str] = None            # NACE kodu aciklamasi
-    tehlike_sinifi: str                            # az_tehlikeli / tehlikeli / cok_tehlikeli (zorunlu)
+    tehlike_sinifi: Optional[str] = None           # Bos = NACE listesinden (listede yoksa zorunlu)
     ana_faaliyet: Optional[str] = None             # Ana faaliyet alani
 
     # Isveren bilgileri
@@ -139,3 +141,24 @@ class IsyeriListResponse(BaseModel):
     """Isyeri listesi yaniti (sayfalama ile)"""
     toplam: int
     isyerleri: list[IsyeriResponse]
+
+
+class IsyeriKonumResponse(BaseModel):
+    """
+    Yakin / harita sorgularinin hafif isyeri kaydi.
+    mesafe_m: yakin sorgusunda noktaya, alan sorgusunda alanin merkezine (metre).
+    """
+    id: int
+    ad: str
+    firma_id: int
+    tehlike_sinifi: str
+    lokasyon: Optional[str] = None
+    koordinat_lat: float
+    koordinat_lng: float
+    mesafe_m: float
+
+
+class IsyeriKonumListResponse(BaseModel):
+    toplam: int
+    kaynak: str                         # "postgis" veya "izgara" (bellekteki indeks)
+    isyerleri: list[IsyeriKonumResponse]
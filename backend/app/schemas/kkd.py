@@ -0,0 +1,70 @@
+# =============================================
+# KKD ZIMMET SCHEMALARI (Pydantic)
+# Kisisel koruyucu donanim teslim kayitlari (tekil + toplu)
+# =============================================
+#
+# KKDZimmetCreate: Tek calisana zimmet
+# KKDZimmetTopluCreate: Ayni KKD'yi bir calisan grubuna (orn. bolum) tek seferde zimmetle
+# KKDZimmetUpdate: Degisebilecek alanlar
+# KKDZimmetResponse: API'nin dondurdugu zimmet bilgisi
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, date
+
+from app.schemas.calisan import CalisanSecimi
+
+
+class KKDBilgisi(BaseModel):
+    """Tekil ve toplu kayitta ortak zimmet alanlari."""
+    kkd_tipi: str                          # "baret", "eldiven", "gozluk", ...
+    kkd_aciklama: Optional[str] = Field(None, max_length=255)   # "3M 6200 Maske"
+    teslim_tarihi: date
+    teslim_alan_imza: bool = False
+
+
+class KKDZimmetCreate(KKDBilgisi):
+    calisan_id: int
+
+
+class KKDZimmetTopluCreate(KKDBilgisi):
+    """
+    Bir bolumun tamamina dagitim:
+    {
+        "calisanlar": {"isyeri_id": 2, "bolum": "Kaynak"},
+        "kkd_tipi": "gozluk",
+        "kkd_aciklama": "Kaynak gozlugu",
+        "teslim_tarihi": "2026-10-19"
+    }
+    Ayni calisana ayni gun ayni tip zaten zimmetlenmisse atlanir.
+    """
+    calisanlar: CalisanSecimi
+
+
+class KKDZimmetUpdate(BaseModel):
+    """Tum alanlar opsiyonel - sadece degisenleri gonder."""
+    kkd_tipi: Optional[str] = None
+    kkd_aciklama: Optional[str] = None
+    teslim_tarihi: Optional[date] = None
+    teslim_alan_imza: Optional[bool] = None
+
+
+class KKDZimmetResponse(BaseModel):
+    """API'nin dondurdugu zimmet bilgisi."""
+    id: int
+    calisan_id: int
+    calisan_adi: Optional[str] = None   # Listede calisan adi (join)
+
+    kkd_tipi: str
+    kkd_aciklama: Optional[str] = None
+    teslim_tarihi: date
+    teslim_alan_imza: Optional[bool] = None
+    olusturma_tarihi: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class KKDZimmetListResponse(BaseModel):
+    """Zimmet listesi yaniti (sayfalama ile)"""
+    toplam: int
+    zimmetler: list[KKDZimmetResponse]
@@ -0,0 +1,50 @@
+# =============================================
+# KULLANICI SCHEMALARI (Pydantic)
+# OSGB'ye yeni kullanici (uzman, hekim, DSP...) ekleme
+# =============================================
+
+from pydantic import BaseModel, EmailStr, Field
+from typing import Literal, Optional
+from datetime import datetime
+
+
+class KullaniciOlustur(BaseModel):
+    """
+    📚 DERS: Yeni kullanici istegi.
+
+    {
+        "email": "ayse@abcosgb.com",
+        "sifre": "gizli123",
+        "ad": "Ayse",
+        "soyad": "Demir",
+        "rol": "isg_uzmani"
+    }
+
+    sistem_admin rolu buradan verilemez. tenant_id sadece sistem_admin
+    icin anlamlidir; OSGB yoneticisi her zaman kendi OSGB'sine ekler.
+    """
+    email: EmailStr
+    sifre: str = Field(min_length=6)
+    ad: str
+    soyad: str
+    telefon: Optional[str] = None
+    unvan: Optional[str] = None
+    rol: Literal["osgb_yoneticisi", "isg_uzmani", "isyeri_hekimi", "dsp", "isveren"]
+    tenant_id: Optional[int] = None
+
+
+class KullaniciResponse(BaseModel):
+    """API'nin dondurdugu kullanici bilgisi (sifre hash'i yok)"""
+    id: int
+    email: str
+    ad: str
+    soyad: str
+    telefon: Optional[str] = None
+    unvan: Optional[str] = None
+    rol: str
+    tenant_id: Optional[int] = None
+    aktif: bool
+    son_giris: Optional[datetime] = None
+    olusturma_tarihi: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
@@ -10,7 +10,7 @@
 # PersonelUpdate: Personel guncellerken degisebilecek alanlar
 # PersonelResponse: API'nin dondurdugu personel bilgisi
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime, date
 
@@ -45,6 +45,11 @@ class PersonelCreate(BaseModel):
     ise_baslama_tarihi: Optional[date] = None
     kullanici_id: Optional[int] = None
 
+    # Ziyaret planlamasi
+    aylik_kapasite_dk: Optional[int] = Field(None, ge=0)  # Bos = tam sureli
+    konum_lat: Optional[float] = Field(None, ge=-90, le=90)
+    konum_lng: Optional[float] = Field(None, ge=-180, le=180)
+
 
 class PersonelUpdate(BaseModel):
     """
@@ -65,6 +70,11 @@ class PersonelUpdate(BaseModel):
 
     ise_baslama_tarihi: Optional[date] = None
     kullanici_id: Optional[int] = None
+
+    # Ziyaret planlamasi
+    aylik_kapasite_dk: Optional[int] = Field(None, ge=0)  # Bos = tam sureli
+    konum_lat: Optional[float] = Field(None, ge=-90, le=90)
+    konum_lng: Optional[float] = Field(None, ge=-180, le=180)
     aktif: Optional[bool] = None
 
 
@@ -88,6 +98,11 @@ class PersonelResponse(BaseModel):
     ise_baslama_tarihi: Optional[date] = None
     kullanici_id: Optional[int] = None
 
+    # Ziyaret planlamasi
+    aylik_kapasite_dk: Optional[int] = None
+    konum_lat: Optional[float] = None
+    konum_lng: Optional[float] = None
+
     profil_foto_url: Optional[str] = None
 
     aktif: bool
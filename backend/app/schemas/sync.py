@@ -0,0 +1,43 @@
+# =============================================
+# SENKRONIZASYON SCHEMALARI (Pydantic)
+# Mobil istemcinin cevrimdisiyken biriktirdigi degisiklikler
+# =============================================
+#
+# SyncDegisikligi: Tek kayit uzerinde tek islem (ekle / guncelle / sil)
+# SyncGonderimi: Bir push istegindeki degisiklikler (sirayla uygulanir)
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, Literal, Optional
+
+
+class SyncDegisikligi(BaseModel):
+    """
+    {
+        "islem_id": "5b1c9f0e-...",     (istemcinin urettigi benzersiz anahtar)
+        "tablo": "calisan",
+        "islem": "guncelle",
+        "id": 42,                        (ekle'de bos)
+        "temel_no": 1530,                (kaydin istemcideki degisim_no'su)
+        "veri": {"telefon": "0532 111 2233"}
+    }
+
+    veri, REST'teki Create (ekle) / Update (guncelle) schemasiyla ayni alanlari
+    tasir. Ayni push'ta once eklenen bir kayda baglanmak icin *_id alanina
+    o eklemenin islem_id'si yazilabilir: {"isyeri_id": "5b1c9f0e-..."}
+    """
+    islem_id: str = Field(..., min_length=8, max_length=64)
+    tablo: Literal["firma", "isyeri", "calisan", "personel"]
+    islem: Literal["ekle", "guncelle", "sil"]
+    id: Optional[int] = None
+    temel_no: Optional[int] = None
+    veri: Dict[str, Any] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def kayit_belirtilmeli(self):
+        if self.islem != "ekle" and self.id is None:
+            raise ValueError("guncelle ve sil icin id belirtilmeli")
+        return self
+
+
+class SyncGonderimi(BaseModel):
+    degisiklikler: list[SyncDegisikligi] = Field(..., min_length=1)
@@ -0,0 +1,75 @@
+# =============================================
+# TENANT (OSGB) SCHEMALARI (Pydantic)
+# Sistem admininin yeni OSGB kurmasi icin veri yapilari
+# =============================================
+
+from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class TenantOlustur(BaseModel):
+    """
+    📚 DERS: Yeni OSGB kurma istegi.
+
+    {
+        "ad": "ABC OSGB Ltd.",
+        "subdomain": "abc",              -> abc.osgbyazilim.com, veritabani osgb_abc
+        "email": "info@abcosgb.com",
+        "yonetici_email": "ali@abcosgb.com",
+        "yonetici_sifre": "gizli123",
+        "yonetici_ad": "Ali",
+        "yonetici_soyad": "Yilmaz"
+    }
+    """
+    ad: str
+    subdomain: str
+    email: Optional[EmailStr] = None
+    telefon: Optional[str] = None
+    adres: Optional[str] = None
+    il: Optional[str] = None
+    ilce: Optional[str] = None
+    vergi_dairesi: Optional[str] = None
+    vergi_no: Optional[str] = None
+    max_isyeri: int = 50
+    max_kullanici: int = Field(10, ge=1)            # Yonetici de bir kullanicidir
+    deneme_gun: Optional[int] = Field(None, ge=1)   # Bos = TENANT_DENEME_GUN
+
+    # OSGB'nin ilk kullanicisi (osgb_yoneticisi rolunde)
+    yonetici_email: EmailStr
+    yonetici_sifre: str = Field(min_length=6)
+    yonetici_ad: str
+    yonetici_soyad: str
+
+
+class TenantDurum(BaseModel):
+    """OSGB'yi devre disi birakma / yeniden acma: {"aktif": false}"""
+    aktif: bool
+
+
+class TenantResponse(BaseModel):
+    """API'nin dondurdugu OSGB bilgisi"""
+    id: int
+    ad: str
+    subdomain: Optional[str] = None
+    db_name: str
+    email: Optional[str] = None
+    telefon: Optional[str] = None
+    il: Optional[str] = None
+    ilce: Optional[str] = None
+    abonelik_durum: Optional[str] = None
+    abonelik_baslangic: Optional[datetime] = None
+    abonelik_bitis: Optional[datetime] = None
+    max_isyeri: Optional[int] = None
+    max_kullanici: Optional[int] = None
+    aktif: bool
+    olusturma_tarihi: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class TenantOlusturYanit(BaseModel):
+    """Yeni OSGB kuruldu: bilgileri ve adim adim sureler (ms)"""
+    tenant: TenantResponse
+    yonetici_email: str
+    sureler: Dict[str, float]
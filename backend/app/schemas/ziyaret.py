@@ -0,0 +1,76 @@
+# =============================================
+# ZIYARET SCHEMALARI (Pydantic)
+# Isyeri ziyaretleri ve aylik ziyaret plani
+# =============================================
+#
+# ZiyaretPlanIstegi: Plan olusturma istegi (donem + istege bagli isyerleri)
+# ZiyaretRotaIstegi: Gunun ziyaret sirasini optimize edip saatlere yazma istegi
+# ZiyaretUpdate: Ziyaret guncellerken degisebilecek alanlar
+# ZiyaretResponse: API'nin dondurdugu ziyaret bilgisi
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import date, datetime
+
+
+class ZiyaretPlanIstegi(BaseModel):
+    """
+    Frontend su JSON'u gonderir:
+    {
+        "donem": "2026-11",
+        "isyeri_idleri": [3, 7]      (bos = tum isyerleri)
+    }
+    """
+    donem: str = Field(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$")
+    isyeri_idleri: Optional[list[int]] = None
+
+
+class ZiyaretRotaIstegi(BaseModel):
+    """
+    {
+        "gun": "2026-11-03",
+        "ziyaretci_id": 5            (bos = o gunun tum personeli)
+    }
+    """
+    gun: date
+    ziyaretci_id: Optional[int] = None
+
+
+class ZiyaretUpdate(BaseModel):
+    """Tum alanlar opsiyonel - sadece degisenleri gonder."""
+    ziyaretci_id: Optional[int] = None
+    ziyaret_tarihi: Optional[datetime] = None
+    ziyaret_bitis: Optional[datetime] = None
+    durum: Optional[str] = None          # "planlandi", "tamamlandi", "iptal", "ertelendi"
+    notlar: Optional[str] = None
+    gps_lat: Optional[float] = None
+    gps_lng: Optional[float] = None
+
+
+class ZiyaretResponse(BaseModel):
+    """API'nin dondurdugu ziyaret bilgisi."""
+    id: int
+    isyeri_id: int
+    ziyaretci_id: Optional[int] = None
+    ziyaretci_adi: Optional[str] = None
+    ziyaret_tarihi: datetime
+    ziyaret_bitis: Optional[datetime] = None
+    durum: Optional[str] = None
+
+    personel_unvan: Optional[str] = None
+    sure_dk: Optional[int] = None
+    plan_donemi: Optional[str] = None
+
+    notlar: Optional[str] = None
+    gps_lat: Optional[float] = None
+    gps_lng: Optional[float] = None
+    onaylandi: Optional[bool] = None
+    olusturma_tarihi: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class ZiyaretListResponse(BaseModel):
+    """Ziyaret listesi yaniti (sayfalama ile)"""
+    toplam: int
+    ziyaretler: list[ZiyaretResponse]
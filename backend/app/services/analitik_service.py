@@ -0,0 +1,343 @@
+# =============================================
+# PLATFORM ANALITIGI (tum OSGB'ler uzerinde toplu sorgu)
+# "Platformda kac aktif calisan var?" -> her OSGB DB'sine paralel sor, topla
+# =============================================
+#
+# 📚 DERS: Fan-out / fan-in
+# Her OSGB'nin ayri veritabani var; tek SQL ile hepsini sayamayiz.
+#   fan-out : ayni sorguyu N veritabanina AYNI ANDA gonder (thread havuzu)
+#   fan-in  : gelen sonuclari birlestir (sayilari topla)
+#
+# Yavas/erisilemeyen bir OSGB tum raporu bekletmesin:
+#   - Her sorguya statement_timeout (PostgreSQL sorguyu kendisi keser)
+#   - Toplam bekleme ANALITIK_ZAMAN_ASIMI_SN; yetismeyenler "eksik" isaretlenir
+#   -> Sonuc KISMI olabilir, hangi OSGB'lerin eksik oldugu yazilir
+#
+# Dashboard her acilista bunu yapmaz: zamanlayici ozetleri_yenile()'yi
+# periyodik calistirir, sonuclar master'daki platform_ozet tablosuna yazilir.
+# Bir OSGB o turda yanit veremezse onceki basarili verisi kullanilir.
+#
+# Yeni sorgu eklemek:
+#   @analitik_sorgusu("egitim", "Egitim sayilari")
+#   def _egitim(db: Session) -> dict:
+#       return {"toplam": db.query(func.count(Egitim.id)).scalar()}
+# Donen sozlukteki sayilar tum OSGB'ler icin toplanir (ic ice sozlukler dahil).
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import MasterSessionLocal, get_tenant_engine, master_engine
+from app.core.logger import db_logger
+from app.models.master import PlatformOzet
+from app.models.tenant import (
+    Calisan, Firma, Isyeri, TehlikeSinifi, Ziyaret, ZiyaretDurumu,
+)
+from app.services.tenant_dizini import TenantKaydi, tenant_dizini
+
+
+AnalitikSorgusu = Callable[[Session], dict]
+
+# ad -> (fonksiyon, aciklama)
+ANALITIK_SORGULARI: Dict[str, tuple] = {}
+
+# Ayni anda calisan toplam OSGB sorgusu sinirli: her biri bir tenant
+# baglantisi tutar. Tum fan-out'lar ayni havuzu paylasir.
+_havuz = ThreadPoolExecutor(max_workers=settings.ANALITIK_PARALEL, thread_name_prefix="analitik")
+
+# Birden fazla worker ayni anda yenilemesin (master DB'de oturum kilidi)
+_YENILEME_KILIT_ANAHTARI = 0x05B6_7E03
+
+
+def analitik_sorgusu(ad: str, aciklama: str):
+    """Sorguyu kayit defterine ekleyen dekorator."""
+    def kaydet(fonk: AnalitikSorgusu) -> AnalitikSorgusu:
+        ANALITIK_SORGULARI[ad] = (fonk, aciklama)
+        return fonk
+    return kaydet
+
+
+# =============================================
+# KAYITLI SORGULAR (tek OSGB icin calisir)
+# =============================================
+@analitik_sorgusu("firma", "Aktif firma sayisi")
+def _firma(db: Session) -> dict:
+    return {"aktif": db.query(func.count(Firma.id)).filter(Firma.aktif == True).scalar() or 0}  # noqa: E712
+
+
+@analitik_sorgusu("isyeri", "Aktif isyerleri ve tehlike sinifi dagilimi")
+def _isyeri(db: Session) -> dict:
+    dagilim = {s.value: 0 for s in TehlikeSinifi}
+    satirlar = (
+        db.query(Isyeri.tehlike_sinifi, func.count(Isyeri.id))
+        .filter(Isyeri.aktif == True)  # noqa: E712
+        .group_by(Isyeri.tehlike_sinifi)
+    )
+    for sinif, adet in satirlar:
+        dagilim[sinif.value] = adet
+    return {"aktif": sum(dagilim.values()), "tehlike_sinifi": dagilim}
+
+
+@analitik_sorgusu("calisan", "Calisan sayilari")
+def _calisan(db: Session) -> dict:
+    toplam, aktif = db.query(
+        func.count(Calisan.id),
+        func.coalesce(func.sum(case((Calisan.aktif == True, 1), else_=0)), 0),  # noqa: E712
+    ).one()
+    return {"toplam": toplam, "aktif": int(aktif)}
+
+
+@analitik_sorgusu("ziyaret", "Ziyaretler: duruma gore ve son 30 gun")
+def _ziyaret(db: Session) -> dict:
+    son_30 = datetime.utcnow() - timedelta(days=30)
+    durumlar = {d.value: 0 for d in ZiyaretDurumu}
+    son_30_gun = 0
+    satirlar = db.query(
+        Ziyaret.durum,
+        func.count(Ziyaret.id),
+        func.sum(case((Ziyaret.ziyaret_tarihi >= son_30, 1), else_=0)),
+    ).group_by(Ziyaret.durum)
+    for durum, adet, son in satirlar:
+        if durum is not None:
+            durumlar[durum.value] = adet
+        son_30_gun += int(son or 0)
+    return {"toplam": sum(durumlar.values()), "son_30_gun": son_30_gun, "durum": durumlar}
+
+
+# =============================================
+# FAN-OUT / FAN-IN
+# =============================================
+def _topla(hedef: dict, kaynak: dict) -> None:
+    for anahtar, deger in kaynak.items():
+        if isinstance(deger, dict):
+            _topla(hedef.setdefault(anahtar, {}), deger)
+        elif isinstance(deger, (int, float)) and not isinstance(deger, bool):
+            hedef[anahtar] = hedef.get(anahtar, 0) + deger
+
+
+def sonuclari_birlestir(sonuclar: Iterable[dict]) -> dict:
+    """[{"aktif": 3}, {"aktif": 5}] -> {"aktif": 8} (ic ice sozlukler dahil)"""
+    toplam: dict = {}
+    for sonuc in sonuclar:
+        _topla(toplam, sonuc)
+    return toplam
+
+
+def _tenant_sorgula(kayit: TenantKaydi, fonk: AnalitikSorgusu, zaman_asimi_ms: int) -> tuple:
+    baslangic = perf_counter()
+    # Engine kaydindaki havuz kullanilir: ayni OSGB'ye yeni TCP baglantisi acilmaz
+    with Session(get_tenant_engine(kayit.db_name)) as db:
+        # SET LOCAL: sadece bu transaction icin; baglanti havuza temiz doner
+        db.execute(text(f"SET LOCAL statement_timeout = {zaman_asimi_ms}"))
+        veri = fonk(db)
+        db.rollback()  # salt okunur
+    return veri, (perf_counter() - baslangic) * 1000
+
+
+def tenantlara_dagit(
+    fonk: Callable[[Session], object],
+    tenantlar: Optional[List[TenantKaydi]] = None,
+    zaman_asimi_sn: Optional[float] = None,
+) -> tuple:
+    """
+    fonk(db)'yi tum (aktif) OSGB'lerde paralel calistirir (sonunda rollback;
+    yazan fonksiyon kendisi commit eder - bkz. kpi_service).
+    Donus: (sonuclar, sureler_ms, hatalar) - hepsi tenant_id ile anahtarli.
+    Kayitli sorgular disindaki tarayicilar da (bkz. uyari_service) bunu kullanir.
+    """
+    if tenantlar is None:
+        tenantlar = [t for t in tenant_dizini.tumu() if t.aktif]
+    zaman_asimi_sn = zaman_asimi_sn or settings.ANALITIK_ZAMAN_ASIMI_SN
+
+    isler = {
+        _havuz.submit(_tenant_sorgula, kayit, fonk, int(zaman_asimi_sn * 1000)): kayit
+        for kayit in tenantlar
+    }
+    bitenler, bitmeyenler = wait(isler, timeout=zaman_asimi_sn)
+
+    sonuclar: Dict[int, object] = {}
+    sureler: Dict[int, float] = {}
+    hatalar: Dict[int, str] = {}
+    for is_ in bitmeyenler:
+        # Henuz baslamadiysa iptal olur; basladiysa statement_timeout keser
+        is_.cancel()
+        hatalar[isler[is_].id] = "zaman asimi"
+    for is_ in bitenler:
+        kayit = isler[is_]
+        try:
+            sonuclar[kayit.id], sureler[kayit.id] = is_.result()
+        except Exception as e:
+            hatalar[kayit.id] = str(e).splitlines()[0] if str(e) else type(e).__name__
+    return sonuclar, sureler, hatalar
+
+
+def dagit(
+    sorgu_adi: str,
+    tenantlar: Optional[List[TenantKaydi]] = None,
+    zaman_asimi_sn: Optional[float] = None,
+) -> dict:
+    """
+    Kayitli sorguyu tum (aktif) OSGB'lerde paralel calistirir.
+
+    Donus:
+    {
+        "sorgu": "calisan",
+        "toplam": {...},                 # yanit veren OSGB'lerin toplami
+        "tenantlar": {5: {...}, ...},    # OSGB bazinda sonuc
+        "sureler": {5: 12.3, ...},       # ms
+        "hatalar": {7: "zaman asimi"},   # yanit vermeyenler
+        "eksik": True/False,
+        "sure_ms": 154.2,
+    }
+    """
+    if sorgu_adi not in ANALITIK_SORGULARI:
+        raise KeyError(sorgu_adi)
+    fonk = ANALITIK_SORGULARI[sorgu_adi][0]
+    if tenantlar is None:
+        tenantlar = [t for t in tenant_dizini.tumu() if t.aktif]
+    baslangic = perf_counter()
+
+    sonuclar, sureler, hatalar = tenantlara_dagit(fonk, tenantlar, zaman_asimi_sn)
+
+    if hatalar:
+        db_logger.warning(f"Analitik '{sorgu_adi}': {len(hatalar)}/{len(tenantlar)} OSGB yanit vermedi {hatalar}")
+
+    return {
+        "sorgu": sorgu_adi,
+        "toplam": sonuclari_birlestir(sonuclar.values()),
+        "tenantlar": sonuclar,
+        "sureler": {tid: round(ms, 1) for tid, ms in sureler.items()},
+        "hatalar": hatalar,
+        "eksik": bool(hatalar),
+        "sure_ms": round((perf_counter() - baslangic) * 1000, 1),
+    }
+
+
+# =============================================
+# PLATFORM_OZET TABLOSU
+# =============================================
+def _ozetleri_yaz(tenantlar: List[TenantKaydi], sonuclar: Dict[str, dict]) -> dict:
+    """
+    Fan-out sonuclarini platform_ozet'e yazar (tek transaction):
+    - OSGB satiri: yanit verdiyse yeni veri, vermediyse eski veri kalir + hata
+    - Toplam satiri (tenant_id=None): OSGB satirlarinin son verilerinin toplami
+    """
+    aktif_idler = {t.id for t in tenantlar}
+    rapor = {}
+    db = MasterSessionLocal()
+    try:
+        for ad, sonuc in sonuclar.items():
+            simdi = datetime.utcnow()
+            mevcut = {s.tenant_id: s for s in db.query(PlatformOzet).filter(PlatformOzet.sorgu == ad)}
+
+            # Silinmis / pasife alinmis OSGB'lerin satirlari toplama girmesin
+            for tenant_id, satir in list(mevcut.items()):
+                if tenant_id is not None and tenant_id not in aktif_idler:
+                    db.delete(satir)
+                    del mevcut[tenant_id]
+
+            for kayit in tenantlar:
+                satir = mevcut.get(kayit.id)
+                if satir is None:
+                    satir = mevcut[kayit.id] = PlatformOzet(sorgu=ad, tenant_id=kayit.id)
+                    db.add(satir)
+                if kayit.id in sonuc["tenantlar"]:
+                    satir.veri = sonuc["tenantlar"][kayit.id]
+                    satir.hata = None
+                    satir.sure_ms = int(sonuc["sureler"][kayit.id])
+                    satir.hesaplama_tarihi = simdi
+                else:
+                    satir.hata = sonuc["hatalar"].get(kayit.id, "yanit yok")
+
+            tenant_satirlari = [s for tid, s in mevcut.items() if tid is not None]
+            eksik = sorted(s.tenant_id for s in tenant_satirlari if s.hata)
+            toplam = mevcut.get(None)
+            if toplam is None:
+                toplam = PlatformOzet(sorgu=ad, tenant_id=None)
+                db.add(toplam)
+            toplam.veri = sonuclari_birlestir(s.veri for s in tenant_satirlari if s.veri)
+            toplam.eksik = eksik
+            toplam.hata = f"{len(eksik)} OSGB guncel degil" if eksik else None
+            toplam.sure_ms = int(sonuc["sure_ms"])
+            toplam.hesaplama_tarihi = simdi
+
+            rapor[ad] = {"sure_ms": sonuc["sure_ms"], "eksik": eksik}
+        db.commit()
+    finally:
+        db.close()
+    return rapor
+
+
+def ozetleri_yenile(sorgu_adlari: Optional[Iterable[str]] = None) -> dict:
+    """
+    📚 DERS: Zamanlayicinin calistirdigi gorev.
+
+    Her sorgu icin fan-out yapar ve sonuclari platform_ozet'e yazar (_ozetleri_yaz).
+    Donus: {"calisan": {"sure_ms": ..., "eksik": [7]}, ...} veya {"atlandi": True}
+
+    📚 DERS: Kilit ve transaction ayri
+    Fan-out saniyeler surebilir. Bu surede master'da transaction acik
+    kalsin istemeyiz (vacuum'u ve baglanti havuzunu bekletir). Bu yuzden:
+    - Kilit: oturum seviyesinde advisory lock, AUTOCOMMIT bir baglantida
+      (transaction acmadan tutulur, finally'de birakilir)
+    - Yazma: tum sonuclar toplandiktan sonra kisa tek bir transaction
+    """
+    kilit = master_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        if not kilit.execute(
+            text("SELECT pg_try_advisory_lock(:k)"), {"k": _YENILEME_KILIT_ANAHTARI}
+        ).scalar():
+            return {"atlandi": True}
+        try:
+            tenantlar = [t for t in tenant_dizini.tumu() if t.aktif]
+            sonuclar = {ad: dagit(ad, tenantlar) for ad in (sorgu_adlari or list(ANALITIK_SORGULARI))}
+            rapor = _ozetleri_yaz(tenantlar, sonuclar)
+        finally:
+            kilit.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _YENILEME_KILIT_ANAHTARI})
+    finally:
+        kilit.close()
+
+    db_logger.info(
+        "Platform ozeti yenilendi: "
+        + ", ".join(f"{ad} {r['sure_ms']:.0f}ms" + (f" ({len(r['eksik'])} eksik)" if r["eksik"] else "")
+                    for ad, r in rapor.items())
+    )
+    return rapor
+
+
+def platform_ozeti(db: Session, tenant_detay: bool = False) -> dict:
+    """Dashboard icin: platform_ozet tablosunu okur (OSGB veritabanlarina gidilmez)."""
+    sorgu = db.query(PlatformOzet)
+    if not tenant_detay:
+        sorgu = sorgu.filter(PlatformOzet.tenant_id.is_(None))
+
+    ozet: Dict[str, dict] = {}
+    detaylar: Dict[str, list] = {}
+    for satir in sorgu:
+        if satir.tenant_id is None:
+            ozet[satir.sorgu] = {
+                "veri": satir.veri,
+                "hesaplama_tarihi": satir.hesaplama_tarihi,
+                "eksik_tenantlar": satir.eksik or [],
+            }
+        else:
+            kayit = tenant_dizini.id_ile(satir.tenant_id)
+            detaylar.setdefault(satir.sorgu, []).append({
+                "tenant_id": satir.tenant_id,
+                "tenant_ad": kayit.ad if kayit else None,
+                "veri": satir.veri,
+                "hata": satir.hata,
+                "sure_ms": satir.sure_ms,
+                "hesaplama_tarihi": satir.hesaplama_tarihi,
+            })
+
+    if tenant_detay:
+        for ad, liste in detaylar.items():
+            ozet.setdefault(ad, {"veri": None, "hesaplama_tarihi": None, "eksik_tenantlar": []})
+            ozet[ad]["tenantlar"] = sorted(liste, key=lambda d: d["tenant_id"])
+    return ozet
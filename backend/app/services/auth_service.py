@@ -15,35 +15,75 @@
 # - Test yazmasi kolay olur
 # - Kod daha okunabilir olur
 
-from datetime import datetime
+import math
+import secrets
+from datetime import datetime, timedelta
+from time import time
+from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
-from app.models.master import Kullanici, Tenant
-from app.core.security import sifre_dogrula, token_olustur
+from app.models.master import Kullanici, RefreshToken, RolEnum
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.rate_limit import giris_email_sinirlayici, giris_ip_sinirlayici
+from app.core.security import (
+    sifre_dogrula_ve_guncelle, erisim_tokeni_olustur,
+    yenileme_tokeni_uret, yenileme_tokeni_hashle,
+)
+from app.core.token_iptal import jti_iptal_et, kullanici_iptal_et
+from app.services.tenant_dizini import TenantKaydi, tenant_dizini
 from app.schemas.auth import KullaniciBilgi, TokenResponse
 
 
-def kullanici_giris(email: str, sifre: str, db: Session) -> TokenResponse:
+def giris_siniri_kontrol(ip: str, email: str) -> None:
+    """
+    📚 DERS: Giris denemesi sinirlamasi (bcrypt'ten ONCE).
+
+    IP ve email kovalarindan jeton alinir. Biri bossa 429 Too Many
+    Requests + Retry-After (saniye) doner; sifre hic kontrol edilmez.
+    """
+    bekle = max(
+        giris_ip_sinirlayici.al(ip),
+        giris_email_sinirlayici.al(email.strip().lower()),
+    )
+    if bekle > 0:
+        logger.warning(f"Giris sinirina takildi: {email} ({ip}), {bekle:.0f}s bekleyecek")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Cok fazla giris denemesi. Lutfen biraz sonra tekrar deneyin.",
+            headers={"Retry-After": str(math.ceil(bekle))},
+        )
+
+
+async def kullanici_giris(
+    email: str,
+    sifre: str,
+    db: Session,
+    ip: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    subdomain_tenant: Optional[TenantKaydi] = None,
+) -> TokenResponse:
     """
     📚 DERS: Kullanici giris islemi.
 
     Adimlar:
     1. Email ile kullaniciyi bul
-    2. Sifre dogru mu kontrol et
+    2. Sifre dogru mu kontrol et (bcrypt havuzunda, event loop kilitlenmez)
     3. Kullanici aktif mi kontrol et
-    4. JWT token olustur
-    5. Token + kullanici bilgilerini dondur
+    4. Access token (kisa) + refresh token (uzun) olustur
+    5. Token'lar + kullanici bilgilerini dondur
 
     Herhangi bir adimda hata olursa HTTPException firlatir.
+
+    📚 DERS: Fonksiyon async ama Session senkron.
+    DB isleri (1, 4, 5) run_in_threadpool ile thread havuzunda yapilir;
+    event loop sadece beklerken diger istekleri islemeye devam eder.
     """
 
     # ---- 1. KULLANICIYI BUL ----
-    kullanici = db.query(Kullanici).filter(
-        Kullanici.email == email
-    ).first()
-    # .filter() = SQL'deki WHERE
-    # .first()  = Ilk sonucu getir (ya da None)
+    kullanici = await run_in_threadpool(kullanici_bul, db, email)
 
     if not kullanici:
         # 📚 DERS: Guvenlik icin "email bulunamadi" DEMIYORUZ.
@@ -55,13 +95,19 @@ def kullanici_giris(email: str, sifre: str, db: Session) -> TokenResponse:
         )
 
     # ---- 2. SIFRE KONTROL ----
-    if not sifre_dogrula(sifre, kullanici.sifre_hash):
+    dogru, yeni_hash = await sifre_dogrula_ve_guncelle(sifre, kullanici.sifre_hash)
+    if not dogru:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email veya sifre hatali",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # 📚 DERS: Sifre dogruysa ve hash eski ayarlarla (dusuk BCRYPT_ROUNDS)
+    # uretilmisse, duz sifre elimizdeyken yenisi yazilir. Kullanici fark etmez.
+    if yeni_hash:
+        kullanici.sifre_hash = yeni_hash
+
     # ---- 3. AKTIFLIK KONTROL ----
     if not kullanici.aktif:
         raise HTTPException(
@@ -69,36 +115,101 @@ def kullanici_giris(email: str, sifre: str, db: Session) -> TokenResponse:
             detail="Hesabiniz devre disi birakilmis",
         )
 
-    # ---- 4. TENANT BILGISI ----
-    # Sistem admin icin tenant yok (null)
-    # OSGB kullanicilari icin tenant bilgisi lazim
-    tenant_ad = None
-    db_name = None
+    # abc.osgbyazilim.com adresinden sadece ABC OSGB'sinin kullanicilari girer
+    # (sistem admin her adresten girebilir)
+    if (
+        subdomain_tenant is not None
+        and kullanici.tenant_id != subdomain_tenant.id
+        and kullanici.rol != RolEnum.SISTEM_ADMIN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email veya sifre hatali",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # ---- 4-5. TOKEN'LAR + SON GIRIS TARIHI (ve varsa yeni hash) ----
+    return await run_in_threadpool(_giris_tamamla, db, kullanici, ip, user_agent)
 
-    if kullanici.tenant_id:
-        tenant = db.query(Tenant).filter(
-            Tenant.id == kullanici.tenant_id
-        ).first()
-        if tenant:
-            tenant_ad = tenant.ad
-            db_name = tenant.db_name
-
-    # ---- 5. JWT TOKEN OLUSTUR ----
-    # Token icine koyacagimiz bilgiler
-    token_verisi = {
-        "sub": kullanici.email,           # sub = subject (kim?)
-        "user_id": kullanici.id,
-        "rol": kullanici.rol.value,       # .value: Enum'un string degeri
-        "tenant_id": kullanici.tenant_id,
-        "db_name": db_name,
-    }
-    access_token = token_olustur(token_verisi)
-
-    # ---- 6. SON GIRIS TARIHINI GUNCELLE ----
+
+def kullanici_bul(db: Session, email: str) -> Optional[Kullanici]:
+    """Email ile kullanici (yoksa None)."""
+    return db.query(Kullanici).filter(
+        Kullanici.email == email
+    ).first()
+    # .filter() = SQL'deki WHERE
+    # .first()  = Ilk sonucu getir (ya da None)
+
+
+def _giris_tamamla(
+    db: Session,
+    kullanici: Kullanici,
+    ip: Optional[str],
+    user_agent: Optional[str],
+) -> TokenResponse:
+    """Yeni oturum (yeni refresh token ailesi) acar ve son girisi yazar."""
+    yanit = _oturum_ac(db, kullanici, aile_id=secrets.token_hex(16), ip=ip, user_agent=user_agent)
     kullanici.son_giris = datetime.utcnow()
     db.commit()
+    return yanit
+
+
+def _tenant_bilgisi(kullanici: Kullanici) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (tenant_ad, db_name) - sistem admin icin tenant yok (None, None).
+    OSGB'si devre disi birakilmis ya da bulunamayan kullaniciya oturum
+    acilmaz (403): db_name'siz token her tenant endpoint'inde patlar.
+    """
+    if not kullanici.tenant_id:
+        return None, None
+    # Master DB yerine bellekteki dizin (bkz. tenant_dizini.py); dizinde
+    # yoksa id_ile master DB'den bir kez daha okur
+    tenant = tenant_dizini.id_ile(kullanici.tenant_id)
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="OSGB hesabi bulunamadi",
+        )
+    if not tenant.aktif:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="OSGB hesabi devre disi",
+        )
+    return tenant.ad, tenant.db_name
+
+
+def _oturum_ac(
+    db: Session,
+    kullanici: Kullanici,
+    aile_id: str,
+    ip: Optional[str],
+    user_agent: Optional[str],
+) -> TokenResponse:
+    """
+    Access + refresh token uretir, refresh token'in hash'ini DB'ye ekler.
+    commit cagirana aittir.
+    """
+    tenant_ad, db_name = _tenant_bilgisi(kullanici)
+    simdi = datetime.utcnow()
+
+    # Kullanicinin suresi dolmus eski refresh kayitlarini temizle
+    # (iptal edilmis ama suresi dolmamislar kalir: tekrar kullanim tespiti icin)
+    db.query(RefreshToken).filter(
+        RefreshToken.kullanici_id == kullanici.id,
+        RefreshToken.son_kullanma < simdi,
+    ).delete(synchronize_session=False)
+
+    refresh_token, refresh_hash = yenileme_tokeni_uret()
+    db.add(RefreshToken(
+        kullanici_id=kullanici.id,
+        token_hash=refresh_hash,
+        aile_id=aile_id,
+        olusturma_tarihi=simdi,
+        son_kullanma=simdi + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ip_adresi=ip,
+        user_agent=(user_agent or "")[:500],
+    ))
 
-    # ---- 7. YANIT OLUSTUR ----
     kullanici_bilgi = KullaniciBilgi(
         id=kullanici.id,
         email=kullanici.email,
@@ -111,7 +222,142 @@ def kullanici_giris(email: str, sifre: str, db: Session) -> TokenResponse:
     )
 
     return TokenResponse(
-        access_token=access_token,
+        access_token=erisim_tokeni_olustur(kullanici, db_name),
         token_type="bearer",
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_token,
         kullanici=kullanici_bilgi,
     )
+
+
+def _aileyi_iptal_et(db: Session, aile_id: str) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.aile_id == aile_id,
+        RefreshToken.iptal_tarihi.is_(None),
+    ).update({RefreshToken.iptal_tarihi: datetime.utcnow()}, synchronize_session=False)
+
+
+def token_yenile(
+    refresh_token: str,
+    db: Session,
+    ip: Optional[str] = None,
+    user_agent: Optional[str] = None,
+) -> TokenResponse:
+    """
+    📚 DERS: Refresh token ile yeni token cifti alma (rotation).
+
+    1. Hash ile kaydi bul
+    2. Iptal edilmis bir token mi geldi? -> Calinmis olabilir:
+       ayni ailedeki TUM token'lar iptal edilir, kullanici tekrar giris yapar
+    3. Eski token'i iptal et, ayni aileden yenisini ver
+
+    Kullanici bilgileri (rol, aktiflik, tenant) burada DB'den taze okunur;
+    degisiklikler en gec bir access token suresi sonra yansir.
+    """
+    gecersiz = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Oturum suresi dolmus, lutfen tekrar giris yapin",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    kayit = db.query(RefreshToken).filter(
+        RefreshToken.token_hash == yenileme_tokeni_hashle(refresh_token)
+    ).first()
+    if kayit is None:
+        raise gecersiz
+
+    simdi = datetime.utcnow()
+    if kayit.iptal_tarihi is not None:
+        logger.warning(
+            f"Iptal edilmis refresh token tekrar kullanildi: kullanici_id={kayit.kullanici_id} "
+            f"aile={kayit.aile_id} ip={ip}. Oturum ailesi kapatildi."
+        )
+        _aileyi_iptal_et(db, kayit.aile_id)
+        db.commit()
+        raise gecersiz
+    if kayit.son_kullanma <= simdi:
+        raise gecersiz
+
+    # 📚 DERS: Ayni token ile ayni anda iki yenileme gelirse sadece biri
+    # kazanmali. "iptal_tarihi IS NULL" kosullu UPDATE bunu DB'de garanti eder.
+    guncellenen = db.query(RefreshToken).filter(
+        RefreshToken.id == kayit.id,
+        RefreshToken.iptal_tarihi.is_(None),
+    ).update({RefreshToken.iptal_tarihi: simdi}, synchronize_session=False)
+    if guncellenen != 1:
+        db.rollback()
+        raise gecersiz
+
+    kullanici = db.query(Kullanici).filter(Kullanici.id == kayit.kullanici_id).first()
+    if kullanici is None or not kullanici.aktif:
+        _aileyi_iptal_et(db, kayit.aile_id)
+        db.commit()
+        raise gecersiz
+
+    yanit = _oturum_ac(db, kullanici, aile_id=kayit.aile_id, ip=ip, user_agent=user_agent)
+    db.commit()
+    return yanit
+
+
+def oturumlari_kapat(db: Session, kullanici_id: int) -> None:
+    """
+    📚 DERS: Kullanicinin TUM oturumlarini kapatir.
+
+    - token_versiyon +1: eski access token'lar iptal listesine girer
+    - Tum refresh token'lar iptal: hicbir cihaz oturumu yenileyemez
+
+    Sifre degisikligi, hesabi devre disi birakma ve
+    "tum cihazlardan cikis" icin kullanilir.
+    """
+    db.query(Kullanici).filter(Kullanici.id == kullanici_id).update(
+        {Kullanici.token_versiyon: Kullanici.token_versiyon + 1},
+        synchronize_session=False,
+    )
+    yeni_versiyon = db.query(Kullanici.token_versiyon).filter(Kullanici.id == kullanici_id).scalar()
+    db.query(RefreshToken).filter(
+        RefreshToken.kullanici_id == kullanici_id,
+        RefreshToken.iptal_tarihi.is_(None),
+    ).update({RefreshToken.iptal_tarihi: datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+    # Bu ana kadar verilmis token'larin en gec dolacagi an
+    kullanici_iptal_et(kullanici_id, yeni_versiyon or 0, time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def tenant_oturumlarini_kapat(db: Session, tenant_id: int) -> int:
+    """
+    OSGB devre disi birakilinca tum kullanicilarinin oturumlarini kapatir.
+    Donus: oturumu kapatilan kullanici sayisi.
+    """
+    kullanici_idleri = [
+        k_id for (k_id,) in db.query(Kullanici.id).filter(Kullanici.tenant_id == tenant_id)
+    ]
+    for k_id in kullanici_idleri:
+        oturumlari_kapat(db, k_id)
+    return len(kullanici_idleri)
+
+
+def cikis_yap(
+    db: Session,
+    kullanici,
+    refresh_token: Optional[str] = None,
+    tum_cihazlar: bool = False,
+) -> None:
+    """
+    Cikis: mevcut access token iptal listesine, refresh token'in ailesi iptal.
+    tum_cihazlar=True ise kullanicinin tum oturumlari kapatilir.
+    """
+    jti_iptal_et(kullanici.jti, kullanici.exp)
+
+    if tum_cihazlar:
+        oturumlari_kapat(db, kullanici.id)
+        return
+
+    if refresh_token:
+        kayit = db.query(RefreshToken).filter(
+            RefreshToken.token_hash == yenileme_tokeni_hashle(refresh_token),
+            RefreshToken.kullanici_id == kullanici.id,
+        ).first()
+        if kayit is not None:
+            _aileyi_iptal_et(db, kayit.aile_id)
+            db.commit()
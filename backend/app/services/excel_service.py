@@ -10,13 +10,21 @@
 # Kullanim:
 # excel_export(query, alan_haritasi) -> Excel dosyasi (bytes)
 # excel_import(dosya, alan_haritasi, model) -> [{veri}, {veri}, ...]
+# sablon_yaniti(request, alan_haritasi, ...) -> Onbellekli sablon (ETag'li)
 
+import hashlib
+import json
+import threading
 from io import BytesIO
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from datetime import datetime
 
+from fastapi import Request, Response
+
+from app.core.metrics import EXCEL_IS_SURESI
+
 
 # 📚 DERS: Alan haritasi (field mapping)
 # Her modul icin hangi alanlar Excel'de gorunecek, Turkce basliklari ne olacak
@@ -46,7 +54,7 @@ ISYERI_ALANLARI = [
     {"alan": "sgk_sicil_no",      "baslik": "SGK Sicil No",       "zorunlu": True,  "genislik": 18},
     {"alan": "nace_kodu",         "baslik": "NACE Kodu",          "zorunlu": True,  "genislik": 12},
     {"alan": "nace_aciklama",     "baslik": "NACE Aciklama",      "zorunlu": False, "genislik": 30},
-    {"alan": "tehlike_sinifi",    "baslik": "Tehlike Sinifi",      "zorunlu": True,  "genislik": 18},
+    {"alan": "tehlike_sinifi",    "baslik": "Tehlike Sinifi",      "zorunlu": False, "genislik": 18},
     {"alan": "ana_faaliyet",      "baslik": "Ana Faaliyet",       "zorunlu": False, "genislik": 25},
     {"alan": "isveren_ad",        "baslik": "Isveren Adi",        "zorunlu": True,  "genislik": 18},
     {"alan": "isveren_soyad",     "baslik": "Isveren Soyadi",     "zorunlu": True,  "genislik": 18},
@@ -86,6 +94,51 @@ PERSONEL_ALANLARI = [
 # Ileride eklenecek moduller icin hazir:
 # ZIYARET_ALANLARI = [...]
 
+# Uygulama acilirken hazirlanan sablonlar: (alan haritasi, sayfa adi)
+# Router'lar sablon_yaniti()'na ayni sayfa adini verir.
+SABLONLAR = [
+    (FIRMA_ALANLARI, "Firma Sablonu"),
+    (ISYERI_ALANLARI, "Isyeri Sablonu"),
+    (CALISAN_ALANLARI, "Calisan Sablonu"),
+    (PERSONEL_ALANLARI, "Personel Sablonu"),
+]
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+# ---- STILLER ----
+# 📚 DERS: Font/PatternFill/Border nesneleri degismez (immutable) degerlerdir;
+# her cagrida yeniden olusturmaya gerek yok, modul seviyesinde bir kez tanimlanir.
+_BEYAZ_KALIN = Font(bold=True, color="FFFFFF", size=11)
+_MAVI_DOLGU = PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")
+_KIRMIZI_DOLGU = PatternFill(start_color="F44336", end_color="F44336", fill_type="solid")
+_SARI_DOLGU = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+_ACIKLAMA_FONT = Font(italic=True, size=9, color="666666")
+_ORTALI = Alignment(horizontal="center", vertical="center")
+_INCE_KENAR = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+
+
+def _export_stilleri(wb: Workbook) -> None:
+    """
+    📚 DERS: Adlandirilmis stil (NamedStyle).
+
+    Her hucreye ayri ayri font/dolgu/kenarlik atamak yerine stil
+    workbook'a BIR KEZ kaydedilir, hucrelere sadece adi verilir:
+        hucre.style = "osgb_veri"
+    NamedStyle nesnesi eklendigi workbook'a baglanir; bu yuzden
+    her workbook icin yenisi olusturulur (alt nesneler ortak).
+    """
+    wb.add_named_style(NamedStyle(
+        name="osgb_baslik", font=_BEYAZ_KALIN, fill=_MAVI_DOLGU,
+        alignment=_ORTALI, border=_INCE_KENAR,
+    ))
+    wb.add_named_style(NamedStyle(name="osgb_veri", border=_INCE_KENAR))
+
 
 def excel_export(kayitlar: list, alan_haritasi: List[Dict], sayfa_adi: str = "Veriler") -> bytes:
     """
@@ -98,28 +151,20 @@ def excel_export(kayitlar: list, alan_haritasi: List[Dict], sayfa_adi: str = "Ve
 
     Doner: Excel dosyasi (bytes olarak)
     """
+    with EXCEL_IS_SURESI.zamanla(islem="export", sayfa=sayfa_adi):
+        return _excel_export(kayitlar, alan_haritasi, sayfa_adi)
+
+
+def _excel_export(kayitlar: list, alan_haritasi: List[Dict], sayfa_adi: str) -> bytes:
     wb = Workbook()
     ws = wb.active
     ws.title = sayfa_adi
-
-    # ---- STIL TANIMLARI ----
-    baslik_font = Font(bold=True, color="FFFFFF", size=11)
-    baslik_fill = PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")
-    baslik_alignment = Alignment(horizontal="center", vertical="center")
-    ince_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
+    _export_stilleri(wb)
 
     # ---- BASLIK SATIRI ----
     for col, alan in enumerate(alan_haritasi, 1):
         hucre = ws.cell(row=1, column=col, value=alan["baslik"])
-        hucre.font = baslik_font
-        hucre.fill = baslik_fill
-        hucre.alignment = baslik_alignment
-        hucre.border = ince_border
+        hucre.style = "osgb_baslik"
         # Sutun genisligi
         ws.column_dimensions[hucre.column_letter].width = alan.get("genislik", 15)
 
@@ -133,7 +178,7 @@ def excel_export(kayitlar: list, alan_haritasi: List[Dict], sayfa_adi: str = "Ve
                 deger = getattr(kayit, alan["alan"], "")
 
             hucre = ws.cell(row=row, column=col, value=deger)
-            hucre.border = ince_border
+            hucre.style = "osgb_veri"
 
     # ---- ALT BILGI ----
     son_satir = len(kayitlar) + 3
@@ -154,17 +199,15 @@ def excel_sablon_olustur(alan_haritasi: List[Dict], sayfa_adi: str = "Sablon") -
     Kullanici bu sablonu indirir, doldurur ve geri yukler.
     Zorunlu alanlar kirmizi baslikla isaretlenir.
     """
+    with EXCEL_IS_SURESI.zamanla(islem="sablon", sayfa=sayfa_adi):
+        return _excel_sablon_olustur(alan_haritasi, sayfa_adi)
+
+
+def _excel_sablon_olustur(alan_haritasi: List[Dict], sayfa_adi: str) -> bytes:
     wb = Workbook()
     ws = wb.active
     ws.title = sayfa_adi
 
-    # Stiller
-    zorunlu_font = Font(bold=True, color="FFFFFF", size=11)
-    zorunlu_fill = PatternFill(start_color="F44336", end_color="F44336", fill_type="solid")
-    normal_font = Font(bold=True, color="FFFFFF", size=11)
-    normal_fill = PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")
-    baslik_alignment = Alignment(horizontal="center", vertical="center")
-
     # Baslik satiri
     for col, alan in enumerate(alan_haritasi, 1):
         baslik = alan["baslik"]
@@ -172,18 +215,17 @@ def excel_sablon_olustur(alan_haritasi: List[Dict], sayfa_adi: str = "Sablon") -
             baslik += " *"
 
         hucre = ws.cell(row=1, column=col, value=baslik)
-        hucre.font = zorunlu_font if alan.get("zorunlu") else normal_font
-        hucre.fill = zorunlu_fill if alan.get("zorunlu") else normal_fill
-        hucre.alignment = baslik_alignment
+        hucre.font = _BEYAZ_KALIN
+        hucre.fill = _KIRMIZI_DOLGU if alan.get("zorunlu") else _MAVI_DOLGU
+        hucre.alignment = _ORTALI
         ws.column_dimensions[hucre.column_letter].width = alan.get("genislik", 15)
 
     # Aciklama satiri (2. satir)
-    aciklama_fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
     for col, alan in enumerate(alan_haritasi, 1):
         aciklama = "Zorunlu" if alan.get("zorunlu") else "Opsiyonel"
         hucre = ws.cell(row=2, column=col, value=aciklama)
-        hucre.fill = aciklama_fill
-        hucre.font = Font(italic=True, size=9, color="666666")
+        hucre.fill = _SARI_DOLGU
+        hucre.font = _ACIKLAMA_FONT
 
     buffer = BytesIO()
     wb.save(buffer)
@@ -191,6 +233,77 @@ def excel_sablon_olustur(alan_haritasi: List[Dict], sayfa_adi: str = "Sablon") -
     return buffer.getvalue()
 
 
+# =============================================
+# SABLON ONBELLEGI
+# =============================================
+# 📚 DERS: Sablon sadece alan haritasina baglidir; veritabanina hic bakmaz.
+# Ayni haritadan her seferinde yeni workbook uretmek bosa CPU harcamak.
+# Bu yuzden:
+# - Uretilen bayt'lar alan haritasinin hash'i ile saklanir (memoization)
+# - Ayni hash ETag olarak gonderilir; tarayici "If-None-Match" ile
+#   sorarsa ve degismediyse 304 (Not Modified) doner, dosya tekrar inmez
+# - Harita degisirse hash de degisir: sablon otomatik yeniden uretilir
+#
+# Sablonun gorunumu (stiller) degisirse SABLON_SURUMU artirilmali ki
+# tarayicilardaki eski ETag'ler gecersiz olsun.
+SABLON_SURUMU = 1
+
+_sablon_onbellegi: Dict[str, bytes] = {}
+_sablon_kilit = threading.Lock()
+
+
+def _sablon_anahtari(alan_haritasi: List[Dict], sayfa_adi: str) -> str:
+    icerik = json.dumps([SABLON_SURUMU, sayfa_adi, alan_haritasi], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(icerik.encode("utf-8")).hexdigest()[:32]
+
+
+def sablon_getir(alan_haritasi: List[Dict], sayfa_adi: str = "Sablon") -> Tuple[bytes, str]:
+    """Onbellekteki sablonu (yoksa uretip) dondurur: (bayt, etag)."""
+    anahtar = _sablon_anahtari(alan_haritasi, sayfa_adi)
+    icerik = _sablon_onbellegi.get(anahtar)
+    if icerik is None:
+        with _sablon_kilit:
+            icerik = _sablon_onbellegi.get(anahtar)
+            if icerik is None:
+                icerik = excel_sablon_olustur(alan_haritasi, sayfa_adi)
+                _sablon_onbellegi[anahtar] = icerik
+    return icerik, f'"{anahtar}"'
+
+
+def sablonlari_hazirla() -> None:
+    """Uygulama acilirken tum modul sablonlarini onceden uretir."""
+    for alan_haritasi, sayfa_adi in SABLONLAR:
+        sablon_getir(alan_haritasi, sayfa_adi)
+
+
+def _etag_eslesiyor_mu(if_none_match: str, etag: str) -> bool:
+    """If-None-Match: "abc", W/"def"  veya  *"""
+    for deger in if_none_match.split(","):
+        deger = deger.strip()
+        if deger == "*" or deger.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def sablon_yaniti(request: Request, alan_haritasi: List[Dict], sayfa_adi: str, dosya_adi: str) -> Response:
+    """
+    Sablon indirme endpoint'leri icin hazir yanit.
+
+    Tarayicida ayni sablon varsa 304 doner (govdesiz).
+    """
+    icerik, etag = sablon_getir(alan_haritasi, sayfa_adi)
+    headers = {
+        "ETag": etag,
+        # Token'li istek: paylasilan cache'ler saklamasin, her seferinde sorulsun
+        "Cache-Control": "private, no-cache",
+    }
+    if _etag_eslesiyor_mu(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f"attachment; filename={dosya_adi}"
+    return Response(content=icerik, media_type=XLSX_MEDIA_TYPE, headers=headers)
+
+
 def excel_import(dosya_icerik: bytes, alan_haritasi: List[Dict]) -> Dict[str, Any]:
     """
     📚 DERS: Excel dosyasindan veri okur ve dogrular.
@@ -204,6 +317,12 @@ def excel_import(dosya_icerik: bytes, alan_haritasi: List[Dict]) -> Dict[str, An
         "hatali_sayisi": 2
     }
     """
+    # Import'ta sayfa adi kullanicinin dosyasindan gelir; etiket sinirli kalsin diye sabit
+    with EXCEL_IS_SURESI.zamanla(islem="import", sayfa="-"):
+        return _excel_import(dosya_icerik, alan_haritasi)
+
+
+def _excel_import(dosya_icerik: bytes, alan_haritasi: List[Dict]) -> Dict[str, Any]:
     try:
         wb = load_workbook(BytesIO(dosya_icerik), read_only=True)
     except Exception:
@@ -0,0 +1,387 @@
+# =============================================
+# GEOKODLAMA SERVISI (adres -> enlem/boylam)
+# Kalici onbellek + hiz sinirli toplu geokodlama
+# =============================================
+#
+# 📚 DERS: Neden sunucuda?
+# Isyeri formunda koordinat, kullanici butona basinca istemciden
+# Nominatim'e sorulur. Excel'den toplu yuklenen isyerlerinin ise hic
+# koordinati olmaz: harita / rota ozellikleri onlari goremez.
+#
+# Akis:
+#   1. Adres sadelestirilir -> adres_anahtari ("Ataturk Cd. No:5, Kadikoy"
+#      ile "ATATÜRK CD NO 5 KADIKÖY" ayni anahtar)
+#   2. geokod_onbellek tablosunda (master DB, tum OSGB'ler ortak) varsa
+#      saglayiciya HIC gidilmez
+#   3. Yoksa saglayiciya sorulur, sonuc (bulunamadi dahil) onbellege yazilir
+#
+# Saglayici degistirilebilir (GEOKOD_SAGLAYICI):
+#   nominatim  -> OpenStreetMap (saniyede en fazla 1 istek, User-Agent zorunlu)
+#   cevrimdisi -> Internetsiz, deterministik sahte koordinat (test/gelistirme)
+# Yeni saglayici: GeokodSaglayici'dan tureyip SAGLAYICILAR'a ekle.
+#
+# Toplu is tek bir arka plan thread'inde sirayla calisir: ayni anda
+# birden fazla OSGB import yapsa da saglayiciya giden hiz sabit kalir.
+# Birden fazla worker/process icin hiz siniri master DB'deki advisory
+# lock ile paylasilir (GeokodSaglayici.sorgula).
+# Isin durumu ve ilerlemesi OSGB'ye WebSocket ile "geokod" olayi olarak gider.
+#
+# Kullanim:
+#   konum = geokodla(master_db, "Ataturk Cd. No:5 Kadikoy Istanbul")
+#   geokod_isi_baslat("osgb_demo", [12, 13, 14])   (Excel import sonrasi)
+
+import hashlib
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from time import monotonic, sleep
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.bildirim import tenant_bildir
+from app.core.config import settings
+from app.core.database import MasterSessionLocal, get_tenant_engine, master_engine
+from app.core.logger import logger
+from app.models.master import GeokodOnbellek
+from app.models.tenant import Firma, Isyeri
+from app.services.mekansal_service import mekansal_indeksler
+from app.services.tenant_dizini import tenant_dizini
+from app.utils.metin import sadelestir
+
+
+Konum = Tuple[float, float]    # (enlem, boylam)
+
+_NOKTALAMA = re.compile(r"[^\w]+")
+
+# Toplu iste bu kadar isyerinde bir commit: uzun is yarida kesilse de ilerleme kaybolmaz
+_PARTI_BOYUTU = 50
+# Saglayici hiz siniri tum worker'larda ortak (master DB'de oturum kilidi)
+_HIZ_KILIT_ANAHTARI = 0x05B6_7E07
+# Saglayici art arda bu kadar hata verirse (servis kapali) is durdurulur
+_ART_ARDA_HATA_SINIRI = 3
+
+
+def adres_anahtari(adres: str) -> str:
+    """Onbellek anahtari: kucuk harf, Turkce karaktersiz, noktalamasiz, tek bosluk."""
+    return " ".join(_NOKTALAMA.sub(" ", sadelestir(adres)).split())[:500]
+
+
+# =============================================
+# SAGLAYICILAR
+# =============================================
+class GeokodSaglayici(ABC):
+    """
+    Saglayici arayuzu. Alt siniflar sadece bul()'u yazar;
+    sorgula() istekler arasi en az istek_araligi_sn bekler.
+
+    📚 DERS: Hiz siniri neden DB'de?
+    threading.Lock sadece bu process'i kapsar; 4 worker'li bir kurulumda
+    saglayiciya saniyede 4 istek gider ve Nominatim IP'yi engeller.
+    istek_araligi_sn > 0 ise kilit master DB'deki oturum advisory lock'udur:
+    istek atilir, aralik dolana kadar kilit tutulur, sonra birakilir.
+    Boylece tum worker'lar toplamda araligin altina inemez.
+    """
+    ad = "temel"
+
+    def __init__(self, istek_araligi_sn: float = 0.0):
+        self.istek_araligi_sn = istek_araligi_sn
+        self._kilit = threading.Lock()
+
+    @abstractmethod
+    def bul(self, adres: str) -> Optional[Konum]:
+        """Adresi koordinata cevirir; bulunamazsa None, servis hatasinda exception."""
+
+    def sorgula(self, adres: str) -> Optional[Konum]:
+        with self._kilit:
+            if self.istek_araligi_sn <= 0:
+                return self.bul(adres)
+            baglanti = master_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            try:
+                baglanti.execute(text("SELECT pg_advisory_lock(:k)"), {"k": _HIZ_KILIT_ANAHTARI})
+                baslangic = monotonic()
+                try:
+                    return self.bul(adres)
+                finally:
+                    bekle = baslangic + self.istek_araligi_sn - monotonic()
+                    if bekle > 0:
+                        sleep(bekle)
+                    baglanti.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _HIZ_KILIT_ANAHTARI})
+            finally:
+                baglanti.close()
+
+
+class NominatimSaglayici(GeokodSaglayici):
+    """
+    📚 DERS: Nominatim kullanim politikasi: saniyede en fazla 1 istek,
+    uygulamayi tanimlayan User-Agent. Ihlal edilirse IP engellenir.
+    """
+    ad = "nominatim"
+
+    def __init__(self):
+        super().__init__(istek_araligi_sn=max(1.0, settings.GEOKOD_ISTEK_ARALIGI_SN))
+        self._istemci = httpx.Client(timeout=10.0, headers={"User-Agent": settings.GEOKOD_USER_AGENT})
+
+    def bul(self, adres: str) -> Optional[Konum]:
+        yanit = self._istemci.get(
+            settings.GEOKOD_NOMINATIM_URL,
+            params={"q": adres, "format": "json", "limit": 1, "countrycodes": "tr"},
+        )
+        yanit.raise_for_status()
+        sonuclar = yanit.json()
+        if not sonuclar:
+            return None
+        return float(sonuclar[0]["lat"]), float(sonuclar[0]["lon"])
+
+
+class CevrimdisiSaglayici(GeokodSaglayici):
+    """
+    Internet gerektirmeyen sahte saglayici (test / gelistirme).
+
+    sabit verilirse sadece o adresleri bilir (digerleri "bulunamadi");
+    verilmezse her adres icin Turkiye sinirlari icinde DETERMINISTIK bir
+    nokta uretir (ayni adres -> ayni koordinat). cagri_sayisi onbellegin
+    calistigini dogrulamak icindir.
+    """
+    ad = "cevrimdisi"
+
+    def __init__(self, sabit: Optional[Dict[str, Konum]] = None):
+        super().__init__(istek_araligi_sn=0.0)
+        self.sabit = {adres_anahtari(a): k for a, k in sabit.items()} if sabit is not None else None
+        self.cagri_sayisi = 0
+
+    def bul(self, adres: str) -> Optional[Konum]:
+        self.cagri_sayisi += 1
+        anahtar = adres_anahtari(adres)
+        if self.sabit is not None:
+            return self.sabit.get(anahtar)
+        ozet = hashlib.sha256(anahtar.encode()).digest()
+        # Enlem 36-42, boylam 26-45 (kabaca Turkiye)
+        lat = 36.0 + int.from_bytes(ozet[:4], "big") / 2**32 * 6.0
+        lng = 26.0 + int.from_bytes(ozet[4:8], "big") / 2**32 * 19.0
+        return round(lat, 6), round(lng, 6)
+
+
+SAGLAYICILAR = {
+    NominatimSaglayici.ad: NominatimSaglayici,
+    CevrimdisiSaglayici.ad: CevrimdisiSaglayici,
+}
+
+_saglayici: Optional[GeokodSaglayici] = None
+_saglayici_kilidi = threading.Lock()
+
+
+def saglayici_getir() -> GeokodSaglayici:
+    """Ayardaki saglayici (ilk kullanimda olusturulur, hiz siniri paylasilsin diye tek nesne)."""
+    global _saglayici
+    with _saglayici_kilidi:
+        if _saglayici is None:
+            sinif = SAGLAYICILAR.get(settings.GEOKOD_SAGLAYICI)
+            if sinif is None:
+                raise ValueError(f"Bilinmeyen geokod saglayicisi: '{settings.GEOKOD_SAGLAYICI}'")
+            _saglayici = sinif()
+        return _saglayici
+
+
+def saglayici_ayarla(saglayici: Optional[GeokodSaglayici]) -> None:
+    """Saglayiciyi degistirir (test / ozel saglayici). None: ayara don."""
+    global _saglayici
+    with _saglayici_kilidi:
+        _saglayici = saglayici
+
+
+# =============================================
+# ONBELLEKLI GEOKODLAMA
+# =============================================
+def geokodla(master_db: Session, adres: str, saglayici: Optional[GeokodSaglayici] = None) -> Tuple[Optional[Konum], bool]:
+    """
+    Donus: (konum | None, onbellekten_mi)
+
+    Saglayici hatasi (ag, 5xx) onbellege YAZILMAZ, exception yukari cikar.
+    """
+    anahtar = adres_anahtari(adres)
+    if not anahtar:
+        return None, True
+
+    kayit = master_db.query(GeokodOnbellek).filter(GeokodOnbellek.adres_anahtari == anahtar).first()
+    if kayit is not None:
+        if kayit.lat is not None:
+            return (kayit.lat, kayit.lng), True
+        tekrar_sinir = datetime.utcnow() - timedelta(days=settings.GEOKOD_BULUNAMADI_TEKRAR_GUN)
+        if kayit.sorgu_tarihi and kayit.sorgu_tarihi > tekrar_sinir:
+            return None, True
+
+    saglayici = saglayici or saglayici_getir()
+    konum = saglayici.sorgula(adres)
+
+    if kayit is None:
+        kayit = GeokodOnbellek(adres_anahtari=anahtar, adres=adres[:500])
+        master_db.add(kayit)
+    kayit.lat, kayit.lng = konum if konum else (None, None)
+    kayit.saglayici = saglayici.ad
+    kayit.sorgu_tarihi = datetime.utcnow()
+    try:
+        master_db.commit()
+    except IntegrityError:
+        # Ayni adresi baska bir is az once yazdi: onunki gecerli
+        master_db.rollback()
+    return konum, False
+
+
+def isyeri_adresi(isyeri: Isyeri, firma: Optional[Firma]) -> Optional[str]:
+    """
+    Isyeri lokasyonu + firmanin ilce/il'i (lokasyonda yazmiyorsa).
+    Lokasyonu olmayan isyeri geokodlanmaz: il merkezi koordinati
+    harita ve rota icin yaniltici olur.
+    """
+    if not isyeri.lokasyon or not isyeri.lokasyon.strip():
+        return None
+    parcalar = [isyeri.lokasyon.strip()]
+    sade = sadelestir(isyeri.lokasyon)
+    for ek in (firma.ilce, firma.il) if firma else ():
+        if ek and sadelestir(ek) not in sade:
+            parcalar.append(ek)
+    return ", ".join(parcalar)
+
+
+# =============================================
+# TOPLU GEOKODLAMA (arka plan isi)
+# =============================================
+def isyerlerini_geokodla(
+    db_name: str,
+    isyeri_idleri: Optional[Iterable[int]] = None,
+    ilerleme: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Koordinati bos isyerlerini geokodlar (isyeri_idleri None ise tumu).
+
+    Ayni adresli isyerleri (ayni sitedeki birimler) tek sorguyla cozulur.
+    ilerleme: her parti commit'inde {"islenen", "isyeri_sayisi", "bulunan"} ile cagrilir
+    (isyeri sayisi; adres sayisi degil: tek adreste yuzlerce birim olabilir).
+    """
+    rapor = {"toplam": 0, "bulunan": 0, "bulunamayan": 0, "adressiz": 0,
+             "onbellekten": 0, "saglayicidan": 0, "hata": None}
+    tenant_db = sessionmaker(bind=get_tenant_engine(db_name), autocommit=False, autoflush=False)()
+    master_db = MasterSessionLocal()
+    try:
+        sorgu = (
+            tenant_db.query(Isyeri, Firma)
+            .outerjoin(Firma, Firma.id == Isyeri.firma_id)
+            .filter(Isyeri.koordinat_lat.is_(None), Isyeri.aktif == True)
+        )
+        if isyeri_idleri is not None:
+            sorgu = sorgu.filter(Isyeri.id.in_(list(isyeri_idleri)))
+
+        # adres_anahtari -> (adres, [isyeri, ...])
+        gruplar: Dict[str, Tuple[str, list]] = {}
+        for isyeri, firma in sorgu.order_by(Isyeri.id):
+            rapor["toplam"] += 1
+            adres = isyeri_adresi(isyeri, firma)
+            if adres is None:
+                rapor["adressiz"] += 1
+                continue
+            gruplar.setdefault(adres_anahtari(adres), (adres, []))[1].append(isyeri)
+
+        isyeri_sayisi = rapor["toplam"] - rapor["adressiz"]
+        islenen = son_commit = art_arda_hata = 0
+        for adres, isyerleri in gruplar.values():
+            try:
+                konum, onbellekten = geokodla(master_db, adres)
+                art_arda_hata = 0
+            except Exception as e:
+                master_db.rollback()
+                art_arda_hata += 1
+                logger.warning(f"Geokodlama hatasi: {adres} | {e}")
+                if art_arda_hata >= _ART_ARDA_HATA_SINIRI:
+                    rapor["hata"] = f"Saglayici art arda {art_arda_hata} kez hata verdi, is durduruldu: {e}"
+                    break
+            else:
+                rapor["onbellekten" if onbellekten else "saglayicidan"] += 1
+                if konum is None:
+                    rapor["bulunamayan"] += len(isyerleri)
+                else:
+                    for isyeri in isyerleri:
+                        isyeri.koordinat_lat, isyeri.koordinat_lng = konum
+                    rapor["bulunan"] += len(isyerleri)
+
+            # Parti: bulunan/bulunamayan/hatali fark etmez, islenen isyeri sayisina gore
+            islenen += len(isyerleri)
+            if islenen - son_commit >= _PARTI_BOYUTU:
+                son_commit = islenen
+                tenant_db.commit()
+                if ilerleme is not None:
+                    ilerleme({"islenen": islenen, "isyeri_sayisi": isyeri_sayisi, "bulunan": rapor["bulunan"]})
+        tenant_db.commit()
+        if rapor["bulunan"]:
+            mekansal_indeksler.gecersiz_kil(db_name)
+    finally:
+        tenant_db.close()
+        master_db.close()
+    return rapor
+
+
+# Tek thread: tum OSGB'lerin isleri sirayla, saglayici hiz siniri asilmaz
+_is_havuzu = ThreadPoolExecutor(max_workers=1, thread_name_prefix="geokod")
+_is_durumlari: Dict[str, dict] = {}
+_durum_kilidi = threading.Lock()
+
+
+def _durumu_guncelle(db_name: str, **degisim) -> None:
+    """Is durumunu gunceller ve OSGB'nin acik ekranlarina bildirir."""
+    with _durum_kilidi:
+        _is_durumlari[db_name].update(**degisim)
+        durum = dict(_is_durumlari[db_name])
+    kayit = tenant_dizini.db_name_ile(db_name)
+    if kayit is not None:
+        tenant_bildir(kayit.id, "geokod", durum)
+
+
+def _isi_calistir(db_name: str, isyeri_idleri: Optional[list]) -> None:
+    _durumu_guncelle(db_name, durum="calisiyor", baslangic=datetime.utcnow().isoformat(timespec="seconds"))
+    try:
+        rapor = isyerlerini_geokodla(
+            db_name, isyeri_idleri, ilerleme=lambda ilerleme: _durumu_guncelle(db_name, ilerleme=ilerleme),
+        )
+        durum = "hata" if rapor["hata"] else "bitti"
+        logger.info(
+            f"Geokodlama bitti: {db_name} | {rapor['bulunan']}/{rapor['toplam']} bulundu, "
+            f"{rapor['saglayicidan']} saglayici sorgusu"
+        )
+    except Exception as e:
+        rapor, durum = {"hata": str(e)}, "hata"
+        logger.error(f"Geokodlama isi basarisiz: {db_name} | {e}")
+    _durumu_guncelle(db_name, durum=durum, bitis=datetime.utcnow().isoformat(timespec="seconds"), rapor=rapor)
+
+
+def geokod_isi_baslat(db_name: str, isyeri_idleri: Optional[Iterable[int]] = None) -> dict:
+    """
+    Arka plan kuyruguna is ekler ve hemen doner.
+    isyeri_idleri None: OSGB'nin koordinatsiz tum isyerleri.
+    """
+    idler = list(isyeri_idleri) if isyeri_idleri is not None else None
+    with _durum_kilidi:
+        _is_durumlari[db_name] = {
+            "durum": "kuyrukta",
+            "isyeri_sayisi": len(idler) if idler is not None else None,
+            "kuyruga_alinma": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        durum = dict(_is_durumlari[db_name])
+    _is_havuzu.submit(_isi_calistir, db_name, idler)
+    return durum
+
+
+def geokod_is_durumu(db_name: str) -> Optional[dict]:
+    """OSGB'nin son geokodlama isinin durumu (bu process'te)."""
+    with _durum_kilidi:
+        durum = _is_durumlari.get(db_name)
+        return dict(durum) if durum else None
+
+
+def geokod_kapat() -> None:
+    """Kapanista: kuyrukta bekleyen isler iptal, calisan is yarida birakilir (ilerleme commit'li)."""
+    _is_havuzu.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,337 @@
+# =============================================
+# DASHBOARD KPI'LARI (OSGB basina tek satirlik ozet)
+# GET /api/v1/dashboard -> SELECT ... FROM kpi_ozeti WHERE id = 1
+# =============================================
+#
+# 📚 DERS: Dashboard her acilista tablolari SAYMAZ.
+# Her OSGB veritabaninda tek satirlik kpi_ozeti tablosu var; KPI'lar
+# yazma aninda guncel tutulur:
+#
+#   1. Sayac kolonlari (firma, isyeri, calisan): kaydi yazan endpoint AYNI
+#      transaction'da artirir/azaltir (Sayac / limit_service ile ayni yontem):
+#        kpi_artir(db, calisan_aktif=1)
+#        -> UPDATE kpi_ozeti SET calisan_aktif = calisan_aktif + 1 WHERE id = 1
+#      Kayit commit olmazsa sayac da olmaz; iki istek ayni anda artirsa da
+#      satir kilidi sirayla uygular.
+#   2. Tarihe bagli gruplar (ziyaret, egitim, fatura): "geciken ziyaret"
+#      hicbir sey yazilmadan, gun donunce de degisir - artirilamaz. Ilgili
+#      kayit degisince o grup indeksli sayimla yeniden hesaplanir
+#      (kpi_yenile(db, "ziyaret")); gun donduyse ilk GET de yeniler.
+#   3. Gece uzlastirmasi (KPI_UZLASTIRMA_SAATI): her OSGB'de tum kolonlar
+#      bastan sayilir; kayan sayac (elle SQL, hook'u olmayan yazim) varsa
+#      duzeltilir ve loglanir.
+#
+# Hook'lar nesne degistirildikten SONRA, commit'ten ONCE cagrilir. Satir
+# OSGB kurulurken (sablon / m0008) olusur; yine de yoksa hook tam sayimla
+# olusturur (once flush: oturumda autoflush kapali, bekleyen kayit da sayilsin).
+# Iki istek ayni anda olusturmaya kalkarsa INSERT ... ON CONFLICT DO NOTHING
+# ile biri kazanir, digeri kendi degisimini UPDATE ile uygular.
+#
+# Kilit sirasi: hook'lar kpi_ozeti satirini kilitlemeden ONCE senkronizasyon
+# sayacini alir (degisim_no_ayir), limit_service ile ayni sira. Yoksa kaydi
+# hook'tan sonra flush eden istek (kpi -> degisim) ile once yazip sonra hook
+# cagiran istek (degisim -> kpi) birbirini bekler: olu kilit.
+#
+# Yeni KPI eklemek: KpiOzeti'ne kolon + KPI_GRUPLARI'ndaki ilgili fonksiyona alan.
+
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, insert, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import MasterSessionLocal
+from app.core.logger import db_logger
+from app.models.tenant import (
+    Calisan, Egitim, Fatura, Firma, Isyeri, KpiOzeti, TehlikeSinifi, Ziyaret, ZiyaretDurumu,
+)
+from app.services.analitik_service import tenantlara_dagit
+from app.services.sync_service import degisim_no_ayir
+from app.services.tenant_dizini import TenantKaydi
+from app.services.uyari_service import egitim_yenilenmis
+
+
+_SATIR_ID = 1
+
+# Birden fazla worker ayni gece uzlastirmasini yapmasin (master DB'de transaction kilidi)
+_UZLASTIRMA_KILIT_ANAHTARI = 0x05B6_7E06
+
+_SINIF_KOLONU = {
+    TehlikeSinifi.AZ_TEHLIKELI: "isyeri_az_tehlikeli",
+    TehlikeSinifi.TEHLIKELI: "isyeri_tehlikeli",
+    TehlikeSinifi.COK_TEHLIKELI: "isyeri_cok_tehlikeli",
+}
+# Hook'larla artirilan kolonlar (uzlastirmada sapma sadece bunlarda anlamli)
+_SAYAC_KOLONLARI = ("firma_aktif", "isyeri_aktif", *_SINIF_KOLONU.values(), "calisan_aktif")
+
+
+# =============================================
+# GRUP HESAPLARI (tek OSGB, bastan sayim)
+# =============================================
+def _sayaclar(db: Session, bugun: date) -> dict:
+    degerler = {kolon: 0 for kolon in _SINIF_KOLONU.values()}
+    for sinif, adet in (
+        db.query(Isyeri.tehlike_sinifi, func.count(Isyeri.id))
+        .filter(Isyeri.aktif == True)  # noqa: E712
+        .group_by(Isyeri.tehlike_sinifi)
+    ):
+        if sinif is not None:
+            degerler[_SINIF_KOLONU[sinif]] = adet
+    degerler["isyeri_aktif"] = sum(degerler.values())
+    degerler["firma_aktif"] = db.query(func.count(Firma.id)).filter(Firma.aktif == True).scalar()  # noqa: E712
+    degerler["calisan_aktif"] = db.query(func.count(Calisan.id)).filter(Calisan.aktif == True).scalar()  # noqa: E712
+    return degerler
+
+
+def _ziyaretler(db: Session, bugun: date) -> dict:
+    gun_basi = datetime.combine(bugun, time.min)
+    yaklasan_sonu = gun_basi + timedelta(days=settings.KPI_YAKLASAN_GUN)
+    planli = db.query(func.count(Ziyaret.id)).filter(Ziyaret.durum == ZiyaretDurumu.PLANLANDI)
+    return {
+        "ziyaret_geciken": planli.filter(Ziyaret.ziyaret_tarihi < gun_basi).scalar(),
+        "ziyaret_yaklasan": planli.filter(
+            Ziyaret.ziyaret_tarihi >= gun_basi, Ziyaret.ziyaret_tarihi < yaklasan_sonu,
+        ).scalar(),
+    }
+
+
+def _egitimler(db: Session, bugun: date) -> dict:
+    """Sure uyarilariyla ayni pencere: aktif calisan, yenilenmemis egitim."""
+    sorgu = (
+        db.query(func.count(Egitim.id))
+        .join(Calisan, Egitim.calisan_id == Calisan.id)
+        .filter(Calisan.aktif == True, ~egitim_yenilenmis())  # noqa: E712
+    )
+    return {
+        "egitim_suresi_dolacak": sorgu.filter(
+            Egitim.gecerlilik_tarihi >= bugun,
+            Egitim.gecerlilik_tarihi <= bugun + timedelta(days=settings.UYARI_ILERI_GUN),
+        ).scalar(),
+        "egitim_suresi_gecmis": sorgu.filter(
+            Egitim.gecerlilik_tarihi < bugun,
+            Egitim.gecerlilik_tarihi >= bugun - timedelta(days=settings.UYARI_GECMIS_GUN),
+        ).scalar(),
+    }
+
+
+def _faturalar(db: Session, bugun: date) -> dict:
+    adet, tutar, vadesi_gecmis = db.query(
+        func.count(Fatura.id),
+        func.coalesce(func.sum(Fatura.genel_toplam), 0.0),
+        func.coalesce(func.sum(case((Fatura.vade_tarihi < bugun, 1), else_=0)), 0),
+    ).filter(Fatura.odendi.isnot(True)).one()
+    return {
+        "fatura_odenmemis": adet,
+        "fatura_odenmemis_tutar": round(float(tutar), 2),
+        "fatura_vadesi_gecmis": vadesi_gecmis,
+    }
+
+
+# grup -> (db, bugun) -> {kolon: deger}
+KPI_GRUPLARI: Dict[str, Callable[[Session, date], dict]] = {
+    "sayac": _sayaclar,
+    "ziyaret": _ziyaretler,
+    "egitim": _egitimler,
+    "fatura": _faturalar,
+}
+TARIHE_BAGLI = ("ziyaret", "egitim", "fatura")
+
+
+def _hesapla(db: Session, gruplar: Iterable[str], bugun: date) -> dict:
+    degerler: dict = {}
+    for grup in gruplar:
+        degerler.update(KPI_GRUPLARI[grup](db, bugun))
+    return degerler
+
+
+def _olustur(db: Session, bugun: date) -> bool:
+    """
+    Satir yoksa tam sayimla olusturur. Baska bir transaction ayni anda
+    olusturduysa False doner: cagiran kendi guncellemesini tekrar uygular.
+    """
+    db.flush()
+    simdi = datetime.utcnow()
+    degerler = dict(
+        id=_SATIR_ID, gun=bugun, guncelleme_tarihi=simdi, uzlastirma_tarihi=simdi,
+        **_hesapla(db, KPI_GRUPLARI, bugun),
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        ekle = pg_insert(KpiOzeti).values(**degerler).on_conflict_do_nothing(index_elements=["id"])
+    else:
+        ekle = insert(KpiOzeti).values(**degerler)
+    return bool(db.execute(ekle).rowcount)
+
+
+# =============================================
+# YAZMA HOOK'LARI (commit ETMEZ - cagiranin transaction'i)
+# =============================================
+def kpi_artir(db: Session, **degisim: int) -> None:
+    """kpi_artir(db, calisan_aktif=-1, isyeri_aktif=3) - sifir degisimler atlanir."""
+    degisim = {kolon: adet for kolon, adet in degisim.items() if adet}
+    if not degisim:
+        return
+    # Kilit sirasi: once senkronizasyon sayaci, sonra kpi_ozeti satiri
+    degisim_no_ayir(db)
+    guncelle = (
+        update(KpiOzeti)
+        .where(KpiOzeti.id == _SATIR_ID)
+        .values(
+            guncelleme_tarihi=datetime.utcnow(),
+            **{kolon: getattr(KpiOzeti, kolon) + adet for kolon, adet in degisim.items()},
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if not db.execute(guncelle).rowcount and not _olustur(db, date.today()):
+        db.execute(guncelle)
+
+
+def kpi_fark(db: Session, once: dict, sonra: dict) -> None:
+    """Bir kaydin degisimden once/sonraki katkisinin farkini uygular."""
+    kpi_artir(db, **{kolon: sonra.get(kolon, 0) - once.get(kolon, 0) for kolon in once.keys() | sonra.keys()})
+
+
+def _aktif(kayit) -> bool:
+    # Yeni eklenen nesnede aktif flush'a kadar None (kolon varsayilani True)
+    return kayit.aktif is not False
+
+
+def firma_katkisi(*firmalar: Firma) -> dict:
+    return {"firma_aktif": sum(1 for f in firmalar if _aktif(f))}
+
+
+def isyeri_katkisi(*isyerleri: Isyeri) -> dict:
+    sayim: Counter = Counter()
+    for isyeri in isyerleri:
+        if _aktif(isyeri) and isyeri.tehlike_sinifi is not None:
+            sayim["isyeri_aktif"] += 1
+            sayim[_SINIF_KOLONU[TehlikeSinifi(isyeri.tehlike_sinifi)]] += 1
+    return dict(sayim)
+
+
+def calisan_katkisi(*calisanlar: Calisan) -> dict:
+    return {"calisan_aktif": sum(1 for c in calisanlar if _aktif(c))}
+
+
+def kpi_yenile(db: Session, *gruplar: str) -> None:
+    """Verilen gruplari bastan sayar (tarihe bagli gruplar icin; commit ETMEZ)."""
+    degisim_no_ayir(db)
+    bugun = date.today()
+    degerler = _hesapla(db, gruplar or KPI_GRUPLARI, bugun)
+    if set(TARIHE_BAGLI) <= set(gruplar or KPI_GRUPLARI):
+        degerler["gun"] = bugun
+    guncelle = (
+        update(KpiOzeti)
+        .where(KpiOzeti.id == _SATIR_ID)
+        .values(guncelleme_tarihi=datetime.utcnow(), **degerler)
+        .execution_options(synchronize_session=False)
+    )
+    if not db.execute(guncelle).rowcount and not _olustur(db, bugun):
+        db.execute(guncelle)
+
+
+# =============================================
+# OKUMA
+# =============================================
+def kpi_getir(db: Session) -> dict:
+    """
+    Tek satir okur. Satir yoksa ya da tarihe bagli kolonlar dunden
+    kaldiysa (gece uzlastirmasi calismadi) once yeniler - gunde en fazla bir kez.
+    """
+    satir = db.get(KpiOzeti, _SATIR_ID)
+    if satir is None or satir.gun != date.today():
+        kpi_yenile(db, *TARIHE_BAGLI)
+        db.commit()
+        satir = db.get(KpiOzeti, _SATIR_ID, populate_existing=True)
+    return {
+        "firma": {"aktif": satir.firma_aktif},
+        "isyeri": {
+            "aktif": satir.isyeri_aktif,
+            "tehlike_sinifi": {sinif.value: getattr(satir, kolon) for sinif, kolon in _SINIF_KOLONU.items()},
+        },
+        "calisan": {"aktif": satir.calisan_aktif},
+        "ziyaret": {"yaklasan": satir.ziyaret_yaklasan, "geciken": satir.ziyaret_geciken},
+        "egitim": {"suresi_dolacak": satir.egitim_suresi_dolacak, "suresi_gecmis": satir.egitim_suresi_gecmis},
+        "fatura": {
+            "odenmemis": satir.fatura_odenmemis,
+            "odenmemis_tutar": satir.fatura_odenmemis_tutar,
+            "vadesi_gecmis": satir.fatura_vadesi_gecmis,
+        },
+        "guncelleme_tarihi": satir.guncelleme_tarihi,
+        "uzlastirma_tarihi": satir.uzlastirma_tarihi,
+    }
+
+
+# =============================================
+# GECE UZLASTIRMASI
+# =============================================
+def tenant_kpi_uzlastir(db: Session) -> dict:
+    """Tek OSGB: tam sayim, satiri duzelt, COMMIT eder. Donus: {kolon: [eski, yeni]} sapmalar."""
+    bugun = date.today()
+    satir = db.get(KpiOzeti, _SATIR_ID)
+    if satir is None:
+        if _olustur(db, bugun):
+            db.commit()
+            return {}
+        satir = db.get(KpiOzeti, _SATIR_ID)     # Baska bir istek az once olusturdu
+    degerler = _hesapla(db, KPI_GRUPLARI, bugun)
+    sapmalar = {
+        kolon: [getattr(satir, kolon), degerler[kolon]]
+        for kolon in _SAYAC_KOLONLARI
+        if getattr(satir, kolon) != degerler[kolon]
+    }
+    simdi = datetime.utcnow()
+    db.execute(
+        update(KpiOzeti)
+        .where(KpiOzeti.id == _SATIR_ID)
+        .values(gun=bugun, guncelleme_tarihi=simdi, uzlastirma_tarihi=simdi, **degerler)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return sapmalar
+
+
+def kpi_uzlastir(tenantlar: Optional[List[TenantKaydi]] = None) -> dict:
+    """
+    📚 DERS: Zamanlayicinin gece calistirdigi gorev.
+    Tum (aktif) OSGB'lerde paralel tam sayim (analitik_service.tenantlara_dagit).
+    Donus: {"tenant_sayisi", "sapmalar": {tenant_id: {...}}, "eksik": [tenant_id], "sure_ms"} veya {"atlandi": True}
+    """
+    baslangic = perf_counter()
+    db = MasterSessionLocal()
+    try:
+        # Transaction sonunda (commit/close) kendiliginden birakilan kilit
+        if db.get_bind().dialect.name == "postgresql" and not db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": _UZLASTIRMA_KILIT_ANAHTARI}
+        ).scalar():
+            return {"atlandi": True}
+        sonuclar, _, hatalar = tenantlara_dagit(tenant_kpi_uzlastir, tenantlar)
+        db.commit()
+    finally:
+        db.close()
+
+    sapmalar = {tenant_id: s for tenant_id, s in sonuclar.items() if s}
+    rapor = {
+        "tenant_sayisi": len(sonuclar),
+        "sapmalar": sapmalar,
+        "eksik": sorted(hatalar),
+        "sure_ms": round((perf_counter() - baslangic) * 1000, 1),
+    }
+    if sapmalar:
+        db_logger.warning(f"KPI uzlastirmasi {len(sapmalar)} OSGB'de sayac duzeltti: {sapmalar}")
+    if hatalar:
+        db_logger.warning(f"KPI uzlastirmasi: {len(hatalar)} OSGB yanit vermedi {hatalar}")
+    db_logger.info(f"KPI uzlastirmasi: {rapor['tenant_sayisi']} OSGB ({rapor['sure_ms']:.0f} ms)")
+    return rapor
+
+
+def uzlastirmaya_kalan_sn(simdi: Optional[datetime] = None) -> float:
+    """Zamanlayicinin ilk gecikmesi: bir sonraki KPI_UZLASTIRMA_SAATI'na kadar."""
+    simdi = simdi or datetime.now()
+    hedef = simdi.replace(hour=settings.KPI_UZLASTIRMA_SAATI, minute=0, second=0, microsecond=0)
+    if hedef <= simdi:
+        hedef += timedelta(days=1)
+    return (hedef - simdi).total_seconds()
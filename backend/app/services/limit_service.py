@@ -0,0 +1,208 @@
+# =============================================
+# ABONELIK LIMITLERI (onbellekli sayaclarla)
+# Tenant.max_isyeri gibi limitleri COUNT(*) atmadan uygular
+# =============================================
+#
+# 📚 DERS: Naif yontem ve sorunu
+#   if db.query(Isyeri).filter(aktif).count() >= limit: reddet
+#   db.add(yeni)
+# 1. Her eklemede tum tabloyu sayar (binlerce satir)
+# 2. Ayni anda iki istek gelirse ikisi de "limit dolmadi" gorur -> limit asilir
+#
+# Bizim yontem: tenant DB'sindeki "sayaclar" tablosu + tek kosullu UPDATE
+#   UPDATE sayaclar SET deger = deger + :adet
+#   WHERE ad = 'isyeri' AND deger + :adet <= :limit
+#   RETURNING deger
+# - Satir donerse yer ayrildi, donmezse limit dolu
+# - UPDATE satiri kilitler: eszamanli istekler sirayla gecer, limit asilamaz
+# - Ekleme ile AYNI transaction'da: ekleme basarisiz olursa (rollback)
+#   sayac da geri alinir
+#
+# Kullanim (endpoint'te, db.commit()'ten ONCE):
+#   limit_ayir(db, kullanici, "isyeri", adet=1)    # ekleme / iceri aktarma
+#   sayac_azalt(db, "isyeri")                       # soft delete
+#
+# Sayac kayarsa (elle SQL, eski kod...) sistem admin
+# POST /api/v1/limit/uzlastir ile gercek sayimdan yeniden hesaplatir.
+#
+# 📚 DERS: Kullanici limiti (max_kullanici) farkli
+# Kullanicilar tenant DB'sinde degil master DB'de durur ve OSGB basina
+# en fazla birkac on tanedir: sayac yerine tenants satiri kilitlenip
+# (SELECT ... FOR UPDATE) aktif kullanicilar sayilir. Kilit commit'e kadar
+# surer; ayni OSGB'ye es zamanli eklemeler sirayla gecer.
+#   kullanici_limiti_ayir(master_db, tenant_id)    # kullanici eklemeden once
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.master import Kullanici, Tenant
+from app.models.tenant import Isyeri, Sayac
+from app.services.sync_service import degisim_no_ayir
+from app.services.tenant_dizini import tenant_dizini
+
+
+# Sayac adi -> (sayilan model, TenantKaydi'ndaki limit alani, okunur ad)
+# Sayilan: aktif (soft delete edilmemis) kayitlar
+SAYAC_TANIMLARI = {
+    "isyeri": (Isyeri, "max_isyeri", "isyeri"),
+}
+
+
+def _gercek_sayi(db: Session, ad: str) -> int:
+    model = SAYAC_TANIMLARI[ad][0]
+    return db.query(func.count(model.id)).filter(model.aktif == True).scalar() or 0  # noqa: E712
+
+
+def _sayac_olustur(db: Session, ad: str) -> None:
+    """Sayac satiri yoksa gercek sayimla olusturur (ilk kullanim)."""
+    try:
+        # SAVEPOINT: ayni anda baskasi olusturduysa sadece bu kisim geri alinir
+        with db.begin_nested():
+            db.add(Sayac(ad=ad, deger=_gercek_sayi(db, ad)))
+    except IntegrityError:
+        pass
+
+
+def tenant_limiti(kullanici, ad: str) -> Optional[int]:
+    """Kullanicinin OSGB'si icin limit (None = sinirsiz). Bellekteki dizinden okunur."""
+    if not kullanici.tenant_id:
+        return None
+    kayit = tenant_dizini.id_ile(kullanici.tenant_id)
+    if kayit is None:
+        return None
+    return getattr(kayit, SAYAC_TANIMLARI[ad][1])
+
+
+def limit_ayir(db: Session, kullanici, ad: str, adet: int = 1) -> int:
+    """
+    Limit dahilinde 'adet' kadar yer ayirir, yeni sayac degerini dondurur.
+    Limit doluysa 403 firlatir; hicbir sey degismez.
+
+    commit cagirana aittir (eklenen kayitlarla birlikte).
+    """
+    if adet <= 0:
+        return 0
+    # Kilit sirasi: once senkronizasyon sayaci (kayit yazilinca zaten alinacak), sonra limit sayaci
+    degisim_no_ayir(db)
+    limit = tenant_limiti(kullanici, ad)
+
+    for _ in range(2):
+        kosullar = [Sayac.ad == ad]
+        if limit is not None:
+            kosullar.append(Sayac.deger + adet <= limit)
+        satir = db.execute(
+            update(Sayac)
+            .where(*kosullar)
+            .values(deger=Sayac.deger + adet, guncelleme_tarihi=datetime.utcnow())
+            .returning(Sayac.deger)
+        ).first()
+        if satir is not None:
+            return satir[0]
+
+        mevcut = db.execute(select(Sayac.deger).where(Sayac.ad == ad)).scalar()
+        if mevcut is None:
+            # Ilk kullanim: sayaci olustur ve tekrar dene
+            _sayac_olustur(db, ad)
+            continue
+
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=(
+                f"Abonelik limitine ulasildi: en fazla {limit} {SAYAC_TANIMLARI[ad][2]} "
+                f"kaydedilebilir (mevcut: {mevcut}, eklenmek istenen: {adet})"
+            ),
+        )
+    raise RuntimeError(f"'{ad}' sayaci olusturulamadi")
+
+
+def sayac_azalt(db: Session, ad: str, adet: int = 1) -> None:
+    """Soft delete / pasife alma sonrasi sayaci azaltir (0'in altina inmez)."""
+    degisim_no_ayir(db)
+    db.execute(
+        update(Sayac)
+        .where(Sayac.ad == ad)
+        .values(
+            deger=case((Sayac.deger >= adet, Sayac.deger - adet), else_=0),
+            guncelleme_tarihi=datetime.utcnow(),
+        )
+    )
+
+
+def _aktif_kullanici_sayisi(master_db: Session, tenant_id: int) -> int:
+    return master_db.query(func.count(Kullanici.id)).filter(
+        Kullanici.tenant_id == tenant_id,
+        Kullanici.aktif == True,  # noqa: E712
+    ).scalar() or 0
+
+
+def kullanici_limiti_ayir(master_db: Session, tenant_id: int, adet: int = 1) -> None:
+    """
+    OSGB'nin max_kullanici limiti 'adet' yeni kullaniciya yetiyor mu?
+    Yetmiyorsa 403 firlatir. tenants satiri commit'e kadar kilitli kalir.
+
+    commit cagirana aittir (eklenen kullanicilarla birlikte).
+    """
+    tenant = master_db.query(Tenant).filter(Tenant.id == tenant_id).with_for_update().first()
+    if tenant is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OSGB bulunamadi")
+    if tenant.max_kullanici is None:
+        return
+
+    mevcut = _aktif_kullanici_sayisi(master_db, tenant_id)
+    if mevcut + adet > tenant.max_kullanici:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=(
+                f"Abonelik limitine ulasildi: en fazla {tenant.max_kullanici} kullanici "
+                f"olusturulabilir (mevcut: {mevcut}, eklenmek istenen: {adet})"
+            ),
+        )
+
+
+def kullanici_kullanimi(master_db: Session, kullanici) -> dict:
+    """{kullanilan, limit}: OSGB'nin aktif kullanicilari (master DB)."""
+    return {
+        "kullanilan": _aktif_kullanici_sayisi(master_db, kullanici.tenant_id),
+        "limit": getattr(tenant_dizini.id_ile(kullanici.tenant_id), "max_kullanici", None),
+    }
+
+
+def kullanim(db: Session, kullanici) -> Dict[str, dict]:
+    """Her sayac icin {kullanilan, limit} (sayac yoksa gercek sayim)."""
+    degerler = dict(db.execute(select(Sayac.ad, Sayac.deger)).all())
+    return {
+        ad: {
+            "kullanilan": degerler[ad] if ad in degerler else _gercek_sayi(db, ad),
+            "limit": tenant_limiti(kullanici, ad),
+        }
+        for ad in SAYAC_TANIMLARI
+    }
+
+
+def sayaclari_uzlastir(db: Session) -> Dict[str, dict]:
+    """
+    📚 DERS: Uzlastirma (reconcile).
+
+    Sayaclari gercek COUNT(*) ile karsilastirir ve duzeltir.
+    Eski tenant DB'lerinde sayaclar tablosu yoksa olusturur.
+    Donus: {"isyeri": {"onceki": 40, "gercek": 42}, ...}
+    """
+    Sayac.__table__.create(bind=db.get_bind(), checkfirst=True)
+    sonuc = {}
+    for ad in SAYAC_TANIMLARI:
+        # Satiri kilitle: uzlastirma sirasinda ekleme araya girmesin
+        sayac = db.query(Sayac).filter(Sayac.ad == ad).with_for_update().first()
+        gercek = _gercek_sayi(db, ad)
+        if sayac is None:
+            db.add(Sayac(ad=ad, deger=gercek))
+            sonuc[ad] = {"onceki": None, "gercek": gercek}
+        else:
+            sonuc[ad] = {"onceki": sayac.deger, "gercek": gercek}
+            sayac.deger = gercek
+    db.commit()
+    return sonuc
@@ -22,6 +22,7 @@ from datetime import datetime, date
 from typing import Optional, Any
 from sqlalchemy.orm import Session
 from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.master import IslemLog, IslemLogEnum, Kullanici
 from app.core.logger import logger
@@ -97,6 +98,11 @@ async def dis_ip_al(request: Optional[Request] = None) -> Optional[str]:
     return None
 
 
+def _log_kaydet(db: Session, log: IslemLog) -> None:
+    db.add(log)
+    db.commit()
+
+
 async def islem_logla(
     db: Session,
     islem_turu: IslemLogEnum,
@@ -121,6 +127,9 @@ async def islem_logla(
 
     Ic IP: request.client.host (yerel ag adresi)
     Dis IP: X-Forwarded-For veya harici API (internet adresi)
+
+    Session senkron oldugu icin INSERT + commit thread havuzunda yapilir;
+    async endpoint'lerden cagrildiginda event loop beklemez.
     """
     try:
         # Request'ten bilgi cikart
@@ -180,8 +189,7 @@ async def islem_logla(
             hata_mesaji=hata_mesaji,
             tarih=datetime.utcnow(),
         )
-        db.add(log)
-        db.commit()
+        await run_in_threadpool(_log_kaydet, db, log)
 
         # Dosya loguna da yaz
         log_seviye = "INFO" if basarili else "WARNING"
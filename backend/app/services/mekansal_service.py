@@ -0,0 +1,258 @@
+# =============================================
+# MEKANSAL SORGULAR (yakindaki isyerleri, harita alani)
+# PostGIS varsa geography indeksi, yoksa bellekte izgara (grid) indeksi
+# =============================================
+#
+# 📚 DERS: Neden indeks?
+# "Su noktaya 5 km icindeki isyerleri" sorusunu duz SQL ile sormak
+# her satir icin mesafe hesaplamak demektir (tam tarama). Mekansal
+# indeks sadece yakindaki adaylara bakar.
+#
+# 1. PostGIS (tercih edilen): isyerleri uzerinde ifade (expression)
+#    indeksi - ayri kolon gerekmez:
+#      CREATE INDEX ix_isyerleri_konum ON isyerleri USING gist
+#        ((ST_SetSRID(ST_MakePoint(koordinat_lng, koordinat_lat), 4326)::geography))
+#    ST_DWithin bu indeksi kullanir; mesafe metre cinsinden, Dunya'nin
+#    egriligi hesaba katilir. Indeks m0002 migrasyonu ve sablon kurulumunda
+#    olusturulur (PostGIS sunucuda kuruluysa).
+#
+# 2. Izgara (PostGIS yoksa): OSGB'nin koordinatli isyerleri bellege
+#    alinir ve ~5 km'lik hucrelere dagitilir. Sorgu sadece daireyi/alani
+#    kesen hucrelere bakar. Birkac bin isyeri icin kurulum birkac ms,
+#    sorgu mikro saniyeler. Isyeri eklenip/degisince gecersiz kilinir;
+#    diger worker'lar icin MEKANSAL_INDEKS_MAKS_YAS_SN guvenlik agi.
+#
+# Kullanim:
+#   sonuc = yakindakiler(db, db_name, lat, lng, yaricap_m=5000)
+#   sonuc = alandakiler(db, db_name, min_lat, min_lng, max_lat, max_lng)
+#   mekansal_indeksler.gecersiz_kil(db_name)     (isyeri degisince)
+
+import heapq
+import math
+import threading
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import db_logger
+from app.models.tenant import Isyeri
+
+
+DUNYA_YARICAPI_M = 6_371_008.8
+_METRE_BASINA_DERECE = 1 / 111_320.0    # enlemde 1 derece ~ 111.32 km
+
+KAYNAK_POSTGIS = "postgis"
+KAYNAK_IZGARA = "izgara"
+
+# Indeksteki ifade ile sorgudaki ifade AYNI olmali ki PostgreSQL indeksi kullansin
+_KONUM_SQL = "ST_SetSRID(ST_MakePoint(isyerleri.koordinat_lng, isyerleri.koordinat_lat), 4326)::geography"
+KONUM_INDEKSI_SQL = f"""
+CREATE INDEX IF NOT EXISTS ix_isyerleri_konum ON isyerleri USING gist (({_KONUM_SQL}))
+WHERE koordinat_lat IS NOT NULL AND koordinat_lng IS NOT NULL
+"""
+
+
+def mesafe_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Iki nokta arasi buyuk daire mesafesi (haversine), metre."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * DUNYA_YARICAPI_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+# =============================================
+# POSTGIS
+# =============================================
+def postgis_kur(baglanti: Connection) -> bool:
+    """
+    PostGIS sunucuda kuruluysa eklentiyi ve konum indeksini olusturur.
+    Kurulu degilse (ya da yetki yoksa) hicbir sey yapmaz: izgara kullanilir.
+    """
+    if baglanti.dialect.name != "postgresql":
+        return False
+    mevcut = baglanti.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")
+    ).scalar()
+    if not mevcut:
+        return False
+    try:
+        # Savepoint: CREATE EXTENSION yetki hatasi tum migrasyonu bozmasin
+        with baglanti.begin_nested():
+            baglanti.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    except Exception as e:
+        db_logger.warning(f"PostGIS eklentisi kurulamadi, izgara indeksi kullanilacak: {e}")
+        return False
+    baglanti.execute(text(KONUM_INDEKSI_SQL))
+    return True
+
+
+_postgis_durumu: Dict[str, bool] = {}
+
+
+def _postgis_var_mi(db: Session, db_name: str) -> bool:
+    if not settings.MEKANSAL_POSTGIS:
+        return False
+    if db_name not in _postgis_durumu:
+        var = db.get_bind().dialect.name == "postgresql" and bool(
+            db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")).scalar()
+        )
+        _postgis_durumu[db_name] = var
+    return _postgis_durumu[db_name]
+
+
+_KOLONLAR = (
+    Isyeri.id, Isyeri.ad, Isyeri.firma_id, Isyeri.tehlike_sinifi,
+    Isyeri.lokasyon, Isyeri.koordinat_lat, Isyeri.koordinat_lng,
+)
+
+
+def _kayit(satir, mesafe: float) -> dict:
+    return {
+        "id": satir.id, "ad": satir.ad, "firma_id": satir.firma_id,
+        "tehlike_sinifi": satir.tehlike_sinifi, "lokasyon": satir.lokasyon,
+        "koordinat_lat": satir.koordinat_lat, "koordinat_lng": satir.koordinat_lng,
+        "mesafe_m": round(mesafe, 1),
+    }
+
+
+def _postgis_sorgu(db: Session, merkez: Tuple[float, float], limit: int, filtre):
+    konum = literal_column(_KONUM_SQL)
+    nokta = func.geography(func.ST_SetSRID(func.ST_MakePoint(merkez[1], merkez[0]), 4326))
+    mesafe = func.ST_Distance(konum, nokta).label("mesafe")
+    sorgu = (
+        db.query(*_KOLONLAR, mesafe)
+        .filter(
+            Isyeri.aktif == True,
+            Isyeri.koordinat_lat.isnot(None), Isyeri.koordinat_lng.isnot(None),
+            filtre(konum, nokta),
+        )
+        .order_by(mesafe)
+        .limit(limit)
+    )
+    return [_kayit(s, s.mesafe) for s in sorgu]
+
+
+# =============================================
+# IZGARA (bellekte)
+# =============================================
+class IzgaraIndeksi:
+    """
+    📚 DERS: Izgara indeksi = noktalari sabit boyutlu hucrelere dagitmak.
+    hucre = (floor(lat / boyut), floor(lng / boyut)). Bir dairenin
+    kestigi hucreler kolayca hesaplanir; sadece onlardaki noktalara
+    bakilir. KD-agacina gore daha basit, esit dagilmis veride ayni hiz.
+    """
+
+    def __init__(self, satirlar: list, hucre_derece: float):
+        self.hucre = hucre_derece
+        self.satirlar = satirlar
+        self._hucreler: Dict[Tuple[int, int], List[int]] = {}
+        for i, s in enumerate(satirlar):
+            self._hucreler.setdefault(self._hucre_no(s.koordinat_lat, s.koordinat_lng), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.satirlar)
+
+    def _hucre_no(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.hucre), math.floor(lng / self.hucre)
+
+    def _adaylar(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+        (i0, j0), (i1, j1) = self._hucre_no(min_lat, min_lng), self._hucre_no(max_lat, max_lng)
+        # Alan cok buyukse (tum Turkiye) hucre hucre gezmek tum listeden pahali
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._hucreler):
+            return range(len(self.satirlar))
+        return (
+            sira
+            for i in range(i0, i1 + 1)
+            for j in range(j0, j1 + 1)
+            for sira in self._hucreler.get((i, j), ())
+        )
+
+    def yakin(self, lat: float, lng: float, yaricap_m: float, limit: int) -> List[dict]:
+        dlat = yaricap_m * _METRE_BASINA_DERECE
+        dlng = dlat / max(math.cos(math.radians(lat)), 0.01)
+        bulunan = []
+        for sira in self._adaylar(lat - dlat, lng - dlng, lat + dlat, lng + dlng):
+            s = self.satirlar[sira]
+            m = mesafe_m(lat, lng, s.koordinat_lat, s.koordinat_lng)
+            if m <= yaricap_m:
+                bulunan.append((m, sira))
+        return [_kayit(self.satirlar[sira], m) for m, sira in heapq.nsmallest(limit, bulunan)]
+
+    def alan(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int) -> List[dict]:
+        merkez_lat, merkez_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+        bulunan = []
+        for sira in self._adaylar(min_lat, min_lng, max_lat, max_lng):
+            s = self.satirlar[sira]
+            if min_lat <= s.koordinat_lat <= max_lat and min_lng <= s.koordinat_lng <= max_lng:
+                bulunan.append((mesafe_m(merkez_lat, merkez_lng, s.koordinat_lat, s.koordinat_lng), sira))
+        return [_kayit(self.satirlar[sira], m) for m, sira in heapq.nsmallest(limit, bulunan)]
+
+
+class MekansalIndeksler:
+    """OSGB (db_name) basina izgara indeksi; ilk sorguda kurulur."""
+
+    def __init__(self):
+        self._indeksler: Dict[str, Tuple[IzgaraIndeksi, float]] = {}
+        self._kilit = threading.Lock()
+
+    def getir(self, db: Session, db_name: str) -> IzgaraIndeksi:
+        kayit = self._indeksler.get(db_name)
+        if kayit is not None and monotonic() - kayit[1] < settings.MEKANSAL_INDEKS_MAKS_YAS_SN:
+            return kayit[0]
+        with self._kilit:
+            # Kilidi beklerken baska istek kurmus olabilir
+            kayit = self._indeksler.get(db_name)
+            if kayit is not None and monotonic() - kayit[1] < settings.MEKANSAL_INDEKS_MAKS_YAS_SN:
+                return kayit[0]
+            satirlar = (
+                db.query(*_KOLONLAR)
+                .filter(Isyeri.aktif == True, Isyeri.koordinat_lat.isnot(None), Isyeri.koordinat_lng.isnot(None))
+                .all()
+            )
+            indeks = IzgaraIndeksi(satirlar, settings.MEKANSAL_IZGARA_DERECE)
+            self._indeksler[db_name] = (indeks, monotonic())
+            return indeks
+
+    def gecersiz_kil(self, db_name: Optional[str]) -> None:
+        if db_name:
+            self._indeksler.pop(db_name, None)
+
+
+mekansal_indeksler = MekansalIndeksler()
+
+
+# =============================================
+# SORGULAR
+# =============================================
+def yakindakiler(db: Session, db_name: str, lat: float, lng: float, yaricap_m: float, limit: int = 50) -> dict:
+    """Noktaya yaricap_m icindeki aktif isyerleri, yakindan uzaga."""
+    if _postgis_var_mi(db, db_name):
+        isyerleri = _postgis_sorgu(
+            db, (lat, lng), limit, lambda konum, nokta: func.ST_DWithin(konum, nokta, yaricap_m),
+        )
+        return {"kaynak": KAYNAK_POSTGIS, "isyerleri": isyerleri}
+    return {"kaynak": KAYNAK_IZGARA, "isyerleri": mekansal_indeksler.getir(db, db_name).yakin(lat, lng, yaricap_m, limit)}
+
+
+def alandakiler(
+    db: Session, db_name: str, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 500,
+) -> dict:
+    """Harita gorunumu (dikdortgen) icindeki aktif isyerleri, merkeze yakindan uzaga."""
+    if _postgis_var_mi(db, db_name):
+        zarf = func.geography(func.ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, 4326))
+        merkez = ((min_lat + max_lat) / 2, (min_lng + max_lng) / 2)
+        isyerleri = _postgis_sorgu(
+            db, merkez, limit,
+            # &&: indeksli kaba eleme; between: dikdortgenin tam siniri
+            lambda konum, nokta: konum.op("&&")(zarf)
+            & Isyeri.koordinat_lat.between(min_lat, max_lat)
+            & Isyeri.koordinat_lng.between(min_lng, max_lng),
+        )
+        return {"kaynak": KAYNAK_POSTGIS, "isyerleri": isyerleri}
+    indeks = mekansal_indeksler.getir(db, db_name)
+    return {"kaynak": KAYNAK_IZGARA, "isyerleri": indeks.alan(min_lat, min_lng, max_lat, max_lng, limit)}
@@ -0,0 +1,210 @@
+# =============================================
+# MIGRASYON CALISTIRICI
+# Bekleyen migrasyonlari TUM OSGB veritabanlarina paralel uygular
+# =============================================
+#
+# 📚 DERS: Neden paralel?
+# 300 OSGB x 2 saniye = 10 dakika kesinti (tek tek). Her veritabani
+# bagimsiz oldugu icin ayni anda N tanesi migre edilebilir. N sinirli
+# tutulur (MIGRASYON_PARALEL): her is bir PostgreSQL baglantisi harcar.
+#
+# Her veritabani icin:
+#   1. pg_try_advisory_lock -> ayni DB'yi iki calistirici ayni anda
+#      migre edemez (digeri "kilitli" raporlar, beklemez)
+#   2. sema_versiyonu tablosundan uygulanmislari oku
+#   3. Bekleyenleri sirayla, HER BIRINI kendi transaction'inda uygula
+#      ve sema_versiyonu'na yaz
+#   4. Hata olursa o DB'de durulur; digerleri devam eder
+#
+# Kaldigi yerden devam: Ilerleme her DB'nin kendi sema_versiyonu
+# tablosundadir. Calistirici yarida kesilirse (deploy iptali, cokme)
+# tekrar calistirmak yeterli; sadece eksik kalanlar uygulanir.
+#
+# Kuru calistirma (--kuru): Bekleyen migrasyonlar tek transaction'da
+# GERCEKTEN calistirilir, sonra ROLLBACK. PostgreSQL'de DDL de geri
+# alinabildigi icin hicbir sey degismez ama SQL hatalari yakalanir.
+#
+# Kullanim:
+#   rapor = tum_tenantlari_migre_et(kuru=True)
+#   python tenant_cli.py migrasyon [--kuru] [--paralel 16] [--rapor rapor.json]
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from time import perf_counter
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.database import MasterSessionLocal, tenant_db_url
+from app.core.logger import db_logger
+from app.migrasyonlar import Migrasyon, migrasyonlar, son_versiyon
+from app.models.master import Tenant
+from app.models.tenant import SemaVersiyonu
+
+
+# 32-bit advisory lock anahtari. Advisory lock'lar veritabani basinadir:
+# ayni anahtar her OSGB DB'sinde o DB'ye ozel bir kilit olur.
+_MIGRASYON_KILIT_ANAHTARI = 0x05B6_7E02
+
+DURUM_UYGULANDI = "uygulandi"
+DURUM_GUNCEL = "guncel"
+DURUM_HATA = "hata"
+DURUM_KILITLI = "kilitli"
+
+
+def _uygula(baglanti, migrasyon: Migrasyon) -> float:
+    baslangic = perf_counter()
+    migrasyon.uygula(baglanti)
+    sure_ms = (perf_counter() - baslangic) * 1000
+    baglanti.execute(
+        SemaVersiyonu.__table__.insert().values(
+            versiyon=migrasyon.versiyon, ad=migrasyon.ad,
+            uygulama_tarihi=datetime.utcnow(), sure_ms=sure_ms,
+        )
+    )
+    return sure_ms
+
+
+def tenant_migre_et(db_name: str, kuru: bool = False) -> dict:
+    """
+    Tek bir veritabanini son versiyona getirir.
+
+    Donus: {"db_name", "durum", "onceki_versiyon", "sonraki_versiyon",
+            "uygulanan": [...], "hata", "sure_ms"}
+    """
+    baslangic = perf_counter()
+    sonuc = {
+        "db_name": db_name,
+        "durum": DURUM_GUNCEL,
+        "onceki_versiyon": None,
+        "sonraki_versiyon": None,
+        "uygulanan": [],
+        "hata": None,
+        "sure_ms": 0.0,
+    }
+
+    # NullPool: yuzlerce DB icin kalici havuz acilmasin
+    engine = create_engine(tenant_db_url(db_name), poolclass=NullPool)
+    try:
+        with engine.connect() as baglanti:
+            kilitlendi = baglanti.execute(
+                text("SELECT pg_try_advisory_lock(:k)"), {"k": _MIGRASYON_KILIT_ANAHTARI}
+            ).scalar()
+            baglanti.commit()
+            if not kilitlendi:
+                sonuc["durum"] = DURUM_KILITLI
+                sonuc["hata"] = "Baska bir migrasyon bu veritabaninda calisiyor"
+                return sonuc
+
+            try:
+                # Uygulama trafigini uzun sure bekletmesin: kilit alamazsa hata ver
+                baglanti.execute(text(f"SET lock_timeout = '{settings.MIGRASYON_KILIT_BEKLEME_SN}s'"))
+                tablo_var = baglanti.dialect.has_table(baglanti, SemaVersiyonu.__tablename__)
+                uygulanmis = (
+                    set(baglanti.execute(select(SemaVersiyonu.versiyon)).scalars()) if tablo_var else set()
+                )
+                baglanti.commit()
+
+                sonuc["onceki_versiyon"] = max(uygulanmis, default=0)
+                bekleyenler = [m for m in migrasyonlar() if m.versiyon not in uygulanmis]
+                sonuc["sonraki_versiyon"] = sonuc["onceki_versiyon"]
+                if not bekleyenler:
+                    return sonuc
+
+                simdiki = None
+                try:
+                    if kuru:
+                        # Hepsi tek transaction'da: sonraki migrasyon oncekinin
+                        # etkisini gorsun, sonunda hepsi geri alinsin
+                        with baglanti.begin() as tx:
+                            if not tablo_var:
+                                SemaVersiyonu.__table__.create(bind=baglanti)
+                            for simdiki in bekleyenler:
+                                _uygula(baglanti, simdiki)
+                                sonuc["uygulanan"].append(simdiki.ad)
+                            tx.rollback()
+                    else:
+                        if not tablo_var:
+                            with baglanti.begin():
+                                SemaVersiyonu.__table__.create(bind=baglanti)
+                        for simdiki in bekleyenler:
+                            with baglanti.begin():
+                                _uygula(baglanti, simdiki)
+                            sonuc["uygulanan"].append(simdiki.ad)
+                            sonuc["sonraki_versiyon"] = simdiki.versiyon
+                    sonuc["durum"] = DURUM_UYGULANDI
+                except Exception as e:
+                    sonuc["durum"] = DURUM_HATA
+                    sonuc["hata"] = f"{simdiki.ad if simdiki else SemaVersiyonu.__tablename__}: {e}"
+            finally:
+                baglanti.rollback()  # yarim kalmis transaction varsa
+                baglanti.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _MIGRASYON_KILIT_ANAHTARI})
+                baglanti.commit()
+    except Exception as e:
+        # Baglanti kurulamadi vs.
+        sonuc["durum"] = DURUM_HATA
+        sonuc["hata"] = str(e)
+    finally:
+        engine.dispose()
+        sonuc["sure_ms"] = round((perf_counter() - baslangic) * 1000, 1)
+    return sonuc
+
+
+def tenant_veritabanlari() -> List[str]:
+    """Master DB'deki tum OSGB veritabanlari (pasifler dahil)."""
+    db = MasterSessionLocal()
+    try:
+        return [db_name for (db_name,) in db.query(Tenant.db_name).order_by(Tenant.id)]
+    finally:
+        db.close()
+
+
+def tum_tenantlari_migre_et(
+    db_adlari: Optional[Iterable[str]] = None,
+    paralel: Optional[int] = None,
+    kuru: bool = False,
+    ilerleme: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    📚 DERS: Sinirli is havuzu (bounded worker pool).
+
+    ThreadPoolExecutor(max_workers=N): en fazla N veritabani ayni anda.
+    Isler bekleme (I/O) agirlikli oldugu icin thread yeterli.
+    ilerleme: her veritabani bitince sonucuyla cagrilir (CLI ciktisi icin).
+
+    Donus: rapor sozlugu (ozet + veritabani basina sonuc)
+    """
+    db_adlari = list(db_adlari) if db_adlari is not None else tenant_veritabanlari()
+    paralel = max(1, paralel or settings.MIGRASYON_PARALEL)
+    baslangic = perf_counter()
+
+    sonuclar = []
+    with ThreadPoolExecutor(max_workers=paralel, thread_name_prefix="migrasyon") as havuz:
+        isler = [havuz.submit(tenant_migre_et, db_name, kuru) for db_name in db_adlari]
+        for is_ in as_completed(isler):
+            sonuc = is_.result()
+            sonuclar.append(sonuc)
+            if sonuc["durum"] == DURUM_HATA:
+                db_logger.error(f"Migrasyon basarisiz: {sonuc['db_name']} | {sonuc['hata']}")
+            elif sonuc["durum"] == DURUM_UYGULANDI and not kuru:
+                db_logger.info(f"Migrasyon uygulandi: {sonuc['db_name']} | {', '.join(sonuc['uygulanan'])}")
+            if ilerleme is not None:
+                ilerleme(sonuc)
+
+    sonuclar.sort(key=lambda s: s["db_name"])
+    ozet = {durum: 0 for durum in (DURUM_UYGULANDI, DURUM_GUNCEL, DURUM_HATA, DURUM_KILITLI)}
+    for sonuc in sonuclar:
+        ozet[sonuc["durum"]] += 1
+
+    return {
+        "tarih": datetime.utcnow().isoformat(timespec="seconds"),
+        "kuru": kuru,
+        "hedef_versiyon": son_versiyon(),
+        "paralel": paralel,
+        "sure_sn": round(perf_counter() - baslangic, 2),
+        "ozet": ozet,
+        "hatalar": [s for s in sonuclar if s["durum"] in (DURUM_HATA, DURUM_KILITLI)],
+        "tenantlar": sonuclar,
+    }
@@ -0,0 +1,202 @@
+# =============================================
+# NACE KODLARI (bellekte indeks)
+# 6 haneli NACE Rev.2 kodu -> aciklama + tehlike sinifi
+# =============================================
+#
+# 📚 DERS: Isyerinin tehlike sinifi serbestce secilmez; Is Sagligi ve
+# Guvenligi Tehlike Siniflari Listesi Tebligi'nde her 6 haneli NACE
+# koduna bir sinif atanmistir. Kod biliniyorsa varsayilan sinif da bilinir;
+# istemci sinifi acikca gonderirse o esas alinir (nace_uygula).
+#
+# Liste sabit ve kucuk (birkac bin satir): acilista CSV'den okunup
+# bellekte tutulur, veritabanina hic gidilmez.
+#
+# Indeks = SIRALI DIZI + bisect:
+#   _kodlar    = ["011107", "011305", ..., "960301"]   (sirali)
+#   "2511" ile baslayanlar -> bisect_left("2511") .. bisect_left("2512")
+#   araligi; O(log n) arama + sonuc kadar kopyalama.
+# Aciklamadaki kelimeler icin ayni yapi: sirali (kelime, sira) ciftleri.
+# Trie'ye gore cok daha az nesne, ayni prefix aramasi.
+#
+# Yeniden yukleme atomiktir: yeni diziler hazirlanip tek atamayla
+# degistirilir; okuyan thread'ler ya eski ya yeni listeyi gorur.
+#
+# Kullanim:
+#   nace_indeksi.yukle()                      (lifespan)
+#   nace_indeksi.getir("25.11.01")            -> NaceKaydi | None
+#   nace_indeksi.ara("2511") / ara("metal")   -> [NaceKaydi, ...]
+#   nace_indeksi.toplu_coz(kodlar)            -> Excel import (tek geciste)
+
+import csv
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.tenant import TehlikeSinifi
+from app.utils.metin import sadelestir
+
+
+VARSAYILAN_DOSYA = Path(__file__).resolve().parent.parent / "data" / "nace_kodlari.csv"
+
+# Excel sayisal hucreden "251101.0" ya da bastaki sifiri atilmis "11107" gelebilir
+_SAYISAL_HUCRE = re.compile(r"^(\d{5,6})\.0$")
+_RAKAM_DISI = re.compile(r"\D")
+
+_KELIME = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class NaceKaydi:
+    kod: str                        # "25.11.01" (resmi yazim)
+    aciklama: str
+    tehlike_sinifi: TehlikeSinifi
+
+    def sozluk(self) -> dict:
+        return {"kod": self.kod, "aciklama": self.aciklama, "tehlike_sinifi": self.tehlike_sinifi.value}
+
+
+def kod_normallestir(ham) -> Optional[str]:
+    """
+    "25.11.01", "251101", 251101, "251101.0", "11107" -> "251101" / "011107".
+    6 haneye tamamlanamayan deger icin None.
+    """
+    if ham is None:
+        return None
+    metin = str(ham).strip()
+    sayisal = _SAYISAL_HUCRE.match(metin)
+    if sayisal:
+        metin = sayisal.group(1)
+    rakamlar = _RAKAM_DISI.sub("", metin)
+    if len(rakamlar) == 5 and "." not in metin:
+        rakamlar = "0" + rakamlar
+    return rakamlar if len(rakamlar) == 6 else None
+
+
+def _noktali(kod6: str) -> str:
+    return f"{kod6[:2]}.{kod6[2:4]}.{kod6[4:]}"
+
+
+class NaceIndeksi:
+    def __init__(self):
+        # (kodlar, kayitlar, kelimeler) tek demet: tek atamayla degisir
+        self._veri: Tuple[List[str], List[NaceKaydi], List[Tuple[str, int]]] = ([], [], [])
+        self.dosya: Optional[Path] = None
+
+    def __len__(self) -> int:
+        return len(self._veri[0])
+
+    def yukle(self, dosya: Optional[str] = None) -> int:
+        """
+        CSV'yi okur (baslik: kod;aciklama;tehlike_sinifi). Hatali satir
+        varsa hicbiri yuklenmez (ValueError): yarim liste ile calisilmasin.
+        """
+        yol = Path(dosya or settings.NACE_DOSYASI or VARSAYILAN_DOSYA)
+        satirlar: Dict[str, NaceKaydi] = {}
+        with open(yol, encoding="utf-8-sig", newline="") as f:
+            for no, satir in enumerate(csv.DictReader(f, delimiter=";"), start=2):
+                kod6 = kod_normallestir(satir.get("kod"))
+                if kod6 is None:
+                    raise ValueError(f"{yol.name}:{no} gecersiz NACE kodu: '{satir.get('kod')}'")
+                try:
+                    sinif = TehlikeSinifi(str(satir.get("tehlike_sinifi") or "").strip())
+                except ValueError:
+                    raise ValueError(f"{yol.name}:{no} gecersiz tehlike sinifi: '{satir.get('tehlike_sinifi')}'")
+                satirlar[kod6] = NaceKaydi(_noktali(kod6), (satir.get("aciklama") or "").strip(), sinif)
+
+        kodlar = sorted(satirlar)
+        kayitlar = [satirlar[k] for k in kodlar]
+        kelimeler = sorted(
+            {(kelime, sira) for sira, kayit in enumerate(kayitlar) for kelime in _KELIME.findall(sadelestir(kayit.aciklama))}
+        )
+        self._veri = (kodlar, kayitlar, kelimeler)
+        self.dosya = yol
+        logger.info(f"NACE indeksi yuklendi: {len(kodlar)} kod ({yol.name})")
+        return len(kodlar)
+
+    def getir(self, kod) -> Optional[NaceKaydi]:
+        kod6 = kod_normallestir(kod)
+        if kod6 is None:
+            return None
+        kodlar, kayitlar, _ = self._veri
+        i = bisect_left(kodlar, kod6)
+        return kayitlar[i] if i < len(kodlar) and kodlar[i] == kod6 else None
+
+    def ara(self, sorgu: str, limit: int = 20) -> List[NaceKaydi]:
+        """
+        📚 DERS: Otomatik tamamlama.
+        Rakamla baslayan sorgu kod onekidir ("25.1" -> 251xxx),
+        digerleri aciklamadaki kelime onekleri ("metal kap" -> ikisi de
+        bir kelimenin basinda gecmeli). Sonuclar kod sirasindadir.
+        """
+        kodlar, kayitlar, kelimeler = self._veri
+        sorgu = (sorgu or "").strip()
+        if not sorgu:
+            return []
+
+        if sorgu[0].isdigit():
+            onek = _RAKAM_DISI.sub("", sorgu)[:6]
+            bas = bisect_left(kodlar, onek)
+            son = bisect_left(kodlar, onek + "~")     # "~" tum rakamlardan buyuk
+            return kayitlar[bas:min(son, bas + limit)]
+
+        eslesen: Optional[set] = None
+        for parca in _KELIME.findall(sadelestir(sorgu)):
+            bas = bisect_left(kelimeler, (parca,))
+            son = bisect_left(kelimeler, (parca + "~",))
+            siralar = {sira for _, sira in kelimeler[bas:son]}
+            eslesen = siralar if eslesen is None else eslesen & siralar
+            if not eslesen:
+                return []
+        return [kayitlar[i] for i in sorted(eslesen or ())[:limit]]
+
+    def toplu_coz(self, kodlar: Iterable) -> List[Optional[NaceKaydi]]:
+        """
+        📚 DERS: Toplu (vektorel) cozumleme.
+        Excel'de ayni kod yuzlerce satirda tekrar eder: her FARKLI deger bir
+        kez normallestirilip aranir, sonuc tum satirlara dagitilir.
+        Donus girdiyle ayni sirada; bulunamayan/gecersiz icin None.
+        """
+        kodlar = list(kodlar)
+        cozulen = {ham: self.getir(ham) for ham in set(kodlar)}
+        return [cozulen[ham] for ham in kodlar]
+
+
+def nace_uygula(veri: dict, kayit: Optional[NaceKaydi]) -> Optional[str]:
+    """
+    Isyeri verisine NACE bilgisini isler (veri yerinde degisir).
+    Hata varsa mesajini dondurur, yoksa None.
+
+    - Kod resmi yazima cevrilir; nace_aciklama bossa listeden doldurulur.
+    - tehlike_sinifi gonderildiyse o kullanilir (liste yalnizca varsayilan;
+      mevzuat/risk degerlendirmesi farkli sinif gerektirebilir).
+    - Gonderilmediyse listeden alinir; kod listede de yoksa hata
+      (eski sinif sessizce korunmaz).
+    """
+    kod6 = kod_normallestir(veri.get("nace_kodu"))
+    if kod6 is None:
+        return f"Gecersiz NACE kodu: '{veri.get('nace_kodu')}' (6 haneli olmali, orn. 25.11.01)"
+    veri["nace_kodu"] = kayit.kod if kayit is not None else _noktali(kod6)
+    if kayit is not None and not veri.get("nace_aciklama"):
+        veri["nace_aciklama"] = kayit.aciklama
+
+    ts = veri.get("tehlike_sinifi")
+    if not ts:
+        if kayit is None:
+            return f"NACE kodu listede yok: '{veri['nace_kodu']}'. Tehlike sinifi belirtilmeli"
+        veri["tehlike_sinifi"] = kayit.tehlike_sinifi
+        return None
+    try:
+        veri["tehlike_sinifi"] = TehlikeSinifi(ts)
+    except ValueError:
+        return (
+            f"Gecersiz tehlike sinifi: '{ts}'. "
+            f"Gecerli degerler: az_tehlikeli, tehlikeli, cok_tehlikeli"
+        )
+    return None
+
+
+nace_indeksi = NaceIndeksi()
@@ -0,0 +1,326 @@
+# =============================================
+# ROTA OPTIMIZASYONU (gunun ziyaret sirasi)
+# Mesafe matrisi + en yakin komsu + 2-opt
+# =============================================
+#
+# 📚 DERS: Gezgin satici problemi (TSP) kesin cozumu ustel zamanlidir;
+# bir gunde 5-50 durak icin sezgisel yeterince iyidir:
+#
+# 1. Mesafe matrisi: d[i][j] = iki durak arasi metre (kus ucusu x
+#    ROTA_YOL_KATSAYISI). Cift mesafeler onbellektedir (tum OSGB'ler
+#    icin tek LRU, toplam ROTA_MESAFE_ONBELLEK cift); ayni isyerleri
+#    her gun tekrar gezildigi icin matrisin cogu hazirdir.
+# 2. En yakin komsu: her adimda en yakin gidilmemis duraga git.
+#    Personelin konumu varsa oradan baslar; yoksa her duraktan
+#    baslatilip en kisasi secilir (50 durak icin 50 deneme, ms'ler).
+# 3. 2-opt: rotada iki kenari kesip aradaki parcayi ters cevirmek yolu
+#    kisaltiyorsa yap; iyilesme kalmayana kadar tekrarla. Kesisen yollar
+#    boylece acilir, sonuc genelde optimumun %5'i icinde.
+#
+# Rota ACIK yoldur: son duraktan donus sayilmaz (personel oradan eve /
+# ofise gider, hangisi oldugu bilinmiyor).
+#
+# Toplu mod: bir gunun TUM personel rotalari ayri islemlerde (process
+# pool) paralel cozulur; 2-opt saf Python ve CPU'ya bagli oldugu icin
+# thread'ler GIL yuzunden hizlandirmaz. Matrisler ana islemde (onbellek
+# burada) hazirlanir, havuza sadece sayilar gider. Havuz "forkserver"
+# (yoksa "spawn") ile baslar: thread'li bir process'i (event loop,
+# thread havuzu, DB baglantilari) fork etmek kilitleri yarim kopyalar.
+#
+# Kullanim:
+#   sira, uzunluk = rota_coz(matris, sabit_baslangic=True)
+#   sonuc = gunluk_rotalar(db, db_name, gun, personel_id=5, uygula=True)
+
+import multiprocessing
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, contains_eager
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.tenant import Isyeri, Personel, Ziyaret, ZiyaretDurumu
+from app.services.mekansal_service import mesafe_m
+
+
+Nokta = Tuple[float, float]
+
+# Bundan az duraklı gunlerde process havuzu acmak cozmekten pahali
+_HAVUZ_ESIGI_DURAK = 40
+
+
+# =============================================
+# COZUCU (saf fonksiyonlar - process havuzunda calisir)
+# =============================================
+def _yol_uzunlugu(sira: Sequence[int], d: List[List[float]]) -> float:
+    sira = list(sira)
+    return sum(d[a][b] for a, b in zip(sira, sira[1:]))
+
+
+def _en_yakin_komsu(d: List[List[float]], bas: int) -> List[int]:
+    n = len(d)
+    sira = [bas]
+    kalan = set(range(n)) - {bas}
+    while kalan:
+        son = d[sira[-1]]
+        sonraki = min(kalan, key=lambda j: (son[j], j))
+        sira.append(sonraki)
+        kalan.remove(sonraki)
+    return sira
+
+
+def _iki_opt(sira: List[int], d: List[List[float]], sabit_baslangic: bool) -> List[int]:
+    """Acik yol icin 2-opt: sira[i..j] ters cevrilir (ilk durak sabitse i >= 1)."""
+    n = len(sira)
+    iyilesti = True
+    while iyilesti:
+        iyilesti = False
+        for i in range(1 if sabit_baslangic else 0, n - 1):
+            for j in range(i + 1, n):
+                a, b, c = (sira[i - 1] if i else None), sira[i], sira[j]
+                e = sira[j + 1] if j + 1 < n else None
+                eski = (d[a][b] if a is not None else 0) + (d[c][e] if e is not None else 0)
+                yeni = (d[a][c] if a is not None else 0) + (d[b][e] if e is not None else 0)
+                if yeni < eski - 1e-6:
+                    sira[i:j + 1] = reversed(sira[i:j + 1])
+                    iyilesti = True
+    return sira
+
+
+def rota_coz(d: List[List[float]], sabit_baslangic: bool) -> Tuple[List[int], float]:
+    """
+    Mesafe matrisinden ziyaret sirasi -> (indeksler, toplam metre).
+    sabit_baslangic: 0. nokta cikis yeri (personel konumu), yer degistirmez.
+    """
+    n = len(d)
+    if n <= 2:
+        sira = list(range(n))
+        return sira, _yol_uzunlugu(sira, d)
+    baslangiclar = [0] if sabit_baslangic else range(n)
+    sira = min((_en_yakin_komsu(d, b) for b in baslangiclar), key=lambda s: _yol_uzunlugu(s, d))
+    sira = _iki_opt(sira, d, sabit_baslangic)
+    return sira, _yol_uzunlugu(sira, d)
+
+
+# =============================================
+# MESAFE ONBELLEGI (tum OSGB'ler icin tek LRU)
+# =============================================
+class MesafeOnbellegi:
+    """
+    (db_name, nokta, nokta) -> metre, TOPLAM en fazla ROTA_MESAFE_ONBELLEK
+    cift (LRU). Sinir OSGB basina olsaydi bellek OSGB sayisiyla buyurdu;
+    tek LRU'da az kullanilan OSGB'nin ciftleri once duser.
+    Anahtar koordinatin kendisi: isyeri tasinirsa eski cift kendiliginden
+    kullanilmaz, gecersiz kilma gerekmez.
+    """
+
+    def __init__(self):
+        self._onbellek: "OrderedDict[tuple, float]" = OrderedDict()
+        self._kilit = threading.Lock()
+
+    def matris(self, db_name: str, noktalar: List[Nokta]) -> List[List[float]]:
+        n = len(noktalar)
+        d = [[0.0] * n for _ in range(n)]
+        with self._kilit:
+            onbellek = self._onbellek
+            for i in range(n):
+                for j in range(i + 1, n):
+                    a, b = (noktalar[i], noktalar[j]) if noktalar[i] <= noktalar[j] else (noktalar[j], noktalar[i])
+                    anahtar = (db_name, a, b)
+                    deger = onbellek.get(anahtar)
+                    if deger is None:
+                        deger = mesafe_m(*a, *b) * settings.ROTA_YOL_KATSAYISI
+                        onbellek[anahtar] = deger
+                    else:
+                        onbellek.move_to_end(anahtar)
+                    d[i][j] = d[j][i] = deger
+            while len(onbellek) > settings.ROTA_MESAFE_ONBELLEK:
+                onbellek.popitem(last=False)
+        return d
+
+    def temizle(self, db_name: Optional[str] = None) -> None:
+        with self._kilit:
+            if db_name is None:
+                self._onbellek.clear()
+            else:
+                for anahtar in [k for k in self._onbellek if k[0] == db_name]:
+                    del self._onbellek[anahtar]
+
+
+mesafe_onbellegi = MesafeOnbellegi()
+
+
+# =============================================
+# PROCESS HAVUZU
+# =============================================
+_havuz: Optional[ProcessPoolExecutor] = None
+_havuz_kilidi = threading.Lock()
+
+
+def _havuz_getir() -> ProcessPoolExecutor:
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is None:
+            yontem = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _havuz = ProcessPoolExecutor(
+                max_workers=settings.ROTA_ISLEM_SAYISI, mp_context=multiprocessing.get_context(yontem),
+            )
+        return _havuz
+
+
+def rota_kapat() -> None:
+    """Kapanista process havuzunu kapatir (acilmissa)."""
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is not None:
+            _havuz.shutdown(wait=False, cancel_futures=True)
+            _havuz = None
+
+
+# =============================================
+# GUNLUK ROTALAR
+# =============================================
+def _konumlu_mu(z: Ziyaret) -> bool:
+    return z.isyeri.koordinat_lat is not None and z.isyeri.koordinat_lng is not None
+
+
+def _hazirla(db_name: str, ziyaretler: list, cikis: Optional[Nokta]) -> dict:
+    """Bir personelin gunu: koordinatli duraklar + matris, koordinatsizlar ayrica."""
+    konumlu = [z for z in ziyaretler if _konumlu_mu(z)]
+    noktalar = [(z.isyeri.koordinat_lat, z.isyeri.koordinat_lng) for z in konumlu]
+    if cikis is not None:
+        noktalar.insert(0, cikis)
+    return {
+        "konumlu": konumlu,
+        "konumsuz": [z for z in ziyaretler if not _konumlu_mu(z)],
+        "matris": mesafe_onbellegi.matris(db_name, noktalar),
+        "sabit": cikis is not None,
+    }
+
+
+def _sonuc(
+    personel: Optional[Personel], gun: date, is_: dict, sira: List[int], uzunluk: float, uygula: bool,
+) -> Tuple[dict, List[dict]]:
+    """
+    Cozumu ziyaret saatlerine cevirir -> (yanit, guncelleme satirlari).
+    Gun ZIYARET_BASLANGIC_SAATI'nde baslar, duraklar arasina yol suresi
+    eklenir; koordinatsiz ziyaretler eski sirasiyla sona kalir.
+    """
+    d = is_["matris"]
+    kaydirma = 1 if is_["sabit"] else 0
+    # (ziyaret, matristeki indeksi): cikis noktasi (0) ziyaret degildir
+    duraklar = [(is_["konumlu"][i - kaydirma], i) for i in sira if i >= kaydirma]
+    duraklar += [(z, None) for z in is_["konumsuz"]]
+
+    hiz_m_dk = settings.ROTA_ORTALAMA_HIZ_KMS * 1000 / 60
+    saat = datetime.combine(gun, datetime.min.time()) + timedelta(hours=settings.ZIYARET_BASLANGIC_SAATI)
+    onceki = 0 if is_["sabit"] else None
+    satirlar, guncellemeler = [], []
+    for z, i in duraklar:
+        if i is not None:
+            if onceki is not None:
+                saat += timedelta(minutes=round(d[onceki][i] / hiz_m_dk))
+            onceki = i
+        sure = z.sure_dk or int(((z.ziyaret_bitis or z.ziyaret_tarihi) - z.ziyaret_tarihi).total_seconds() // 60)
+        bitis = saat + timedelta(minutes=sure)
+        satirlar.append({
+            "ziyaret_id": z.id,
+            "isyeri_id": z.isyeri_id,
+            "isyeri_adi": z.isyeri.ad,
+            "koordinat_lat": z.isyeri.koordinat_lat,
+            "koordinat_lng": z.isyeri.koordinat_lng,
+            "baslangic": saat,
+            "bitis": bitis,
+        })
+        guncellemeler.append({"id": z.id, "ziyaret_tarihi": saat, "ziyaret_bitis": bitis})
+        saat = bitis
+
+    return {
+        "personel_id": personel.id if personel else None,
+        "personel_adi": f"{personel.ad} {personel.soyad}" if personel else None,
+        "gun": gun,
+        "durak_sayisi": len(satirlar),
+        "toplam_km": round(uzunluk / 1000, 1),
+        "onceki_km": round(_yol_uzunlugu(range(len(d)), d) / 1000, 1),   # Mevcut (saat) sirasi
+        "cikis_konumu": is_["sabit"],
+        "konumsuz_ziyaret_idleri": [z.id for z in is_["konumsuz"]],
+        "uygulandi": uygula,
+        "sira": satirlar,
+    }, guncellemeler
+
+
+def gunluk_rotalar(
+    db: Session,
+    db_name: str,
+    gun: date,
+    personel_id: Optional[int] = None,
+    uygula: bool = False,
+) -> dict:
+    """
+    Gunun PLANLANDI ziyaretlerini personel bazinda siralar.
+    personel_id yoksa o gunun tum personeli (toplu mod, process havuzu).
+    uygula=True: ziyaret saatleri yeni siraya gore (yol suresi dahil)
+    tek toplu UPDATE ile yazilir ve commit edilir.
+    """
+    baslangic = perf_counter()
+    gun_basi = datetime.combine(gun, datetime.min.time())
+    sorgu = (
+        db.query(Ziyaret)
+        .join(Isyeri, Ziyaret.isyeri_id == Isyeri.id)
+        .options(contains_eager(Ziyaret.isyeri))
+        .filter(
+            Ziyaret.ziyaret_tarihi >= gun_basi,
+            Ziyaret.ziyaret_tarihi < gun_basi + timedelta(days=1),
+            Ziyaret.durum == ZiyaretDurumu.PLANLANDI,
+            Ziyaret.ziyaretci_id.isnot(None),
+        )
+    )
+    if personel_id is not None:
+        sorgu = sorgu.filter(Ziyaret.ziyaretci_id == personel_id)
+    gruplar: Dict[int, list] = defaultdict(list)
+    for z in sorgu.order_by(Ziyaret.ziyaret_tarihi, Ziyaret.id):
+        gruplar[z.ziyaretci_id].append(z)
+
+    personeller = {
+        p.id: p for p in db.query(Personel).filter(Personel.id.in_(list(gruplar)))
+    } if gruplar else {}
+    isler = {}
+    for pid, ziyaretler in gruplar.items():
+        p = personeller.get(pid)
+        cikis = (p.konum_lat, p.konum_lng) if p and p.konum_lat is not None and p.konum_lng is not None else None
+        isler[pid] = _hazirla(db_name, ziyaretler, cikis)
+
+    toplam_durak = sum(len(i["matris"]) for i in isler.values())
+    if len(isler) > 1 and toplam_durak >= _HAVUZ_ESIGI_DURAK and settings.ROTA_ISLEM_SAYISI > 1:
+        havuz = _havuz_getir()
+        gelecekler = {pid: havuz.submit(rota_coz, i["matris"], i["sabit"]) for pid, i in isler.items()}
+        cozumler = {pid: f.result() for pid, f in gelecekler.items()}
+    else:
+        cozumler = {pid: rota_coz(i["matris"], i["sabit"]) for pid, i in isler.items()}
+
+    rotalar, guncellemeler = [], []
+    for pid in sorted(isler):
+        sira, uzunluk = cozumler[pid]
+        yanit, satirlar = _sonuc(personeller.get(pid), gun, isler[pid], sira, uzunluk, uygula)
+        rotalar.append(yanit)
+        guncellemeler.extend(satirlar)
+
+    if uygula and guncellemeler:
+        db.execute(update(Ziyaret), guncellemeler, execution_options={"synchronize_session": False})
+        db.commit()
+
+    sure_ms = round((perf_counter() - baslangic) * 1000, 1)
+    logger.info(f"Rota {gun} ({db_name}): {len(rotalar)} personel, {toplam_durak} durak ({sure_ms} ms)")
+    return {
+        "gun": gun,
+        "personel_sayisi": len(rotalar),
+        "toplam_km": round(sum(r["toplam_km"] for r in rotalar), 1),
+        "onceki_km": round(sum(r["onceki_km"] for r in rotalar), 1),
+        "sure_ms": sure_ms,
+        "rotalar": rotalar,
+    }
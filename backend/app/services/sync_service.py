@@ -0,0 +1,307 @@
+# =============================================
+# MOBIL SENKRONIZASYON (delta sync)
+# Flutter istemcisi cevrimdisi calisir; baglaninca sadece degisenleri ceker
+# =============================================
+#
+# 📚 DERS: Neden "guncelleme_tarihi > X" degil de sira numarasi?
+# Saat ile imlec tutmak iki yerden kaybeder: ayni milisaniyede yazilan
+# kayitlar ve commit sirasi. Transaction A 10:00:01'de yazip 10:00:05'te
+# commit ederse, 10:00:03'te senkronize olan istemci A'yi hic gormez.
+#
+# Bu yuzden her OSGB veritabaninda tek bir degisiklik sayaci var
+# (sayaclar tablosunda ad='degisim'). Senkronize edilen tablolara
+# (firma, isyeri, calisan, personel, dokuman) yazan HER transaction:
+#   1. Ilk yazdigi ifadede sayaci bir artirir (BEFORE STATEMENT tetikleyicisi)
+#      -> numarayi alir, sayac satirinin kilidi commit'e kadar onda kalir
+#   2. Yazdigi her satirin degisim_no'suna bu numarayi koyar (BEFORE ROW)
+# Bir sonraki yazan, numara alabilmek icin oncekinin commit'ini bekler:
+# numaralar COMMIT sirasindadir. "Sayac = N" goren okuyucu, N ve oncesinin
+# tamaminin commit edildigini (ya da geri alindigini) bilir; kacan kayit olmaz.
+# Bedeli: bu tablolara yazan transaction'lar OSGB basina sirayla commit olur
+# (tek bir satir kilidi, transaction'lar kisa).
+#
+# Tetikleyici veritabaninda oldugu icin ORM disi yazimlar da (toplu UPDATE,
+# ziyaret planinin executemany'si, elle SQL) numara alir.
+#
+# Silme: kayitlar fiziksel silinmez, aktif=False olur (bu da bir UPDATE)
+# -> istemciye aktif=False satir olarak gider.
+#
+# Imlec (since): "<degisim_no>" ya da sayfa bir transaction'in ortasinda
+# bittiyse "<degisim_no>.<tablo sirasi>.<id>". Istemci icini yorumlamaz,
+# bir sonraki istekte aynen geri gonderir.
+#
+# Kilit sirasi: degisim sayaci her zaman DIGER sayaclardan (isyeri limiti)
+# ONCE alinir, bkz. limit_service.limit_ayir -> olu kilit (deadlock) olmaz.
+#
+# Kullanim:
+#   sayfa = degisiklikleri_getir(db, imlec_coz(since), bayt=512 * 1024)
+#   sayfa.govde -> {"imlec": "...", "devam": true, "degisiklikler": {"firma": [...], ...}}
+
+import heapq
+import json
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tenant import Calisan, Dokuman, Firma, Isyeri, Personel, Sayac
+from app.schemas.calisan import CalisanResponse
+from app.schemas.dokuman import DokumanResponse
+from app.schemas.firma import FirmaResponse
+from app.schemas.isyeri import IsyeriResponse
+from app.schemas.personel import PersonelResponse
+
+
+# sayaclar tablosundaki degisiklik sayacinin adi
+DEGISIM_SAYACI = "degisim"
+
+
+@dataclass(frozen=True)
+class SyncTablosu:
+    ad: str                 # Yanittaki anahtar ve push'taki "tablo"
+    model: type
+    sema: type              # REST'teki response schemasi: istemci ayni alanlari gorur
+
+
+# 📚 DERS: Sira onemli: ayni transaction'daki kayitlar bu sirayla gider,
+# istemci once firmayi sonra ona bagli isyerini yazar.
+SYNC_TABLOLARI: Tuple[SyncTablosu, ...] = (
+    SyncTablosu("firma", Firma, FirmaResponse),
+    SyncTablosu("isyeri", Isyeri, IsyeriResponse),
+    SyncTablosu("calisan", Calisan, CalisanResponse),
+    SyncTablosu("personel", Personel, PersonelResponse),
+    SyncTablosu("dokuman", Dokuman, DokumanResponse),
+)
+SYNC_TABLO_ADLARI = {t.ad: t for t in SYNC_TABLOLARI}
+
+# Imlecte "bu degisim_no'nun tum tablolari bitti" anlamina gelen tablo sirasi
+_TAMAM = len(SYNC_TABLOLARI)
+
+# (degisim_no, tablo sirasi, id): kayitlarin gonderim sirasi
+Imlec = Tuple[int, int, int]
+
+
+DEGISIM_TETIKLEYICI_SQL = f"""
+CREATE OR REPLACE FUNCTION degisim_no_ayir() RETURNS bigint AS $$
+DECLARE
+    numara bigint := nullif(current_setting('osgb.degisim_no', true), '')::bigint;
+BEGIN
+    IF numara IS NULL THEN
+        -- Satir kilidi commit'e kadar bu transaction'da kalir
+        UPDATE sayaclar SET deger = deger + 1, guncelleme_tarihi = (now() AT TIME ZONE 'utc')
+            WHERE ad = '{DEGISIM_SAYACI}' RETURNING deger INTO numara;
+        IF numara IS NOT NULL THEN
+            -- is_local = true: transaction bitince (ya da savepoint geri alininca) silinir
+            PERFORM set_config('osgb.degisim_no', numara::text, true);
+        END IF;
+    END IF;
+    RETURN numara;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION degisim_ifade() RETURNS trigger AS $$
+BEGIN
+    PERFORM degisim_no_ayir();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION degisim_satir() RETURNS trigger AS $$
+BEGIN
+    NEW.degisim_no := degisim_no_ayir();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# 📚 DERS: Neden iki tetikleyici?
+# Satir tetikleyicisi, satir kilitlendikten SONRA calisir. Sayac kilidini
+# orada almak "satir kilidi -> sayac kilidi" sirasi demektir; sayaci tutan
+# baska bir transaction o satira yazmak isterse olu kilit olur. Ifade
+# tetikleyicisi hicbir satira dokunulmadan once calisir: sayac hep ONCE alinir.
+TABLO_TETIKLEYICI_SQL = """
+DROP TRIGGER IF EXISTS degisim_ifade ON {tablo};
+CREATE TRIGGER degisim_ifade
+    BEFORE INSERT OR UPDATE ON {tablo}
+    FOR EACH STATEMENT EXECUTE FUNCTION degisim_ifade();
+DROP TRIGGER IF EXISTS degisim_satir ON {tablo};
+CREATE TRIGGER degisim_satir
+    BEFORE INSERT OR UPDATE ON {tablo}
+    FOR EACH ROW EXECUTE FUNCTION degisim_satir();
+"""
+
+
+def degisim_kur(baglanti: Connection) -> bool:
+    """
+    Sayaci ve tetikleyicileri kurar (sablon ve migrasyon). Tekrar calismasi zararsiz.
+    degisim_no'su bos kayitlar (tetikleyiciden onceki veri) tek bir numara alir.
+    PostgreSQL degilse hicbir sey yapmaz.
+    """
+    if baglanti.dialect.name != "postgresql":
+        return False
+    baglanti.execute(
+        text(
+            "INSERT INTO sayaclar (ad, deger, guncelleme_tarihi) "
+            "VALUES (:ad, 0, now() AT TIME ZONE 'utc') ON CONFLICT (ad) DO NOTHING"
+        ),
+        {"ad": DEGISIM_SAYACI},
+    )
+    baglanti.execute(text(DEGISIM_TETIKLEYICI_SQL))
+    for tablo in SYNC_TABLOLARI:
+        ad = tablo.model.__tablename__
+        baglanti.execute(text(TABLO_TETIKLEYICI_SQL.format(tablo=ad)))
+        baglanti.execute(text(f"UPDATE {ad} SET degisim_no = NULL WHERE degisim_no IS NULL"))
+    return True
+
+
+def degisim_no_ayir(db: Session) -> Optional[int]:
+    """
+    Bu transaction'in degisim numarasini SIMDI alir (tetikleyici de ayni numarayi kullanir).
+    Sonraki okumalar commit'e kadar senkronize tablolarda kimsenin yazmadigini bilir.
+    PostgreSQL degilse None.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text("SELECT degisim_no_ayir()")).scalar()
+
+
+def son_degisim_no(db: Session) -> Optional[int]:
+    """Commit edilmis en son degisim numarasi (sayac yoksa None)."""
+    return db.query(Sayac.deger).filter(Sayac.ad == DEGISIM_SAYACI).scalar()
+
+
+# =============================================
+# IMLEC
+# =============================================
+def imlec_coz(metin: Optional[str]) -> Imlec:
+    """'since' parametresi -> (degisim_no, tablo sirasi, id). Bos = bastan."""
+    if not metin:
+        return (0, _TAMAM, 0)
+    try:
+        parcalar = tuple(int(p) for p in metin.split("."))
+    except ValueError:
+        parcalar = ()
+    if len(parcalar) == 1 and parcalar[0] >= 0:
+        return (parcalar[0], _TAMAM, 0)
+    if len(parcalar) == 3 and parcalar[0] >= 0 and 0 <= parcalar[1] < _TAMAM:
+        return parcalar
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Gecersiz senkronizasyon imleci",
+    )
+
+
+def imlec_yaz(imlec: Imlec) -> str:
+    no, sira, kayit_id = imlec
+    return str(no) if sira == _TAMAM else f"{no}.{sira}.{kayit_id}"
+
+
+# =============================================
+# CEKME (pull)
+# =============================================
+@dataclass
+class SyncSayfasi:
+    imlec: str
+    devam: bool
+    satir: int
+    govde: bytes    # Hazir JSON (sikistirmayi endpoint yapar)
+
+
+def satir_sozlugu(tablo: SyncTablosu, kayit) -> dict:
+    """REST yanitindaki alanlar + silinme (aktif) ve surum (degisim_no) bilgisi."""
+    veri = tablo.sema.model_validate(kayit).model_dump(mode="json")
+    veri["aktif"] = kayit.aktif
+    veri["degisim_no"] = kayit.degisim_no
+    return veri
+
+
+def _json(veri) -> str:
+    return json.dumps(veri, ensure_ascii=False, separators=(",", ":"))
+
+
+def _tablo_satirlari(db: Session, sira: int, tablo: SyncTablosu, imlec: Imlec, ust: Optional[int], limit: int) -> list:
+    """Bu tablonun imlecten SONRAKI ilk 'limit' kaydi, gonderim sirasiyla."""
+    model = tablo.model
+    no, imlec_sira, imlec_id = imlec
+    if sira < imlec_sira:
+        kosul = model.degisim_no > no
+    elif sira == imlec_sira:
+        kosul = or_(model.degisim_no > no, and_(model.degisim_no == no, model.id > imlec_id))
+    else:
+        kosul = model.degisim_no >= no
+    sorgu = db.query(model).filter(kosul)
+    if ust is not None:
+        sorgu = sorgu.filter(model.degisim_no <= ust)
+    return sorgu.order_by(model.degisim_no, model.id).limit(limit).all()
+
+
+def degisiklikleri_getir(db: Session, imlec: Imlec, bayt: Optional[int] = None) -> SyncSayfasi:
+    """
+    📚 DERS: Boyuta gore sayfalama.
+
+    Sabit "1000 kayit" sayfasi, dokuman satiri ile isyeri satiri ayni
+    boyutta olmadigi icin mobil agda ya cok kucuk ya cok buyuk kalir.
+    Kayitlar (degisim_no, tablo, id) sirasiyla eklenir; JSON boyutu
+    'bayt'i gecince sayfa kapanir (en az bir kayit her zaman gider).
+
+    Ust sinir: sorgulardan once okunan sayac. Sayfa boyunca commit olan
+    yeni degisiklikler bu sayfaya girmez (tablolar arasi tutarlilik),
+    bir sonraki istekte gelir.
+    """
+    bayt = bayt or settings.SYNC_SAYFA_BAYT
+    ust = son_degisim_no(db)
+    if ust is not None and imlec[0] > ust:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Imlec sunucudaki son degisiklikten ileride: tam senkronizasyon gerekli (since olmadan)",
+        )
+
+    limit = settings.SYNC_TABLO_SATIR
+    akislar = []
+    # Satir siniri dolan tablolarin son anahtarlarinin en kucugu: otesi bu sayfada
+    # bilinmiyor (o tablonun sonraki kayitlari okunmadi)
+    sinir: Optional[Imlec] = None
+    for sira, tablo in enumerate(SYNC_TABLOLARI):
+        kayitlar = _tablo_satirlari(db, sira, tablo, imlec, ust, limit)
+        if len(kayitlar) == limit:
+            son = (kayitlar[-1].degisim_no, sira, kayitlar[-1].id)
+            sinir = son if sinir is None else min(sinir, son)
+        akislar.append([((k.degisim_no, sira, k.id), tablo, k) for k in kayitlar])
+
+    parcalar = {t.ad: [] for t in SYNC_TABLOLARI}
+    boyut = 0
+    satir = 0
+    devam = sinir is not None
+    son_anahtar = None
+    for anahtar, tablo, kayit in heapq.merge(*akislar, key=lambda x: x[0]):
+        if sinir is not None and anahtar > sinir:
+            break
+        metin = _json(satir_sozlugu(tablo, kayit))
+        parcalar[tablo.ad].append(metin)
+        boyut += len(metin)
+        satir += 1
+        son_anahtar = anahtar
+        if boyut >= bayt:
+            devam = True
+            break
+
+    if devam:
+        yeni_imlec = son_anahtar or imlec
+    elif ust is not None:
+        # ust'e kadar her sey gonderildi
+        yeni_imlec = (ust, _TAMAM, 0)
+    else:
+        yeni_imlec = son_anahtar or imlec
+
+    imlec_metni = imlec_yaz(yeni_imlec)
+    degisiklikler = ",".join(f'"{ad}":[{",".join(liste)}]' for ad, liste in parcalar.items())
+    govde = (
+        f'{{"imlec":{_json(imlec_metni)},"devam":{_json(devam)},"satir":{satir},'
+        f'"degisiklikler":{{{degisiklikler}}}}}'
+    )
+    return SyncSayfasi(imlec=imlec_metni, devam=devam, satir=satir, govde=govde.encode())
+
@@ -0,0 +1,185 @@
+# =============================================
+# TENANT DIZINI (bellekte OSGB listesi)
+# id / subdomain / db_name -> tenant bilgisi, master DB'ye gitmeden
+# =============================================
+#
+# 📚 DERS: Neden bellekte?
+# "abc.osgbyazilim.com hangi veritabani?" sorusu HER istekte sorulur.
+# Tenant listesi nadiren degisir, yuzlerce satirdir: bellekte tutmak
+# master DB'ye her istekte sorgu atmaktan cok daha ucuz.
+#
+# Guncel kalmasi:
+# 1. Uygulama acilirken tum liste yuklenir (lifespan)
+# 2. tenants tablosundaki tetikleyici her degisiklikte
+#    pg_notify('tenant_degisti', '<id>') gonderir -> sadece o satir yenilenir
+#    (bkz. app/core/pg_dinleyici.py)
+# 3. Guvenlik agi: TENANT_DIZINI_MAKS_YAS_SN'den eski liste ilk
+#    kullanimda bastan yuklenir (dinleyici calismiyorsa bile)
+#
+# Kullanim:
+#   kayit = tenant_dizini.subdomain_ile("abc")
+#   kayit = tenant_dizini.id_ile(kullanici.tenant_id)
+#   kayit.db_name, kayit.aktif, kayit.max_isyeri ...
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from time import monotonic
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import MasterSessionLocal
+from app.core.logger import db_logger
+from app.models.master import Tenant
+
+
+TENANT_KANALI = "tenant_degisti"
+
+# create_db.py tarafindan kurulur
+BILDIRIM_TETIKLEYICI_SQL = f"""
+CREATE OR REPLACE FUNCTION tenant_degisti_bildir() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('{TENANT_KANALI}', OLD.id::text);
+    ELSE
+        PERFORM pg_notify('{TENANT_KANALI}', NEW.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tenant_degisti ON tenants;
+CREATE TRIGGER tenant_degisti
+    AFTER INSERT OR UPDATE OR DELETE ON tenants
+    FOR EACH ROW EXECUTE FUNCTION tenant_degisti_bildir();
+"""
+
+# Yukleme basarisizsa (DB kapali) her istekte tekrar denenmesin
+_TEKRAR_DENEME_SN = 5.0
+
+
+@dataclass(frozen=True)
+class TenantKaydi:
+    """Bir OSGB'nin yonlendirme ve limit bilgileri (degistirilemez kopya)."""
+    id: int
+    ad: str
+    subdomain: Optional[str]
+    db_name: str
+    aktif: bool
+    abonelik_durum: Optional[str]
+    abonelik_bitis: Optional[datetime]
+    max_isyeri: Optional[int]
+    max_kullanici: Optional[int]
+
+    @classmethod
+    def modelden(cls, tenant: Tenant) -> "TenantKaydi":
+        return cls(
+            id=tenant.id,
+            ad=tenant.ad,
+            subdomain=tenant.subdomain.lower() if tenant.subdomain else None,
+            db_name=tenant.db_name,
+            aktif=bool(tenant.aktif),
+            abonelik_durum=tenant.abonelik_durum.value if tenant.abonelik_durum else None,
+            abonelik_bitis=tenant.abonelik_bitis,
+            max_isyeri=tenant.max_isyeri,
+            max_kullanici=tenant.max_kullanici,
+        )
+
+
+class TenantDizini:
+    """
+    📚 DERS: Okumalar kilitsiz, yazmalar kilitli.
+
+    Sozlukler hic yerinde degistirilmez: yenileme yeni sozlukler kurar ve
+    tek atamayla degistirir. Okuyan thread ya eski ya yeni sozlugu gorur,
+    asla yarim guncellenmis bir sozlugu degil.
+    """
+
+    def __init__(self):
+        self._id: Dict[int, TenantKaydi] = {}
+        self._subdomain: Dict[str, TenantKaydi] = {}
+        self._db_name: Dict[str, TenantKaydi] = {}
+        self._son_yukleme: Optional[float] = None
+        self._son_deneme = 0.0
+        self._kilit = threading.Lock()
+
+    # ---- YUKLEME ----
+    def _degistir(self, kayitlar: List[TenantKaydi]) -> None:
+        self._id = {k.id: k for k in kayitlar}
+        self._subdomain = {k.subdomain: k for k in kayitlar if k.subdomain}
+        self._db_name = {k.db_name: k for k in kayitlar}
+
+    def yukle(self) -> None:
+        """Tum tenant listesini master DB'den bastan yukler."""
+        with self._kilit:
+            self._son_deneme = monotonic()
+            db = MasterSessionLocal()
+            try:
+                kayitlar = [TenantKaydi.modelden(t) for t in db.query(Tenant).all()]
+            finally:
+                db.close()
+            self._degistir(kayitlar)
+            self._son_yukleme = monotonic()
+        db_logger.info(f"Tenant dizini yuklendi: {len(kayitlar)} OSGB")
+
+    def tenant_yenile(self, tenant_id: int) -> Optional[TenantKaydi]:
+        """Tek bir tenant'i yeniden okur (silinmisse dizinden cikarir)."""
+        with self._kilit:
+            db = MasterSessionLocal()
+            try:
+                tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+                yeni = TenantKaydi.modelden(tenant) if tenant else None
+            finally:
+                db.close()
+            kayitlar = [k for k in self._id.values() if k.id != tenant_id]
+            if yeni is not None:
+                kayitlar.append(yeni)
+            self._degistir(kayitlar)
+        return yeni
+
+    def bildirim(self, veri: str) -> None:
+        """pg_dinleyici geri cagirmasi: veri = degisen tenant id'si."""
+        if veri.isdigit():
+            self.tenant_yenile(int(veri))
+        else:
+            self.yukle()
+
+    def yukleme_gerekli_mi(self) -> bool:
+        """Bir sonraki sorgu master DB'den yeniden yukleme yapacak mi?"""
+        simdi = monotonic()
+        eski = self._son_yukleme is None or simdi - self._son_yukleme > settings.TENANT_DIZINI_MAKS_YAS_SN
+        return eski and simdi - self._son_deneme > _TEKRAR_DENEME_SN
+
+    def _guncel_tut(self) -> None:
+        if self.yukleme_gerekli_mi():
+            try:
+                self.yukle()
+            except Exception as e:
+                db_logger.error(f"Tenant dizini yuklenemedi: {e}")
+
+    # ---- SORGULAMA ----
+    def id_ile(self, tenant_id: int) -> Optional[TenantKaydi]:
+        self._guncel_tut()
+        kayit = self._id.get(tenant_id)
+        if kayit is None and tenant_id is not None:
+            # Yeni eklenmis, bildirimi henuz gelmemis olabilir.
+            # id token'dan gelir (dogrulanmis kullanici): DB'ye bakmak guvenli.
+            kayit = self.tenant_yenile(tenant_id)
+        return kayit
+
+    def subdomain_ile(self, subdomain: str) -> Optional[TenantKaydi]:
+        # Bilinmeyen subdomain'ler DB'ye gitmez: herkes rastgele
+        # subdomain uydurup master DB'yi sorguya bogabilirdi.
+        self._guncel_tut()
+        return self._subdomain.get(subdomain.lower())
+
+    def db_name_ile(self, db_name: str) -> Optional[TenantKaydi]:
+        self._guncel_tut()
+        return self._db_name.get(db_name)
+
+    def tumu(self) -> List[TenantKaydi]:
+        self._guncel_tut()
+        return list(self._id.values())
+
+
+tenant_dizini = TenantDizini()
@@ -0,0 +1,431 @@
+# =============================================
+# TENANT PROVIZYON (yeni OSGB kurulumu)
+# Sablon veritabanindan kopyalayarak saniyenin altinda yeni OSGB DB'si
+# =============================================
+#
+# 📚 DERS: Eski yontem ve sorunu
+#   CREATE DATABASE osgb_abc;            -> bos veritabani
+#   Base.metadata.create_all(...)        -> her tablo, enum, indeks icin ayri DDL
+# Onlarca DDL komutu + her biri icin katalog guncellemesi: saniyeler surer,
+# ustelik master tablolarini da tenant DB'sine kurar.
+#
+# Yeni yontem: PostgreSQL sablon (template) veritabani
+#   osgb_template  : tum tenant tablolari BIR KEZ kurulmus, bos veritabani
+#   CREATE DATABASE osgb_abc TEMPLATE osgb_template;
+# PostgreSQL sablonu dosya/blok seviyesinde kopyalar: tek komut, DDL yok.
+#
+# Sablonun guncel kalmasi:
+#   Sablon kurulurken modellerden hesaplanan "sema parmak izi" veritabaninin
+#   aciklamasina (COMMENT ON DATABASE) yazilir. sablon_hazirla() her
+#   provizyondan once parmak izini karsilastirir; modeller ya da son
+#   migrasyon degistiyse sablon bastan kurulur. Mevcut tenant DB'leri
+#   migrasyonlarla guncellenir (app/migrasyonlar/), sablon ise hep en son
+#   semayi tasir ve tum migrasyonlar uygulanmis olarak isaretlenir.
+#
+# Kilitler (birden fazla uvicorn worker'i ayni anda calisabilir):
+#   - Sablon yeniden kurulurken: advisory lock (ozel)
+#   - Sablondan kopyalarken  : ayni advisory lock (paylasimli)
+#   -> kopyalar birbirini beklemez, sadece sablon kurulumunu bekler
+#
+# Kullanim:
+#   sablon_hazirla()                                  # gerekirse sablonu kur
+#   tenant, yonetici, sureler = tenant_olustur(db, {...}, {...})
+#   tenant, kapatilan = tenant_durum_degistir(db, tenant_id, aktif=False)
+#   python tenant_cli.py olustur --ad "ABC OSGB" --subdomain abc ...
+
+import hashlib
+import re
+from datetime import datetime, timedelta
+from time import perf_counter, sleep
+from typing import Dict, Optional, Tuple
+
+import psycopg2
+import psycopg2.errors
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from fastapi import HTTPException, status
+from sqlalchemy import Enum, create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.core.config import settings
+from app.core.database import Base, get_tenant_engine, tenant_db_url, tenant_engine_kapat
+from app.core.logger import db_logger
+from app.migrasyonlar import migrasyonlar, son_versiyon
+from app.models.master import AbonelikDurumEnum, Kullanici, RolEnum, Tenant
+from app.models.tenant import TENANT_TABLOLARI, KpiOzeti, SemaVersiyonu
+from app.services.auth_service import tenant_oturumlarini_kapat
+from app.services.mekansal_service import postgis_kur
+from app.services.sync_service import degisim_kur
+from app.services.tenant_dizini import tenant_dizini
+
+
+_PARMAK_IZI_ONEKI = "osgb-sema:"
+# 32-bit advisory lock anahtari (sabit: tum worker'lar ayni kilidi kullanir)
+_SABLON_KILIT_ANAHTARI = 0x05B6_7E01
+_SUBDOMAIN_DESENI = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,46}[a-z0-9])?$")
+# CREATE DATABASE ... TEMPLATE, sablona bagli biri varsa hata verir (ObjectInUse)
+_KLON_DENEME = 5
+
+
+# =============================================
+# YARDIMCILAR
+# =============================================
+def _yonetim_baglantisi():
+    """
+    'postgres' veritabanina autocommit baglanti.
+    CREATE/DROP DATABASE transaction icinde calismaz.
+    """
+    baglanti = psycopg2.connect(
+        host=settings.DATABASE_HOST,
+        port=settings.DATABASE_PORT,
+        user=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        database="postgres",
+    )
+    baglanti.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    return baglanti
+
+
+def _db_var_mi(cursor, db_name: str) -> bool:
+    cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", (db_name,))
+    return cursor.fetchone() is not None
+
+
+def _db_aciklamasi(cursor, db_name: str) -> Optional[str]:
+    cursor.execute(
+        "SELECT shobj_description(oid, 'pg_database') FROM pg_catalog.pg_database WHERE datname = %s",
+        (db_name,),
+    )
+    satir = cursor.fetchone()
+    return satir[0] if satir else None
+
+
+def sema_parmak_izi() -> str:
+    """
+    📚 DERS: Tenant semasinin ozeti (hash).
+
+    Her tablonun CREATE TABLE / CREATE INDEX ciktisi, enum degerleri ve
+    son migrasyon versiyonu hash'lenir. Modele kolon, tablo, indeks veya
+    enum degeri ya da yeni migrasyon eklenince parmak izi degisir
+    -> sablon eskimis demektir.
+    """
+    dialect = postgresql.dialect()
+    parcalar = [f"migrasyon={son_versiyon()}"]
+    for tablo in sorted(TENANT_TABLOLARI, key=lambda t: t.name):
+        parcalar.append(str(CreateTable(tablo).compile(dialect=dialect)))
+        for indeks in sorted(tablo.indexes, key=lambda i: i.name or ""):
+            parcalar.append(str(CreateIndex(indeks).compile(dialect=dialect)))
+        for kolon in tablo.columns:
+            if isinstance(kolon.type, Enum):
+                parcalar.append(f"{kolon.type.name}={','.join(kolon.type.enums)}")
+    return hashlib.sha256("\n".join(parcalar).encode()).hexdigest()[:16]
+
+
+def subdomain_dogrula(subdomain: str) -> str:
+    """Kucuk harfe cevirir ve kontrol eder; gecersizse 400."""
+    subdomain = (subdomain or "").strip().lower()
+    ayrilmis = {s.strip() for s in settings.TENANT_AYRILMIS_SUBDOMAINLER.split(",") if s.strip()}
+    if not _SUBDOMAIN_DESENI.match(subdomain) or subdomain in ayrilmis:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Gecersiz subdomain: '{subdomain}'. "
+                "Kucuk harf, rakam ve '-' kullanilabilir (en fazla 48 karakter)"
+            ),
+        )
+    return subdomain
+
+
+def db_adi_uret(subdomain: str) -> str:
+    """'abc-isg' -> 'osgb_abc_isg'"""
+    return "osgb_" + subdomain.replace("-", "_")
+
+
+# =============================================
+# SABLON VERITABANI
+# =============================================
+def sablon_durumu() -> dict:
+    """Sablon var mi, semasi modellerle ayni mi?"""
+    beklenen = sema_parmak_izi()
+    baglanti = _yonetim_baglantisi()
+    try:
+        with baglanti.cursor() as cur:
+            mevcut = _db_var_mi(cur, settings.TENANT_SABLON_DB)
+            aciklama = _db_aciklamasi(cur, settings.TENANT_SABLON_DB) if mevcut else None
+    finally:
+        baglanti.close()
+
+    parmak_izi = None
+    if aciklama and aciklama.startswith(_PARMAK_IZI_ONEKI):
+        parmak_izi = aciklama[len(_PARMAK_IZI_ONEKI):]
+    return {
+        "db": settings.TENANT_SABLON_DB,
+        "mevcut": mevcut,
+        "parmak_izi": parmak_izi,
+        "beklenen": beklenen,
+        "guncel": mevcut and parmak_izi == beklenen,
+    }
+
+
+def _sablonu_kur(cur, parmak_izi: str) -> None:
+    sablon = sql.Identifier(settings.TENANT_SABLON_DB)
+
+    if _db_var_mi(cur, settings.TENANT_SABLON_DB):
+        # Sablon isaretli veritabani silinemez; once isareti kaldir
+        cur.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false ALLOW_CONNECTIONS true").format(sablon))
+        cur.execute(sql.SQL("DROP DATABASE {} WITH (FORCE)").format(sablon))
+    cur.execute(sql.SQL("CREATE DATABASE {}").format(sablon))
+
+    # NullPool: is bitince baglanti gercekten kapanir. Acik kalan tek bir
+    # baglanti bile sonraki CREATE DATABASE ... TEMPLATE'i engellerdi.
+    engine = create_engine(tenant_db_url(settings.TENANT_SABLON_DB), poolclass=NullPool)
+    try:
+        with engine.begin() as baglanti:
+            Base.metadata.create_all(bind=baglanti, tables=TENANT_TABLOLARI)
+            # Modelde olmayan nesneler (PostGIS eklentisi + konum indeksi,
+            # senkronizasyon sayaci + tetikleyicileri)
+            postgis_kur(baglanti)
+            degisim_kur(baglanti)
+            # KPI ozetinin tek satiri (bos veritabani: tum sayaclar 0, bkz. m0008)
+            baglanti.execute(KpiOzeti.__table__.insert().values(id=1))
+            # Sema zaten en son halinde: migrasyonlari "uygulanmis" isaretle ki
+            # bu sablondan kopyalanan OSGB'ler migrasyonda atlanmasin
+            baglanti.execute(
+                SemaVersiyonu.__table__.insert(),
+                [{"versiyon": m.versiyon, "ad": m.ad} for m in migrasyonlar()],
+            )
+    finally:
+        engine.dispose()
+
+    cur.execute(
+        sql.SQL("COMMENT ON DATABASE {} IS {}").format(sablon, sql.Literal(_PARMAK_IZI_ONEKI + parmak_izi))
+    )
+    # ALLOW_CONNECTIONS false: kimse yanlislikla baglanip kopyalamayi engelleyemez
+    cur.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false").format(sablon))
+
+
+def sablon_hazirla(yeniden: bool = False) -> bool:
+    """
+    Sablon yoksa ya da semasi eskiyse kurar. Kurduysa True doner.
+
+    yeniden=True: parmak izine bakmadan bastan kurar.
+    """
+    parmak_izi = sema_parmak_izi()
+    baglanti = _yonetim_baglantisi()
+    try:
+        with baglanti.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (_SABLON_KILIT_ANAHTARI,))
+            try:
+                # Kilidi beklerken baska worker kurmus olabilir: kilit ALTINDA tekrar bak
+                guncel = (
+                    _db_var_mi(cur, settings.TENANT_SABLON_DB)
+                    and _db_aciklamasi(cur, settings.TENANT_SABLON_DB) == _PARMAK_IZI_ONEKI + parmak_izi
+                )
+                if guncel and not yeniden:
+                    return False
+                baslangic = perf_counter()
+                _sablonu_kur(cur, parmak_izi)
+                db_logger.info(
+                    f"Tenant sablonu kuruldu: {settings.TENANT_SABLON_DB} | sema {parmak_izi} "
+                    f"| {(perf_counter() - baslangic) * 1000:.0f}ms"
+                )
+                return True
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (_SABLON_KILIT_ANAHTARI,))
+    finally:
+        baglanti.close()
+
+
+# =============================================
+# TENANT VERITABANI
+# =============================================
+def veritabani_klonla(db_name: str) -> None:
+    """
+    📚 DERS: CREATE DATABASE ... TEMPLATE
+
+    Sablon kurulmus olmali (sablon_hazirla). Ayni isimde veritabani
+    varsa 409 firlatir.
+    """
+    baglanti = _yonetim_baglantisi()
+    try:
+        with baglanti.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock_shared(%s)", (_SABLON_KILIT_ANAHTARI,))
+            try:
+                komut = sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                    sql.Identifier(db_name), sql.Identifier(settings.TENANT_SABLON_DB),
+                )
+                for deneme in range(1, _KLON_DENEME + 1):
+                    try:
+                        cur.execute(komut)
+                        return
+                    except psycopg2.errors.DuplicateDatabase:
+                        raise HTTPException(
+                            status_code=status.HTTP_409_CONFLICT,
+                            detail=f"'{db_name}' veritabani zaten mevcut",
+                        )
+                    except psycopg2.errors.ObjectInUse:
+                        # Sablona anlik bir baglanti var (ornek: yonetim araci)
+                        if deneme == _KLON_DENEME:
+                            raise
+                        sleep(0.2 * deneme)
+            finally:
+                cur.execute("SELECT pg_advisory_unlock_shared(%s)", (_SABLON_KILIT_ANAHTARI,))
+    finally:
+        baglanti.close()
+
+
+def veritabani_sil(db_name: str) -> None:
+    """Tenant veritabanini siler (basarisiz provizyonu geri almak icin)."""
+    if db_name == settings.TENANT_SABLON_DB or db_name == settings.DATABASE_NAME:
+        raise ValueError(f"'{db_name}' silinemez")
+    tenant_engine_kapat(db_name)
+    baglanti = _yonetim_baglantisi()
+    try:
+        with baglanti.cursor() as cur:
+            cur.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(db_name)))
+    finally:
+        baglanti.close()
+
+
+# =============================================
+# YENI OSGB
+# =============================================
+def tenant_olustur(
+    db: Session,
+    tenant_alanlari: dict,
+    yonetici_alanlari: dict,
+) -> Tuple[Tenant, Kullanici, Dict[str, float]]:
+    """
+    📚 DERS: Yeni OSGB = veritabani + master kaydi + yonetici kullanici.
+
+    tenant_alanlari  : ad, subdomain (zorunlu) + Tenant kolonlari
+                       (email, telefon, il, max_isyeri, deneme_gun ...)
+    yonetici_alanlari: email, sifre_hash, ad, soyad
+
+    Sira onemli:
+    1. Master'da cakisma kontrolu (ucuz, veritabani olusturmadan once)
+    2. Veritabanini sablondan kopyala
+    3. Master kayitlarini ekle; basarisizsa veritabanini geri sil
+    4. Dizini yenile ve baglanti havuzunu isit -> ilk istek beklemez
+
+    Donus: (tenant, yonetici, sureler_ms)
+    """
+    sureler: Dict[str, float] = {}
+    baslangic = perf_counter()
+
+    alanlar = dict(tenant_alanlari)
+    subdomain = subdomain_dogrula(alanlar.pop("subdomain"))
+    db_name = db_adi_uret(subdomain)
+    deneme_gun = alanlar.pop("deneme_gun", None) or settings.TENANT_DENEME_GUN
+    yonetici_email = yonetici_alanlari["email"].lower()
+
+    # ---- 1. Cakisma ve limit kontrolu ----
+    # Yonetici de max_kullanici'ya sayilir (bkz. limit_service.kullanici_limiti_ayir)
+    if alanlar.get("max_kullanici") is not None and alanlar["max_kullanici"] < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="max_kullanici en az 1 olmali (OSGB yoneticisi de bir kullanicidir)",
+        )
+    if db.query(Tenant.id).filter((Tenant.subdomain == subdomain) | (Tenant.db_name == db_name)).first():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"'{subdomain}' subdomain'i zaten kullaniliyor",
+        )
+    if db.query(Kullanici.id).filter(Kullanici.email == yonetici_email).first():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"'{yonetici_email}' email adresi zaten kayitli",
+        )
+
+    # ---- 2. Veritabani ----
+    t = perf_counter()
+    sablon_hazirla()
+    sureler["sablon_ms"] = (perf_counter() - t) * 1000
+
+    t = perf_counter()
+    veritabani_klonla(db_name)
+    sureler["klon_ms"] = (perf_counter() - t) * 1000
+
+    # ---- 3. Master kayitlari ----
+    t = perf_counter()
+    simdi = datetime.utcnow()
+    try:
+        tenant = Tenant(
+            **alanlar,
+            subdomain=subdomain,
+            db_name=db_name,
+            abonelik_durum=AbonelikDurumEnum.DENEME,
+            abonelik_baslangic=simdi,
+            abonelik_bitis=simdi + timedelta(days=deneme_gun),
+        )
+        db.add(tenant)
+        db.flush()  # tenant.id lazim
+
+        yonetici = Kullanici(
+            email=yonetici_email,
+            sifre_hash=yonetici_alanlari["sifre_hash"],
+            ad=yonetici_alanlari["ad"],
+            soyad=yonetici_alanlari["soyad"],
+            rol=RolEnum.OSGB_YONETICISI,
+            tenant_id=tenant.id,
+            aktif=True,
+        )
+        db.add(yonetici)
+        db.commit()
+    except Exception:
+        db.rollback()
+        # Sahipsiz veritabani kalmasin
+        try:
+            veritabani_sil(db_name)
+        except Exception as e:
+            db_logger.error(f"Provizyon geri alinamadi, '{db_name}' elle silinmeli: {e}")
+        raise
+    sureler["kayit_ms"] = (perf_counter() - t) * 1000
+
+    # ---- 4. Ilk istege hazirlik ----
+    t = perf_counter()
+    # NOTIFY'i beklemeden bu process'in dizinine ekle (diger worker'lar
+    # tetikleyiciden haber alir)
+    tenant_dizini.tenant_yenile(tenant.id)
+    with get_tenant_engine(db_name).connect() as baglanti:
+        baglanti.execute(text("SELECT 1"))
+    sureler["isitma_ms"] = (perf_counter() - t) * 1000
+    sureler["toplam_ms"] = (perf_counter() - baslangic) * 1000
+
+    db_logger.info(
+        f"Yeni OSGB kuruldu: {tenant.ad} ({db_name}) | "
+        + " ".join(f"{ad}={ms:.0f}" for ad, ms in sureler.items())
+    )
+    return tenant, yonetici, sureler
+
+
+def tenant_durum_degistir(db: Session, tenant_id: int, aktif: bool) -> Tuple[Tenant, int]:
+    """
+    📚 DERS: OSGB'yi devre disi birakma / yeniden acma.
+
+    Devre disi birakilinca:
+    1. tenants.aktif=false yazilir; tetikleyici NOTIFY ile tum worker'larin
+       dizinini yeniler -> tenant_db_getir ve giris 403 dondurur
+    2. Tum kullanicilarin token_versiyon'u artar, refresh token'lari iptal edilir
+       (bkz. auth_service.oturumlari_kapat)
+
+    Donus: (tenant, oturumu kapatilan kullanici sayisi)
+    """
+    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    if tenant is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OSGB bulunamadi")
+
+    tenant.aktif = aktif
+    db.commit()
+    tenant_dizini.tenant_yenile(tenant.id)
+
+    kapatilan = 0 if aktif else tenant_oturumlarini_kapat(db, tenant.id)
+    db.refresh(tenant)
+    db_logger.info(
+        f"OSGB {'aktif edildi' if aktif else 'devre disi birakildi'}: {tenant.ad} ({tenant.db_name})"
+        + ("" if aktif else f" | {kapatilan} kullanicinin oturumu kapatildi")
+    )
+    return tenant, kapatilan
@@ -0,0 +1,105 @@
+# =============================================
+# TOPLU KAYIT (ayni egitim / KKD'yi bir calisan grubuna yaz)
+# =============================================
+#
+# 📚 DERS: 500 calisana egitim yazmak = 500 INSERT round-trip'i DEGIL.
+#   1. Hedef calisanlar TEK sorguyla secilir (id listesi ya da
+#      isyeri + bolum filtresi).
+#   2. Zaten kaydi olanlar TEK sorguyla bulunur (ayni gun ayni egitim
+#      tekrar yazilmasin - istek iki kez gonderilirse de).
+#   3. Kalanlar TEK INSERT ile yazilir (executemany; psycopg2 bunu
+#      sayfa sayfa cok satirli INSERT'e cevirir).
+#   4. Tek commit: ya hepsi ya hicbiri (kpi_gruplari verilirse KPI
+#      ozeti de ayni transaction'da yeniden sayilir).
+# Toplam 3 sorgu + 1 commit, kayit sayisindan bagimsiz.
+#
+# Kullanim:
+#   rapor = toplu_kaydet(db, Egitim, secim, ortak, ("egitim_adi", "egitim_tarihi"), ("egitim",))
+
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.tenant import Calisan
+from app.schemas.calisan import CalisanSecimi
+from app.services.kpi_service import kpi_yenile
+
+
+# Tek istekte yazilabilecek en fazla kayit (istek boyutu / kilit suresi siniri)
+TOPLU_EN_FAZLA = 5000
+
+
+def calisanlari_sec(db: Session, secim: CalisanSecimi) -> Tuple[List[int], List[int]]:
+    """
+    Secimdeki AKTIF calisanlar -> (idler, bulunamayan_idler).
+    Id listesi verildiyse listede olup aktif olmayan / filtreye uymayanlar
+    bulunamayan olarak doner.
+    """
+    sorgu = db.query(Calisan.id).filter(Calisan.aktif == True)  # noqa: E712
+    istenen = set(secim.calisan_idleri or ())
+    if istenen:
+        sorgu = sorgu.filter(Calisan.id.in_(istenen))
+    if secim.isyeri_id:
+        sorgu = sorgu.filter(Calisan.isyeri_id == secim.isyeri_id)
+    if secim.bolum:
+        sorgu = sorgu.filter(Calisan.bolum == secim.bolum)
+    idler = sorted(i for (i,) in sorgu)
+    return idler, sorted(istenen - set(idler))
+
+
+def toplu_ekle(
+    db: Session,
+    model,
+    calisan_idleri: List[int],
+    ortak: dict,
+    tekil_kolonlar: Iterable[str],
+) -> Tuple[int, List[int]]:
+    """
+    Her calisana ortak alanlarla bir kayit ekler (commit ETMEZ).
+    tekil_kolonlar'da ayni degerlere sahip kaydi olan calisan atlanir.
+    Donus: (eklenen_sayisi, atlanan_calisan_idleri)
+    """
+    if not calisan_idleri:
+        return 0, []
+    kosullar = [getattr(model, kolon) == ortak[kolon] for kolon in tekil_kolonlar]
+    mevcut = {
+        i for (i,) in db.query(model.calisan_id).filter(model.calisan_id.in_(calisan_idleri), *kosullar)
+    }
+    yeni = [{"calisan_id": i, **ortak} for i in calisan_idleri if i not in mevcut]
+    if yeni:
+        db.execute(insert(model), yeni)
+    return len(yeni), sorted(mevcut)
+
+
+def toplu_kaydet(
+    db: Session,
+    model,
+    secim: CalisanSecimi,
+    ortak: dict,
+    tekil_kolonlar: Iterable[str],
+    kpi_gruplari: Iterable[str] = (),
+) -> dict:
+    """
+    Sec + ekle (+ KPI) + TEK commit. Secim TOPLU_EN_FAZLA'yi asarsa ValueError.
+    Donus: {"calisan_sayisi", "eklenen", "atlanan": [calisan_id], "bulunamayan": [calisan_id]}
+    """
+    idler, bulunamayan = calisanlari_sec(db, secim)
+    if len(idler) > TOPLU_EN_FAZLA:
+        raise ValueError(
+            f"Secim {len(idler)} calisan iceriyor; tek istekte en fazla {TOPLU_EN_FAZLA} kayit yazilabilir"
+        )
+    try:
+        eklenen, atlanan = toplu_ekle(db, model, idler, ortak, tekil_kolonlar)
+        if eklenen and kpi_gruplari:
+            kpi_yenile(db, *kpi_gruplari)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {
+        "calisan_sayisi": len(idler),
+        "eklenen": eklenen,
+        "atlanan": atlanan,
+        "bulunamayan": bulunamayan,
+    }
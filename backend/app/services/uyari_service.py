@@ -0,0 +1,285 @@
+# =============================================
+# SURE UYARILARI (egitim sertifikasi son gecerlilik tarihleri)
+# Tum OSGB'leri periyodik tara -> master'daki sure_uyarilari tablosu
+# =============================================
+#
+# 📚 DERS: Neden onbellek tablo?
+# Binlerce calisanin egitimlerini tek tek kontrol etmek (calisan basina
+# bir sorgu) N+1 felaketidir; her dashboard acilisinda tek sorguyla
+# hesaplamak da gereksiz tekrar. Bunun yerine:
+#
+#   1. Her OSGB DB'sinde TEK aralik sorgusu:
+#        gecerlilik_tarihi BETWEEN bugun - GECMIS_GUN AND bugun + ILERI_GUN
+#      (ix_egitimler_gecerlilik_tarihi indeksi; sadece aralik okunur)
+#      Ayni calisan ayni egitimi sonradan tekrar aldiysa eski sertifika
+#      uyari vermez (NOT EXISTS, ix_egitimler_calisan_id).
+#   2. OSGB'ler paralel taranir (analitik_service.tenantlara_dagit:
+#      ortak thread havuzu, statement_timeout, toplam zaman asimi).
+#   3. Yanit veren her OSGB'nin satirlari tek DELETE + tek INSERT ile
+#      degisir; yanit vermeyenin eski satirlari kalir.
+#   4. GET /api/v1/uyarilar sadece sure_uyarilari'ni okur.
+#
+# Zamanlayici UYARI_TARAMA_DK'da bir calistirir; OSGB yoneticisi kendi
+# OSGB'si icin aninda yeniletebilir (POST /api/v1/uyarilar/yenile).
+# Uyari sayisi degisen OSGB'lere WebSocket ile "sure_uyarilari" bildirimi gider.
+#
+# Yeni tur eklemek (orn. periyodik saglik muayenesi):
+#   UYARI_TARAMALARI["muayene"] = _muayene_taramasi   # (db, bas, son) -> [satir]
+
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, exists, func, insert, text
+from sqlalchemy.orm import Session, aliased
+
+from app.core.bildirim import tenant_bildir
+from app.core.config import settings
+from app.core.database import MasterSessionLocal
+from app.core.logger import db_logger
+from app.models.master import SureUyarisi
+from app.models.tenant import Calisan, Egitim, Isyeri
+from app.services.analitik_service import tenantlara_dagit
+from app.services.tenant_dizini import TenantKaydi, tenant_dizini
+
+
+# Birden fazla worker ayni anda taramasin (master DB'de transaction kilidi, bkz. _kilitle)
+_TARAMA_KILIT_ANAHTARI = 0x05B6_7E05
+
+
+def egitim_yenilenmis():
+    """Ayni calisan ayni egitimi sonradan tekrar aldi mi? (Egitim satirina bagli EXISTS)"""
+    sonraki = aliased(Egitim)
+    return exists().where(
+        sonraki.calisan_id == Egitim.calisan_id,
+        sonraki.egitim_adi == Egitim.egitim_adi,
+        sonraki.egitim_tarihi > Egitim.egitim_tarihi,
+    )
+
+
+def _egitim_taramasi(db: Session, bas: date, son: date) -> List[dict]:
+    """Aktif calisanlarin, aralikta biten ve yenilenmemis egitimleri."""
+    satirlar = (
+        db.query(
+            Egitim.id, Egitim.egitim_adi, Egitim.gecerlilik_tarihi,
+            Calisan.id, Calisan.ad, Calisan.soyad, Isyeri.id, Isyeri.ad,
+        )
+        .join(Calisan, Egitim.calisan_id == Calisan.id)
+        .join(Isyeri, Calisan.isyeri_id == Isyeri.id)
+        .filter(
+            Egitim.gecerlilik_tarihi >= bas,
+            Egitim.gecerlilik_tarihi <= son,
+            Calisan.aktif == True,  # noqa: E712
+            ~egitim_yenilenmis(),
+        )
+    )
+    return [
+        {
+            "kayit_id": egitim_id,
+            "baslik": egitim_adi,
+            "son_tarih": gecerlilik,
+            "calisan_id": calisan_id,
+            "calisan_adi": f"{ad} {soyad}",
+            "isyeri_id": isyeri_id,
+            "isyeri_adi": isyeri_adi,
+        }
+        for egitim_id, egitim_adi, gecerlilik, calisan_id, ad, soyad, isyeri_id, isyeri_adi in satirlar
+    ]
+
+
+# tur -> (db, bas, son) -> [satir]
+UYARI_TARAMALARI: Dict[str, Callable[[Session, date, date], List[dict]]] = {
+    "egitim": _egitim_taramasi,
+}
+
+
+def _tara(db: Session) -> List[dict]:
+    """Tek OSGB: tum uyari turleri (tenantlara_dagit bunu her OSGB'de calistirir)."""
+    bugun = date.today()
+    bas = bugun - timedelta(days=settings.UYARI_GECMIS_GUN)
+    son = bugun + timedelta(days=settings.UYARI_ILERI_GUN)
+    satirlar = []
+    for tur, tarama in UYARI_TARAMALARI.items():
+        for satir in tarama(db, bas, son):
+            satir["tur"] = tur
+            satirlar.append(satir)
+    return satirlar
+
+
+def _kilitle(db: Session, tenant_idleri: Optional[List[int]], bekle: bool) -> bool:
+    """
+    📚 DERS: Tam tarama ve tek OSGB taramasi ayni kilidi paylasmaz.
+    Tek genel kilit olsaydi tam tarama surerken egitim eklenen OSGB'nin
+    taramasi atlanir, uyari bir sonraki zamanlanmis taramaya kadar eksik kalirdi.
+    - Tam tarama: genel anahtara OZEL kilit, beklemeden (biri calisiyorsa atla)
+    - OSGB taramasi: genel anahtara PAYLASIMLI kilit (tam taramayi bekler, diger
+      OSGB'lerle birlikte calisir) + her OSGB'nin kendi kilidi (id sirasiyla)
+    bekle=False: kilitlerden biri alinamazsa hemen False doner.
+    """
+    if tenant_idleri is None:
+        return db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": _TARAMA_KILIT_ANAHTARI}
+        ).scalar()
+    fonk = "pg_advisory_xact_lock" if bekle else "pg_try_advisory_xact_lock"
+    sorgular = [(f"SELECT {fonk}_shared(:k)", {"k": _TARAMA_KILIT_ANAHTARI})] + [
+        (f"SELECT {fonk}(:k, :t)", {"k": _TARAMA_KILIT_ANAHTARI, "t": tenant_id})
+        for tenant_id in sorted(tenant_idleri)
+    ]
+    for sql, parametreler in sorgular:
+        # pg_advisory_xact_lock void doner; sadece try_ surumu False donebilir
+        if db.execute(text(sql), parametreler).scalar() is False:
+            return False
+    return True
+
+
+def uyarilari_yenile(tenantlar: Optional[List[TenantKaydi]] = None, bekle: bool = True) -> dict:
+    """
+    📚 DERS: Zamanlayicinin calistirdigi gorev.
+    tenantlar verilmezse tum aktif OSGB'ler taranir ve silinmis /
+    pasif OSGB'lerin satirlari da temizlenir.
+    bekle: tenantlar verildiyse, ayni OSGB'ler taranirken kilidi bekle
+    (False: bekleme, atla).
+    Donus: {"tenant_sayisi", "uyari_sayisi", "eksik": [tenant_id], "sure_ms"} veya {"atlandi": True}
+    """
+    baslangic = perf_counter()
+    tam_tarama = tenantlar is None
+    if tenantlar is None:
+        tenantlar = [t for t in tenant_dizini.tumu() if t.aktif]
+
+    db = MasterSessionLocal()
+    try:
+        # Transaction sonunda (commit) kendiliginden birakilan kilitler
+        if db.get_bind().dialect.name == "postgresql" and not _kilitle(
+            db, None if tam_tarama else [t.id for t in tenantlar], bekle,
+        ):
+            return {"atlandi": True}
+
+        sonuclar, _, hatalar = tenantlara_dagit(_tara, tenantlar)
+        simdi = datetime.utcnow()
+        # Bildirim icin: tarama oncesi hangi uyarilar vardi (tenant -> {(tur, kayit_id)})
+        onceki: Dict[int, set] = {}
+        if sonuclar:
+            for tenant_id, tur, kayit_id in db.query(
+                SureUyarisi.tenant_id, SureUyarisi.tur, SureUyarisi.kayit_id
+            ).filter(SureUyarisi.tenant_id.in_(list(sonuclar))):
+                onceki.setdefault(tenant_id, set()).add((tur, kayit_id))
+
+        if tam_tarama:
+            db.execute(
+                delete(SureUyarisi).where(SureUyarisi.tenant_id.notin_([t.id for t in tenantlar])),
+                execution_options={"synchronize_session": False},
+            )
+        if sonuclar:
+            db.execute(
+                delete(SureUyarisi).where(SureUyarisi.tenant_id.in_(list(sonuclar))),
+                execution_options={"synchronize_session": False},
+            )
+            yeni = [
+                {**satir, "tenant_id": tenant_id, "hesaplama_tarihi": simdi}
+                for tenant_id, satirlar in sonuclar.items()
+                for satir in satirlar
+            ]
+            if yeni:
+                db.execute(insert(SureUyarisi), yeni)
+        db.commit()
+    finally:
+        db.close()
+
+    # Sadece uyarilari degisen OSGB'ler: her tarama tum ekranlari yeniletmesin
+    for tenant_id, satirlar in sonuclar.items():
+        simdiki = {(satir["tur"], satir["kayit_id"]) for satir in satirlar}
+        eski = onceki.get(tenant_id, set())
+        if simdiki != eski:
+            tenant_bildir(tenant_id, "sure_uyarilari", {
+                "uyari_sayisi": len(simdiki),
+                "yeni": len(simdiki - eski),
+            })
+
+    rapor = {
+        "tenant_sayisi": len(sonuclar),
+        "uyari_sayisi": sum(len(s) for s in sonuclar.values()),
+        "eksik": sorted(hatalar),
+        "sure_ms": round((perf_counter() - baslangic) * 1000, 1),
+    }
+    if hatalar:
+        db_logger.warning(f"Sure uyarisi taramasi: {len(hatalar)}/{len(tenantlar)} OSGB yanit vermedi {hatalar}")
+    db_logger.info(
+        f"Sure uyarilari yenilendi: {rapor['tenant_sayisi']} OSGB, {rapor['uyari_sayisi']} uyari ({rapor['sure_ms']:.0f} ms)"
+    )
+    return rapor
+
+
+def tenant_uyarilarini_yenile(tenant_id: int, bekle: bool = True) -> dict:
+    """
+    Tek OSGB'yi hemen tarar (egitim eklendi/guncellendi, yonetici istedi).
+    bekle=False: o OSGB zaten taraniyorsa {"atlandi": True} doner.
+    """
+    kayit = tenant_dizini.id_ile(tenant_id)
+    if kayit is None:
+        raise KeyError(tenant_id)
+    return uyarilari_yenile([kayit], bekle=bekle)
+
+
+def tenant_uyarilarini_arka_planda_yenile(tenant_id: int) -> None:
+    """
+    BackgroundTasks icin: egitim yazildiktan SONRA calisir, hata yanita
+    yansimaz (bir sonraki zamanlanmis tarama zaten duzeltir).
+    """
+    try:
+        tenant_uyarilarini_yenile(tenant_id)
+    except Exception as e:
+        db_logger.warning(f"Sure uyarilari yenilenemedi (tenant {tenant_id}): {e}")
+
+
+def uyarilari_getir(
+    db: Session,
+    tenant_id: int,
+    gun: Optional[int] = None,
+    gecmis: bool = True,
+    tur: Optional[str] = None,
+    isyeri_id: Optional[int] = None,
+    sayfa: int = 1,
+    adet: int = 50,
+) -> dict:
+    """
+    OSGB'nin uyarilari, en yakin son tarih once (sadece sure_uyarilari okunur).
+    gun: bugunden itibaren kac gun icinde bitenler (varsayilan UYARI_ILERI_GUN).
+    gecmis: suresi zaten dolmus olanlar da gelsin mi?
+    """
+    bugun = date.today()
+    sorgu = db.query(SureUyarisi).filter(
+        SureUyarisi.tenant_id == tenant_id,
+        SureUyarisi.son_tarih <= bugun + timedelta(days=settings.UYARI_ILERI_GUN if gun is None else gun),
+    )
+    if not gecmis:
+        sorgu = sorgu.filter(SureUyarisi.son_tarih >= bugun)
+    if tur:
+        sorgu = sorgu.filter(SureUyarisi.tur == tur)
+    if isyeri_id:
+        sorgu = sorgu.filter(SureUyarisi.isyeri_id == isyeri_id)
+
+    toplam = sorgu.count()
+    gecmis_sayisi = sorgu.filter(SureUyarisi.son_tarih < bugun).count() if gecmis else 0
+    satirlar = sorgu.order_by(SureUyarisi.son_tarih, SureUyarisi.id).offset((sayfa - 1) * adet).limit(adet).all()
+    hesaplama = (
+        db.query(func.max(SureUyarisi.hesaplama_tarihi)).filter(SureUyarisi.tenant_id == tenant_id).scalar()
+    )
+    return {
+        "toplam": toplam,
+        "suresi_gecmis": gecmis_sayisi,
+        "hesaplama_tarihi": hesaplama,
+        "uyarilar": [
+            {
+                "tur": s.tur,
+                "kayit_id": s.kayit_id,
+                "baslik": s.baslik,
+                "son_tarih": s.son_tarih,
+                "kalan_gun": (s.son_tarih - bugun).days,
+                "calisan_id": s.calisan_id,
+                "calisan_adi": s.calisan_adi,
+                "isyeri_id": s.isyeri_id,
+                "isyeri_adi": s.isyeri_adi,
+            }
+            for s in satirlar
+        ],
+    }
@@ -0,0 +1,511 @@
+# =============================================
+# ZIYARET PLANLAMA (aylik toplu plan)
+# Tum isyerleri -> ISG uzmani / hekim / DSP atamasi + ziyaret takvimi
+# =============================================
+#
+# 📚 DERS: Ne kadar ziyaret gerekli?
+# ISG Hizmetleri Yonetmeligi her calisan icin AYLIK en az hizmet
+# suresi belirler (dakika / calisan / ay):
+#
+#                     az tehlikeli   tehlikeli   cok tehlikeli
+#   ISG uzmani              10           20            40
+#   Isyeri hekimi            5           10            15
+#   DSP                      -            -            10  (10+ calisan)
+#
+# Donemde TAMAMLANAN ziyaretler dusulur; kalan sure gunluk en fazla
+# ZIYARET_GUNLUK_DK'lik ziyaretlere bolunur.
+#
+# Kim gidecek? (atama sezgiseli, ayni anda tum isyerleri)
+# 1. Mevcut atama korunur: isyerinin uzmani/hekimi hala aktif, sinifi
+#    yetiyor ve kapasitesi varsa ayni kisi (isyeri personeli tanir).
+# 2. Kalan talepler ZORDAN KOLAYA siralanir (cok tehlikeli ve uzun
+#    sureliler once) - secenegi az olan once secer.
+# 3. Her talep, uygun adaylar icinde EN UCUZ olana verilir:
+#      maliyet = uzaklik_km + DOLULUK_CEZASI_KM * doluluk_orani
+#    Uzaklik personelin konumundan (yoksa zaten atandigi isyerlerinin
+#    merkezinden); doluluk cezasi isi tek kisiye yigmaz.
+# 4. Uygun/kapasiteli kimse yoksa ziyaret ATANMADAN (ziyaretci_id bos)
+#    yazilir ve raporda listelenir - plan eksik ama gorunur.
+# Uzman sinif sarti: cok tehlikeli -> A, tehlikeli -> A/B, az -> hepsi.
+#
+# Yazma set bazlidir: donemin kapsamdaki PLANLANDI ziyaretleri tek
+# DELETE ile silinir, yenileri tek INSERT (executemany) ile yazilir,
+# isyeri atamalari tek UPDATE ile guncellenir. Tamamlanan / iptal /
+# ertelenen ziyaretlere dokunulmaz.
+#
+# Artimli plan: isyeri ya da personel degisince sadece etkilenen
+# isyerleri, plani olan bu ve sonraki donemler icin yeniden planlanir
+# (yeniden_planla). Diger isyerlerinin ziyaretleri yerinde kalir ve
+# personelin kapasitesinden dusulur.
+#
+# Kullanim:
+#   rapor = plan_olustur(db, "2026-11")                  (tum isyerleri)
+#   rapor = plan_olustur(db, "2026-11", isyeri_idleri=[3, 7])
+#   yeniden_planla(db, isyeri_idleri=[3])                (isyeri degisti)
+#   yeniden_planla(db, personel_id=12)                   (personel degisti)
+#   arka_plan.add_task(ziyaretleri_arka_planda_yenile, db_name, [3])  (endpoint'ten)
+
+import calendar
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, or_, text, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import get_tenant_engine
+from app.core.logger import logger
+from app.models.tenant import (
+    Calisan, Isyeri, Personel, PersonelUnvan, TehlikeSinifi, UzmanlikSinifi, Ziyaret, ZiyaretDurumu,
+)
+from app.services.mekansal_service import mesafe_m
+from app.services.kpi_service import kpi_yenile
+
+
+# Dakika / calisan / ay
+YASAL_SURE_DK = {
+    PersonelUnvan.ISG_UZMANI: {
+        TehlikeSinifi.AZ_TEHLIKELI: 10, TehlikeSinifi.TEHLIKELI: 20, TehlikeSinifi.COK_TEHLIKELI: 40,
+    },
+    PersonelUnvan.ISYERI_HEKIMI: {
+        TehlikeSinifi.AZ_TEHLIKELI: 5, TehlikeSinifi.TEHLIKELI: 10, TehlikeSinifi.COK_TEHLIKELI: 15,
+    },
+    PersonelUnvan.DSP: {TehlikeSinifi.COK_TEHLIKELI: 10},
+}
+DSP_ASGARI_CALISAN = 10
+
+# Uzmanin girebilecegi isyerleri (sinifi bos olan C sayilir)
+SINIF_YETKISI = {
+    UzmanlikSinifi.A_SINIFI: {TehlikeSinifi.AZ_TEHLIKELI, TehlikeSinifi.TEHLIKELI, TehlikeSinifi.COK_TEHLIKELI},
+    UzmanlikSinifi.B_SINIFI: {TehlikeSinifi.AZ_TEHLIKELI, TehlikeSinifi.TEHLIKELI},
+    UzmanlikSinifi.C_SINIFI: {TehlikeSinifi.AZ_TEHLIKELI},
+}
+
+TEHLIKE_SIRASI = {TehlikeSinifi.AZ_TEHLIKELI: 0, TehlikeSinifi.TEHLIKELI: 1, TehlikeSinifi.COK_TEHLIKELI: 2}
+
+# Isyeri uzerindeki atama kolonlari (personel ID; isg_uzmani_id vb. kullanici ID'sidir)
+ATAMA_KOLONU = {
+    PersonelUnvan.ISG_UZMANI: "isg_uzmani_personel_id",
+    PersonelUnvan.ISYERI_HEKIMI: "isyeri_hekimi_personel_id",
+    PersonelUnvan.DSP: "dsp_personel_id",
+}
+
+DOLULUK_CEZASI_KM = 20      # Tamamen dolu bir personel, 20 km uzaktaki bostaki ile esit maliyette
+SURE_YUVARLAMA_DK = 5
+
+# Bu alanlar degisince plan yeniden kurulur (yeniden_planla)
+PLAN_ALANLARI_ISYERI = {"tehlike_sinifi", "nace_kodu", "koordinat_lat", "koordinat_lng", "aktif"}
+PLAN_ALANLARI_PERSONEL = {"aktif", "uzmanlik_sinifi", "aylik_kapasite_dk", "konum_lat", "konum_lng"}
+
+# Ayni OSGB'de iki plan ayni anda calisip ziyaretleri cift yazmasin
+_PLAN_KILIT_ANAHTARI = 0x5A1E7E44
+
+_DONEM = re.compile(r"^(\d{4})-(0[1-9]|1[0-2])$")
+
+# Kapasiteyi dolduran ziyaretler (iptal / ertelenen bos sayilir)
+_DOLU_DURUMLAR = (ZiyaretDurumu.PLANLANDI, ZiyaretDurumu.TAMAMLANDI)
+
+
+def donem_coz(donem: str) -> Tuple[int, int]:
+    """'2026-11' -> (2026, 11). Gecersizse ValueError."""
+    eslesme = _DONEM.match(donem or "")
+    if not eslesme:
+        raise ValueError(f"Gecersiz donem: '{donem}' (YYYY-AA olmali, orn. 2026-11)")
+    return int(eslesme.group(1)), int(eslesme.group(2))
+
+
+def donem_yaz(gun: date) -> str:
+    return f"{gun.year:04d}-{gun.month:02d}"
+
+
+def is_gunleri(yil: int, ay: int, bugun: Optional[date] = None) -> List[date]:
+    """Donemin hafta ici gunleri; icinde bulunulan ayda bugunden itibaren."""
+    bugun = bugun or date.today()
+    son = calendar.monthrange(yil, ay)[1]
+    return [
+        g for g in (date(yil, ay, i) for i in range(1, son + 1))
+        if g.weekday() < 5 and g >= bugun
+    ]
+
+
+def _yuvarla(dakika: float) -> int:
+    return int(math.ceil(dakika / SURE_YUVARLAMA_DK) * SURE_YUVARLAMA_DK)
+
+
+@dataclass
+class _Talep:
+    isyeri_id: int
+    unvan: PersonelUnvan
+    tehlike: TehlikeSinifi
+    dakika: int                          # Bu donem kalan yasal sure
+    lat: Optional[float]
+    lng: Optional[float]
+    mevcut_personel_id: Optional[int]
+    personel_id: Optional[int] = None
+    neden: str = ""
+
+
+@dataclass
+class _Personel:
+    id: int
+    ad: str
+    unvan: PersonelUnvan
+    sinif: Optional[UzmanlikSinifi]
+    kapasite: int
+    lat: Optional[float]
+    lng: Optional[float]
+    kullanilan: int = 0
+    gun_bos: int = 0                     # Donemin kalan is gunlerindeki bos dakika
+    _toplam_lat: float = 0.0
+    _toplam_lng: float = 0.0
+    _konumlu: int = 0
+    gun_yuku: Dict[date, int] = field(default_factory=lambda: defaultdict(int))
+
+    def uygun_mu(self, talep: _Talep) -> bool:
+        if self.unvan == PersonelUnvan.ISG_UZMANI:
+            yetki = SINIF_YETKISI[self.sinif or UzmanlikSinifi.C_SINIFI]
+            if talep.tehlike not in yetki:
+                return False
+        return min(self.kapasite - self.kullanilan, self.gun_bos) >= talep.dakika
+
+    def merkez(self) -> Optional[Tuple[float, float]]:
+        if self.lat is not None and self.lng is not None:
+            return self.lat, self.lng
+        if self._konumlu:
+            return self._toplam_lat / self._konumlu, self._toplam_lng / self._konumlu
+        return None
+
+    def ata(self, talep: _Talep) -> None:
+        talep.personel_id = self.id
+        self.kullanilan += talep.dakika
+        self.gun_bos -= talep.dakika
+        if talep.lat is not None and talep.lng is not None:
+            self._toplam_lat += talep.lat
+            self._toplam_lng += talep.lng
+            self._konumlu += 1
+
+    def maliyet(self, talep: _Talep) -> float:
+        merkez = self.merkez()
+        uzaklik_km = 0.0
+        if merkez is not None and talep.lat is not None and talep.lng is not None:
+            uzaklik_km = mesafe_m(merkez[0], merkez[1], talep.lat, talep.lng) / 1000
+        doluluk = (self.kullanilan + talep.dakika) / self.kapasite if self.kapasite else 1.0
+        return uzaklik_km + DOLULUK_CEZASI_KM * doluluk
+
+
+def _talepleri_olustur(db: Session, donem: str, isyerleri: list) -> List[_Talep]:
+    """Her isyeri x unvan icin donemde kalan yasal sure."""
+    if not isyerleri:
+        return []
+    idler = [i.id for i in isyerleri]
+    calisan_sayilari = dict(
+        db.query(Calisan.isyeri_id, func.count(Calisan.id))
+        .filter(Calisan.isyeri_id.in_(idler), Calisan.aktif == True)
+        .group_by(Calisan.isyeri_id)
+        .all()
+    )
+    tamamlanan = {
+        (isyeri_id, unvan): dk or 0
+        for isyeri_id, unvan, dk in db.query(Ziyaret.isyeri_id, Ziyaret.personel_unvan, func.sum(Ziyaret.sure_dk))
+        .filter(
+            Ziyaret.plan_donemi == donem,
+            Ziyaret.isyeri_id.in_(idler),
+            Ziyaret.durum == ZiyaretDurumu.TAMAMLANDI,
+        )
+        .group_by(Ziyaret.isyeri_id, Ziyaret.personel_unvan)
+        .all()
+    }
+
+    talepler = []
+    for isyeri in isyerleri:
+        calisan = calisan_sayilari.get(isyeri.id, 0)
+        if not calisan:
+            continue
+        for unvan, oranlar in YASAL_SURE_DK.items():
+            oran = oranlar.get(isyeri.tehlike_sinifi)
+            if not oran or (unvan == PersonelUnvan.DSP and calisan < DSP_ASGARI_CALISAN):
+                continue
+            kalan = calisan * oran - tamamlanan.get((isyeri.id, unvan), 0)
+            if kalan <= 0:
+                continue
+            talepler.append(_Talep(
+                isyeri_id=isyeri.id,
+                unvan=unvan,
+                tehlike=isyeri.tehlike_sinifi,
+                dakika=_yuvarla(kalan),
+                lat=isyeri.koordinat_lat,
+                lng=isyeri.koordinat_lng,
+                mevcut_personel_id=getattr(isyeri, ATAMA_KOLONU[unvan]),
+            ))
+    return talepler
+
+
+def _ata(talepler: List[_Talep], personeller: Dict[int, _Personel]) -> None:
+    """Talepleri personele dagitir (talep.personel_id / talep.neden doldurulur)."""
+    unvana_gore: Dict[PersonelUnvan, List[_Personel]] = defaultdict(list)
+    for p in personeller.values():
+        unvana_gore[p.unvan].append(p)
+
+    # 1. Mevcut atamalar (once hepsi: yeni talepler tanidik personeli kapmasin)
+    kalanlar = []
+    for talep in talepler:
+        p = personeller.get(talep.mevcut_personel_id)
+        if p is not None and p.unvan == talep.unvan and p.uygun_mu(talep):
+            p.ata(talep)
+        else:
+            kalanlar.append(talep)
+
+    # 2. Zordan kolaya, en ucuz uygun aday
+    kalanlar.sort(key=lambda t: (TEHLIKE_SIRASI[t.tehlike], t.dakika), reverse=True)
+    for talep in kalanlar:
+        adaylar = [p for p in unvana_gore[talep.unvan] if p.uygun_mu(talep)]
+        if not adaylar:
+            talep.neden = (
+                "Aktif personel yok" if not unvana_gore[talep.unvan]
+                else "Uygun sinifta bos kapasiteli personel yok"
+            )
+            continue
+        min(adaylar, key=lambda p: (p.maliyet(talep), p.id)).ata(talep)
+
+
+def _gun_sec(gunler: List[date], hedef: int, gun_yuku: Dict[date, int], sure: int) -> Tuple[date, int]:
+    """
+    Hedef gune en yakin, sureyi kaldiran gun. Hicbiri kaldirmiyorsa en bos
+    gun ve oraya sigan kadari (ziyaret gunlere bolunur) -> (gun, sure).
+    """
+    for uzaklik in range(len(gunler)):
+        for i in (hedef - uzaklik, hedef + uzaklik):
+            if 0 <= i < len(gunler) and gun_yuku[gunler[i]] + sure <= settings.ZIYARET_GUNLUK_DK:
+                return gunler[i], sure
+    gun = min(gunler, key=lambda g: (gun_yuku[g], g))
+    bos = settings.ZIYARET_GUNLUK_DK - gun_yuku[gun]
+    return gun, bos if bos > 0 else sure
+
+
+def _ziyaret_satirlari(
+    donem: str, gunler: List[date], talepler: List[_Talep], personeller: Dict[int, _Personel],
+) -> List[dict]:
+    """Her talebi gunluk ziyaretlere boler ve donemin is gunlerine yayar."""
+    satirlar = []
+    atanmamis_gun_yuku: Dict[date, int] = defaultdict(int)
+    simdi = datetime.now()
+    for talep in talepler:
+        p = personeller.get(talep.personel_id)
+        adet = max(1, math.ceil(talep.dakika / settings.ZIYARET_GUNLUK_DK))
+        sure = _yuvarla(talep.dakika / adet)
+        gun_yuku = p.gun_yuku if p else atanmamis_gun_yuku
+        kalan, k = talep.dakika, 0
+        while kalan > 0:
+            # Ziyaretler aya esit aralikla dagilsin (hedef gun), dolu gun atlanir
+            hedef = min(int((k + 0.5) * len(gunler) / adet), len(gunler) - 1)
+            parca = min(sure, kalan)
+            if p:
+                gun, parca = _gun_sec(gunler, hedef, gun_yuku, parca)
+            else:
+                gun = gunler[hedef]
+            baslangic = datetime.combine(gun, datetime.min.time()) + timedelta(
+                hours=settings.ZIYARET_BASLANGIC_SAATI, minutes=gun_yuku[gun] if p else 0,
+            )
+            if p:
+                gun_yuku[gun] += parca
+            kalan -= parca
+            k += 1
+            satirlar.append({
+                "isyeri_id": talep.isyeri_id,
+                "ziyaretci_id": p.id if p else None,
+                "ziyaretci_adi": p.ad if p else None,
+                "ziyaret_tarihi": baslangic,
+                "ziyaret_bitis": baslangic + timedelta(minutes=parca),
+                "durum": ZiyaretDurumu.PLANLANDI,
+                "personel_unvan": talep.unvan,
+                "sure_dk": parca,
+                "plan_donemi": donem,
+                "olusturma_tarihi": simdi,
+            })
+    return satirlar
+
+
+def _kilitle(db: Session) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _PLAN_KILIT_ANAHTARI})
+
+
+def plan_olustur(
+    db: Session,
+    donem: str,
+    isyeri_idleri: Optional[Iterable[int]] = None,
+    bugun: Optional[date] = None,
+) -> dict:
+    """
+    Donemin ziyaret planini (yeniden) kurar ve commit eder.
+    isyeri_idleri verilirse sadece o isyerleri planlanir; digerlerinin
+    ziyaretleri korunur ve personel kapasitesinden dusulur.
+    Gecmis donem ya da is gunu kalmamis donem icin ValueError.
+    """
+    baslangic = perf_counter()
+    yil, ay = donem_coz(donem)
+    gunler = is_gunleri(yil, ay, bugun)
+    if not gunler:
+        raise ValueError(f"{donem} doneminde planlanabilecek is gunu kalmadi")
+    kapsam = None if isyeri_idleri is None else sorted(set(isyeri_idleri))
+
+    _kilitle(db)
+
+    # 1. Kapsamdaki eski plan (yalnizca PLANLANDI) silinir
+    silme = delete(Ziyaret).where(Ziyaret.plan_donemi == donem, Ziyaret.durum == ZiyaretDurumu.PLANLANDI)
+    if kapsam is not None:
+        silme = silme.where(Ziyaret.isyeri_id.in_(kapsam))
+    db.execute(silme.execution_options(synchronize_session=False))
+
+    # 2. Personel ve donemde zaten dolu olan sureleri
+    personeller = {
+        p.id: _Personel(
+            id=p.id,
+            ad=f"{p.ad} {p.soyad}",
+            unvan=p.unvan,
+            sinif=p.uzmanlik_sinifi,
+            kapasite=p.aylik_kapasite_dk if p.aylik_kapasite_dk is not None else settings.PERSONEL_AYLIK_KAPASITE_DK,
+            lat=p.konum_lat,
+            lng=p.konum_lng,
+        )
+        for p in db.query(Personel).filter(Personel.aktif == True).all()
+    }
+    dolu = (
+        db.query(Ziyaret.ziyaretci_id, Ziyaret.ziyaret_tarihi, Ziyaret.sure_dk)
+        .filter(
+            Ziyaret.plan_donemi == donem,
+            Ziyaret.durum.in_(_DOLU_DURUMLAR),
+            Ziyaret.ziyaretci_id.isnot(None),
+        )
+    )
+    for personel_id, tarih, sure in dolu:
+        p = personeller.get(personel_id)
+        if p is not None and sure:
+            p.kullanilan += sure
+            p.gun_yuku[tarih.date()] += sure
+    # Aylik kapasite kalan gunlere sigmiyorsa (ay sonu, yogun takvim) siniri gunler koyar
+    for p in personeller.values():
+        p.gun_bos = sum(max(0, settings.ZIYARET_GUNLUK_DK - p.gun_yuku[g]) for g in gunler)
+
+    # 3. Talepler -> atama -> takvim
+    sorgu = db.query(Isyeri).filter(Isyeri.aktif == True)
+    if kapsam is not None:
+        sorgu = sorgu.filter(Isyeri.id.in_(kapsam))
+    isyerleri = sorgu.all()
+    talepler = _talepleri_olustur(db, donem, isyerleri)
+    _ata(talepler, personeller)
+    satirlar = _ziyaret_satirlari(donem, gunler, talepler, personeller)
+
+    # 4. Set bazli yazma
+    if satirlar:
+        db.execute(insert(Ziyaret), satirlar)
+    atamalar: Dict[int, dict] = {}
+    for talep in talepler:
+        # Kimse atanamadiysa eski (artik uygun olmayan) atama da temizlenir
+        if talep.personel_id != talep.mevcut_personel_id:
+            atamalar.setdefault(talep.isyeri_id, {"id": talep.isyeri_id})[ATAMA_KOLONU[talep.unvan]] = talep.personel_id
+    if atamalar:
+        # Ayni kolon kumesi tek executemany'de olmali: kume bazinda grupla
+        gruplar: Dict[tuple, List[dict]] = defaultdict(list)
+        for satir in atamalar.values():
+            gruplar[tuple(sorted(satir))].append(satir)
+        for grup in gruplar.values():
+            db.execute(update(Isyeri), grup, execution_options={"synchronize_session": False})
+    kpi_yenile(db, "ziyaret")
+    db.commit()
+
+    atanamayan = [
+        {"isyeri_id": t.isyeri_id, "unvan": t.unvan.value, "dakika": t.dakika, "neden": t.neden}
+        for t in talepler if t.personel_id is None
+    ]
+    sure_ms = round((perf_counter() - baslangic) * 1000, 1)
+    logger.info(
+        f"Ziyaret plani {donem}: {len(isyerleri)} isyeri, {len(satirlar)} ziyaret, "
+        f"{len(atanamayan)} atanamayan talep ({sure_ms} ms)"
+    )
+    return {
+        "donem": donem,
+        "isyeri_sayisi": len(isyerleri),
+        "talep_sayisi": len(talepler),
+        "ziyaret_sayisi": len(satirlar),
+        "atanamayan": atanamayan,
+        "personel_doluluk": [
+            {"personel_id": p.id, "ad": p.ad, "unvan": p.unvan.value, "kapasite_dk": p.kapasite, "planlanan_dk": p.kullanilan}
+            for p in sorted(personeller.values(), key=lambda p: p.id)
+            if p.kullanilan
+        ],
+        "sure_ms": sure_ms,
+    }
+
+
+def yeniden_planla(
+    db: Session,
+    isyeri_idleri: Iterable[int] = (),
+    personel_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    📚 DERS: Artimli plan.
+    Isyeri (tehlike sinifi, konum, aktiflik) ya da personel (aktiflik,
+    sinif, kapasite, konum) degisince cagrilir. Sadece etkilenen
+    isyerleri, plani olan bu ve sonraki donemlerde yeniden planlanir.
+    Personel icin etkilenen = ona atanmis ya da planli ziyareti olan isyerleri.
+    """
+    bugun = date.today()
+    bu_donem = donem_yaz(bugun)
+    kapsam = set(isyeri_idleri)
+    if personel_id is not None:
+        kapsam.update(
+            i for (i,) in db.query(Ziyaret.isyeri_id).filter(
+                Ziyaret.ziyaretci_id == personel_id,
+                Ziyaret.durum == ZiyaretDurumu.PLANLANDI,
+                Ziyaret.plan_donemi >= bu_donem,
+            ).distinct()
+        )
+        kapsam.update(
+            i for (i,) in db.query(Isyeri.id).filter(or_(
+                Isyeri.isg_uzmani_personel_id == personel_id,
+                Isyeri.isyeri_hekimi_personel_id == personel_id,
+                Isyeri.dsp_personel_id == personel_id,
+            ))
+        )
+    if not kapsam:
+        return []
+
+    donemler = [
+        d for (d,) in db.query(Ziyaret.plan_donemi)
+        .filter(Ziyaret.plan_donemi >= bu_donem)
+        .distinct()
+        .order_by(Ziyaret.plan_donemi)
+    ]
+    raporlar = []
+    for donem in donemler:
+        try:
+            raporlar.append(plan_olustur(db, donem, kapsam, bugun=bugun))
+        except ValueError:
+            continue     # Bu ayin is gunleri bitti; sonraki donemler yine de planlanir
+    return raporlar
+
+
+def ziyaretleri_arka_planda_yenile(
+    db_name: str,
+    isyeri_idleri: Iterable[int] = (),
+    personel_id: Optional[int] = None,
+) -> None:
+    """
+    BackgroundTasks icin: isyeri/personel yazildiktan SONRA calisir, yanit
+    plani beklemez. Istegin oturumu kapanmis olur; kendi oturumunu acar.
+    Hata yanita yansimaz (plan POST /ziyaret/plan ile elle de yenilenebilir).
+    """
+    db = sessionmaker(bind=get_tenant_engine(db_name), autocommit=False, autoflush=False)()
+    try:
+        yeniden_planla(db, list(isyeri_idleri), personel_id)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Ziyaret plani yenilenemedi ({db_name}): {e}")
+    finally:
+        db.close()
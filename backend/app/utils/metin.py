@@ -0,0 +1,11 @@
+# =============================================
+# METIN YARDIMCILARI
+# =============================================
+
+# Arama/eslestirme Turkce karakterden bagimsiz olsun: "Ağaç" ile "agac" ayni
+_SADELESTIR = str.maketrans("çğıöşüÇĞİÖŞÜâîû", "cgiosuCGIOSUaiu")
+
+
+def sadelestir(metin: str) -> str:
+    """Turkce karakterleri ASCII karsiligina cevirir ve kucuk harfe indirir."""
+    return metin.translate(_SADELESTIR).lower()
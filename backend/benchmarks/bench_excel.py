@@ -0,0 +1,252 @@
+# =============================================
+# EXCEL SERVISI MIKRO-BENCHMARK
+# excel_export / excel_sablon_olustur / excel_import
+# =============================================
+#
+# Kullanim (backend/ klasorunden):
+#   python -m benchmarks.bench_excel
+#   python -m benchmarks.bench_excel --satir 1000,10000,50000 --harita CALISAN --islem export
+#   python -m benchmarks.bench_excel --karsilastir benchmarks/sonuclar/excel_eski.json
+#
+# Her alan haritasi (FIRMA, ISYERI, CALISAN, PERSONEL) icin
+# satir x sutun matrisi olculur:
+#   satir : --satir listesi (varsayilan 100, 1000, 10000)
+#   sutun : haritanin ilk 3 alani, ilk yarisi ve tamami
+#
+# Olculenler:
+#   sure_ms   : en iyi (min) ve ortanca (median) duvar saati suresi
+#   rss_mb    : islem sirasinda process'in ulastigi en yuksek bellek (peak RSS)
+#   artis_mb  : peak RSS'in islem oncesine gore artisi
+#   boyut_kb  : uretilen Excel dosyasinin boyutu (import icin: okunan dosya)
+#
+# Bir durum --zaman-asimi'ni asarsa sonuca "zaman_asimi" yazilir ve ayni
+# islem/harita/sutun icin daha buyuk satir sayilari denenmez.
+#
+# 📚 DERS: Neden her olcum ayri process'te?
+# Peak RSS process omru boyunca sadece artar. Ayni process'te 50.000
+# satirlik export'tan sonra 100 satirlik olcum yapilirsa onun da
+# "peak"i 50.000'lik olurdu. Her durum kendi temiz process'inde calisir.
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import date, datetime
+from time import perf_counter
+from typing import Optional
+
+from openpyxl import Workbook
+
+from app.services import excel_service
+
+
+SONUC_DIZINI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sonuclar")
+HARITALAR = ("FIRMA", "ISYERI", "CALISAN", "PERSONEL")
+ISLEMLER = ("export", "sablon", "import")
+
+
+def _harita(ad: str, sutun: int) -> list:
+    return getattr(excel_service, f"{ad}_ALANLARI")[:sutun]
+
+
+def _sutun_secenekleri(ad: str) -> list:
+    tam = len(getattr(excel_service, f"{ad}_ALANLARI"))
+    return sorted({min(3, tam), max(1, tam // 2), tam})
+
+
+def _ornek_deger(alan: str, i: int):
+    """Alan adina gore gercekci bir deger (tarih alanlari date, digerleri metin)."""
+    if "tarih" in alan:
+        return date(1970 + i % 50, 1 + i % 12, 1 + i % 28)
+    if alan == "email":
+        return f"kayit{i}@ornek.com.tr"
+    if alan in ("tc_no", "sgk_sicil_no", "vergi_no"):
+        return str(10_000_000_000 + i)
+    return f"{alan} {i} ornek deger"
+
+
+def ornek_kayitlar(harita: list, satir: int) -> list:
+    return [{a["alan"]: _ornek_deger(a["alan"], i) for a in harita} for i in range(satir)]
+
+
+def import_dosyasi_yaz(harita: list, satir: int, yol: str) -> None:
+    """Sablon basliklariyla (yildizsiz) dolu bir import dosyasi yazar."""
+    # write_only kullanilmiyor: boyut (dimension) bilgisi yazilmaz, import okuyamaz
+    wb = Workbook()
+    ws = wb.active
+    ws.append([a["baslik"] for a in harita])
+    for kayit in ornek_kayitlar(harita, satir):
+        ws.append([kayit[a["alan"]] for a in harita])
+    wb.save(yol)
+
+
+def _rss_mb() -> float:
+    # Linux'ta ru_maxrss KB, macOS'ta bayt cinsindendir
+    carpan = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * carpan / (1024 * 1024)
+
+
+# =============================================
+# TEK OLCUM (alt process'te calisir)
+# =============================================
+def tek_olcum(islem: str, harita_adi: str, sutun: int, satir: int, tekrar: int, dosya: str) -> dict:
+    harita = _harita(harita_adi, sutun)
+
+    if islem == "export":
+        kayitlar = ornek_kayitlar(harita, satir)
+        calistir = lambda: excel_service.excel_export(kayitlar, harita, harita_adi.title())
+    elif islem == "sablon":
+        calistir = lambda: excel_service.excel_sablon_olustur(harita, harita_adi.title())
+    else:
+        with open(dosya, "rb") as f:
+            icerik = f.read()
+        calistir = lambda: excel_service.excel_import(icerik, harita)
+
+    rss_once = _rss_mb()
+    sureler = []
+    cikti = None
+    for _ in range(tekrar):
+        baslangic = perf_counter()
+        cikti = calistir()
+        sureler.append((perf_counter() - baslangic) * 1000)
+    rss_sonra = _rss_mb()
+
+    if islem == "import":
+        assert cikti["basarili_sayisi"] == satir, cikti["hatali"][:3]
+        boyut = len(icerik)
+    else:
+        boyut = len(cikti)
+
+    return {
+        "sure_min_ms": round(min(sureler), 2),
+        "sure_ort_ms": round(statistics.median(sureler), 2),
+        "rss_mb": round(rss_sonra, 1),
+        "artis_mb": round(rss_sonra - rss_once, 1),
+        "boyut_kb": round(boyut / 1024, 1),
+    }
+
+
+def _alt_process(islem, harita_adi, sutun, satir, tekrar, dosya="", zaman_asimi=None) -> Optional[dict]:
+    """Olcumu ayri process'te calistirir. Zaman asiminda None doner."""
+    komut = [sys.executable, "-m", "benchmarks.bench_excel", "--_tek",
+             islem, harita_adi, str(sutun), str(satir), str(tekrar), dosya]
+    try:
+        sonuc = subprocess.run(komut, capture_output=True, text=True, timeout=zaman_asimi)
+    except subprocess.TimeoutExpired:
+        return None
+    if sonuc.returncode != 0:
+        raise RuntimeError(f"{islem} {harita_adi} {sutun}x{satir} basarisiz:\n{sonuc.stderr}")
+    return json.loads(sonuc.stdout.strip().splitlines()[-1])
+
+
+# =============================================
+# MATRIS
+# =============================================
+def matris_calistir(args) -> list:
+    satirlar = [int(s) for s in args.satir.split(",")]
+    haritalar = [h.strip().upper() for h in args.harita.split(",")] if args.harita else list(HARITALAR)
+    islemler = [i.strip() for i in args.islem.split(",")] if args.islem else list(ISLEMLER)
+
+    sonuclar = []
+    print(f"{'islem':7s} {'harita':9s} {'sutun':>5s} {'satir':>7s} {'min ms':>10s} {'ort ms':>10s} "
+          f"{'rss MB':>8s} {'artis MB':>9s} {'boyut KB':>9s}")
+    print("-" * 82)
+    with tempfile.TemporaryDirectory() as gecici:
+        for harita_adi in haritalar:
+            for sutun in _sutun_secenekleri(harita_adi):
+                for islem in islemler:
+                    # Sablonun satir sayisi yok: her harita/sutun icin bir kez
+                    for satir in ([0] if islem == "sablon" else satirlar):
+                        dosya = ""
+                        if islem == "import":
+                            dosya = os.path.join(gecici, f"{harita_adi}_{sutun}_{satir}.xlsx")
+                            import_dosyasi_yaz(_harita(harita_adi, sutun), satir, dosya)
+                        olcum = _alt_process(islem, harita_adi, sutun, satir, args.tekrar, dosya,
+                                             args.zaman_asimi)
+                        if olcum is None:
+                            # Daha buyuk satir sayilari da yetismez; bu durumu atla
+                            print(f"{islem:7s} {harita_adi:9s} {sutun:5d} {satir:7d}   "
+                                  f"zaman asimi ({args.zaman_asimi:.0f}s), buyuk satirlar atlandi")
+                            sonuclar.append({"islem": islem, "harita": harita_adi, "sutun": sutun,
+                                             "satir": satir, "zaman_asimi": True})
+                            break
+                        olcum.update({"islem": islem, "harita": harita_adi, "sutun": sutun, "satir": satir})
+                        sonuclar.append(olcum)
+                        print(f"{islem:7s} {harita_adi:9s} {sutun:5d} {satir:7d} {olcum['sure_min_ms']:10.1f} "
+                              f"{olcum['sure_ort_ms']:10.1f} {olcum['rss_mb']:8.1f} {olcum['artis_mb']:9.1f} "
+                              f"{olcum['boyut_kb']:9.1f}")
+    return sonuclar
+
+
+def _anahtar(olcum: dict) -> tuple:
+    return olcum["islem"], olcum["harita"], olcum["sutun"], olcum["satir"]
+
+
+def karsilastir(eski_dosya: str, yeni: list) -> None:
+    with open(eski_dosya, encoding="utf-8") as f:
+        eski = {_anahtar(o): o for o in json.load(f)["olcumler"]}
+    print()
+    print(f"Karsilastirma: {eski_dosya}")
+    print(f"{'islem':7s} {'harita':9s} {'sutun':>5s} {'satir':>7s} {'sure':>10s} {'artis MB':>10s} {'boyut':>10s}")
+    print("-" * 64)
+    for o in yeni:
+        e = eski.get(_anahtar(o))
+        if e is None or o.get("zaman_asimi") or e.get("zaman_asimi"):
+            continue
+
+        def fark(alan):
+            return f"{(o[alan] - e[alan]) / e[alan] * 100:+.1f}%" if e[alan] else "-"
+
+        print(f"{o['islem']:7s} {o['harita']:9s} {o['sutun']:5d} {o['satir']:7d} {fark('sure_min_ms'):>10s} "
+              f"{o['artis_mb'] - e['artis_mb']:+10.1f} {fark('boyut_kb'):>10s}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--_tek":
+        islem, harita_adi, sutun, satir, tekrar = sys.argv[2:7]
+        dosya = sys.argv[7] if len(sys.argv) > 7 else ""
+        print(json.dumps(tek_olcum(islem, harita_adi, int(sutun), int(satir), int(tekrar), dosya)))
+        return
+
+    parser = argparse.ArgumentParser(description="Excel servisi mikro-benchmark")
+    parser.add_argument("--satir", default="100,1000,10000", help="Virgulle ayrilmis satir sayilari")
+    parser.add_argument("--harita", default="", help="FIRMA,ISYERI,CALISAN,PERSONEL (bos = hepsi)")
+    parser.add_argument("--islem", default="", help="export,sablon,import (bos = hepsi)")
+    parser.add_argument("--tekrar", type=int, default=3, help="Her durum icin tekrar sayisi")
+    parser.add_argument("--zaman-asimi", type=float, default=60,
+                        help="Tek durum icin en fazla sure (saniye); asilirsa buyuk satirlar atlanir")
+    parser.add_argument("--karsilastir", default="", help="Onceki sonuc dosyasi (JSON)")
+    parser.add_argument("--cikti", default="", help="Sonuc dosyasi (bos = benchmarks/sonuclar/excel_...)")
+    args = parser.parse_args()
+
+    olcumler = matris_calistir(args)
+
+    cikti = args.cikti
+    if not cikti:
+        os.makedirs(SONUC_DIZINI, exist_ok=True)
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip() or "yerel"
+        cikti = os.path.join(SONUC_DIZINI, f"excel_{datetime.now().strftime('%Y%m%d-%H%M%S')}_{commit}.json")
+    with open(cikti, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "tarih": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "makine": platform.node(),
+                "tekrar": args.tekrar,
+            },
+            "olcumler": olcumler,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuc: {cikti}")
+
+    if args.karsilastir:
+        karsilastir(args.karsilastir, olcumler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# =============================================
+# MIDDLEWARE BENCHMARK
+# Istek loglama middleware'inin maliyetini olcer
+# =============================================
+#
+# Kullanim (backend/ klasorunden):
+#   python -m benchmarks.bench_middleware
+#   python -m benchmarks.bench_middleware --istek 20000 --eszamanli 50 --loglu
+#
+# Ayni basit endpoint'i uc sekilde calistirir ve saniyedeki istek
+# sayisini (req/s) karsilastirir:
+#   1. middleware'siz
+#   2. RequestLoggerMiddleware (saf ASGI)
+#   3. Eski yontem: BaseHTTPMiddleware ile ayni is
+#
+# Istekler ag kullanmadan (httpx ASGITransport) dogrudan uygulamaya gider;
+# boylece olculen fark sadece middleware'in kendi yukudur.
+
+import argparse
+import asyncio
+import logging
+from time import perf_counter
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logger import api_logger
+from app.middleware.request_logger import RequestLoggerMiddleware
+
+
+class EskiLoggerMiddleware(BaseHTTPMiddleware):
+    """Karsilastirma icin: BaseHTTPMiddleware ile yazilmis esdeger middleware."""
+
+    async def dispatch(self, request, call_next):
+        baslangic = perf_counter()
+        response = await call_next(request)
+        sure = perf_counter() - baslangic
+        response.headers["x-response-time"] = f"{sure * 1000:.2f}ms"
+        api_logger.info(f"{request.method:6s} {request.url.path} | {response.status_code} | {sure:.3f}s")
+        return response
+
+
+def uygulama_olustur(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/firma/{firma_id}")
+    async def firma(firma_id: int):
+        return {"id": firma_id, "ad": "Ornek Firma"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def olc(app: FastAPI, istek: int, eszamanli: int) -> float:
+    """istek adet GET'i eszamanli worker ile gonderir, req/s dondurur."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Isinma
+        for _ in range(50):
+            await client.get("/firma/1")
+
+        kalan = istek
+
+        async def worker():
+            nonlocal kalan
+            while kalan > 0:
+                kalan -= 1
+                yanit = await client.get("/firma/1")
+                assert yanit.status_code == 200
+
+        baslangic = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(eszamanli)))
+        return istek / (perf_counter() - baslangic)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Istek loglama middleware benchmark'i")
+    parser.add_argument("--istek", type=int, default=5000, help="Her senaryo icin istek sayisi")
+    parser.add_argument("--eszamanli", type=int, default=20, help="Eszamanli istemci sayisi")
+    parser.add_argument("--loglu", action="store_true",
+                        help="Log yazma maliyetini de olc (varsayilan: sadece middleware)")
+    args = parser.parse_args()
+
+    if not args.loglu:
+        # Olcumu konsol ciktisi bogmasin: INFO kayitlari kuyruga hic girmez
+        api_logger.setLevel(logging.WARNING)
+
+    senaryolar = [
+        ("middleware yok", None),
+        ("RequestLoggerMiddleware (ASGI)", RequestLoggerMiddleware),
+        ("BaseHTTPMiddleware (eski)", EskiLoggerMiddleware),
+    ]
+
+    print(f"{args.istek} istek, {args.eszamanli} eszamanli istemci")
+    print("-" * 56)
+    referans = None
+    for ad, middleware in senaryolar:
+        rps = await olc(uygulama_olustur(middleware), args.istek, args.eszamanli)
+        referans = referans or rps
+        print(f"{ad:34s} {rps:9.0f} req/s  ({rps / referans * 100:5.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
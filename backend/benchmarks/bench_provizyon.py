@@ -0,0 +1,164 @@
+# =============================================
+# TENANT PROVIZYON BENCHMARK
+# Yeni OSGB'nin ilk istege hazir olma suresi
+# =============================================
+#
+# Kullanim (backend/ klasorunden, create_db.py bir kez calistirilmis olmali):
+#   python -m benchmarks.bench_provizyon
+#   python -m benchmarks.bench_provizyon --tekrar 10
+#
+# Iki olcum yapilir:
+#   1. Veritabani olusturma: bos DB + create_all  vs  CREATE DATABASE ... TEMPLATE
+#   2. Ilk istege kadar gecen sure (time-to-first-request):
+#      tenant_olustur() baslangicindan, yeni OSGB'nin yoneticisinin
+#      GET /api/v1/firma isteginin 200 donmesine kadar
+#
+# Tum kayitlar "bench_prov_" onekiyle olusturulur ve sonunda silinir.
+#
+# 📚 DERS: Neden bcrypt yok?
+# Yonetici sifresi bir kez hash'lenip tum tekrarlarda kullanilir ve token
+# dogrudan uretilir: olculen sure sadece provizyonun kendisi olsun.
+
+import argparse
+import asyncio
+import logging
+import statistics
+from time import perf_counter
+
+import httpx
+from psycopg2 import sql
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base, MasterSessionLocal, tenant_db_url
+from app.core.logger import api_logger, db_logger
+from app.core.security import erisim_tokeni_olustur, sifre_hashle
+from app.main import app
+from app.models.master import Kullanici, Tenant
+from app.services.tenant_provizyon import (
+    TENANT_TABLOLARI, _yonetim_baglantisi, sablon_hazirla, tenant_olustur,
+    veritabani_klonla, veritabani_sil,
+)
+
+
+ONEK = "bench_prov_"
+
+
+def _ozet(sureler: list) -> str:
+    return f"min {min(sureler):8.1f} ms   ortanca {statistics.median(sureler):8.1f} ms"
+
+
+def create_all_ile(db_adi: str) -> None:
+    """Eski yontem: bos veritabani + her tablo icin DDL."""
+    baglanti = _yonetim_baglantisi()
+    try:
+        with baglanti.cursor() as cur:
+            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_adi)))
+    finally:
+        baglanti.close()
+    engine = create_engine(tenant_db_url(db_adi), poolclass=NullPool)
+    try:
+        Base.metadata.create_all(bind=engine, tables=TENANT_TABLOLARI)
+    finally:
+        engine.dispose()
+
+
+def veritabani_olcumu(tekrar: int) -> None:
+    print("1. Veritabani olusturma")
+    for ad, fonk in (("create_all", create_all_ile), ("sablon (TEMPLATE)", veritabani_klonla)):
+        sureler = []
+        for i in range(tekrar):
+            db_adi = f"{ONEK}db_{i}"
+            baslangic = perf_counter()
+            fonk(db_adi)
+            sureler.append((perf_counter() - baslangic) * 1000)
+            veritabani_sil(db_adi)
+        print(f"   {ad:20s} {_ozet(sureler)}")
+
+
+async def ilk_istek_olcumu(tekrar: int) -> None:
+    print("2. Ilk istege kadar gecen sure (tenant_olustur + GET /api/v1/firma)")
+    sifre_hash = sifre_hashle("bench123")
+    toplamlar = []
+    adimlar = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(tekrar):
+            subdomain = f"{ONEK}{i}".replace("_", "-")
+            db = MasterSessionLocal()
+            try:
+                baslangic = perf_counter()
+                tenant, yonetici, sureler = tenant_olustur(
+                    db,
+                    {"ad": f"Bench Provizyon {i}", "subdomain": subdomain},
+                    {"email": f"{ONEK}{i}@osgbyazilim.com", "sifre_hash": sifre_hash,
+                     "ad": "Bench", "soyad": "Yonetici"},
+                )
+                token = erisim_tokeni_olustur(yonetici, tenant.db_name)
+                yanit = await client.get("/api/v1/firma", headers={"Authorization": f"Bearer {token}"})
+                toplam = (perf_counter() - baslangic) * 1000
+            finally:
+                db.close()
+            assert yanit.status_code == 200, yanit.text
+
+            sureler["ilk_istek_ms"] = toplam - sureler["toplam_ms"]
+            toplamlar.append(toplam)
+            for ad, ms in sureler.items():
+                adimlar.setdefault(ad, []).append(ms)
+
+    for ad, liste in adimlar.items():
+        if ad != "toplam_ms":
+            print(f"   {ad:20s} {_ozet(liste)}")
+    print(f"   {'TOPLAM':20s} {_ozet(toplamlar)}")
+
+
+def temizle() -> None:
+    db = MasterSessionLocal()
+    try:
+        tenantlar = db.query(Tenant).filter(Tenant.db_name.like(f"osgb_{ONEK}%")).all()
+        db_adlari = [t.db_name for t in tenantlar]
+        db.query(Kullanici).filter(Kullanici.email.like(f"{ONEK}%")).delete(synchronize_session=False)
+        for t in tenantlar:
+            db.delete(t)
+        db.commit()
+    finally:
+        db.close()
+
+    baglanti = _yonetim_baglantisi()
+    try:
+        with baglanti.cursor() as cur:
+            cur.execute(
+                "SELECT datname FROM pg_catalog.pg_database WHERE datname LIKE %s OR datname LIKE %s",
+                (f"{ONEK}%", f"osgb_{ONEK}%"),
+            )
+            db_adlari += [satir[0] for satir in cur.fetchall()]
+    finally:
+        baglanti.close()
+    for db_adi in set(db_adlari):
+        veritabani_sil(db_adi)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tenant provizyon benchmark'i")
+    parser.add_argument("--tekrar", type=int, default=5, help="Her olcum icin tekrar sayisi")
+    args = parser.parse_args()
+
+    # Olcumu log ciktisi bogmasin
+    api_logger.setLevel(logging.WARNING)
+    db_logger.setLevel(logging.WARNING)
+
+    temizle()
+    baslangic = perf_counter()
+    sablon_hazirla()
+    print(f"Sablon hazir ({(perf_counter() - baslangic) * 1000:.0f} ms)")
+    print("-" * 64)
+    try:
+        veritabani_olcumu(args.tekrar)
+        asyncio.run(ilk_istek_olcumu(args.tekrar))
+    finally:
+        temizle()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# =============================================
+# WEBSOCKET BAGLANTI BENCHMARK'I
+# Bir worker kac bosta bildirim baglantisi tasir, yayin ne kadar surer?
+# =============================================
+#
+# Kullanim (backend/ klasorunden):
+#   python -m benchmarks.bench_websocket
+#   python -m benchmarks.bench_websocket --baglanti 5000 --adim 1000 --yayin 5
+#   python -m benchmarks.bench_websocket --sikistirma      # permessage-deflate acik (karsilastirma)
+#   python -m benchmarks.bench_websocket --url http://localhost:8000 --pid 12345
+#
+# --url verilmezse tek worker'li bir uvicorn sureci kendisi baslatir
+# (PG_DINLEYICI_AKTIF / ZAMANLAYICI_AKTIF kapali, run_server.py gibi
+# WebSocket sikistirmasi kapali). Veritabani gerekmez:
+# token'lar bu surecte ayni SECRET_KEY ile uretilir. Calisan bir sunucu
+# olculecekse o da ayni SECRET_KEY ile baslatilmis olmali.
+#
+# Her adimda:
+#   1. --adim kadar yeni baglanti acilir ({"olay": "giris"} + "baglandi" beklenir)
+#   2. Sunucu surecinin bellegi (RSS, /proc/<pid>/status) okunur
+#      -> baglanti basina KB = (RSS - baglantisiz RSS) / baglanti
+#   3. POST /api/v1/bildirim/duyuru ile --yayin kez tenant kanalina yayin;
+#      istek anindan her baglantinin mesaji almasina kadar gecen sure
+#
+# 📚 DERS: Bosta baglanti neden ucuz?
+# Her baglanti sunucuda bir soket + iki bekleyen asyncio gorevi + bos bir
+# kuyruktur; thread yok. Sinir genelde bellek degil acik dosya sayisidir:
+# betik kendi sinirini (ulimit -n) hard limit'e kadar yukseltir, baslattigi
+# sunucu da bunu devralir. Istemci ve sunucu ayni makinede ise her baglanti
+# iki dosya tanimlayicisi harcar.
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from time import perf_counter
+from types import SimpleNamespace
+
+import httpx
+import websockets
+
+from app.core.security import erisim_tokeni_olustur
+from app.models.master import RolEnum
+
+
+BENCH_TENANT_ID = 1
+
+
+def _token(kullanici_id: int, rol: str = "osgb_yoneticisi", tenant_id=BENCH_TENANT_ID) -> str:
+    kullanici = SimpleNamespace(
+        id=kullanici_id, email=f"bench_ws_{kullanici_id}@osgbyazilim.com", ad="Bench", soyad=str(kullanici_id),
+        rol=RolEnum(rol), tenant_id=tenant_id, aktif=True, token_versiyon=0,
+    )
+    return erisim_tokeni_olustur(kullanici, "osgb_bench" if tenant_id else None)
+
+
+def _dosya_sinirini_yukselt() -> int:
+    yumusak, sert = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if yumusak < sert:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (sert, sert))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def _rss_mb(pid) -> float:
+    """Surecin fiziksel bellegi (Linux). Okunamazsa NaN."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for satir in f:
+                if satir.startswith("VmRSS:"):
+                    return int(satir.split()[1]) / 1024
+    except (OSError, TypeError):
+        pass
+    return float("nan")
+
+
+async def _sunucu_baslat(port: int, baglanti: int, sikistirma: bool) -> subprocess.Popen:
+    ortam = {
+        **os.environ,
+        "PG_DINLEYICI_AKTIF": "false",
+        "ZAMANLAYICI_AKTIF": "false",
+        "WS_MAKS_BAGLANTI": str(baglanti + 100),
+    }
+    surec = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096",
+         "--ws-per-message-deflate", "true" if sikistirma else "false"],
+        env=ortam, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"http://127.0.0.1:{port}/health")
+                return surec
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    surec.kill()
+    raise RuntimeError("Sunucu baslamadi")
+
+
+class Istemciler:
+    """Acik baglantilar ve her birinin aldigi duyurularin zamani."""
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self.baglantilar = []
+        self.okuyucular = []
+        # duyuru no -> [alma zamani, ...]
+        self.alimlar = defaultdict(list)
+        self.hatalar = 0
+
+    async def _ac(self, sira: int) -> None:
+        try:
+            ws = await websockets.connect(self.ws_url, ping_interval=None, max_size=2 ** 16)
+            await ws.send(json.dumps({"olay": "giris", "token": _token(1000 + sira % 100)}))
+            mesaj = json.loads(await ws.recv())
+            if mesaj["olay"] != "baglandi":
+                raise RuntimeError(mesaj)
+        except Exception:
+            self.hatalar += 1
+            return
+        self.baglantilar.append(ws)
+        self.okuyucular.append(asyncio.create_task(self._oku(ws)))
+
+    async def _oku(self, ws) -> None:
+        try:
+            async for ham in ws:
+                mesaj = json.loads(ham)
+                if mesaj["olay"] == "duyuru":
+                    self.alimlar[mesaj["veri"]["mesaj"]].append(perf_counter())
+        except Exception:
+            pass
+
+    async def ac(self, adet: int, eszamanli: int) -> float:
+        """adet baglanti acar (en fazla eszamanli tanesi ayni anda el sikisir); sure (sn)."""
+        baslangic = perf_counter()
+        sinir = asyncio.Semaphore(eszamanli)
+        ilk = len(self.baglantilar) + self.hatalar
+
+        async def tek(sira):
+            async with sinir:
+                await self._ac(sira)
+
+        await asyncio.gather(*(tek(ilk + i) for i in range(adet)))
+        return perf_counter() - baslangic
+
+    async def kapat(self) -> None:
+        for gorev in self.okuyucular:
+            gorev.cancel()
+        await asyncio.gather(*(ws.close() for ws in self.baglantilar), return_exceptions=True)
+
+
+async def yayin_olc(client: httpx.AsyncClient, istemciler: Istemciler, no: str, zaman_asimi: float):
+    """Tek duyuru: istekten tum baglantilara ulasana kadar gecikmeler (ms)."""
+    beklenen = len(istemciler.baglantilar)
+    baslangic = perf_counter()
+    yanit = await client.post("/api/v1/bildirim/duyuru", json={"mesaj": no})
+    yanit.raise_for_status()
+    bitis = perf_counter() + zaman_asimi
+    while len(istemciler.alimlar[no]) < beklenen and perf_counter() < bitis:
+        await asyncio.sleep(0.005)
+    return [(t - baslangic) * 1000 for t in istemciler.alimlar.pop(no, [])], beklenen
+
+
+def _yuzdelik(liste, oran):
+    return sorted(liste)[min(len(liste) - 1, int(len(liste) * oran))] if liste else float("nan")
+
+
+async def main(args):
+    dosya_siniri = _dosya_sinirini_yukselt()
+    print(f"Acik dosya siniri: {dosya_siniri}")
+
+    surec = None
+    url, pid = args.url, args.pid
+    if url is None:
+        surec = await _sunucu_baslat(args.port, args.baglanti, args.sikistirma)
+        url, pid = f"http://127.0.0.1:{args.port}", surec.pid
+        print(f"Sunucu baslatildi (pid {pid})")
+    ws_url = url.replace("http", "ws", 1) + "/api/v1/bildirim/ws"
+
+    istemciler = Istemciler(ws_url)
+    yonetici = {"Authorization": f"Bearer {_token(1)}"}
+    admin = {"Authorization": f"Bearer {_token(2, 'sistem_admin', None)}"}
+    try:
+        async with httpx.AsyncClient(base_url=url, headers=yonetici, timeout=30) as client:
+            await asyncio.sleep(0.5)
+            rss_bos = _rss_mb(pid)
+            print(f"Baglantisiz RSS: {rss_bos:.1f} MB\n")
+            print(f"{'baglanti':>9s} {'acma/sn':>9s} {'RSS MB':>8s} {'KB/bag':>7s} "
+                  f"{'yayin p50':>10s} {'p99':>8s} {'max':>8s} {'teslim':>7s}")
+
+            while len(istemciler.baglantilar) + istemciler.hatalar < args.baglanti:
+                adet = min(args.adim, args.baglanti - len(istemciler.baglantilar) - istemciler.hatalar)
+                sure = await istemciler.ac(adet, args.eszamanli)
+                await asyncio.sleep(0.5)
+                n = len(istemciler.baglantilar)
+                rss = _rss_mb(pid)
+
+                gecikmeler, teslim, beklenen = [], 0, 0
+                for i in range(args.yayin):
+                    liste, beklenen_i = await yayin_olc(client, istemciler, f"{n}-{i}", args.zaman_asimi)
+                    gecikmeler.extend(liste)
+                    teslim += len(liste)
+                    beklenen += beklenen_i
+
+                print(
+                    f"{n:9d} {adet / sure:9.0f} {rss:8.1f} {(rss - rss_bos) * 1024 / max(n, 1):7.1f} "
+                    f"{statistics.median(gecikmeler) if gecikmeler else float('nan'):8.1f}ms "
+                    f"{_yuzdelik(gecikmeler, 0.99):6.1f}ms {max(gecikmeler, default=float('nan')):6.1f}ms "
+                    f"{teslim / max(beklenen, 1):6.1%}"
+                )
+
+            durum = (await client.get("/api/v1/bildirim/durum", headers=admin)).json()
+            print(f"\nSunucu: {durum}")
+            if istemciler.hatalar:
+                print(f"Acilamayan baglanti: {istemciler.hatalar}")
+    finally:
+        await istemciler.kapat()
+        if surec is not None:
+            surec.terminate()
+            surec.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket bildirim baglanti benchmark'i")
+    parser.add_argument("--baglanti", type=int, default=2000, help="Toplam bosta baglanti")
+    parser.add_argument("--adim", type=int, default=500, help="Her olcum adiminda acilan baglanti")
+    parser.add_argument("--yayin", type=int, default=3, help="Her adimda yapilan duyuru sayisi")
+    parser.add_argument("--eszamanli", type=int, default=200, help="Ayni anda el sikisan baglanti")
+    parser.add_argument("--zaman-asimi", type=float, default=10.0, help="Yayinin ulasmasi icin en fazla bekleme (sn)")
+    parser.add_argument("--url", default=None, help="Calisan sunucu (orn. http://localhost:8000); bos = kendisi baslatir")
+    parser.add_argument("--pid", type=int, default=None, help="--url ile: bellegi olculecek sunucu surecinin pid'i")
+    parser.add_argument("--port", type=int, default=8765, help="Kendi baslattigi sunucunun portu")
+    parser.add_argument("--sikistirma", action="store_true", help="Kendi baslattigi sunucuda permessage-deflate acik")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+# =============================================
+# YUK TESTI SONUCLARINI KARSILASTIR
+# Iki commit arasinda yavaslama (regresyon) var mi?
+# =============================================
+#
+# Kullanim (backend/ klasorunden):
+#   python -m benchmarks.karsilastir benchmarks/sonuclar/eski.json benchmarks/sonuclar/yeni.json
+#   python -m benchmarks.karsilastir eski.json yeni.json --esik 15
+#
+# Her senaryo icin p50/p95/p99, req/s ve istek basina DB sorgusu
+# yan yana yazilir. p95 --esik yuzdesinden fazla kotulestiyse ya da
+# istek basina DB sorgusu arttiysa satir "!!" ile isaretlenir ve
+# cikis kodu 1 olur (CI'da kullanilabilir).
+#
+# Not: Olcumler ayni makinede, ayni seed verisiyle alinmali.
+
+import argparse
+import json
+import sys
+
+
+def _degisim(eski, yeni) -> str:
+    if eski in (None, 0) or yeni is None:
+        return "-"
+    return f"{(yeni - eski) / eski * 100:+.1f}%"
+
+
+def karsilastir(eski: dict, yeni: dict, esik: float) -> list:
+    """Regresyon gosteren senaryolarin listesini dondurur, tabloyu yazdirir."""
+    print(f"eski: {eski['meta'].get('git_commit')} {eski['meta'].get('etiket', '')} ({eski['meta']['tarih']})")
+    print(f"yeni: {yeni['meta'].get('git_commit')} {yeni['meta'].get('etiket', '')} ({yeni['meta']['tarih']})")
+    print()
+    print(f"{'senaryo':14s} {'p50':>18s} {'p95':>18s} {'p99':>18s} {'req/s':>10s} {'db/istek':>12s}")
+    print("-" * 96)
+
+    regresyonlar = []
+    adlar = sorted(set(eski["senaryolar"]) | set(yeni["senaryolar"]))
+    for ad in adlar + ["TOPLAM"]:
+        if ad == "TOPLAM":
+            e, y = eski["toplam"], yeni["toplam"]
+        else:
+            e, y = eski["senaryolar"].get(ad), yeni["senaryolar"].get(ad)
+        if e is None or y is None:
+            print(f"{ad:14s} (sadece {'yeni' if e is None else 'eski'} sonucta var)")
+            continue
+
+        sutunlar = []
+        for alan in ("p50_ms", "p95_ms", "p99_ms"):
+            sutunlar.append(f"{y[alan]:8.1f} {_degisim(e[alan], y[alan]):>9s}")
+        sutunlar.append(f"{_degisim(e['rps'], y['rps']):>10s}")
+        db_e, db_y = e.get("db_sorgu_ort"), y.get("db_sorgu_ort")
+        sutunlar.append(f"{db_y if db_y is not None else '-':>5} ({db_e if db_e is not None else '-'})")
+
+        kotu = False
+        if e["p95_ms"] and (y["p95_ms"] - e["p95_ms"]) / e["p95_ms"] * 100 > esik:
+            kotu = True
+        if db_e is not None and db_y is not None and db_y > db_e:
+            kotu = True
+        if kotu and ad != "TOPLAM":
+            regresyonlar.append(ad)
+
+        print(f"{ad:14s} " + " ".join(sutunlar) + ("  !!" if kotu else ""))
+
+    print("(sureler ms, yuzdeler eskiye gore; db/istek: yeni (eski))")
+    return regresyonlar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Iki yuk testi sonucunu karsilastir")
+    parser.add_argument("eski", help="Referans sonuc dosyasi (JSON)")
+    parser.add_argument("yeni", help="Yeni sonuc dosyasi (JSON)")
+    parser.add_argument("--esik", type=float, default=10.0,
+                        help="p95 bu yuzdeden fazla artarsa regresyon say (varsayilan: 10)")
+    args = parser.parse_args()
+
+    with open(args.eski, encoding="utf-8") as f:
+        eski = json.load(f)
+    with open(args.yeni, encoding="utf-8") as f:
+        yeni = json.load(f)
+
+    regresyonlar = karsilastir(eski, yeni, args.esik)
+    if regresyonlar:
+        print(f"\nREGRESYON: {', '.join(regresyonlar)}")
+        sys.exit(1)
+    print("\nRegresyon yok.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+# =============================================
+# YUK TESTI VERI TOHUMLAMA (seed)
+# N adet OSGB (tenant) ve gercekci miktarda kayit olusturur
+# =============================================
+#
+# Kullanim (backend/ klasorunden, create_db.py bir kez calistirilmis olmali):
+#   python -m benchmarks.seed --tenant 3
+#   python -m benchmarks.seed --tenant 5 --firma 200 --calisan 40 --sifirla
+#
+# Her tenant icin:
+#   - Master DB'de Tenant kaydi + yonetici kullanici
+#       email: bench{i}@osgbyazilim.com   sifre: bench123
+#   - Ayri veritabani: bench_osgb_{i}
+#   - Firma, Isyeri, Calisan, Personel, Dokuman (diskte gercek dosyalarla)
+#   - Master DB'de IslemLog kayitlari
+#
+# 📚 DERS: Neden tek tek db.add() degil?
+# 100.000 calisani tek tek eklemek dakikalar surer. insert(Model) + satir
+# listesi ile SQLAlchemy cok satirli INSERT uretir (executemany), saniyeler surer.
+#
+# Veriler --tohum degeriyle uretilir: ayni parametreler = ayni veri.
+# Boylece iki commit arasindaki olcumler ayni veri uzerinde yapilir.
+
+import argparse
+import random
+from datetime import date, datetime, timedelta
+from time import perf_counter
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.api.v1.dokuman import UPLOAD_DIR
+from app.core.config import settings
+from app.core.database import get_tenant_engine, master_engine, tenant_engine_kapat
+from app.core.security import sifre_hashle
+from app.models.master import (
+    AbonelikDurumEnum, IslemLog, IslemLogEnum, Kullanici, RolEnum, Tenant,
+)
+from app.models.tenant import (
+    Calisan, Dokuman, Firma, Isyeri, Personel, PersonelUnvan, TehlikeSinifi, UzmanlikSinifi,
+)
+from app.services.tenant_provizyon import sablon_hazirla, veritabani_klonla
+
+
+BENCH_SIFRE = "bench123"
+PARTI = 5000  # Tek INSERT'te gonderilen en fazla satir
+
+
+def tenant_db_adi(i: int) -> str:
+    return f"bench_osgb_{i}"
+
+
+def tenant_email(i: int) -> str:
+    return f"bench{i}@osgbyazilim.com"
+
+
+# ---- ORNEK VERI HAVUZLARI ----
+ADLAR = ["Ahmet", "Mehmet", "Ayse", "Fatma", "Mustafa", "Emine", "Ali", "Zeynep", "Huseyin",
+         "Elif", "Hasan", "Hatice", "Ibrahim", "Merve", "Omer", "Esra", "Yusuf", "Busra", "Murat", "Seda"]
+SOYADLAR = ["Yilmaz", "Kaya", "Demir", "Sahin", "Celik", "Yildiz", "Yildirim", "Ozturk", "Aydin",
+            "Ozdemir", "Arslan", "Dogan", "Kilic", "Aslan", "Cetin", "Kara", "Koc", "Kurt", "Ozkan", "Simsek"]
+ILLER = {
+    "Istanbul": ["Kadikoy", "Besiktas", "Umraniye", "Tuzla", "Esenyurt"],
+    "Ankara": ["Cankaya", "Yenimahalle", "Sincan", "Etimesgut"],
+    "Izmir": ["Bornova", "Karsiyaka", "Cigli", "Torbali"],
+    "Bursa": ["Nilufer", "Osmangazi", "Inegol"],
+    "Kocaeli": ["Gebze", "Izmit", "Dilovasi"],
+}
+SEKTORLER = [
+    ("25.11.01", "Metal yapi ve yapi parcalari imalati", TehlikeSinifi.COK_TEHLIKELI),
+    ("41.20.01", "Ikamet amacli binalarin insaati", TehlikeSinifi.COK_TEHLIKELI),
+    ("10.71.01", "Ekmek imalati", TehlikeSinifi.TEHLIKELI),
+    ("22.22.01", "Plastik ambalaj imalati", TehlikeSinifi.TEHLIKELI),
+    ("47.11.02", "Bakkal ve market perakende ticareti", TehlikeSinifi.AZ_TEHLIKELI),
+    ("62.01.01", "Bilgisayar programlama faaliyetleri", TehlikeSinifi.AZ_TEHLIKELI),
+]
+FIRMA_EKLERI = ["Insaat", "Metal", "Gida", "Plastik", "Tekstil", "Lojistik", "Yazilim", "Enerji"]
+GOREVLER = ["Operator", "Usta", "Muhendis", "Tekniker", "Depo Sorumlusu", "Sofor", "Idari Personel"]
+BOLUMLER = ["Uretim", "Depo", "Bakim", "Idari", "Sevkiyat", "Kalite"]
+KAN_GRUPLARI = ["A Rh+", "A Rh-", "B Rh+", "0 Rh+", "0 Rh-", "AB Rh+"]
+
+# Dokuman kayitlarinin isaret ettigi ornek dosyalar: (ad, mime, boyut)
+ORNEK_DOSYALAR = [
+    ("risk_degerlendirmesi.pdf", "application/pdf", 200 * 1024),
+    ("egitim_katilim.jpg", "image/jpeg", 60 * 1024),
+    ("acil_durum_plani.pdf", "application/pdf", 1024 * 1024),
+]
+
+
+def _rastgele_tarih(rnd: random.Random, baslangic_yil: int, bitis_yil: int) -> date:
+    baslangic = date(baslangic_yil, 1, 1)
+    return baslangic + timedelta(days=rnd.randrange((date(bitis_yil, 12, 31) - baslangic).days))
+
+
+def _toplu_ekle(db: Session, model, satirlar: list) -> None:
+    for i in range(0, len(satirlar), PARTI):
+        db.execute(insert(model), satirlar[i:i + PARTI])
+
+
+# =============================================
+# VERITABANI
+# =============================================
+def _postgres_baglantisi():
+    conn = psycopg2.connect(
+        host=settings.DATABASE_HOST,
+        port=settings.DATABASE_PORT,
+        user=settings.DATABASE_USER,
+        password=settings.DATABASE_PASSWORD,
+        database="postgres",
+    )
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    return conn
+
+
+def tenant_db_hazirla(db_adi: str, sifirla: bool) -> bool:
+    """Tenant veritabanini olusturur. Zaten varsa ve sifirla=False ise False doner."""
+    conn = _postgres_baglantisi()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", (db_adi,))
+        if cursor.fetchone():
+            if not sifirla:
+                return False
+            tenant_engine_kapat(db_adi)
+            cursor.execute(f'DROP DATABASE "{db_adi}" WITH (FORCE)')
+    finally:
+        conn.close()
+
+    # Tablolar sablondan gelir (bkz. app/services/tenant_provizyon.py)
+    sablon_hazirla()
+    veritabani_klonla(db_adi)
+    return True
+
+
+def master_kayitlari(db: Session, i: int, db_adi: str) -> Tenant:
+    """Tenant ve yonetici kullanicisini olusturur (varsa gunceller)."""
+    tenant = db.query(Tenant).filter(Tenant.db_name == db_adi).first()
+    if tenant is None:
+        tenant = Tenant(
+            ad=f"Bench OSGB {i}",
+            db_name=db_adi,
+            subdomain=f"bench{i}",
+            email=tenant_email(i),
+            il="Istanbul",
+            ilce="Kadikoy",
+            abonelik_durum=AbonelikDurumEnum.AKTIF,
+            abonelik_baslangic=datetime.utcnow(),
+            abonelik_bitis=datetime.utcnow() + timedelta(days=365),
+            max_isyeri=100000,
+            max_kullanici=1000,
+        )
+        db.add(tenant)
+        db.flush()
+
+    kullanici = db.query(Kullanici).filter(Kullanici.email == tenant_email(i)).first()
+    if kullanici is None:
+        db.add(Kullanici(
+            email=tenant_email(i),
+            sifre_hash=sifre_hashle(BENCH_SIFRE),
+            ad="Bench",
+            soyad=f"Yonetici {i}",
+            rol=RolEnum.OSGB_YONETICISI,
+            tenant_id=tenant.id,
+            aktif=True,
+            email_dogrulandi=True,
+        ))
+    db.commit()
+    return tenant
+
+
+# =============================================
+# TENANT VERISI
+# =============================================
+def tenant_verisi_olustur(db: Session, i: int, db_adi: str, args, rnd: random.Random) -> dict:
+    """Bir tenant DB'sine firma, isyeri, calisan, personel ve dokuman ekler."""
+    simdi = datetime.utcnow()
+
+    # ---- FIRMALAR ----
+    firmalar = []
+    for n in range(args.firma):
+        il = rnd.choice(list(ILLER))
+        firmalar.append({
+            "ad": f"{rnd.choice(SOYADLAR)} {rnd.choice(FIRMA_EKLERI)} A.S. {n + 1}",
+            "kisa_ad": f"FRM{n + 1}",
+            "adres": f"{rnd.randint(1, 200)}. Sokak No:{rnd.randint(1, 99)}",
+            "il": il,
+            "ilce": rnd.choice(ILLER[il]),
+            "email": f"info{n + 1}@firma{i}.com.tr",
+            "telefon": f"0{rnd.randint(212, 488)} {rnd.randint(100, 999)} {rnd.randint(1000, 9999)}",
+            "vergi_dairesi": f"{il} VD",
+            "vergi_no": f"{rnd.randint(10 ** 9, 10 ** 10 - 1)}",
+            "aktif": rnd.random() > 0.05,
+            "olusturma_tarihi": simdi,
+            "guncelleme_tarihi": simdi,
+        })
+    _toplu_ekle(db, Firma, firmalar)
+    firma_idleri = db.scalars(select(Firma.id).order_by(Firma.id)).all()
+
+    # ---- ISYERLERI ----
+    isyerleri = []
+    for firma_id in firma_idleri:
+        for n in range(args.isyeri):
+            nace, aciklama, tehlike = rnd.choice(SEKTORLER)
+            isyerleri.append({
+                "firma_id": firma_id,
+                "ad": f"Firma {firma_id} Sube {n + 1}",
+                "sgk_sicil_no": f"{rnd.randint(10 ** 16, 10 ** 17 - 1)}",
+                "nace_kodu": nace,
+                "nace_aciklama": aciklama,
+                "tehlike_sinifi": tehlike,
+                "ana_faaliyet": aciklama,
+                "isveren_ad": rnd.choice(ADLAR),
+                "isveren_soyad": rnd.choice(SOYADLAR),
+                "hizmet_baslama": _rastgele_tarih(rnd, 2020, 2025),
+                "ucretlendirme": float(rnd.randrange(2000, 30000, 500)),
+                "koordinat_lat": round(rnd.uniform(36.0, 42.0), 6),
+                "koordinat_lng": round(rnd.uniform(26.0, 44.0), 6),
+                "aktif": True,
+                "olusturma_tarihi": simdi,
+                "guncelleme_tarihi": simdi,
+            })
+    _toplu_ekle(db, Isyeri, isyerleri)
+    isyeri_idleri = db.scalars(select(Isyeri.id).order_by(Isyeri.id)).all()
+
+    # ---- CALISANLAR ----
+    # TC no: tenant ve sira numarasindan (benzersiz, 11 hane)
+    calisanlar = []
+    tc = 10_000_000_000 + i * 100_000_000
+    for isyeri_id in isyeri_idleri:
+        # Gercek hayatta isyeri buyuklukleri farklidir: ortalama args.calisan
+        for _ in range(max(1, int(rnd.expovariate(1 / args.calisan)))):
+            tc += 1
+            ad = rnd.choice(ADLAR)
+            calisanlar.append({
+                "isyeri_id": isyeri_id,
+                "tc_no": str(tc),
+                "ad": ad,
+                "soyad": rnd.choice(SOYADLAR),
+                "telefon": f"05{rnd.randint(30, 59)} {rnd.randint(100, 999)} {rnd.randint(10, 99)} {rnd.randint(10, 99)}",
+                "email": f"{ad.lower()}{tc % 100000}@ornek.com",
+                "dogum_tarihi": _rastgele_tarih(rnd, 1965, 2004),
+                "ise_giris_tarihi": _rastgele_tarih(rnd, 2010, 2025),
+                "gorev": rnd.choice(GOREVLER),
+                "bolum": rnd.choice(BOLUMLER),
+                "kan_grubu": rnd.choice(KAN_GRUPLARI),
+                "aktif": rnd.random() > 0.03,
+                "olusturma_tarihi": simdi,
+                "guncelleme_tarihi": simdi,
+            })
+    _toplu_ekle(db, Calisan, calisanlar)
+
+    # ---- PERSONEL ----
+    personeller = []
+    tc = 20_000_000_000 + i * 100_000
+    for n in range(args.personel):
+        tc += 1
+        unvan = rnd.choice(list(PersonelUnvan))
+        personeller.append({
+            "ad": rnd.choice(ADLAR),
+            "soyad": rnd.choice(SOYADLAR),
+            "tc_no": str(tc),
+            "telefon": f"05{rnd.randint(30, 59)} {rnd.randint(1000000, 9999999)}",
+            "email": f"personel{n + 1}@bench{i}.com",
+            "unvan": unvan,
+            "uzmanlik_belgesi_no": f"BLG-{rnd.randint(10000, 99999)}",
+            "uzmanlik_sinifi": rnd.choice(list(UzmanlikSinifi)) if unvan == PersonelUnvan.ISG_UZMANI else None,
+            "brans": "Is ve Meslek Hastaliklari" if unvan == PersonelUnvan.ISYERI_HEKIMI else None,
+            "ise_baslama_tarihi": _rastgele_tarih(rnd, 2015, 2025),
+            "aktif": True,
+            "olusturma_tarihi": simdi,
+            "guncelleme_tarihi": simdi,
+        })
+    _toplu_ekle(db, Personel, personeller)
+
+    # ---- DOKUMANLAR ----
+    # Diskte birkac gercek dosya, kayitlar bunlari paylasir (medya indirme senaryosu icin)
+    klasor = UPLOAD_DIR / db_adi / "bench"
+    klasor.mkdir(parents=True, exist_ok=True)
+    dosyalar = []
+    for ad, mime, boyut in ORNEK_DOSYALAR:
+        yol = klasor / ad
+        if not yol.exists() or yol.stat().st_size != boyut:
+            yol.write_bytes(rnd.randbytes(boyut))
+        dosyalar.append((ad, mime, boyut, str(yol)))
+
+    kaynaklar = [("firma", firma_idleri), ("isyeri", isyeri_idleri)]
+    dokumanlar = []
+    for _ in range(args.dokuman):
+        kaynak_tipi, idler = rnd.choice(kaynaklar)
+        ad, mime, boyut, yol = rnd.choice(dosyalar)
+        dokumanlar.append({
+            "kaynak_tipi": kaynak_tipi,
+            "kaynak_id": rnd.choice(idler),
+            "dosya_adi": ad,
+            "dosya_yolu": yol,
+            "dosya_tipi": mime,
+            "dosya_boyutu": boyut,
+            "yukleyen_adi": "Bench Yonetici",
+            "aktif": True,
+            "olusturma_tarihi": simdi,
+        })
+    _toplu_ekle(db, Dokuman, dokumanlar)
+    db.commit()
+
+    return {
+        "firma": len(firmalar),
+        "isyeri": len(isyerleri),
+        "calisan": len(calisanlar),
+        "personel": len(personeller),
+        "dokuman": len(dokumanlar),
+    }
+
+
+def islem_loglari_olustur(db: Session, tenant: Tenant, adet: int, rnd: random.Random) -> None:
+    """Master DB'ye son 90 gune yayilmis IslemLog kayitlari ekler."""
+    simdi = datetime.utcnow()
+    moduller = ["auth", "firma", "isyeri", "calisan", "personel", "dokuman"]
+    loglar = []
+    for _ in range(adet):
+        islem = rnd.choice(list(IslemLogEnum))
+        loglar.append({
+            "kullanici_email": tenant.email,
+            "kullanici_rol": RolEnum.OSGB_YONETICISI.value,
+            "kullanici_ad": "Bench Yonetici",
+            "tenant_id": tenant.id,
+            "tenant_ad": tenant.ad,
+            "islem_turu": islem,
+            "modul": "auth" if islem in (IslemLogEnum.GIRIS, IslemLogEnum.CIKIS) else rnd.choice(moduller),
+            "aciklama": "Bench kaydi",
+            "ip_adresi": f"10.0.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}",
+            "http_metod": rnd.choice(["GET", "POST", "PUT", "DELETE"]),
+            "basarili": islem != IslemLogEnum.GIRIS_BASARISIZ,
+            "tarih": simdi - timedelta(seconds=rnd.randrange(90 * 24 * 3600)),
+        })
+    _toplu_ekle(db, IslemLog, loglar)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yuk testi icin tenant ve veri olusturur")
+    parser.add_argument("--tenant", type=int, default=3, help="Olusturulacak tenant sayisi")
+    parser.add_argument("--firma", type=int, default=100, help="Tenant basina firma")
+    parser.add_argument("--isyeri", type=int, default=3, help="Firma basina isyeri")
+    parser.add_argument("--calisan", type=int, default=25, help="Isyeri basina ORTALAMA calisan")
+    parser.add_argument("--personel", type=int, default=40, help="Tenant basina OSGB personeli")
+    parser.add_argument("--dokuman", type=int, default=500, help="Tenant basina dokuman")
+    parser.add_argument("--log", type=int, default=5000, help="Tenant basina islem logu (master DB)")
+    parser.add_argument("--tohum", type=int, default=42, help="Rastgele veri tohumu")
+    parser.add_argument("--sifirla", action="store_true", help="Var olan bench tenant'larini silip yeniden olustur")
+    args = parser.parse_args()
+
+    print(f"{args.tenant} tenant tohumlaniyor...")
+    for i in range(1, args.tenant + 1):
+        db_adi = tenant_db_adi(i)
+        baslangic = perf_counter()
+        rnd = random.Random(args.tohum * 1000 + i)
+
+        if not tenant_db_hazirla(db_adi, args.sifirla):
+            print(f"  {db_adi}: zaten mevcut, atlandi (yeniden olusturmak icin --sifirla)")
+            continue
+
+        with Session(master_engine) as master_db:
+            tenant = master_kayitlari(master_db, i, db_adi)
+            if args.sifirla:
+                master_db.query(IslemLog).filter(IslemLog.tenant_id == tenant.id).delete()
+                master_db.commit()
+            islem_loglari_olustur(master_db, tenant, args.log, rnd)
+
+        with Session(get_tenant_engine(db_adi)) as db:
+            sayilar = tenant_verisi_olustur(db, i, db_adi, args, rnd)
+
+        ozet = ", ".join(f"{ad}={sayi}" for ad, sayi in sayilar.items())
+        print(f"  {db_adi}: {ozet}, islem_log={args.log} ({perf_counter() - baslangic:.1f}s)")
+
+    print()
+    print("Giris bilgileri: bench{i}@osgbyazilim.com / " + BENCH_SIFRE)
+
+
+if __name__ == "__main__":
+    main()
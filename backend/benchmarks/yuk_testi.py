@@ -0,0 +1,345 @@
+# =============================================
+# UCTAN UCA YUK TESTI
+# Calisan bir API sunucusuna senaryolu istek yagdirir
+# =============================================
+#
+# Hazirlik (backend/ klasorunden):
+#   python -m benchmarks.seed --tenant 3          # bench verisi
+#   uvicorn app.main:app --workers 4              # ayri terminalde sunucu
+#
+# Not: "giris" senaryosu ayni email ile tekrar tekrar giris yapar; sunucu
+# giris sinirlamasina takilmasin diye yuksek limitlerle baslatilmali:
+#   GIRIS_EMAIL_KAPASITE=1000000 GIRIS_IP_KAPASITE=1000000 uvicorn app.main:app --workers 4
+#
+# Kullanim:
+#   python -m benchmarks.yuk_testi --tenant 3 --kullanici 20 --sure 60
+#   python -m benchmarks.yuk_testi --senaryo liste,detay --etiket "index eklendi"
+#
+# Her sanal kullanici bir bench tenant'ina giris yapar ve --sure boyunca
+# agirlikli rastgele senaryolar calistirir:
+#
+#   giris         POST /auth/login/json            (bcrypt: CPU agir)
+#   liste         GET  /firma|isyeri|calisan|personel?sayfa=..
+#   arama         GET  /firma|calisan|personel?arama=..
+#   detay         GET  /<kaynak>/{id}
+#   excel_export  GET  /firma|isyeri/excel/export
+#   excel_import  POST /firma/excel/import          (10 satirlik dosya, VERI EKLER)
+#   medya         GET  /dokuman/indir/{id}
+#
+# 📚 DERS: Ortalama degil, yuzdelik (percentile)
+# Ortalama 50ms olabilir ama isteklerin %1'i 3 saniye suruyorsa kullanicilar
+# bunu hisseder. p50 = tipik istek, p95/p99 = en yavas %5/%1'in baslangici.
+#
+# Sunucu DB_DEBUG_HEADERLARI=True ile calisiyorsa X-DB-Queries header'indan
+# istek basina SQL sorgu sayisi da raporlanir (N+1 regresyonlari icin).
+#
+# Sonuc benchmarks/sonuclar/<tarih>_<commit>.json dosyasina yazilir.
+# Iki sonucu karsilastirmak icin: python -m benchmarks.karsilastir eski.json yeni.json
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from io import BytesIO
+from time import perf_counter
+
+import httpx
+from openpyxl import Workbook
+
+from app.services.excel_service import FIRMA_ALANLARI
+from benchmarks.seed import BENCH_SIFRE, tenant_email
+
+
+SONUC_DIZINI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sonuclar")
+
+# Senaryo adi -> agirlik (ne siklikla secilecegi)
+SENARYO_AGIRLIKLARI = {
+    "giris": 1,
+    "liste": 30,
+    "arama": 20,
+    "detay": 30,
+    "excel_export": 3,
+    "excel_import": 1,
+    "medya": 10,
+}
+
+LISTE_KAYNAKLARI = {
+    "firma": "firmalar",
+    "isyeri": "isyerleri",
+    "calisan": "calisanlar",
+    "personel": "personeller",
+}
+ARAMA_KELIMELERI = ["Yilmaz", "Kaya", "Ahmet", "Ayse", "Metal", "Insaat", "Demir", "Zeynep"]
+
+
+def yuzdelik(sirali: list, oran: float) -> float:
+    """Sirali listede en yakin sira (nearest-rank) yuzdeligi."""
+    if not sirali:
+        return 0.0
+    indeks = max(0, min(len(sirali) - 1, math.ceil(oran * len(sirali)) - 1))
+    return sirali[indeks]
+
+
+def _git(*komut) -> str:
+    try:
+        return subprocess.run(
+            ["git", *komut], capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+class Olcumler:
+    """Senaryo bazinda sure, durum kodu ve DB sorgu sayilarini biriktirir."""
+
+    def __init__(self):
+        self.sureler = defaultdict(list)      # senaryo -> [ms, ...]
+        self.hatalar = defaultdict(int)       # senaryo -> hata sayisi
+        self.durumlar = defaultdict(lambda: defaultdict(int))
+        self.db_sorgulari = defaultdict(list)  # senaryo -> [sorgu sayisi, ...]
+
+    def kaydet(self, senaryo: str, sure_ms: float, yanit: httpx.Response = None, hata: str = None):
+        self.sureler[senaryo].append(sure_ms)
+        if yanit is None:
+            self.hatalar[senaryo] += 1
+            self.durumlar[senaryo][hata or "baglanti"] += 1
+            return
+        self.durumlar[senaryo][str(yanit.status_code)] += 1
+        if yanit.status_code >= 400:
+            self.hatalar[senaryo] += 1
+        db = yanit.headers.get("x-db-queries")
+        if db is not None:
+            self.db_sorgulari[senaryo].append(int(db))
+
+    def rapor(self, gecen: float) -> dict:
+        senaryolar = {}
+        for ad, sureler in sorted(self.sureler.items()):
+            sirali = sorted(sureler)
+            db = sorted(self.db_sorgulari.get(ad, []))
+            senaryolar[ad] = {
+                "istek": len(sirali),
+                "hata": self.hatalar.get(ad, 0),
+                "rps": round(len(sirali) / gecen, 2),
+                "ort_ms": round(sum(sirali) / len(sirali), 2),
+                "p50_ms": round(yuzdelik(sirali, 0.50), 2),
+                "p95_ms": round(yuzdelik(sirali, 0.95), 2),
+                "p99_ms": round(yuzdelik(sirali, 0.99), 2),
+                "max_ms": round(sirali[-1], 2),
+                "db_sorgu_ort": round(sum(db) / len(db), 2) if db else None,
+                "db_sorgu_p95": yuzdelik(db, 0.95) if db else None,
+                "durum_kodlari": dict(self.durumlar[ad]),
+            }
+        tum = sorted(s for sureler in self.sureler.values() for s in sureler)
+        toplam_hata = sum(self.hatalar.values())
+        return {
+            "toplam": {
+                "istek": len(tum),
+                "hata": toplam_hata,
+                "hata_orani": round(toplam_hata / len(tum), 4) if tum else 0.0,
+                "rps": round(len(tum) / gecen, 2),
+                "p50_ms": round(yuzdelik(tum, 0.50), 2),
+                "p95_ms": round(yuzdelik(tum, 0.95), 2),
+                "p99_ms": round(yuzdelik(tum, 0.99), 2),
+            },
+            "senaryolar": senaryolar,
+        }
+
+
+def import_dosyasi(satir: int = 10) -> bytes:
+    """Firma import sablonuyla ayni basliklarda, benzersiz adli kucuk bir Excel."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append([alan["baslik"] for alan in FIRMA_ALANLARI])
+    for _ in range(satir):
+        ek = uuid.uuid4().hex[:10]
+        ornek = {
+            "ad": f"Yuk Testi Firma {ek}", "kisa_ad": ek[:8], "il": "Istanbul", "ilce": "Kadikoy",
+            "email": f"yuk{ek}@ornek.com", "telefon": "0212 555 0000",
+        }
+        ws.append([ornek.get(alan["alan"], "") for alan in FIRMA_ALANLARI])
+    cikti = BytesIO()
+    wb.save(cikti)
+    return cikti.getvalue()
+
+
+class SanalKullanici:
+    """Tek bir tenant'a bagli, senaryolari sirayla calistiran istemci."""
+
+    def __init__(self, client: httpx.AsyncClient, olcumler: Olcumler, tenant: int,
+                 senaryolar: list, rnd: random.Random, dokuman_adet: int):
+        self.client = client
+        self.olcumler = olcumler
+        self.tenant = tenant
+        self.rnd = rnd
+        self.dokuman_adet = dokuman_adet
+        self.headers = {}
+        self.toplamlar = {}    # kaynak -> kayit sayisi (detay icin id araligi)
+        self.senaryolar = senaryolar
+        self.agirliklar = [SENARYO_AGIRLIKLARI[s] for s in senaryolar]
+
+    async def _istek(self, senaryo: str, metod: str, yol: str, **kwargs):
+        baslangic = perf_counter()
+        try:
+            yanit = await self.client.request(metod, yol, headers=self.headers, **kwargs)
+            await yanit.aread()
+        except httpx.HTTPError as e:
+            self.olcumler.kaydet(senaryo, (perf_counter() - baslangic) * 1000, hata=type(e).__name__)
+            return None
+        self.olcumler.kaydet(senaryo, (perf_counter() - baslangic) * 1000, yanit)
+        return yanit
+
+    async def giris(self) -> bool:
+        self.headers = {}
+        yanit = await self._istek("giris", "POST", "/api/v1/auth/login/json", json={
+            "email": tenant_email(self.tenant), "sifre": BENCH_SIFRE,
+        })
+        if yanit is None or yanit.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {yanit.json()['access_token']}"}
+        return True
+
+    async def hazirla(self) -> None:
+        """Detay senaryosu icin kaynaklardaki kayit sayilarini ogren (olcume dahil degil)."""
+        for kaynak in LISTE_KAYNAKLARI:
+            yanit = await self.client.get(f"/api/v1/{kaynak}", params={"adet": 1}, headers=self.headers)
+            if yanit.status_code == 200:
+                self.toplamlar[kaynak] = yanit.json()["toplam"]
+
+    async def calistir(self, bitis: float) -> None:
+        if not await self.giris():
+            return
+        await self.hazirla()
+        while perf_counter() < bitis:
+            senaryo = self.rnd.choices(self.senaryolar, self.agirliklar)[0]
+            await getattr(self, f"s_{senaryo}")()
+
+    # ---- SENARYOLAR ----
+    async def s_giris(self):
+        await self.giris()
+
+    async def s_liste(self):
+        kaynak = self.rnd.choice(list(LISTE_KAYNAKLARI))
+        son_sayfa = max(1, self.toplamlar.get(kaynak, 0) // 20)
+        await self._istek("liste", "GET", f"/api/v1/{kaynak}", params={
+            "sayfa": self.rnd.randint(1, min(son_sayfa, 50)), "adet": 20,
+        })
+
+    async def s_arama(self):
+        kaynak = self.rnd.choice(["firma", "calisan", "personel"])
+        await self._istek("arama", "GET", f"/api/v1/{kaynak}", params={
+            "arama": self.rnd.choice(ARAMA_KELIMELERI),
+        })
+
+    async def s_detay(self):
+        kaynak = self.rnd.choice(list(LISTE_KAYNAKLARI))
+        toplam = self.toplamlar.get(kaynak, 0)
+        if toplam:
+            await self._istek("detay", "GET", f"/api/v1/{kaynak}/{self.rnd.randint(1, toplam)}")
+
+    async def s_excel_export(self):
+        if self.rnd.random() < 0.5:
+            await self._istek("excel_export", "GET", "/api/v1/firma/excel/export")
+        else:
+            firma_id = self.rnd.randint(1, max(1, self.toplamlar.get("firma", 1)))
+            await self._istek("excel_export", "GET", "/api/v1/isyeri/excel/export",
+                              params={"firma_id": firma_id})
+
+    async def s_excel_import(self):
+        await self._istek("excel_import", "POST", "/api/v1/firma/excel/import", files={
+            "dosya": ("yuk_testi.xlsx", import_dosyasi(),
+                      "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+        })
+
+    async def s_medya(self):
+        if self.dokuman_adet:
+            await self._istek("medya", "GET", f"/api/v1/dokuman/indir/{self.rnd.randint(1, self.dokuman_adet)}")
+
+
+async def yuk_testi(args) -> dict:
+    senaryolar = [s.strip() for s in args.senaryo.split(",")] if args.senaryo else list(SENARYO_AGIRLIKLARI)
+    bilinmeyen = set(senaryolar) - set(SENARYO_AGIRLIKLARI)
+    if bilinmeyen:
+        raise SystemExit(f"Bilinmeyen senaryo: {', '.join(sorted(bilinmeyen))}")
+
+    olcumler = Olcumler()
+    limitler = httpx.Limits(max_connections=args.kullanici, max_keepalive_connections=args.kullanici)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.zaman_asimi, limits=limitler) as client:
+        baslangic = perf_counter()
+        bitis = baslangic + args.sure
+        kullanicilar = [
+            SanalKullanici(client, olcumler, (k % args.tenant) + 1, senaryolar,
+                           random.Random(args.tohum + k), args.dokuman)
+            for k in range(args.kullanici)
+        ]
+        await asyncio.gather(*(k.calistir(bitis) for k in kullanicilar))
+        gecen = perf_counter() - baslangic
+
+    sonuc = olcumler.rapor(gecen)
+    sonuc["meta"] = {
+        "tarih": datetime.now().isoformat(timespec="seconds"),
+        "etiket": args.etiket,
+        "git_commit": _git("rev-parse", "--short", "HEAD"),
+        "git_dal": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "url": args.url,
+        "tenant": args.tenant,
+        "kullanici": args.kullanici,
+        "sure_s": round(gecen, 2),
+        "senaryolar": senaryolar,
+        "python": platform.python_version(),
+        "makine": platform.node(),
+    }
+    return sonuc
+
+
+def rapor_yazdir(sonuc: dict) -> None:
+    print(f"{'senaryo':14s} {'istek':>7s} {'hata':>5s} {'req/s':>8s} {'p50':>8s} {'p95':>8s} "
+          f"{'p99':>8s} {'db/istek':>9s}")
+    print("-" * 74)
+    for ad, s in sonuc["senaryolar"].items():
+        db = f"{s['db_sorgu_ort']:.1f}" if s["db_sorgu_ort"] is not None else "-"
+        print(f"{ad:14s} {s['istek']:7d} {s['hata']:5d} {s['rps']:8.1f} {s['p50_ms']:8.1f} "
+              f"{s['p95_ms']:8.1f} {s['p99_ms']:8.1f} {db:>9s}")
+    t = sonuc["toplam"]
+    print("-" * 74)
+    print(f"{'TOPLAM':14s} {t['istek']:7d} {t['hata']:5d} {t['rps']:8.1f} {t['p50_ms']:8.1f} "
+          f"{t['p95_ms']:8.1f} {t['p99_ms']:8.1f}")
+    print("(sureler ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OSGB API uctan uca yuk testi")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API adresi")
+    parser.add_argument("--tenant", type=int, default=3, help="Kullanilacak bench tenant sayisi (seed ile ayni)")
+    parser.add_argument("--kullanici", type=int, default=20, help="Eszamanli sanal kullanici")
+    parser.add_argument("--sure", type=float, default=30, help="Test suresi (saniye)")
+    parser.add_argument("--senaryo", default="", help="Virgulle ayrilmis senaryolar (bos = hepsi)")
+    parser.add_argument("--dokuman", type=int, default=500, help="Tenant basina dokuman sayisi (seed ile ayni)")
+    parser.add_argument("--zaman-asimi", type=float, default=30, help="Istek zaman asimi (saniye)")
+    parser.add_argument("--tohum", type=int, default=42, help="Senaryo secimi icin rastgele tohum")
+    parser.add_argument("--etiket", default="", help="Sonuca eklenecek not (ornek: 'index eklendi')")
+    parser.add_argument("--cikti", default="", help="Sonuc dosyasi (bos = benchmarks/sonuclar/...)")
+    args = parser.parse_args()
+
+    print(f"{args.url} | {args.kullanici} kullanici | {args.tenant} tenant | {args.sure:.0f}s")
+    sonuc = asyncio.run(yuk_testi(args))
+    rapor_yazdir(sonuc)
+
+    cikti = args.cikti
+    if not cikti:
+        os.makedirs(SONUC_DIZINI, exist_ok=True)
+        commit = sonuc["meta"]["git_commit"] or "yerel"
+        cikti = os.path.join(SONUC_DIZINI, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{commit}.json")
+    with open(cikti, "w", encoding="utf-8") as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"Sonuc: {cikti}")
+
+
+if __name__ == "__main__":
+    main()
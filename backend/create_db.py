@@ -12,6 +12,7 @@ from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from app.core.config import settings
 from app.core.database import Base, master_engine
 from app.models.master import Tenant, Kullanici, RolEnum, AbonelikDurumEnum
+from app.services.tenant_dizini import BILDIRIM_TETIKLEYICI_SQL
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
@@ -72,6 +73,43 @@ def tablolari_olustur():
     return True
 
 
+def sema_guncelle():
+    """
+    Mevcut kurulumlardaki tablolara sonradan eklenen kolonlari ekle.
+    (create_all yeni TABLOLARI olusturur ama var olan tabloya kolon eklemez)
+    """
+    print("2b. Sema guncelleniyor...")
+
+    from sqlalchemy import text
+    try:
+        with master_engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE kullanicilar "
+                "ADD COLUMN IF NOT EXISTS token_versiyon INTEGER NOT NULL DEFAULT 0"
+            ))
+            # tenants degisince uygulamalar bellekteki dizini yenilesin (LISTEN/NOTIFY)
+            conn.execute(text(BILDIRIM_TETIKLEYICI_SQL))
+            # platform_ozet: (sorgu, tenant_id) basina tek satir (once tekrarlari temizle)
+            conn.execute(text(
+                "DELETE FROM platform_ozet a USING platform_ozet b "
+                "WHERE a.sorgu = b.sorgu AND a.tenant_id IS NOT DISTINCT FROM b.tenant_id AND a.id < b.id"
+            ))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_platform_ozet_sorgu_tenant "
+                "ON platform_ozet (sorgu, tenant_id)"
+            ))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_platform_ozet_sorgu_toplam "
+                "ON platform_ozet (sorgu) WHERE tenant_id IS NULL"
+            ))
+        print("   Sema guncel!")
+    except Exception as e:
+        print(f"   HATA: {e}")
+        return False
+
+    return True
+
+
 def admin_olustur():
     """Varsayilan sistem admin kullanicisi olustur"""
     print("3. Admin kullanicisi olusturuluyor...")
@@ -179,10 +217,19 @@ def ornek_tenant_olustur():
 
 
 def tenant_db_olustur(db_name: str):
-    """Yeni bir tenant icin veritabani olustur"""
+    """
+    Yeni bir tenant icin veritabani olustur.
+    Veritabani osgb_template sablonundan kopyalanir (bkz. app/services/tenant_provizyon.py).
+    """
     print(f"5. Tenant veritabani olusturuluyor: {db_name}...")
 
+    from app.services.migrasyon_service import tenant_migre_et
+    from app.services.tenant_provizyon import sablon_hazirla, veritabani_klonla
+
     try:
+        if sablon_hazirla():
+            print(f"   '{settings.TENANT_SABLON_DB}' sablonu kuruldu!")
+
         conn = psycopg2.connect(
             host=settings.DATABASE_HOST,
             port=settings.DATABASE_PORT,
@@ -190,34 +237,25 @@ def tenant_db_olustur(db_name: str):
             password=settings.DATABASE_PASSWORD,
             database="postgres"
         )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cursor = conn.cursor()
-
         cursor.execute(
             "SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
             (db_name,)
         )
         exists = cursor.fetchone()
-
-        if not exists:
-            cursor.execute(f"CREATE DATABASE {db_name}")
-            print(f"   '{db_name}' veritabani olusturuldu!")
-        else:
-            print(f"   '{db_name}' zaten mevcut.")
-
         cursor.close()
         conn.close()
 
-        # Tenant tablolarini olustur
-        from app.core.database import get_tenant_engine
-        from app.models.tenant import (
-            Firma, Isyeri, Bolum, Calisan, Personel,
-            Egitim, KKDZimmet, Ziyaret,
-            CariHesap, Fatura,
-        )
-        tenant_engine = get_tenant_engine(db_name)
-        Base.metadata.create_all(bind=tenant_engine)
-        print(f"   '{db_name}' tablolari olusturuldu!")
+        if not exists:
+            veritabani_klonla(db_name)
+            print(f"   '{db_name}' veritabani sablondan olusturuldu!")
+        else:
+            # Eski kurulum: bekleyen migrasyonlari uygula
+            sonuc = tenant_migre_et(db_name)
+            if sonuc["hata"]:
+                raise RuntimeError(sonuc["hata"])
+            uygulanan = f" Uygulanan migrasyonlar: {', '.join(sonuc['uygulanan'])}" if sonuc["uygulanan"] else ""
+            print(f"   '{db_name}' zaten mevcut.{uygulanan}")
 
     except Exception as e:
         print(f"   HATA: {e}")
@@ -240,6 +278,10 @@ if __name__ == "__main__":
     if not tablolari_olustur():
         exit(1)
 
+    # 2b. Eski kurulumlara yeni kolonlar
+    if not sema_guncelle():
+        exit(1)
+
     # 3. Admin kullanici olustur
     if not admin_olustur():
         exit(1)
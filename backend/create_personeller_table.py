@@ -1,51 +1,14 @@
 """
-Personeller tablosunu tenant DB'de olustur.
+Eski kurulumlar icin: tenant DB'lerinde eksik tablolari (personeller dahil) olustur.
 Kullanim: python3 create_personeller_table.py
+
+Not: Yeni OSGB'ler sablondan kurulur ve tum tablolar hazir gelir.
+Eksik tablolar m0001_baslangic migrasyonu ile olusturulur; ayni is icin:
+    python tenant_cli.py migrasyon
 """
-from app.core.database import get_tenant_engine
-from sqlalchemy import text
+import sys
+
+from tenant_cli import main
 
-engine = get_tenant_engine('demo_osgb')
-with engine.connect() as conn:
-    # Enum type'larini olustur
-    conn.execute(text("""
-        DO $$ BEGIN
-            CREATE TYPE personelunvan AS ENUM ('isg_uzmani', 'isyeri_hekimi', 'dsp');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """))
-    conn.execute(text("""
-        DO $$ BEGIN
-            CREATE TYPE uzmanliksinifi AS ENUM ('a_sinifi', 'b_sinifi', 'c_sinifi');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """))
-    # Personeller tablosunu olustur
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS personeller (
-            id SERIAL PRIMARY KEY,
-            ad VARCHAR(100) NOT NULL,
-            soyad VARCHAR(100) NOT NULL,
-            tc_no VARCHAR(11) UNIQUE,
-            telefon VARCHAR(20),
-            email VARCHAR(255),
-            unvan personelunvan NOT NULL,
-            uzmanlik_belgesi_no VARCHAR(100),
-            diploma_no VARCHAR(100),
-            uzmanlik_sinifi uzmanliksinifi,
-            brans VARCHAR(255),
-            ise_baslama_tarihi DATE,
-            kullanici_id INTEGER,
-            aktif BOOLEAN DEFAULT TRUE,
-            olusturma_tarihi TIMESTAMP DEFAULT NOW(),
-            guncelleme_tarihi TIMESTAMP DEFAULT NOW()
-        );
-    """))
-    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_personeller_id ON personeller (id)'))
-    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_personeller_tc_no ON personeller (tc_no)'))
-    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_personeller_unvan ON personeller (unvan)'))
-    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_personeller_kullanici_id ON personeller (kullanici_id)'))
-    conn.commit()
-    print('Personeller tablosu basariyla olusturuldu!')
+sys.argv = [sys.argv[0], "migrasyon", *sys.argv[1:]]
+sys.exit(main())
@@ -4,4 +4,6 @@ import uvicorn
 from app.main import app
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001, reload=False)
+    # WebSocket sikistirmasi kapali: bildirimler kisa JSON, zlib durumu ise
+    # baglanti basina ~100 KB bellek (bkz. app/api/v1/bildirim.py)
+    uvicorn.run(app, host="0.0.0.0", port=8001, reload=False, ws_per_message_deflate=False)
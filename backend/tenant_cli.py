@@ -0,0 +1,158 @@
+"""
+OSGB (tenant) yonetim araci.
+
+Kullanim (backend/ klasorunden):
+    python tenant_cli.py sablon                 # Sablon DB'yi gerekirse kur
+    python tenant_cli.py sablon --yeniden       # Sablonu bastan kur
+    python tenant_cli.py liste
+    python tenant_cli.py olustur --ad "ABC OSGB" --subdomain abc \\
+        --yonetici-email ali@abc.com --yonetici-sifre gizli123 \\
+        --yonetici-ad Ali --yonetici-soyad Yilmaz
+    python tenant_cli.py migrasyon --kuru       # Bekleyen migrasyonlari dene (degisiklik yok)
+    python tenant_cli.py migrasyon --paralel 16 --rapor migrasyon_raporu.json
+    python tenant_cli.py migrasyon --db osgb_demo
+
+Ayrinti: app/services/tenant_provizyon.py, app/services/migrasyon_service.py
+"""
+
+import argparse
+import json
+import sys
+
+from fastapi import HTTPException
+
+from app.core.database import MasterSessionLocal
+from app.core.security import sifre_hashle
+from app.migrasyonlar import son_versiyon
+from app.models.master import Tenant
+from app.services.migrasyon_service import DURUM_HATA, DURUM_KILITLI, tum_tenantlari_migre_et
+from app.services.tenant_provizyon import sablon_durumu, sablon_hazirla, tenant_olustur
+
+
+def sablon(args) -> int:
+    kuruldu = sablon_hazirla(yeniden=args.yeniden)
+    durum = sablon_durumu()
+    print(f"Sablon   : {durum['db']} ({'yeniden kuruldu' if kuruldu else 'zaten guncel'})")
+    print(f"Sema     : {durum['parmak_izi']}")
+    return 0
+
+
+def liste(args) -> int:
+    db = MasterSessionLocal()
+    try:
+        tenantlar = db.query(Tenant).order_by(Tenant.id).all()
+    finally:
+        db.close()
+    print(f"{'ID':>4}  {'SUBDOMAIN':<20} {'VERITABANI':<24} {'DURUM':<14} AD")
+    for t in tenantlar:
+        durum = t.abonelik_durum.value if t.abonelik_durum else "-"
+        if not t.aktif:
+            durum += " (pasif)"
+        print(f"{t.id:>4}  {t.subdomain or '-':<20} {t.db_name:<24} {durum:<14} {t.ad}")
+    return 0
+
+
+def olustur(args) -> int:
+    tenant_alanlari = {
+        "ad": args.ad,
+        "subdomain": args.subdomain,
+        "email": args.email,
+        "telefon": args.telefon,
+        "il": args.il,
+        "ilce": args.ilce,
+        "max_isyeri": args.max_isyeri,
+        "max_kullanici": args.max_kullanici,
+        "deneme_gun": args.deneme_gun,
+    }
+    yonetici_alanlari = {
+        "email": args.yonetici_email,
+        "sifre_hash": sifre_hashle(args.yonetici_sifre),
+        "ad": args.yonetici_ad,
+        "soyad": args.yonetici_soyad,
+    }
+
+    db = MasterSessionLocal()
+    try:
+        tenant, yonetici, sureler = tenant_olustur(db, tenant_alanlari, yonetici_alanlari)
+    except HTTPException as e:
+        print(f"HATA: {e.detail}")
+        return 1
+    finally:
+        db.close()
+
+    print(f"OSGB kuruldu : {tenant.ad} (id={tenant.id})")
+    print(f"Veritabani   : {tenant.db_name}")
+    print(f"Yonetici     : {yonetici.email}")
+    print("Sureler (ms) : " + ", ".join(f"{ad}={ms:.0f}" for ad, ms in sureler.items()))
+    return 0
+
+
+def migrasyon(args) -> int:
+    kip = "KURU CALISTIRMA (degisiklik yapilmaz)" if args.kuru else "UYGULANIYOR"
+    print(f"Migrasyon -> v{son_versiyon()} | {kip}")
+
+    def ilerleme(sonuc: dict) -> None:
+        satir = f"  {sonuc['db_name']:<28} {sonuc['durum']:<10} {sonuc['sure_ms']:>8.0f} ms"
+        if sonuc["uygulanan"]:
+            satir += "  " + ", ".join(sonuc["uygulanan"])
+        if sonuc["hata"]:
+            satir += f"  HATA: {sonuc['hata']}"
+        print(satir, flush=True)
+
+    rapor = tum_tenantlari_migre_et(
+        db_adlari=args.db or None, paralel=args.paralel, kuru=args.kuru, ilerleme=ilerleme,
+    )
+
+    # Mevcut OSGB'ler migre edildi: yeni OSGB'ler de son semadan kurulsun
+    if not args.kuru and not args.db and sablon_hazirla():
+        print(f"Sablon yenilendi: {sablon_durumu()['db']}")
+
+    print("-" * 60)
+    print(" | ".join(f"{durum}: {adet}" for durum, adet in rapor["ozet"].items()) + f" | {rapor['sure_sn']}s")
+    if args.rapor:
+        with open(args.rapor, "w", encoding="utf-8") as f:
+            json.dump(rapor, f, ensure_ascii=False, indent=2)
+        print(f"Rapor: {args.rapor}")
+    return 1 if rapor["ozet"][DURUM_HATA] or rapor["ozet"][DURUM_KILITLI] else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="OSGB (tenant) yonetim araci")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    p = alt.add_parser("sablon", help="Sablon veritabanini kur / guncelle")
+    p.add_argument("--yeniden", action="store_true", help="Guncel olsa bile bastan kur")
+    p.set_defaults(fonk=sablon)
+
+    p = alt.add_parser("liste", help="Tum OSGB'leri listele")
+    p.set_defaults(fonk=liste)
+
+    p = alt.add_parser("olustur", help="Yeni OSGB kur")
+    p.add_argument("--ad", required=True)
+    p.add_argument("--subdomain", required=True)
+    p.add_argument("--email")
+    p.add_argument("--telefon")
+    p.add_argument("--il")
+    p.add_argument("--ilce")
+    p.add_argument("--max-isyeri", type=int, default=50)
+    p.add_argument("--max-kullanici", type=int, default=10)
+    p.add_argument("--deneme-gun", type=int)
+    p.add_argument("--yonetici-email", required=True)
+    p.add_argument("--yonetici-sifre", required=True)
+    p.add_argument("--yonetici-ad", required=True)
+    p.add_argument("--yonetici-soyad", required=True)
+    p.set_defaults(fonk=olustur)
+
+    p = alt.add_parser("migrasyon", help="Bekleyen migrasyonlari tum OSGB veritabanlarina uygula")
+    p.add_argument("--kuru", action="store_true", help="Calistir ve geri al (hicbir sey degismez)")
+    p.add_argument("--paralel", type=int, help="Ayni anda migre edilen DB sayisi (varsayilan: MIGRASYON_PARALEL)")
+    p.add_argument("--db", action="append", help="Sadece bu veritabani (birden fazla verilebilir)")
+    p.add_argument("--rapor", help="Sonuclari bu JSON dosyasina yaz")
+    p.set_defaults(fonk=migrasyon)
+
+    args = parser.parse_args()
+    return args.fonk(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
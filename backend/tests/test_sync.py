@@ -0,0 +1,188 @@
+# =============================================
+# POST /api/v1/sync TESTLERI
+# =============================================
+#
+# Calistirma (backend/ dizininden):
+#   python -m pytest -q tests
+#
+# PostgreSQL gerekmez: tenant tablolari bellekteki SQLite'ta kurulur.
+# degisim_no'yu PostgreSQL'de tetikleyici yazar; burada ayni isi test
+# oturumunun before_flush dinleyicisi yapar (transaction basina bir numara).
+
+import os
+
+os.environ.setdefault("PG_DINLEYICI_AKTIF", "false")
+os.environ.setdefault("ZAMANLAYICI_AKTIF", "false")
+
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.api.v1.firma as firma_api
+import app.api.v1.isyeri as isyeri_api
+import app.api.v1.personel as personel_api
+import app.api.v1.sync as sync_api
+from app.core.database import Base, get_master_db
+from app.main import app as uygulama
+from app.middleware import deps
+from app.models.master import RolEnum
+from app.models.tenant import (
+    TENANT_TABLOLARI, Firma, Isyeri, Personel, PersonelUnvan, Sayac, TehlikeSinifi,
+)
+from app.services.sync_service import SYNC_TABLOLARI
+from app.services.tenant_dizini import TenantKaydi, tenant_dizini
+
+_SYNC_MODELLERI = tuple(t.model for t in SYNC_TABLOLARI)
+
+
+class _Kullanici:
+    id = 1
+    tenant_id = 1
+    db_name = "test_tenant"
+    rol = RolEnum.OSGB_YONETICISI
+    ad = "Test"
+    soyad = "Kullanici"
+
+
+@pytest.fixture
+def oturum_fabrikasi():
+    motor = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(motor, tables=TENANT_TABLOLARI)
+    fabrika = sessionmaker(bind=motor, autocommit=False, autoflush=False)
+
+    @event.listens_for(fabrika, "before_flush")
+    def _degisim_no_damgala(oturum, flush_context, nesneler):
+        hedef = [n for n in (*oturum.new, *oturum.dirty) if isinstance(n, _SYNC_MODELLERI)]
+        if not hedef:
+            return
+        if "degisim_no" not in oturum.info:
+            oturum.execute(text("UPDATE sayaclar SET deger = deger + 1 WHERE ad = 'degisim'"))
+            oturum.info["degisim_no"] = oturum.execute(
+                text("SELECT deger FROM sayaclar WHERE ad = 'degisim'")
+            ).scalar()
+        for nesne in hedef:
+            nesne.degisim_no = oturum.info["degisim_no"]
+
+    @event.listens_for(fabrika, "after_commit")
+    @event.listens_for(fabrika, "after_rollback")
+    def _transaction_bitti(oturum):
+        oturum.info.pop("degisim_no", None)
+
+    with fabrika() as db:
+        db.add(Sayac(ad="degisim", deger=0))
+        db.commit()
+        firma = Firma(ad="Firma", il="Ankara", ilce="Cankaya", email="f@x.com", telefon="1")
+        db.add(firma)
+        db.flush()
+        db.add(Isyeri(
+            firma_id=firma.id, ad="Isyeri", sgk_sicil_no="1", nace_kodu="25.11.01",
+            tehlike_sinifi=TehlikeSinifi.TEHLIKELI, isveren_ad="A", isveren_soyad="B",
+        ))
+        db.add(Personel(ad="Ayse", soyad="Yilmaz", unvan=PersonelUnvan.ISG_UZMANI))
+        db.commit()
+    yield fabrika
+    motor.dispose()
+
+
+@pytest.fixture
+def istemci(oturum_fabrikasi, monkeypatch):
+    def _db():
+        db = oturum_fabrikasi()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def _log_yok(**kwargs):
+        pass
+
+    for modul in (firma_api, isyeri_api, personel_api):
+        monkeypatch.setattr(modul, "islem_logla", _log_yok)
+
+    tenant_dizini._degistir([TenantKaydi(
+        id=1, ad="Test OSGB", subdomain=None, db_name=_Kullanici.db_name, aktif=True,
+        abonelik_durum=None, abonelik_bitis=None, max_isyeri=None, max_kullanici=None,
+    )])
+    tenant_dizini._son_yukleme = time.monotonic() + 10 ** 9
+
+    uygulama.dependency_overrides[deps.mevcut_kullanici_getir] = lambda: _Kullanici
+    uygulama.dependency_overrides[deps.tenant_db_getir] = _db
+    uygulama.dependency_overrides[get_master_db] = _db
+    yield TestClient(uygulama)
+    uygulama.dependency_overrides.clear()
+
+
+def _sunucudaki(istemci, tablo):
+    return istemci.get("/api/v1/sync").json()["degisiklikler"][tablo][0]
+
+
+def _degisiklik(tablo, islem, kayit, veri=None):
+    degisiklik = {
+        "islem_id": str(uuid.uuid4()), "tablo": tablo, "islem": islem,
+        "id": kayit["id"], "temel_no": kayit["degisim_no"],
+    }
+    if veri is not None:
+        degisiklik["veri"] = veri
+    return degisiklik
+
+
+def test_isyeri_ve_personel_guncelle_sil_plani_yeniler(istemci, monkeypatch):
+    planlanan = []
+    monkeypatch.setattr(
+        isyeri_api, "ziyaretleri_arka_planda_yenile",
+        lambda db_name, isyeri_idleri=(), personel_id=None: planlanan.append(("isyeri", list(isyeri_idleri))),
+    )
+    monkeypatch.setattr(
+        personel_api, "ziyaretleri_arka_planda_yenile",
+        lambda db_name, isyeri_idleri=(), personel_id=None: planlanan.append(("personel", personel_id)),
+    )
+
+    isyeri, personel = _sunucudaki(istemci, "isyeri"), _sunucudaki(istemci, "personel")
+    yanit = istemci.post("/api/v1/sync", json={"degisiklikler": [
+        _degisiklik("isyeri", "guncelle", isyeri, {"tehlike_sinifi": "az_tehlikeli"}),
+        _degisiklik("personel", "guncelle", personel, {"aylik_kapasite_dk": 6000}),
+    ]})
+    assert yanit.status_code == 200
+    assert yanit.json()["uygulandi"] == 2, yanit.json()
+    assert yanit.json()["sonuclar"][0]["kayit"]["tehlike_sinifi"] == "az_tehlikeli"
+
+    isyeri, personel = _sunucudaki(istemci, "isyeri"), _sunucudaki(istemci, "personel")
+    yanit = istemci.post("/api/v1/sync", json={"degisiklikler": [
+        _degisiklik("isyeri", "sil", isyeri),
+        _degisiklik("personel", "sil", personel),
+    ]})
+    assert yanit.status_code == 200
+    sonuclar = yanit.json()["sonuclar"]
+    assert [s["durum"] for s in sonuclar] == ["uygulandi", "uygulandi"], sonuclar
+    assert [s["kayit"]["aktif"] for s in sonuclar] == [False, False]
+
+    # Ziyaret plani her degisiklik icin yanittan sonra yenilendi
+    assert planlanan == [
+        ("isyeri", [isyeri["id"]]), ("personel", personel["id"]),
+        ("isyeri", [isyeri["id"]]), ("personel", personel["id"]),
+    ]
+
+
+def test_beklenmeyen_hata_sadece_o_degisikligi_dusurur(istemci, monkeypatch):
+    async def _bozuk(**kwargs):
+        raise RuntimeError("beklenmeyen")
+
+    _, _, _, create_sema, update_sema = sync_api._YAZMA["isyeri"]
+    monkeypatch.setitem(sync_api._YAZMA, "isyeri", (_bozuk, _bozuk, _bozuk, create_sema, update_sema))
+    isyeri, personel = _sunucudaki(istemci, "isyeri"), _sunucudaki(istemci, "personel")
+    yanit = istemci.post("/api/v1/sync", json={"degisiklikler": [
+        _degisiklik("isyeri", "guncelle", isyeri, {"ad": "Yeni ad"}),
+        _degisiklik("personel", "guncelle", personel, {"telefon": "5550000000"}),
+    ]})
+    assert yanit.status_code == 200
+    hatali, uygulanan = yanit.json()["sonuclar"]
+    assert (hatali["durum"], hatali["kod"]) == ("hata", 500)
+    assert uygulanan["durum"] == "uygulandi"
+    assert _sunucudaki(istemci, "isyeri")["ad"] == "Isyeri"